@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+import asyncio
+import concurrent.futures
+import unittest
+
+from vert import AsyncGraph, AsyncGraphStore, DBMGraphStore, MemoryGraphStore, LockingGraphStore, DirectedEdgeID
+
+
+class CountingExecutor(concurrent.futures.ThreadPoolExecutor):
+
+    def __init__(self, max_workers):
+        super().__init__(max_workers)
+        self.jobs = 0
+
+    def submit(self, *args, **kwargs):
+        self.jobs += 1
+        return super().submit(*args, **kwargs)
+
+
+class TestAsyncGraphStore(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.executor = CountingExecutor(2)
+        self.store = AsyncGraphStore(DBMGraphStore({}), self.executor)
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.store.close())
+        self.executor.shutdown()
+        self.loop.close()
+
+    def run_async(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def testBlocking(self):
+        self.assertTrue(self.store.blocking)
+        self.assertIsInstance(self.store.store, LockingGraphStore)
+
+        async def work():
+            await self.store.add_edges(DirectedEdgeID(index, index + 1) for index in range(2500))
+            await self.store.set_vertex_data(0, 'name', 'zero')
+            sinks = await self.store.iter_sinks(0).collect()
+            vertices = []
+            async for vid in self.store.iter_vertices():
+                vertices.append(vid)
+            return sinks, vertices, await self.store.get_vertex_data(0, 'name'), await self.store.count_edges()
+
+        sinks, vertices, name, count = self.run_async(work())
+        self.assertEqual(sinks, [1])
+        self.assertEqual(sorted(vertices), list(range(2501)))
+        self.assertEqual(name, 'zero')
+        self.assertEqual(count, 2500)
+
+    def testCoalescedLookups(self):
+        self.run_async(self.store.set_vertex_data_many((index, {'k': index}) for index in range(100)))
+        jobs = self.executor.jobs
+
+        async def lookup(index):
+            return await self.store.get_vertex_data(index, 'k'), await self.store.has_vertex(index)
+
+        async def gather(*coroutines):
+            return await asyncio.gather(*coroutines)
+
+        results = self.run_async(gather(*[lookup(index) for index in range(100)]))
+        self.assertEqual(results, [(index, True) for index in range(100)])
+        # One batch for the data lookups, and one for the vertex checks that follow them.
+        self.assertEqual(self.executor.jobs - jobs, 2)
+
+        # Identical lookups are made once, and lookups with unhashable arguments still work.
+        results = self.run_async(gather(self.store.get_vertex_data(1, 'k'), self.store.get_vertex_data(1, 'k'),
+                                        self.store.get_vertex_data(1, 'missing', [])))
+        self.assertEqual(results, [1, 1, []])
+
+    def testErrors(self):
+        # An error raised by one lookup is passed to its caller alone, not to the others in the same batch.
+        self.store.store.get_vertex_data = lambda vid, key, default: {0: 'zero'}[vid]
+
+        async def work():
+            return await asyncio.gather(self.store.get_vertex_data(0, 'k'), self.store.get_vertex_data(1, 'k'),
+                                        return_exceptions=True)
+
+        results = self.run_async(work())
+        self.assertEqual(results[0], 'zero')
+        self.assertIsInstance(results[1], KeyError)
+        self.assertEqual(self.executor.jobs, 1)
+
+
+class TestAsyncGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def run_async(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def check(self, graph):
+        async def work():
+            await graph.add_vertex('a', ['person'], {'age': 30})
+            eid = await graph.add_edge('a', 'b', labels=['knows'], data={'since': 2001})
+            await graph.add_edge('b', 'c', directed=False)
+            vertex = await graph.get_vertex('a')
+            edge = await graph.get_edge('a', 'b')
+            found = await graph.find_vertices(age=30).collect()
+            edges = await graph.find_edges({'since': 2001}).collect()
+            degree = await graph.run(lambda g, vid: len(g.vertices[vid].sinks), 'a')
+            removed = await graph.remove_edge('c', 'b', directed=False), await graph.remove_vertex('z')
+            await graph.close()
+            return eid, vertex, edge, found, edges, degree, removed
+
+        eid, vertex, edge, found, edges, degree, removed = self.run_async(work())
+        self.assertEqual(eid, DirectedEdgeID('a', 'b'))
+        self.assertEqual((vertex.labels, vertex.data, vertex.outbound), ({'person'}, {'age': 30}, 1))
+        self.assertEqual((edge.labels, edge.data), ({'knows'}, {'since': 2001}))
+        self.assertEqual(found, ['a'])
+        self.assertEqual(edges, [eid])
+        self.assertEqual(degree, 1)
+        self.assertEqual(removed, (True, False))
+
+    def testMemory(self):
+        graph = AsyncGraph()
+        self.assertFalse(graph.store.blocking)
+        self.assertIsInstance(graph.store.store, MemoryGraphStore)
+        self.check(graph)
+
+    def testDBM(self):
+        graph = AsyncGraph(DBMGraphStore({}), max_workers=2)
+        self.assertTrue(graph.store.blocking)
+        self.check(graph)
+        self.assertFalse(graph.is_open)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
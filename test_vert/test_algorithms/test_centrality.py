@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+import random
+import unittest
+
+from vert import Graph, MemoryGraphStore, DirectedEdgeID, UndirectedEdgeID
+from vert.algorithms import IN, OUT, pagerank, personalized_pagerank, degree_centrality, eigenvector_centrality
+from vert.algorithms.centrality import numpy
+
+
+def reference_pagerank(store, damping=0.85, iterations=200):
+    """A straightforward pure-Python PageRank over directed edges, for comparison."""
+    vids = list(store.iter_vertices())
+    ranks = {vid: 1.0 / len(vids) for vid in vids}
+    for _ in range(iterations):
+        dangling = sum(ranks[vid] for vid in vids if not store.count_outbound(vid))
+        new_ranks = {vid: (1.0 - damping + damping * dangling) / len(vids) for vid in vids}
+        for vid in vids:
+            sinks = list(store.iter_sinks(vid))
+            for sink in sinks:
+                new_ranks[sink] += damping * ranks[vid] / len(sinks)
+        ranks = new_ranks
+    return ranks
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed.")
+class TestCentrality(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = Graph()
+        for source, sink in [('a', 'b'), ('b', 'c'), ('c', 'a'), ('d', 'a'), ('d', 'c')]:
+            self.graph.edges[source, sink].add()
+        self.graph.vertices['e'].add()
+
+    def testPageRank(self):
+        ranks = pagerank(self.graph, tolerance=1e-12, max_iterations=500)
+        expected = reference_pagerank(self.graph.store)
+        self.assertEqual(set(ranks), set(expected))
+        for vid in ranks:
+            self.assertAlmostEqual(ranks[vid], expected[vid], places=8)
+        self.assertAlmostEqual(sum(ranks.values()), 1.0)
+
+        rng = random.Random(0)
+        store = MemoryGraphStore()
+        store.add_vertices(range(50))
+        store.add_edges(DirectedEdgeID(rng.randrange(50), rng.randrange(50)) for _ in range(200))
+        ranks = pagerank(store, tolerance=1e-12, max_iterations=500)
+        expected = reference_pagerank(store)
+        for vid in ranks:
+            self.assertAlmostEqual(ranks[vid], expected[vid], places=8)
+
+    def testWeightsAndWriteBack(self):
+        self.graph.edges['a', 'c'].add().data['w'] = 3.0
+        self.graph.edges['a', 'b'].data['w'] = 1.0
+        unweighted = pagerank(self.graph)
+        weighted = pagerank(self.graph, weight_key='w', store_key='rank')
+        self.assertGreater(weighted['c'] - weighted['b'], unweighted['c'] - unweighted['b'])
+        for vid, rank in weighted.items():
+            self.assertEqual(self.graph.vertices[vid].data['rank'], rank)
+        self.assertEqual(pagerank(Graph()), {})
+
+    def testPersonalizedPageRank(self):
+        ranks = personalized_pagerank(self.graph, ['d'])
+        self.assertEqual(ranks['e'], 0)
+        self.assertGreater(ranks['d'], 0.15)
+        self.assertAlmostEqual(sum(ranks.values()), 1.0)
+        self.assertEqual(personalized_pagerank(self.graph, {'d': 2.0, 'e': 0.0}), ranks)
+        with self.assertRaises(ValueError):
+            personalized_pagerank(self.graph, [])
+
+    def testDegreeCentrality(self):
+        self.graph.edges[{'e', 'a'}].add()
+        degrees = degree_centrality(self.graph, normalized=False)
+        self.assertEqual(degrees, {'a': 4, 'b': 2, 'c': 3, 'd': 2, 'e': 1})
+        self.assertEqual(degree_centrality(self.graph, OUT, normalized=False)['a'], 2)
+        self.assertEqual(degree_centrality(self.graph, IN, normalized=False)['a'], 3)
+        self.assertEqual(degree_centrality(self.graph, store_key='degree')['a'], 1.0)
+        self.assertEqual(self.graph.vertices['c'].data['degree'], 0.75)
+
+    def testEigenvectorCentrality(self):
+        store = MemoryGraphStore()
+        # A star: the center should score highest, and the leaves equally.
+        store.add_edges(UndirectedEdgeID(0, leaf) for leaf in range(1, 5))
+        scores = eigenvector_centrality(store, tolerance=1e-12, max_iterations=1000)
+        self.assertAlmostEqual(sum(score ** 2 for score in scores.values()), 1.0)
+        for leaf in range(1, 5):
+            self.assertAlmostEqual(scores[leaf], scores[1])
+            self.assertAlmostEqual(scores[0] / scores[leaf], 2.0, places=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
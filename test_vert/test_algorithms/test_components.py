@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+import unittest
+
+from vert import Graph, MemoryGraphStore, DirectedEdgeID, UndirectedEdgeID
+from vert.algorithms import connected_components, strongly_connected_components, UnionFind, \
+    ComponentIndexGraphStore
+
+
+class TestUnionFind(unittest.TestCase):
+
+    def testUnion(self):
+        index = UnionFind()
+        self.assertTrue(index.same('a', 'a'))
+        self.assertFalse(index.same('a', 'b'))
+        self.assertEqual(index.size('a'), 1)
+        self.assertEqual(list(index.iter_members('a')), ['a'])
+        self.assertTrue(index.union('a', 'b'))
+        self.assertTrue(index.union('c', 'd'))
+        self.assertFalse(index.union('b', 'a'))
+        self.assertFalse(index.same('a', 'c'))
+        self.assertTrue(index.union('d', 'a'))
+        self.assertTrue(index.same('b', 'c'))
+        self.assertEqual(index.size('a'), 4)
+        self.assertEqual(set(index.iter_members('c')), {'a', 'b', 'c', 'd'})
+        self.assertEqual(index.merges, 3)
+        index.add('e')
+        self.assertEqual(len(index), 5)
+        self.assertIn('e', index)
+        self.assertNotIn('f', index)
+
+
+class TestComponents(unittest.TestCase):
+
+    def setUp(self):
+        # A directed cycle 0 -> 1 -> 2 -> 0 feeding 3, an undirected pair 4 -- 5, and an isolated vertex 6.
+        self.store = MemoryGraphStore()
+        self.store.add_edges([DirectedEdgeID(0, 1), DirectedEdgeID(1, 2), DirectedEdgeID(2, 0), DirectedEdgeID(2, 3),
+                              UndirectedEdgeID(4, 5)])
+        self.store.add_vertex(6)
+
+    def testConnectedComponents(self):
+        components = sorted(connected_components(self.store), key=min)
+        self.assertEqual(components, [{0, 1, 2, 3}, {4, 5}, {6}])
+
+    def testStronglyConnectedComponents(self):
+        components = list(strongly_connected_components(Graph(self.store)))
+        self.assertEqual(sorted(components, key=min), [{0, 1, 2}, {3}, {4, 5}, {6}])
+        # Reverse topological order: the component {3} comes before the cycle that leads to it.
+        self.assertLess(components.index({3}), components.index({0, 1, 2}))
+
+    def testIndex(self):
+        store = ComponentIndexGraphStore(self.store)
+        self.assertEqual(store.count_components(), 3)
+        self.assertTrue(store.same_component(3, 0))
+        self.assertFalse(store.same_component(3, 4))
+        store.add_edge(DirectedEdgeID(5, 3))
+        self.assertTrue(store.same_component(4, 0))
+        self.assertEqual(store.component_of(6), {6})
+        store.add_edge(UndirectedEdgeID(6, 7))
+        self.assertEqual(store.component_of(7), {6, 7})
+        self.assertEqual(store.count_components(), 2)
+        store.discard_edge(DirectedEdgeID(5, 3))
+        self.assertFalse(store.same_component(4, 0))
+        self.assertEqual(store.count_components(), 3)
+        store.discard_vertex(2)
+        self.assertEqual(store.component_of(0), {0, 1})
+        self.assertEqual(store.count_components(), 4)
+
+    def testBulkMethods(self):
+        # Every bulk method that can create edges merges them into the index.
+        calls = [
+            lambda store, eid: store.add_edges([eid]),
+            lambda store, eid: store.set_edge_data_many([(eid, {'k': 1})]),
+            lambda store, eid: store.add_edge_labels_many([(eid, ['x'])]),
+        ]
+        for call in calls:
+            store = ComponentIndexGraphStore(MemoryGraphStore())
+            store.add_vertices([1, 2])
+            self.assertEqual(store.count_components(), 2)
+            call(store, DirectedEdgeID(1, 2))
+            self.assertTrue(store.has_edge(DirectedEdgeID(1, 2)))
+            self.assertTrue(store.same_component(1, 2))
+            self.assertEqual(store.count_components(), 1)
+
+    def testGraphMethods(self):
+        for store in self.store, ComponentIndexGraphStore(self.store):
+            graph = Graph(store)
+            self.assertEqual(graph.component_of(graph.vertices[3]), {0, 1, 2, 3})
+            self.assertTrue(graph.same_component(0, 3))
+            self.assertFalse(graph.same_component(0, 6))
+
+
+if __name__ == '__main__':
+    unittest.main()
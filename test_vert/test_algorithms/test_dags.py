@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+import unittest
+
+from vert import MemoryGraphStore, DBMGraphStore, Graph, DirectedEdgeID, UndirectedEdgeID
+from vert.algorithms import VertexCounters, KAHN, DFS, topological_sort, find_cycle, is_dag
+
+
+class TestVertexCounters(unittest.TestCase):
+
+    def testMixedIDs(self):
+        counters = VertexCounters(4, max_count=100)
+        for vid in [2, 50, 1000, -1, 'a']:
+            self.assertEqual(counters[vid], 0)
+            counters[vid] = 3
+            self.assertEqual(counters[vid], 3)
+            self.assertEqual(counters.decrement(vid), 2)
+            self.assertEqual(counters[vid], 2)
+        counters[3] = 0
+        counters['b'] = 0
+        self.assertEqual(counters[3], 0)
+        self.assertEqual(counters['b'], 0)
+        self.assertEqual(counters[99], 0)
+
+
+class TestDAGs(unittest.TestCase):
+
+    def setUp(self):
+        # 0 -> 1 -> 3, 0 -> 2 -> 3, 3 -> 4, an isolated vertex 5, and an undirected edge 4 -- 0, which is ignored.
+        self.store = MemoryGraphStore()
+        self.store.add_edges([DirectedEdgeID(0, 1), DirectedEdgeID(1, 3), DirectedEdgeID(0, 2), DirectedEdgeID(2, 3),
+                              DirectedEdgeID(3, 4), UndirectedEdgeID(4, 0)])
+        self.store.add_vertex(5)
+
+    def assertTopological(self, store, order):
+        self.assertEqual(sorted(order, key=repr), sorted(store.iter_vertices(), key=repr))
+        positions = {vid: i for i, vid in enumerate(order)}
+        for eid in store.iter_edges():
+            if eid.is_directed:
+                self.assertLess(positions[eid.source], positions[eid.sink])
+
+    def testTopologicalSort(self):
+        for method in KAHN, DFS:
+            self.assertTopological(self.store, list(topological_sort(Graph(self.store), method)))
+        self.assertTrue(is_dag(self.store))
+        self.assertIsNone(find_cycle(self.store))
+        with self.assertRaises(ValueError):
+            topological_sort(self.store, 'bogus')
+
+    def testCycles(self):
+        self.store.add_edge(DirectedEdgeID(4, 1))
+        self.assertFalse(is_dag(self.store))
+        cycle = find_cycle(self.store)
+        self.assertEqual(sorted(cycle), [1, 3, 4])
+        for i, vid in enumerate(cycle):
+            self.assertTrue(self.store.has_edge(DirectedEdgeID(vid, cycle[(i + 1) % len(cycle)])))
+        for method in KAHN, DFS:
+            with self.assertRaises(ValueError):
+                list(topological_sort(self.store, method))
+        self.store.add_edge(DirectedEdgeID(5, 5))
+        self.store.discard_edge(DirectedEdgeID(4, 1))
+        self.assertEqual(find_cycle(self.store), [5])
+
+    def testLongChain(self):
+        # Far deeper than the recursion limit, on a DBM graph store.
+        store = DBMGraphStore({})
+        store.add_edges(DirectedEdgeID('v%d' % i, 'v%d' % (i + 1)) for i in range(5000))
+        for method in KAHN, DFS:
+            self.assertEqual(list(topological_sort(store, method)), ['v%d' % i for i in range(5001)])
+        store.add_edge(DirectedEdgeID('v5000', 'v0'))
+        self.assertEqual(len(find_cycle(store)), 5001)
+
+
+if __name__ == '__main__':
+    unittest.main()
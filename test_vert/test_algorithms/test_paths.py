@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+import random
+import unittest
+
+from vert import Graph, MemoryGraphStore, DirectedEdgeID, UndirectedEdgeID
+from vert.algorithms import IN, BOTH, dijkstra, bidirectional_dijkstra, astar, shortest_path
+
+
+class TestShortestPaths(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = Graph()
+        for source, sink, weight in [('a', 'b', 1), ('b', 'c', 2), ('a', 'c', 5), ('c', 'd', 1), ('b', 'd', 7),
+                                     ('d', 'e', 3), ('x', 'a', 1)]:
+            self.graph.edges[source, sink].add().data['weight'] = weight
+        self.graph.edges['c', 'e'].add()  # Default weight of 1.
+
+    def testDijkstra(self):
+        distances, predecessors = dijkstra(self.graph, 'a')
+        self.assertEqual(distances, {'a': 0, 'b': 1, 'c': 3, 'd': 4, 'e': 4})
+        self.assertEqual(predecessors, {'a': None, 'b': 'a', 'c': 'b', 'd': 'c', 'e': 'c'})
+        distances, _ = dijkstra(self.graph, 'a', default_weight=10)
+        self.assertEqual(distances['e'], 7)
+        distances, _ = dijkstra(self.graph, 'a', cutoff=3)
+        self.assertEqual(set(distances), {'a', 'b', 'c'})
+        distances, _ = dijkstra(self.graph, 'a', target='b')
+        self.assertNotIn('d', distances)
+        distances, _ = dijkstra(self.graph, 'c', direction=IN)
+        self.assertEqual(distances, {'c': 0, 'b': 2, 'a': 3, 'x': 4})
+
+    def testPointToPoint(self):
+        for function in (bidirectional_dijkstra, shortest_path):
+            self.assertEqual(function(self.graph, 'a', 'e'), (4, ['a', 'b', 'c', 'e']))
+            self.assertEqual(function(self.graph, 'x', 'd'), (5, ['x', 'a', 'b', 'c', 'd']))
+            self.assertEqual(function(self.graph, 'a', 'a'), (0, ['a']))
+            self.assertIsNone(function(self.graph, 'e', 'a'))
+            self.assertEqual(function(self.graph, 'e', 'a', direction=BOTH).cost, 4)
+        path = astar(self.graph, 'a', 'e', lambda vid, target: 0)
+        self.assertEqual(path, (4, ['a', 'b', 'c', 'e']))
+        self.assertEqual(shortest_path(self.graph, self.graph.vertices['e'], 'x', direction=IN,
+                                       heuristic=lambda vid, target: 0).vids, ['e', 'c', 'b', 'a', 'x'])
+        self.assertIsNone(astar(self.graph, 'e', 'a', lambda vid, target: 0))
+
+    def testNegativeWeight(self):
+        self.graph.edges['e', 'f'].add().data['weight'] = -1
+        with self.assertRaises(ValueError):
+            dijkstra(self.graph, 'a')
+
+    def testGridAgreement(self):
+        # Compare all three algorithms on a randomly weighted grid, using Manhattan distance as the A* heuristic.
+        rng = random.Random(0)
+        store = MemoryGraphStore()
+        size = 12
+        for x in range(size):
+            for y in range(size):
+                for other in ((x + 1, y), (x, y + 1)):
+                    if other[0] < size and other[1] < size:
+                        eid = UndirectedEdgeID(x * size + y, other[0] * size + other[1])
+                        store.set_edge_data_many([(eid, {'weight': rng.randint(1, 9)})])
+
+        def manhattan(vid, target):
+            return abs(vid // size - target // size) + abs(vid % size - target % size)
+
+        for _ in range(20):
+            source, target = rng.randrange(size * size), rng.randrange(size * size)
+            distances, _ = dijkstra(store, source, direction=BOTH, target=target)
+            expected = distances[target]
+            self.assertEqual(bidirectional_dijkstra(store, source, target, direction=BOTH).cost, expected)
+            path = astar(store, source, target, manhattan, direction=BOTH)
+            self.assertEqual(path.cost, expected)
+            self.assertEqual(path.vids[0], source)
+            self.assertEqual(path.vids[-1], target)
+
+
+class TestWeightedAdjacency(unittest.TestCase):
+
+    def testStoreMethods(self):
+        store = MemoryGraphStore()
+        store.set_edge_data(DirectedEdgeID(1, 2), 'w', 5)
+        store.add_edge(DirectedEdgeID(1, 3))
+        store.set_edge_data(UndirectedEdgeID(1, 4), 'w', 6)
+        self.assertEqual(sorted(store.iter_outbound_data(1, 'w')), [(2, 5), (3, None)])
+        self.assertEqual(sorted(store.iter_outbound_data(1, 'w', 0)), [(2, 5), (3, 0)])
+        self.assertEqual(list(store.iter_inbound_data(2, 'w')), [(1, 5)])
+        self.assertEqual(list(store.iter_undirected_data(4, 'w')), [(1, 6)])
+        self.assertEqual(list(store.iter_outbound_data(9, 'w')), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
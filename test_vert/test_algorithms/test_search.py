@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+import unittest
+
+from vert import Graph, MemoryGraphStore, DirectedEdgeID, UndirectedEdgeID
+from vert.algorithms import IN, BOTH, VisitedSet, bfs, dfs, bfs_frontiers, k_hop_neighborhood
+
+
+class TestVisitedSet(unittest.TestCase):
+
+    def testMixedIDs(self):
+        visited = VisitedSet(4, max_flag_count=100)
+        self.assertTrue(visited.add(2))
+        self.assertFalse(visited.add(2))
+        self.assertTrue(visited.add(50))
+        self.assertTrue(visited.add(1000))
+        self.assertTrue(visited.add(-1))
+        self.assertTrue(visited.add('a'))
+        self.assertEqual(visited.add_new([2, 3, 3, 'a', 'b', 70, 1000, 2000]), [3, 'b', 70, 2000])
+        self.assertEqual(len(visited), 9)
+        self.assertEqual(sorted(visited, key=repr), sorted([2, 3, 50, 70, 1000, 2000, -1, 'a', 'b'], key=repr))
+        for vid in [2, 3, 50, 70, 1000, 2000, -1, 'a', 'b']:
+            self.assertIn(vid, visited)
+        for vid in [0, 99, 100, 3000, -2, 'c']:
+            self.assertNotIn(vid, visited)
+
+
+class TestSearch(unittest.TestCase):
+
+    def setUp(self):
+        # 0 -> 1 -> 3 -> 5, 0 -> 2 -> 3, 2 -> 4, 6 -> 0, and an undirected edge 5 -- 7.
+        self.store = MemoryGraphStore()
+        self.store.add_edges([DirectedEdgeID(0, 1), DirectedEdgeID(1, 3), DirectedEdgeID(3, 5), DirectedEdgeID(0, 2),
+                              DirectedEdgeID(2, 3), DirectedEdgeID(2, 4), DirectedEdgeID(6, 0),
+                              UndirectedEdgeID(5, 7)])
+        self.graph = Graph(self.store)
+
+    def testBFS(self):
+        self.assertEqual(dict(bfs(self.graph, 0)), {0: 0, 1: 1, 2: 1, 3: 2, 4: 2, 5: 3})
+        self.assertEqual(dict(bfs(self.store, self.graph.vertices[0], max_depth=1)), {0: 0, 1: 1, 2: 1})
+        self.assertEqual(dict(bfs(self.graph, 5, IN)), {5: 0, 3: 1, 1: 2, 2: 2, 0: 3, 6: 4})
+        self.assertEqual(dict(bfs(self.graph, 7, BOTH))[6], 5)
+        self.assertEqual(next(bfs(self.graph, 4)), (4, 0))
+        with self.assertRaises(ValueError):
+            list(bfs(self.graph, 0, 'sideways'))
+
+    def testDFS(self):
+        order = list(dfs(self.graph, 0))
+        self.assertEqual(sorted(order), [0, 1, 2, 3, 4, 5])
+        self.assertEqual(order[0], 0)
+        # Preorder: every vertex after the first is reached from a vertex that came before it.
+        for index, vid in enumerate(order[1:], 1):
+            self.assertTrue(any(source in order[:index] for source in self.store.iter_sources(vid)))
+        self.assertEqual(sorted(dfs(self.graph, 0, max_depth=1)), [0, 1, 2])
+        self.assertEqual(list(dfs(self.graph, 0, max_depth=0)), [0])
+
+    def testDeepDFS(self):
+        store = MemoryGraphStore()
+        store.add_edges(DirectedEdgeID(vid, vid + 1) for vid in range(5000))
+        self.assertEqual(list(dfs(store, 0)), list(range(5001)))
+
+    def testFrontiers(self):
+        frontiers = [sorted(frontier) for frontier in bfs_frontiers(self.graph, [0, 6])]
+        self.assertEqual(frontiers, [[0, 6], [1, 2], [3, 4], [5]])
+        frontiers = [sorted(frontier) for frontier in bfs_frontiers(self.graph, [0], max_depth=1)]
+        self.assertEqual(frontiers, [[0], [1, 2]])
+        self.assertEqual(list(bfs_frontiers(self.graph, [])), [])
+
+    def testKHop(self):
+        self.assertEqual(k_hop_neighborhood(self.graph, 0, 0), set())
+        self.assertEqual(k_hop_neighborhood(self.graph, 0, 2), {1, 2, 3, 4})
+        self.assertEqual(k_hop_neighborhood(self.graph, 3, 1, BOTH), {1, 2, 5})
+        self.assertEqual(k_hop_neighborhood(self.graph, 5, 10, BOTH), {0, 1, 2, 3, 4, 6, 7})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+import itertools
+import random
+import unittest
+
+from vert import Graph, MemoryGraphStore, DirectedEdgeID, UndirectedEdgeID
+from vert.algorithms import triangles, count_triangles, clustering, average_clustering, global_clustering
+
+
+class TestTriangles(unittest.TestCase):
+
+    def setUp(self):
+        # Two triangles sharing the edge 1 -- 2, with mixed directions, a parallel edge, a self-loop, and a pendant
+        # vertex 4.
+        self.store = MemoryGraphStore()
+        self.store.add_edges([DirectedEdgeID(0, 1), DirectedEdgeID(2, 0), UndirectedEdgeID(1, 2), DirectedEdgeID(1, 3),
+                              DirectedEdgeID(3, 2), DirectedEdgeID(2, 1), DirectedEdgeID(3, 3), DirectedEdgeID(3, 4)])
+        self.store.add_vertex(5)
+        self.graph = Graph(self.store)
+
+    def testTriangles(self):
+        self.assertEqual(triangles(self.graph), {0: 1, 1: 2, 2: 2, 3: 1, 4: 0, 5: 0})
+        self.assertEqual(count_triangles(self.store), 2)
+
+    def testClustering(self):
+        coefficients = clustering(self.graph, store_key='clustering')
+        self.assertEqual(coefficients, {0: 1.0, 1: 2 / 3, 2: 2 / 3, 3: 1 / 3, 4: 0.0, 5: 0.0})
+        self.assertEqual(self.graph.vertices[1].data['clustering'], 2 / 3)
+        self.assertAlmostEqual(average_clustering(self.graph), (1 + 2 / 3 + 2 / 3 + 1 / 3) / 6)
+        # Paths of length two: 1 at vertex 0, 3 each at 1 and 2, and 3 at vertex 3.
+        self.assertAlmostEqual(global_clustering(self.graph), 6 / 10)
+
+    def testEmpty(self):
+        store = MemoryGraphStore()
+        self.assertEqual(triangles(store), {})
+        self.assertEqual(average_clustering(store), 0.0)
+        self.assertEqual(global_clustering(store), 0.0)
+
+    def testRandomGraph(self):
+        random.seed(0)
+        store = MemoryGraphStore()
+        store.add_edges(UndirectedEdgeID(random.randrange(40), random.randrange(40)) for _ in range(200))
+        neighbors = {vid: set(store.iter_neighbors(vid)) - {vid} for vid in store.iter_vertices()}
+        expected = {vid: sum(1 for a, b in itertools.combinations(neighbors[vid], 2) if b in neighbors[a])
+                    for vid in neighbors}
+        self.assertEqual(triangles(store), expected)
+        self.assertEqual(triangles(store, processes=2), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
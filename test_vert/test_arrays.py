@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+import unittest
+
+from vert import Graph
+from vert.arrays import numpy, scipy, to_csr, to_scipy_sparse
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed.")
+class TestCSRExport(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = Graph()
+        self.graph.edges['a', 'b'].add().data['weight'] = 2.0
+        self.graph.edges['a', 'c'].add().data['weight'] = 3.0
+        self.graph.edges['c', 'a'].add()
+        self.graph.edges[{'b', 'd'}].add().data['weight'] = 5.0
+        self.graph.vertices['e'].add()
+
+    def rows(self, arrays):
+        result = {}
+        for row, vid in enumerate(arrays.vids):
+            start, end = arrays.indptr[row], arrays.indptr[row + 1]
+            columns = [arrays.vids[column] for column in arrays.indices[start:end]]
+            if arrays.weights is None:
+                result[vid] = set(columns)
+            else:
+                result[vid] = set(zip(columns, arrays.weights[start:end].tolist()))
+        return result
+
+    def testStructure(self):
+        arrays = to_csr(self.graph)
+        self.assertEqual(set(arrays.vids), {'a', 'b', 'c', 'd', 'e'})
+        self.assertEqual({vid: arrays.vids[row] for vid, row in arrays.index.items()},
+                         {vid: vid for vid in arrays.vids})
+        self.assertIsNone(arrays.weights)
+        self.assertEqual(self.rows(arrays), {'a': {'b', 'c'}, 'b': {'d'}, 'c': {'a'}, 'd': {'b'}, 'e': set()})
+
+    def testDirectedOnly(self):
+        arrays = to_csr(self.graph.store, undirected=False)
+        self.assertEqual(self.rows(arrays), {'a': {'b', 'c'}, 'b': set(), 'c': {'a'}, 'd': set(), 'e': set()})
+
+    def testWeights(self):
+        arrays = to_csr(self.graph, weight_key='weight', default_weight=0.5)
+        self.assertEqual(self.rows(arrays), {
+            'a': {('b', 2.0), ('c', 3.0)},
+            'b': {('d', 5.0)},
+            'c': {('a', 0.5)},
+            'd': {('b', 5.0)},
+            'e': set(),
+        })
+
+    @unittest.skipIf(scipy is None, "SciPy is not installed.")
+    def testScipySparse(self):
+        matrix, vids, index = to_scipy_sparse(self.graph, weight_key='weight')
+        self.assertEqual(matrix.shape, (5, 5))
+        self.assertEqual(matrix.nnz, 5)
+        self.assertEqual(matrix[index['a'], index['c']], 3.0)
+        self.assertEqual(matrix[index['c'], index['a']], 1.0)
+        self.assertEqual(matrix[index['d'], index['b']], 5.0)
+        self.assertEqual(matrix[index['b'], index['a']], 0.0)
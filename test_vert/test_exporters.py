@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+import glob
+import gzip
+import json
+import os
+import unittest
+import xml.etree.ElementTree as ElementTree
+
+from vert import Graph, MemoryGraphStore, DBMGraphStore, DirectedEdgeID, UndirectedEdgeID, export_graph, \
+    import_edges
+from vert.exporters import EDGE_LIST, GRAPHML, JSONL
+from vert.__main__ import main
+
+
+GRAPHML_NAMESPACE = '{http://graphml.graphdrawing.org/xmlns}'
+
+
+class TestExporters(unittest.TestCase):
+
+    def setUp(self):
+        self.prefix = 'test_exporters'
+        self.remove_files()
+        self.graph = Graph()
+        self.graph.vertices['a'].add().labels.add('person')
+        self.graph.vertices['a'].data['age'] = 30
+        self.graph.edges['a', 'b'].add().data['weight'] = 2.5
+        self.graph.edges['b', 'c'].add().labels.add('knows')
+        self.graph.edges[{'c', 'a'}].add().data['note'] = 'x < y & z'
+        self.graph.vertices['d'].add()
+
+    def tearDown(self):
+        self.remove_files()
+
+    def remove_files(self):
+        for path in glob.glob(self.prefix + '*'):
+            os.remove(path)
+
+    def read_lines(self, path):
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as file:
+            return file.read().splitlines()
+
+    def testJSONL(self):
+        path = self.prefix + '.jsonl.gz'
+        stats = export_graph(self.graph, path)
+        self.assertEqual((stats.vertices, stats.edges), (4, 3))
+        records = [json.loads(line) for line in self.read_lines(path)]
+        vertices = {record['vertex']: record for record in records if 'vertex' in record}
+        edges = {(record['source'], record['sink']): record for record in records if 'source' in record}
+        self.assertEqual(vertices['a'], {'vertex': 'a', 'labels': ['person'], 'data': {'age': 30}})
+        self.assertEqual(edges['a', 'b']['data'], {'weight': 2.5})
+        self.assertTrue(edges['a', 'b']['directed'])
+        self.assertEqual(edges['b', 'c']['labels'], ['knows'])
+        self.assertEqual(len([record for record in edges.values() if not record['directed']]), 1)
+        self.assertEqual(glob.glob(self.prefix + '*.tmp'), [])
+
+    def testJSONLRoundTrip(self):
+        path = self.prefix + '.jsonl.gz'
+        export_graph(self.graph, path)
+        store = MemoryGraphStore()
+        stats = import_edges(store, path, JSONL)
+        self.assertEqual((stats.records, stats.edges), (7, 3))
+        self.assertEqual(set(store.iter_vertices()), {'a', 'b', 'c', 'd'})
+        self.assertEqual(set(store.iter_edges()), set(self.graph.store.iter_edges()))
+        self.assertEqual(set(store.iter_vertex_labels('a')), {'person'})
+        self.assertEqual(store.get_vertex_data('a', 'age'), 30)
+        self.assertEqual(store.get_edge_data(DirectedEdgeID('a', 'b'), 'weight'), 2.5)
+        self.assertEqual(set(store.iter_edge_labels(DirectedEdgeID('b', 'c'))), {'knows'})
+        self.assertEqual(store.get_edge_data(UndirectedEdgeID('c', 'a'), 'note'), 'x < y & z')
+        self.assertFalse(store.has_edge_data(DirectedEdgeID('a', 'b'), 'data'))
+
+    def testEdgeList(self):
+        path = self.prefix + '.txt'
+        export_graph(self.graph, path, EDGE_LIST)
+        self.assertIn('a b 2.5', self.read_lines(path))
+        store = MemoryGraphStore()
+        import_edges(store, path)
+        self.assertEqual(store.count_edges(), 3)
+        self.assertEqual(store.get_edge_data(DirectedEdgeID('a', 'b'), 'weight'), 2.5)
+
+        self.graph.vertices['e f'].add()
+        self.graph.edges['e f', 'a'].add()
+        with self.assertRaises(ValueError):
+            export_graph(self.graph, path, EDGE_LIST)
+        self.assertEqual(glob.glob(self.prefix + '*.tmp'), [])
+
+    def testGraphML(self):
+        path = self.prefix + '.graphml'
+        export_graph(self.graph, path, GRAPHML)
+        root = ElementTree.parse(path).getroot()
+        keys = {key.get('id'): (key.get('for'), key.get('attr.name'), key.get('attr.type'))
+                for key in root.iter(GRAPHML_NAMESPACE + 'key')}
+        self.assertIn(('node', 'age', 'long'), keys.values())
+        self.assertIn(('edge', 'weight', 'double'), keys.values())
+        nodes = {node.get('id'): node for node in root.iter(GRAPHML_NAMESPACE + 'node')}
+        self.assertEqual(set(nodes), {'a', 'b', 'c', 'd'})
+        data = {keys[element.get('key')][1]: element.text for element in nodes['a']}
+        self.assertEqual(data, {'labels': '["person"]', 'age': '30'})
+        edges = list(root.iter(GRAPHML_NAMESPACE + 'edge'))
+        self.assertEqual(len(edges), 3)
+        undirected = [edge for edge in edges if edge.get('directed') == 'false']
+        self.assertEqual(len(undirected), 1)
+        self.assertEqual(undirected[0][0].text, 'x < y & z')
+
+    def testPartitions(self):
+        path = self.prefix + '-{}.jsonl'
+        with self.assertRaises(ValueError):
+            export_graph(self.graph, self.prefix + '.jsonl', partitions=2)
+        stats = export_graph(self.graph, path, partitions=3)
+        self.assertEqual((stats.vertices, stats.edges), (4, 3))
+        lines = []
+        for partition in range(3):
+            lines.extend(self.read_lines(self.prefix + '-%d.jsonl' % partition))
+        self.assertEqual(len(lines), 7)
+
+        # Writing the partitions separately produces the same files.
+        single = [export_graph(self.graph, self.prefix + '-single-{}.jsonl', partitions=3, partition=partition)
+                  for partition in range(3)]
+        self.assertEqual(sum(stats.vertices + stats.edges for stats in single), 7)
+        for partition in range(3):
+            self.assertEqual(self.read_lines(self.prefix + '-%d.jsonl' % partition),
+                             self.read_lines(self.prefix + '-single-%d.jsonl' % partition))
+
+    def testCommandLine(self):
+        source = self.prefix + '.db'
+        store = DBMGraphStore(source)
+        store.add_edges([DirectedEdgeID(i, i + 1) for i in range(20)] + [UndirectedEdgeID(0, 10)])
+        store.close()
+        output = self.prefix + '-{}.jsonl.gz'
+        self.assertEqual(main(['export', source, output, '--partitions', '2', '--processes', '2', '--quiet']), 0)
+        lines = self.read_lines(self.prefix + '-0.jsonl.gz') + self.read_lines(self.prefix + '-1.jsonl.gz')
+        self.assertEqual(len(lines), 21 + 21)
+        self.assertEqual(main(['export', self.prefix + '.missing', output, '--quiet']), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+import gc
+import glob
+import gzip
+import os
+import unittest
+
+from vert import Graph, MemoryGraphStore, DirectedEdgeID, UndirectedEdgeID, import_edges
+from vert.importers import CSV, JSONL
+from vert.__main__ import main
+
+
+class TestImporters(unittest.TestCase):
+
+    def setUp(self):
+        self.prefix = 'test_importers'
+        self.remove_files()
+
+    def tearDown(self):
+        self.remove_files()
+
+    def remove_files(self):
+        for path in glob.glob(self.prefix + '.*'):
+            os.remove(path)
+
+    def write(self, extension, text):
+        path = self.prefix + extension
+        if path.endswith('.gz'):
+            with gzip.open(path, 'wt', encoding='utf-8') as file:
+                file.write(text)
+        else:
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(text)
+        return path
+
+    def testEdgeList(self):
+        path = self.write('.txt', "# A comment\n1 2\n1 3 0.5\n\n2 3\n1 2\n")
+        store = MemoryGraphStore()
+        stats = import_edges(store, path, id_type=int)
+        self.assertEqual((stats.records, stats.edges), (4, 3))
+        self.assertEqual(set(store.iter_edges()), {DirectedEdgeID(1, 2), DirectedEdgeID(1, 3), DirectedEdgeID(2, 3)})
+        self.assertEqual(store.get_edge_data(DirectedEdgeID(1, 3), 'weight'), 0.5)
+
+    def testCSV(self):
+        path = self.write('.csv.gz', 'from,to,kind\na,b,friend\nb,c,\n"c,d",a,"x"\n')
+        graph = Graph()
+        stats = import_edges(graph, path, CSV, directed=False, source_key='from', sink_key='to')
+        self.assertEqual(stats.edges, 3)
+        self.assertEqual(set(graph.store.iter_edges()), {UndirectedEdgeID('a', 'b'), UndirectedEdgeID('b', 'c'),
+                                                         UndirectedEdgeID('c,d', 'a')})
+        self.assertEqual(dict(graph.edges[{'a', 'b'}].data), {'kind': 'friend'})
+        self.assertEqual(dict(graph.edges[{'b', 'c'}].data), {})
+
+    def testJSONL(self):
+        text = ''.join('{"source": %d, "sink": %d, "labels": ["l"], "w": %d}\n' % (i, i + 1, i) for i in range(50))
+        path = self.write('.jsonl', text)
+        reports = []
+        store = MemoryGraphStore()
+        stats = import_edges(store, path, JSONL, chunk_size=20, processes=2, progress=reports.append)
+        self.assertEqual((stats.records, stats.edges), (50, 50))
+        self.assertEqual([report.records for report in reports], [20, 40, 50])
+        self.assertEqual(store.get_edge_data(DirectedEdgeID(7, 8), 'w'), 7)
+        self.assertEqual(set(store.iter_edge_labels(DirectedEdgeID(7, 8))), {'l'})
+
+    def testPauseGC(self):
+        path = self.write('.txt', ''.join('%d %d\n' % (i, i + 1) for i in range(10)))
+        states = []
+        progress = lambda stats: states.append(gc.isenabled())
+        import_edges(MemoryGraphStore(), path, chunk_size=5, progress=progress)
+        self.assertEqual(states, [True, True])
+        states.clear()
+        import_edges(MemoryGraphStore(), path, chunk_size=5, progress=progress, pause_gc=True)
+        self.assertEqual(states, [False, False])
+        self.assertTrue(gc.isenabled())
+
+    def testErrors(self):
+        path = self.write('.txt', "1 2 3 4\n")
+        with self.assertRaises(ValueError):
+            import_edges(MemoryGraphStore(), path)
+        with self.assertRaises(ValueError):
+            import_edges(MemoryGraphStore(), path, 'bogus')
+
+    def testCommandLine(self):
+        path = self.write('.csv', "source,sink\n1,2\n2,3\n")
+        target = self.prefix + '.snapshot'
+        self.assertEqual(main(['import', target, path, '--store', 'snapshot', '--int-ids', '--quiet']), 0)
+        self.assertEqual(main(['import', target, self.write('.txt', "3 4\n"), '--store', 'snapshot', '--quiet',
+                               '--int-ids']), 0)
+        store = MemoryGraphStore.load(target)
+        self.assertEqual(set(store.iter_edges()), {DirectedEdgeID(1, 2), DirectedEdgeID(2, 3), DirectedEdgeID(3, 4)})
+
+    def testCommandLineFailure(self):
+        target = self.prefix + '.snapshot'
+        self.assertEqual(main(['import', target, self.write('.txt', "1 2\n"), '--store', 'snapshot', '--quiet']), 0)
+        with open(target, 'rb') as file:
+            saved = file.read()
+        # The first file imports fine, but the second is malformed, so the snapshot must be left as it was.
+        good = self.write('.edges', "2 3\n")
+        bad = self.write('.bad', "3 4 5 6\n")
+        with self.assertRaises(ValueError):
+            main(['import', target, good, bad, '--store', 'snapshot', '--quiet'])
+        with open(target, 'rb') as file:
+            self.assertEqual(file.read(), saved)
+        store = MemoryGraphStore.load(target)
+        self.assertEqual(set(store.iter_edges()), {DirectedEdgeID('1', '2')})
+
+
+if __name__ == '__main__':
+    unittest.main()
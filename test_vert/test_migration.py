@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+import gc
+import os
+import unittest
+
+from vert import Graph, MemoryGraphStore, DBMGraphStore, migrate
+
+
+class TestMigration(unittest.TestCase):
+
+    def setUp(self):
+        self.path = 'test_migration.checkpoint'
+        self.graph = Graph(MemoryGraphStore())
+        for index in range(25):
+            self.graph.edges[index, (index + 1) % 25].add()
+        self.graph.edges[{3, 7}].add().labels.add('shortcut')
+        self.graph.vertices[0].labels.add('start')
+        self.graph.vertices[0].data['name'] = 'zero'
+        self.graph.edges[0, 1].data['weight'] = 1.5
+
+    def tearDown(self):
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+
+    def assertCopied(self, copy):
+        self.assertEqual(len(copy.vertices), 25)
+        self.assertEqual(len(copy.edges), 26)
+        self.assertEqual(set(copy.store.iter_edges()), set(self.graph.store.iter_edges()))
+        self.assertEqual(set(copy.vertices[0].labels), {'start'})
+        self.assertEqual(copy.vertices[0].data['name'], 'zero')
+        self.assertEqual(set(copy.edges[{3, 7}].labels), {'shortcut'})
+        self.assertEqual(copy.edges[0, 1].data['weight'], 1.5)
+
+    def testCopyTo(self):
+        calls = []
+        copy = self.graph.copy_to(DBMGraphStore({}), batch_size=10,
+                                  progress=lambda *args: calls.append(args))
+        self.assertCopied(copy)
+        self.assertEqual(calls, [('vertices', 10, 25), ('vertices', 20, 25), ('vertices', 25, 25),
+                                 ('edges', 10, 26), ('edges', 20, 26), ('edges', 26, 26)])
+
+    def testPauseGC(self):
+        states = []
+        progress = lambda *args: states.append(gc.isenabled())
+        migrate(self.graph, MemoryGraphStore(), 10, progress)
+        self.assertEqual(set(states), {True})
+        states.clear()
+        migrate(self.graph, MemoryGraphStore(), 10, progress, pause_gc=True)
+        self.assertEqual(set(states), {False})
+        self.assertTrue(gc.isenabled())
+
+    def testResume(self):
+        destination = MemoryGraphStore()
+        copied = []
+
+        def interrupt(phase, done, total):
+            copied.append(done)
+            if phase == 'edges' and done == 10:
+                raise KeyboardInterrupt()
+
+        with self.assertRaises(KeyboardInterrupt):
+            migrate(self.graph, destination, 10, interrupt, self.path)
+        self.assertTrue(os.path.isfile(self.path))
+        self.assertEqual(destination.count_edges(), 10)
+
+        copied.clear()
+        result = migrate(self.graph, destination, 10, lambda phase, done, total: copied.append(done), self.path)
+        self.assertEqual(copied, [20, 26])
+        self.assertEqual(tuple(result), (25, 26))
+        self.assertFalse(os.path.isfile(self.path))
+        self.assertCopied(Graph(destination))
+
+    def testStaleCheckpoint(self):
+        def interrupt(phase, done, total):
+            if phase == 'edges' and done == 10:
+                raise KeyboardInterrupt()
+
+        destination = MemoryGraphStore()
+        with self.assertRaises(KeyboardInterrupt):
+            migrate(self.graph, destination, 10, interrupt, self.path)
+
+        # A different destination, or a different source, doesn't pick up where the checkpoint left off.
+        with self.assertRaises(ValueError):
+            migrate(self.graph, MemoryGraphStore(), 10, checkpoint=self.path)
+        with self.assertRaises(ValueError):
+            migrate(self.graph, DBMGraphStore({}), 10, checkpoint=self.path)
+        other = Graph(MemoryGraphStore())
+        for index in range(25):
+            other.edges[index + 100, index + 101].add()
+        with self.assertRaises(ValueError):
+            migrate(other, destination, 10, checkpoint=self.path)
+        self.assertTrue(os.path.isfile(self.path))
+
+        # A source of the same size, listing different vertices, is caught by the digest of the vertices copied.
+        renamed = Graph(MemoryGraphStore())
+        for index in range(25):
+            renamed.edges['v%d' % index, 'v%d' % ((index + 1) % 25)].add()
+        renamed.edges['v3', 'v7'].add()
+        with self.assertRaises(ValueError):
+            migrate(renamed, destination, 10, checkpoint=self.path)
+
+        result = migrate(self.graph, destination, 10, checkpoint=self.path)
+        self.assertEqual(tuple(result), (25, 26))
+        self.assertCopied(Graph(destination))
+
+    def testBadCheckpoint(self):
+        with open(self.path, 'w') as file:
+            file.write('not a checkpoint')
+        with self.assertRaises(ValueError):
+            migrate(self.graph, MemoryGraphStore(), checkpoint=self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
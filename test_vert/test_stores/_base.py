@@ -8,7 +8,7 @@ from typing import Type
 import unittest
 
 
-from vert import Graph, GraphStore, Vertex, Edge, DirectedEdge
+from vert import Graph, GraphStore, Vertex, Edge, DirectedEdge, DirectedEdgeID, UndirectedEdgeID
 
 
 class TestGraphStore(unittest.TestCase):
@@ -325,3 +325,329 @@ class TestGraphStore(unittest.TestCase):
         self.assertEqual(len(edge.data), 0)
         self.assertNotIn(key1, edge.data)
         self.assertNotIn(key2, edge.data)
+
+    def testBulkOperations(self):
+        store = self.graph.store
+        self.graph.vertices.update(['b1', 'b2', self.graph.vertices['b3'], 'b1'])
+        self.assertEqual(len(self.graph.vertices), 3)
+        self.graph.edges.update([('b1', 'b2'), ('b2', 'b4'), ('b1', 'b2'), self.graph.edges['b4', 'b1']])
+        self.assertEqual(len(self.graph.edges), 3)
+        self.assertEqual(len(self.graph.vertices), 4)
+        self.assertEqual(set(self.graph.vertices['b1'].sinks), {self.graph.vertices['b2']})
+        self.assertEqual(set(self.graph.vertices['b1'].sources), {self.graph.vertices['b4']})
+        self.assertEqual(set(self.graph.vertices['b4'].sources), {self.graph.vertices['b2']})
+
+        store.set_vertex_data_many([('b1', {'k1': 1, 'k2': 2}), ('b5', {'k1': 5}), ('b1', {'k2': 3})])
+        self.assertEqual(dict(self.graph.vertices['b1'].data), {'k1': 1, 'k2': 3})
+        self.assertEqual(dict(self.graph.vertices['b5'].data), {'k1': 5})
+        self.assertEqual(len(self.graph.vertices), 5)
+
+        store.set_edge_data_many([(DirectedEdgeID('b1', 'b2'), {'k': 'x'}), (DirectedEdgeID('b5', 'b1'), {'k': 'y'})])
+        self.assertEqual(dict(self.graph.edges['b1', 'b2'].data), {'k': 'x'})
+        self.assertEqual(dict(self.graph.edges['b5', 'b1'].data), {'k': 'y'})
+        self.assertEqual(len(self.graph.edges), 4)
+
+        store.add_vertex_labels_many([('b1', ['l1', 'l2']), ('b6', ['l1']), ('b1', ['l2', 'l3'])])
+        self.assertEqual(set(self.graph.vertices['b1'].labels), {'l1', 'l2', 'l3'})
+        self.assertEqual(set(self.graph.vertices['b6'].labels), {'l1'})
+        self.assertEqual(store.count_vertices_with_label('l1'), 2)
+        self.assertEqual(len(self.graph.vertices), 6)
+
+        store.add_edge_labels_many([(DirectedEdgeID('b1', 'b2'), ['l4']), (UndirectedEdgeID('b6', 'b7'), ['l4', 'l5'])])
+        self.assertEqual(set(self.graph.edges['b1', 'b2'].labels), {'l4'})
+        self.assertEqual(set(self.graph.edges[{'b6', 'b7'}].labels), {'l4', 'l5'})
+        self.assertEqual(store.count_edges_with_label('l4'), 2)
+        self.assertEqual(len(self.graph.edges), 5)
+        self.assertEqual(len(self.graph.vertices), 7)
+        self.graph.vertices.difference_update(['b6', 'b7'])
+
+        self.assertEqual(store.discard_edges([DirectedEdgeID('b1', 'b2'), DirectedEdgeID('b1', 'b2'),
+                                              DirectedEdgeID('b2', 'b1')]), 1)
+        self.assertFalse(self.graph.edges['b1', 'b2'].exists)
+        self.assertNotIn(self.graph.vertices['b2'], self.graph.vertices['b1'].sinks)
+        self.assertNotIn(self.graph.vertices['b1'], self.graph.vertices['b2'].sources)
+        self.graph.edges.difference_update([('b2', 'b4')])
+        self.assertEqual(len(self.graph.edges), 2)
+
+        self.assertEqual(store.discard_vertices(['b1', 'b6']), 1)
+        self.graph.vertices.difference_update(['b3'])
+        self.assertEqual(len(self.graph.vertices), 3)
+        self.assertEqual(len(self.graph.edges), 0)
+
+    def testNeighborIDs(self):
+        store = self.graph.store
+        store.add_edges([DirectedEdgeID('n1', 'n2'), DirectedEdgeID('n1', 'n3'), DirectedEdgeID('n3', 'n1'),
+                         DirectedEdgeID('n4', 'n1'), UndirectedEdgeID('n1', 'n5'), UndirectedEdgeID('n2', 'n1')])
+        self.assertEqual(sorted(store.iter_sinks('n1')), ['n2', 'n3'])
+        self.assertEqual(sorted(store.iter_sources('n1')), ['n3', 'n4'])
+        self.assertEqual(sorted(store.iter_neighbors('n1')), ['n2', 'n3', 'n4', 'n5'])
+        self.assertEqual(sorted(store.iter_neighbors('n5')), ['n1'])
+        self.assertEqual(list(store.iter_sinks('n5')), [])
+        self.assertEqual(list(store.iter_sources('missing')), [])
+        self.assertEqual(list(store.iter_neighbors('missing')), [])
+        self.assertEqual(sorted(self.graph.iter_sink_ids(self.graph.vertices['n1'])), ['n2', 'n3'])
+        self.assertEqual(sorted(self.graph.iter_source_ids('n1')), ['n3', 'n4'])
+        self.assertEqual(sorted(self.graph.iter_neighbor_ids('n2')), ['n1'])
+        self.assertTrue(store.has_inbound('n1'))
+        self.assertFalse(store.has_inbound('n4'))
+        self.assertTrue(self.graph.vertices['n4'].exists)
+
+    def testRecords(self):
+        store = self.graph.store
+        self.assertIsNone(store.get_vertex_record('r1'))
+        self.assertIsNone(store.get_edge_record(DirectedEdgeID('r1', 'r2')))
+        self.assertIsNone(self.graph.vertices['r1'].record)
+        store.add_edges([DirectedEdgeID('r1', 'r2'), DirectedEdgeID('r3', 'r1'), DirectedEdgeID('r4', 'r1'),
+                         UndirectedEdgeID('r1', 'r5')])
+        store.add_vertex_label('r1', 'l1')
+        store.set_vertex_data('r1', 'k1', None)
+        store.set_vertex_data('r1', 'k2', 2)
+        store.add_edge_label(DirectedEdgeID('r1', 'r2'), 'l2')
+        store.set_edge_data(DirectedEdgeID('r1', 'r2'), 'k3', 3)
+
+        record = self.graph.vertices['r1'].record
+        self.assertEqual(record.labels, {'l1'})
+        self.assertEqual(record.data, {'k1': None, 'k2': 2})
+        self.assertEqual((record.inbound, record.outbound, record.undirected), (2, 1, 1))
+        record.data['k2'] = 'changed'
+        self.assertEqual(store.get_vertex_data('r1', 'k2'), 2)
+        self.assertEqual(self.graph.edges['r1', 'r2'].record, ({'l2'}, {'k3': 3}))
+        self.assertEqual(store.get_edge_record(UndirectedEdgeID('r5', 'r1')), (frozenset(), {}))
+        vids = ['r1', 'r2', 'r9']
+        self.assertEqual(store.get_vertex_records(vids), [store.get_vertex_record(vid) for vid in vids])
+        eids = [DirectedEdgeID('r1', 'r2'), DirectedEdgeID('r2', 'r1'), UndirectedEdgeID('r5', 'r1')]
+        self.assertEqual(store.get_edge_records(eids), [store.get_edge_record(eid) for eid in eids])
+
+        sentinel = object()
+        self.assertIsNone(store.get_vertex_data('r1', 'k1', sentinel))
+        self.assertIs(store.get_vertex_data('r1', 'k4', sentinel), sentinel)
+        self.assertIs(store.get_vertex_data('r9', 'k1', sentinel), sentinel)
+        self.assertIs(store.get_edge_data(DirectedEdgeID('r1', 'r2'), 'k4', sentinel), sentinel)
+        self.assertIs(store.get_edge_data(DirectedEdgeID('r2', 'r1'), 'k3', sentinel), sentinel)
+
+        data = self.graph.vertices['r1'].data
+        self.assertIsNone(data['k1'])
+        with self.assertRaises(KeyError):
+            _ = data['k4']
+        self.assertEqual(sorted(data.items(), key=repr), [('k1', None), ('k2', 2)])
+        self.assertEqual(sorted(data.values(), key=repr), [2, None])
+        self.assertEqual(list(self.graph.vertices['r9'].data.items()), [])
+        self.assertEqual(dict(self.graph.edges['r1', 'r2'].data.items()), {'k3': 3})
+        with self.assertRaises(KeyError):
+            _ = self.graph.edges['r1', 'r2'].data['k4']
+
+    def testFilterVertices(self):
+        store = self.graph.store
+        store.add_vertices(['f1', 'f2', 'f3'])
+        store.add_vertex_label('f1', 'l1')
+        store.add_vertex_label('f1', 'l2')
+        store.add_vertex_label('f2', 'l1')
+        store.set_vertex_data('f2', 'k', 'v')
+        store.set_vertex_data('f3', 'k', 'v')
+        store.set_vertex_data('f3', 'n', None)
+        vids = ['f3', 'f1', 'f2', 'missing']
+        self.assertEqual(list(store.filter_vertices(vids)), vids)
+        self.assertEqual(list(store.filter_vertices(vids, ['l1'])), ['f1', 'f2'])
+        self.assertEqual(list(store.filter_vertices(vids, ['l1', 'l2'])), ['f1'])
+        self.assertEqual(list(store.filter_vertices(vids, data={'k': 'v'})), ['f3', 'f2'])
+        self.assertEqual(list(store.filter_vertices(vids, ['l1'], {'k': 'v'})), ['f2'])
+        self.assertEqual(list(store.filter_vertices(vids, data={'n': None})), ['f3'])
+        self.assertEqual(list(store.filter_vertices(iter(vids), ['l3'])), [])
+
+    def testDataIndexes(self):
+        graph = self.graph
+        store = graph.store
+        for vid, email in (('i1', 'a@x'), ('i2', 'b@x'), ('i3', 'a@x')):
+            graph.vertices[vid].data['email'] = email
+        graph.edges['i1', 'i2'].data['kind'] = 'friend'
+        graph.edges['i2', 'i3'].data['kind'] = 'friend'
+
+        # Lookups give the same results with and without an index.
+        self.assertFalse(store.has_vertex_data_index('email'))
+        self.assertEqual(set(store.find_vertices('email', 'a@x')), {'i1', 'i3'})
+        store.add_vertex_data_index('email')
+        store.add_edge_data_index('kind')
+        self.assertTrue(store.has_vertex_data_index('email'))
+        self.assertTrue(store.has_edge_data_index('kind'))
+        self.assertEqual(set(store.find_vertices('email', 'a@x')), {'i1', 'i3'})
+        self.assertEqual(set(store.find_edges('kind', 'friend')),
+                         {DirectedEdgeID('i1', 'i2'), DirectedEdgeID('i2', 'i3')})
+        self.assertEqual(list(store.find_vertices('email', 'missing')), [])
+
+        # The indexes follow changes to the data.
+        graph.vertices['i1'].data['email'] = 'c@x'
+        del graph.vertices['i2'].data['email']
+        store.set_vertex_data_many([('i4', {'email': 'a@x'}), ('i3', {'email': 'b@x'})])
+        self.assertEqual(set(store.find_vertices('email', 'a@x')), {'i4'})
+        self.assertEqual(set(store.find_vertices('email', 'b@x')), {'i3'})
+        graph.vertices['i3'].remove()
+        self.assertEqual(list(store.find_vertices('email', 'b@x')), [])
+        self.assertEqual(list(store.find_edges('kind', 'friend')), [DirectedEdgeID('i1', 'i2')])
+        store.set_edge_data_many([(UndirectedEdgeID('i1', 'i4'), {'kind': 'friend'})])
+        graph.edges['i1', 'i2'].data['kind'] = 'enemy'
+        self.assertEqual(list(store.find_edges('kind', 'friend')), [UndirectedEdgeID('i1', 'i4')])
+        del graph.edges['i1', 'i2'].data['kind']
+        self.assertEqual(list(store.find_edges('kind', 'enemy')), [])
+        store.discard_edge(UndirectedEdgeID('i1', 'i4'))
+        self.assertEqual(list(store.find_edges('kind', 'friend')), [])
+
+        # The graph interface looks up one key and checks the others.
+        graph.vertices['i1'].data['age'] = 3
+        graph.vertices['i4'].data['age'] = 3
+        graph.edges['i1', 'i4'].data['kind'] = 'enemy'
+        self.assertEqual([vertex.vid for vertex in graph.vertices.find(email='a@x', age=3)], ['i4'])
+        self.assertEqual({vertex.vid for vertex in graph.vertices.find({'age': 3})}, {'i1', 'i4'})
+        self.assertEqual([edge.eid for edge in graph.edges.find(kind='enemy')], [DirectedEdgeID('i1', 'i4')])
+
+        self.assertTrue(store.discard_vertex_data_index('email'))
+        self.assertFalse(store.discard_vertex_data_index('email'))
+        self.assertFalse(store.has_vertex_data_index('email'))
+        self.assertEqual(list(store.find_vertices('email', 'a@x')), ['i4'])
+        self.assertTrue(store.discard_edge_data_index('kind'))
+
+    def testBooleanValues(self):
+        graph = self.graph
+        store = graph.store
+        for vid, score in (('t0', 1), ('t1', 1.0), ('t2', 2), ('t3', 0), ('t4', True), ('t5', False)):
+            graph.vertices[vid].data['score'] = score
+        graph.edges['t0', 't1'].data['flag'] = 1
+        graph.edges['t1', 't2'].data['flag'] = True
+
+        # Booleans are not found by lookups of the equal numbers 1 and 0, or the other way around, and are not numbers
+        # in range lookups, whether or not the key is indexed, in every kind of graph store.
+        for index in (None, False, True):
+            if index is not None:
+                store.add_vertex_data_index('score', ordered=index)
+                store.add_edge_data_index('flag', ordered=index)
+            self.assertEqual(set(store.find_vertices('score', 1)), {'t0', 't1'})
+            self.assertEqual(set(store.find_vertices('score', 0)), {'t3'})
+            self.assertEqual(list(store.find_vertices('score', True)), ['t4'])
+            self.assertEqual(list(store.find_vertices('score', False)), ['t5'])
+            found = list(store.find_vertices_in_range('score'))
+            self.assertEqual((found[0], set(found[1:3]), found[3:]), ('t3', {'t0', 't1'}, ['t2']))
+            self.assertEqual(list(store.find_edges('flag', 1)), [DirectedEdgeID('t0', 't1')])
+            self.assertEqual(list(store.find_edges('flag', True)), [DirectedEdgeID('t1', 't2')])
+            self.assertEqual(list(store.find_edges_in_range('flag')), [DirectedEdgeID('t0', 't1')])
+
+        # The indexes follow changes between Booleans and numbers.
+        graph.vertices['t4'].data['score'] = 1
+        graph.vertices['t0'].data['score'] = True
+        self.assertEqual(set(store.find_vertices('score', 1)), {'t1', 't4'})
+        self.assertEqual(list(store.find_vertices('score', True)), ['t0'])
+        self.assertEqual(sorted(store.find_vertices_in_range('score', 1, 1)), ['t1', 't4'])
+        del graph.vertices['t0'].data['score']
+        self.assertEqual(list(store.find_vertices('score', True)), [])
+
+        # The same goes for the other criteria of a find, whichever one is looked up first.
+        graph.vertices['m1'].data.update(a=1, b=True)
+        graph.vertices['m2'].data.update(a=1, b=1)
+        graph.edges['m1', 'm2'].data.update(a=1, b=True)
+        graph.edges['m2', 'm1'].data.update(a=1, b=1)
+        self.assertEqual(list(store.filter_vertices(['m1', 'm2'], data={'a': 1, 'b': 1})), ['m2'])
+        self.assertEqual(list(store.filter_vertices(['m1', 'm2'], data={'b': True})), ['m1'])
+        for criteria in ({'a': 1, 'b': 1}, {'b': 1, 'a': 1}):
+            self.assertEqual([vertex.vid for vertex in graph.vertices.find(criteria)], ['m2'])
+            self.assertEqual([edge.eid for edge in graph.edges.find(criteria)], [DirectedEdgeID('m2', 'm1')])
+        self.assertEqual([vertex.vid for vertex in graph.vertices.find(a=1, b=True)], ['m1'])
+
+    def testLabelIndexes(self):
+        graph = self.graph
+        store = graph.store
+        graph.vertices['j1'].labels.add('person')
+        graph.vertices['j2'].labels.add('person')
+        graph.vertices['j2'].labels.add('admin')
+        graph.edges['j1', 'j2'].labels.add('knows')
+        graph.edges[{'j2', 'j3'}].labels.add('knows')
+        self.assertEqual(set(store.iter_vertices_with_label('person')), {'j1', 'j2'})
+        self.assertEqual(store.count_vertices_with_label('person'), 2)
+        self.assertEqual(store.count_vertices_with_label('missing'), 0)
+        self.assertEqual(list(store.iter_vertices_with_label('missing')), [])
+        self.assertEqual(set(store.iter_edges_with_label('knows')),
+                         {DirectedEdgeID('j1', 'j2'), UndirectedEdgeID('j2', 'j3')})
+        self.assertEqual(store.count_edges_with_label('knows'), 2)
+
+        # The indexes follow changes to the labels, and removal of the vertices and edges.
+        graph.vertices['j1'].labels.add('person')
+        self.assertEqual(store.count_vertices_with_label('person'), 2)
+        graph.vertices['j1'].labels.remove('person')
+        self.assertEqual(list(store.iter_vertices_with_label('person')), ['j2'])
+        graph.edges['j1', 'j2'].labels.remove('knows')
+        self.assertEqual(list(store.iter_edges_with_label('knows')), [UndirectedEdgeID('j2', 'j3')])
+        graph.edges['j1', 'j2'].labels.add('knows')
+        store.discard_edges([DirectedEdgeID('j1', 'j2')])
+        self.assertEqual(store.count_edges_with_label('knows'), 1)
+        graph.vertices['j2'].remove()
+        self.assertEqual(list(store.iter_vertices_with_label('person')), [])
+        self.assertEqual(store.count_vertices_with_label('admin'), 0)
+        self.assertEqual(store.count_edges_with_label('knows'), 0)
+
+        # The graph interface.
+        graph.vertices['j4'].labels.add('person')
+        graph.edges['j4', 'j5'].labels.add('likes')
+        self.assertEqual([vertex.vid for vertex in graph.vertices.with_label('person')], ['j4'])
+        self.assertEqual(graph.vertices.count_with_label('person'), 1)
+        self.assertEqual([edge.eid for edge in graph.edges.with_label('likes')], [DirectedEdgeID('j4', 'j5')])
+        self.assertEqual(graph.edges.count_with_label('likes'), 1)
+
+    def testRangeIndexes(self):
+        graph = self.graph
+        store = graph.store
+        # Enough distinct values to span several chunks and pages of an ordered index.
+        for index in range(1200):
+            graph.vertices['r%d' % index].data['ts'] = index if index % 2 else float(index)
+        graph.vertices['r-dup'].data['ts'] = 7
+        graph.vertices['r-text'].data['ts'] = 'text'
+        expected = ['r%d' % index for index in range(1200)]
+
+        def in_range(*args, **kwargs):
+            return list(store.find_vertices_in_range('ts', *args, **kwargs))
+
+        # Scans and ordered indexes give the same results.
+        for ordered in (False, True):
+            if ordered:
+                store.add_vertex_data_index('ts', ordered=True)
+                self.assertTrue(store.has_vertex_data_index('ts', ordered=True))
+            self.assertEqual(in_range(10, 12), ['r10', 'r11', 'r12'])
+            self.assertEqual(set(in_range(7, 7)), {'r7', 'r-dup'})
+            self.assertEqual(in_range(None, 2.5), ['r0', 'r1', 'r2'])
+            self.assertEqual(in_range(1198), ['r1198', 'r1199'])
+            self.assertEqual(in_range(reverse=True)[:3], ['r1199', 'r1198', 'r1197'])
+            self.assertEqual(in_range(5.5, 8.5, reverse=True)[-1], 'r6')
+            self.assertEqual([vid for vid in in_range() if vid != 'r-dup'], expected)
+            self.assertEqual(in_range(2000), [])
+
+        # The ordered index follows changes to the data.
+        graph.vertices['r10'].data['ts'] = 5000
+        graph.vertices['r11'].data['ts'] = 'no longer a number'
+        graph.vertices['r12'].remove()
+        store.set_vertex_data_many([('r13', {'ts': -1})])
+        self.assertEqual(in_range(10, 13), [])
+        self.assertEqual(in_range(reverse=True)[0], 'r10')
+        self.assertEqual(in_range()[0], 'r13')
+        for index in range(300, 900):
+            del graph.vertices['r%d' % index].data['ts']
+        self.assertEqual(in_range(290, 910), ['r%d' % index for index in list(range(290, 300)) + list(range(900, 911))])
+
+        # The store can be modified while iterating.
+        expected = in_range(0, 1000)
+        visited = []
+        for vid in store.find_vertices_in_range('ts', 0, 1000):
+            visited.append(vid)
+            graph.vertices[vid].data['ts'] = -1 - graph.vertices[vid].data['ts']
+        self.assertEqual(visited, expected)
+
+        graph.edges['r1', 'r2'].data['weight'] = 3
+        graph.edges['r2', 'r3'].data['weight'] = 1.5
+        graph.edges['r3', 'r1'].data['weight'] = 2
+        store.add_edge_data_index('weight', ordered=True)
+        self.assertTrue(store.has_edge_data_index('weight'))
+        self.assertTrue(store.discard_edge_data_index('weight'))
+        self.assertFalse(store.has_edge_data_index('weight', ordered=True))
+        store.add_edge_data_index('weight', ordered=True)
+        self.assertEqual(list(store.find_edges_in_range('weight', 2)),
+                         [DirectedEdgeID('r3', 'r1'), DirectedEdgeID('r1', 'r2')])
+
+        # The graph interface.
+        self.assertEqual([edge.eid for edge in graph.edges.find_range('weight', reverse=True, limit=1)],
+                         [DirectedEdgeID('r1', 'r2')])
+        self.assertEqual([vertex.vid for vertex in graph.vertices.find_range('ts', -5, -3)], ['r4', 'r3', 'r2'])
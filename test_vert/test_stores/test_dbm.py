@@ -3,16 +3,38 @@
 # Copyright 2017 Aaron M. Hosford
 # See LICENSE.txt for licensing information.
 
+import glob
+import multiprocessing
 import os
+import threading
 import unittest
 
 from vert.stores.dbm import DBMGraphStore
-from vert import Graph
+from vert.stores.locking import FileReadWriteLock, LockingGraphStore
+from vert import Graph, DirectedEdgeID
 
 # noinspection PyProtectedMember
 import test_vert.test_stores._base as _base
 
 
+def remove_db_files(path):
+    # Depending on which dbm implementation is in use, the database may be spread across several files which share
+    # the path as a prefix.
+    for file_path in [path] + glob.glob(glob.escape(path) + '.*'):
+        if os.path.isfile(file_path):
+            os.remove(file_path)
+
+
+def add_shared_edges(path, offset, count):
+    # Run in a separate process by TestSharedDBMGraphStore.
+    store = LockingGraphStore(DBMGraphStore(path, shared=True))
+    for index in range(count):
+        store.add_edge(DirectedEdgeID(offset + index, 'hub'))
+        with store.write_locked():
+            store.set_vertex_data('hub', 'count', store.get_vertex_data('hub', 'count', 0) + 1)
+    store.close()
+
+
 class TestDBMGraphStore(_base.TestGraphStore):
 
     @property
@@ -28,8 +50,7 @@ class TestDBMGraphStore(_base.TestGraphStore):
     def createStore(self):
         # noinspection PyAttributeOutsideInit
         self.path = 'test1.db'
-        if os.path.isfile(self.path):
-            os.remove(self.path)
+        remove_db_files(self.path)
         return self.path
 
     def expectedStoreClass(self):
@@ -42,8 +63,8 @@ class TestDBMGraphStore(_base.TestGraphStore):
             # noinspection PyProtectedMember
             graph._graph_store.close()
         path = getattr(self, 'path', None)
-        if path and os.path.isfile(path):
-            os.remove(path)
+        if path:
+            remove_db_files(path)
 
 
 class TestDBMGraphStoreNoCache(_base.TestGraphStore):
@@ -61,8 +82,7 @@ class TestDBMGraphStoreNoCache(_base.TestGraphStore):
     def createStore(self):
         # noinspection PyAttributeOutsideInit
         self.path = 'test2.db'
-        if os.path.isfile(self.path):
-            os.remove(self.path)
+        remove_db_files(self.path)
         return self.path
 
     def expectedStoreClass(self):
@@ -82,8 +102,8 @@ class TestDBMGraphStoreNoCache(_base.TestGraphStore):
             # noinspection PyProtectedMember
             graph._graph_store.close()
         path = getattr(self, 'path', None)
-        if path and os.path.isfile(path):
-            os.remove(path)
+        if path:
+            remove_db_files(path)
 
 
 class TestDBMGraphStorePersistence(unittest.TestCase):
@@ -132,6 +152,174 @@ class TestDBMGraphStorePersistence(unittest.TestCase):
 
         self.assert_(not graph.is_open)
 
+    def testDataIndexPersistence(self):
+        with Graph(self.path) as graph:
+            graph.store.add_vertex_data_index('email')
+            graph.vertices[1].data['email'] = 'a@x'
+            graph.vertices[(2, 3)].data['email'] = 'a@x'
+        with Graph(self.path) as graph:
+            self.assertTrue(graph.store.has_vertex_data_index('email'))
+            self.assertEqual(set(graph.store.find_vertices('email', 'a@x')), {1, (2, 3)})
+            graph.vertices[1].remove()
+        with Graph(self.path) as graph:
+            self.assertEqual(list(graph.store.find_vertices('email', 'a@x')), [(2, 3)])
+            self.assertTrue(graph.store.discard_vertex_data_index('email'))
+        with Graph(self.path) as graph:
+            self.assertFalse(graph.store.has_vertex_data_index('email'))
+            self.assertEqual(list(graph.store.find_vertices('email', 'a@x')), [(2, 3)])
+
+    def testRangeIndexPersistence(self):
+        with Graph(self.path) as graph:
+            graph.store.add_vertex_data_index('ts', ordered=True)
+            for index in range(400):
+                graph.vertices[index].data['ts'] = index * 0.5
+        with Graph(self.path) as graph:
+            self.assertTrue(graph.store.has_vertex_data_index('ts', ordered=True))
+            self.assertEqual(list(graph.store.find_vertices_in_range('ts', 10, 11)), [20, 21, 22])
+            self.assertEqual([vertex.vid for vertex in graph.vertices.find_range('ts', reverse=True, limit=2)],
+                             [399, 398])
+            graph.vertices[399].remove()
+        with Graph(self.path) as graph:
+            self.assertEqual(next(graph.store.find_vertices_in_range('ts', reverse=True)), 398)
+            self.assertTrue(graph.store.discard_vertex_data_index('ts'))
+            self.assertFalse(graph.store.has_vertex_data_index('ts', ordered=True))
+
+    def testLabelIndexPersistence(self):
+        with Graph(self.path) as graph:
+            graph.vertices[1].labels.add('person')
+            graph.vertices[(2, 3)].labels.add('person')
+            graph.edges[1, 4].labels.add('knows')
+        with Graph(self.path) as graph:
+            self.assertEqual(graph.store.count_vertices_with_label('person'), 2)
+            self.assertEqual(set(graph.store.iter_vertices_with_label('person')), {1, (2, 3)})
+            self.assertEqual(graph.edges.count_with_label('knows'), 1)
+            graph.vertices[1].remove()
+        with Graph(self.path) as graph:
+            self.assertEqual(list(graph.store.iter_vertices_with_label('person')), [(2, 3)])
+            self.assertEqual(graph.store.count_edges_with_label('knows'), 0)
+
+    def testLabelIndexBuiltForOldDatabases(self):
+        db = {}
+        store = DBMGraphStore(db)
+        store.add_vertex_label('a', 'person')
+        store.add_edge_label(DirectedEdgeID('a', 'b'), 'knows')
+        store.close()
+        # Remove the label index, as in a database written before it was added.
+        for key in list(db):
+            if key[:1] in (b'n', b'l'):
+                del db[key]
+        store = DBMGraphStore(db)
+        self.assertEqual(list(store.iter_vertices_with_label('person')), ['a'])
+        self.assertEqual(store.count_edges_with_label('knows'), 1)
+        store.close()
+
     def tearDown(self):
-        if os.path.isfile(self.path):
-            os.remove(self.path)
+        remove_db_files(self.path)
+
+
+class TestLockedSharedDBMGraphStore(_base.TestGraphStore):
+
+    def createStore(self):
+        # noinspection PyAttributeOutsideInit
+        self.path = 'test3.db'
+        remove_db_files(self.path)
+        return LockingGraphStore(DBMGraphStore(self.path, shared=True))
+
+    def expectedStoreClass(self):
+        return LockingGraphStore
+
+    def tearDown(self):
+        super().tearDown()
+        # noinspection PyProtectedMember
+        self._graph._graph_store.close()
+        remove_db_files(self.path)
+
+
+class TestSharedDBMGraphStore(unittest.TestCase):
+
+    def setUp(self):
+        self.path = 'test4.db'
+        remove_db_files(self.path)
+
+    def tearDown(self):
+        remove_db_files(self.path)
+
+    def testCacheInvalidation(self):
+        first = LockingGraphStore(DBMGraphStore(self.path, shared=True))
+        second = LockingGraphStore(DBMGraphStore(self.path, shared=True))
+        self.assertIsInstance(first.lock, FileReadWriteLock)
+        first.add_edge(DirectedEdgeID('a', 'b'))
+        first.set_vertex_data('a', 'k', 1)
+        self.assertEqual(second.count_edges(), 1)
+        self.assertEqual(second.get_vertex_data('a', 'k'), 1)
+
+        # Both graph stores have the vertex and the counts cached now.
+        second.set_vertex_data('a', 'k', 2)
+        second.add_vertex_label('a', 'x')
+        second.add_edge(DirectedEdgeID('b', 'c'))
+        self.assertEqual(first.get_vertex_data('a', 'k'), 2)
+        self.assertEqual(first.count_edges(), 2)
+        self.assertEqual(first.count_vertices_with_label('x'), 1)
+        self.assertEqual(list(first.iter_sinks('b')), ['c'])
+
+        # Reading doesn't make the other graph store reload.
+        generation = second.lock.generation
+        first.has_vertex('a')
+        second.has_vertex('a')
+        self.assertEqual(second.lock.generation, generation)
+        first.close()
+        second.close()
+
+    def testDirectUse(self):
+        # Shared graph stores take their own lock, so they can be used without a LockingGraphStore.
+        graph = Graph(DBMGraphStore(self.path, shared=True))
+        other = DBMGraphStore(self.path, shared=True)
+        graph.edges['a', 'b'].add()
+        graph.vertices['a'].data['k'] = 1
+        self.assertEqual(other.count_edges(), 1)
+        self.assertEqual(other.get_vertex_data('a', 'k'), 1)
+        other.set_vertex_data('a', 'k', 2)
+        other.add_edge(DirectedEdgeID('a', 'c'))
+        self.assertEqual(graph.vertices['a'].data['k'], 2)
+        self.assertEqual(set(graph.vertices['a'].sinks), {graph.vertices['b'], graph.vertices['c']})
+
+        # Iterators are read while the lock is held, so they can be consumed after the database is changed.
+        sinks = other.iter_sinks('a')
+        graph.vertices['a'].remove()
+        self.assertEqual(set(sinks), {'b', 'c'})
+        self.assertFalse(other.has_vertex('a'))
+
+        # A sequence of calls is made atomic by holding the write lock around it.
+        def increment():
+            for _ in range(20):
+                with other.lock.write_locked():
+                    other.set_vertex_data('b', 'count', other.get_vertex_data('b', 'count', 0) + 1)
+        threads = [threading.Thread(target=increment) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(graph.vertices['b'].data['count'], 60)
+        graph.close()
+        other.close()
+
+    def testConcurrentProcesses(self):
+        DBMGraphStore(self.path, shared=True).close()
+        processes = [multiprocessing.Process(target=add_shared_edges, args=(self.path, offset * 100, 50))
+                     for offset in range(3)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertEqual([process.exitcode for process in processes], [0, 0, 0])
+
+        store = DBMGraphStore(self.path)
+        self.assertEqual(store.count_vertices(), 151)
+        self.assertEqual(store.count_edges(), 150)
+        self.assertEqual(store.count_inbound('hub'), 150)
+        self.assertEqual(store.get_vertex_data('hub', 'count'), 150)
+        store.close()
+
+    def testUnsupportedPath(self):
+        with self.assertRaises(TypeError):
+            DBMGraphStore({}, shared=True)
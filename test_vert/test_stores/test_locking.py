@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+import itertools
+import os
+import sys
+import threading
+import time
+import unittest
+
+from vert import DirectedEdgeID
+from vert.stores.dbm import DBMGraphStore
+from vert.stores.memory import MemoryGraphStore
+from vert.stores.locking import ReadWriteLock, LockingGraphStore
+
+# noinspection PyProtectedMember
+import test_vert.test_stores._base as _base
+
+
+class TestLockingGraphStore(_base.TestGraphStore):
+
+    def createStore(self):
+        return LockingGraphStore(MemoryGraphStore())
+
+    def expectedStoreClass(self):
+        return LockingGraphStore
+
+    def testConcurrentAccess(self):
+        store = self.graph._graph_store
+        store.add_vertex_data_index('k', ordered=True)
+        thread_count = 8
+        per_thread = 200
+        errors = []
+
+        def write(offset):
+            for index in range(per_thread):
+                source = offset * per_thread + index
+                store.add_edge(DirectedEdgeID(source, 'hub'))
+                store.set_vertex_data(source, 'k', index)
+            for index in range(0, per_thread, 2):
+                store.discard_vertex(offset * per_thread + index)
+
+        def read():
+            try:
+                for _ in range(50):
+                    for vid in store.iter_sources('hub'):
+                        store.get_vertex_data(vid, 'k')
+                    list(itertools.islice(store.find_vertices_in_range('k', 10, reverse=True), 10))
+                    list(store.iter_edges())
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=write, args=(offset,)) for offset in range(thread_count)]
+        threads += [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        remaining = thread_count * per_thread // 2
+        self.assertEqual(len(self.graph.vertices), remaining + 1)
+        self.assertEqual(len(self.graph.vertices['hub'].sources), remaining)
+        self.assertEqual(len(list(store.find_vertices_in_range('k'))), remaining)
+
+    def testAtomicSequence(self):
+        store = self.graph._graph_store
+
+        def increment():
+            for _ in range(200):
+                with store.write_locked():
+                    store.set_vertex_data('counter', 'value', store.get_vertex_data('counter', 'value', 0) + 1)
+
+        threads = [threading.Thread(target=increment) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(store.get_vertex_data('counter', 'value'), 800)
+
+
+class TestLockingDBMGraphStore(unittest.TestCase):
+
+    def setUp(self):
+        self.path = 'test_locking.db'
+        self.remove_files()
+        self.store = LockingGraphStore(DBMGraphStore(self.path, v_cache_size=10, e_cache_size=10))
+
+    def tearDown(self):
+        self.store.close()
+        self.remove_files()
+
+    def remove_files(self):
+        for extension in ('.bak', '.dat', '.dir', '.db', ''):
+            if os.path.exists(self.path + extension):
+                os.remove(self.path + extension)
+
+    def testConcurrentReaders(self):
+        # The caches are much smaller than the graph, so the readers keep pushing each other's records out of them.
+        self.store.add_edges(DirectedEdgeID(index, index + 1) for index in range(200))
+        for index in range(200):
+            self.store.set_vertex_data(index, 'k', index)
+        expected = {index: (index, [index + 1]) for index in range(200)}
+        results = []
+
+        def read():
+            found = {}
+            for index in range(200):
+                found[index] = (self.store.get_vertex_data(index, 'k'), list(self.store.iter_sinks(index)))
+            results.append(found)
+
+        # Switch threads as often as possible, so the readers interleave inside the cache code.
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=read) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        self.assertEqual(results, [expected] * 4)
+
+
+class TestReadWriteLock(unittest.TestCase):
+
+    def setUp(self):
+        self.lock = ReadWriteLock()
+
+    def testSharedReaders(self):
+        inside = []
+        both = threading.Barrier(2, timeout=5)
+
+        def read():
+            with self.lock.read_locked():
+                inside.append(True)
+                both.wait()  # Only returns if both readers hold the lock at once.
+
+        threads = [threading.Thread(target=read) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(inside, [True, True])
+
+    def testWriterExcludesReaders(self):
+        events = []
+        self.lock.acquire_write()
+
+        def read():
+            with self.lock.read_locked():
+                events.append('read')
+
+        thread = threading.Thread(target=read)
+        thread.start()
+        time.sleep(0.05)
+        events.append('write')
+        self.lock.release_write()
+        thread.join()
+        self.assertEqual(events, ['write', 'read'])
+
+    def testWaitingWriterBlocksNewReaders(self):
+        events = []
+        self.lock.acquire_read()
+
+        def write():
+            with self.lock.write_locked():
+                events.append('write')
+
+        def read():
+            with self.lock.read_locked():
+                events.append('read')
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        time.sleep(0.05)
+        reader = threading.Thread(target=read)
+        reader.start()
+        time.sleep(0.05)
+        self.assertEqual(events, [])
+
+        # A thread already holding the read lock can take it again, even with a writer waiting.
+        with self.lock.read_locked():
+            pass
+        self.lock.release_read()
+        writer.join()
+        reader.join()
+        self.assertEqual(events, ['write', 'read'])
+
+    def testReentrancy(self):
+        with self.lock.write_locked():
+            with self.lock.write_locked():
+                with self.lock.read_locked():
+                    pass
+        with self.lock.read_locked():
+            with self.assertRaises(RuntimeError):
+                self.lock.acquire_write()
+        with self.assertRaises(RuntimeError):
+            self.lock.release_read()
+        with self.assertRaises(RuntimeError):
+            self.lock.release_write()
+
+        # The lock is free again.
+        done = []
+
+        def write():
+            with self.lock.write_locked():
+                done.append(True)
+
+        thread = threading.Thread(target=write)
+        thread.start()
+        thread.join(5)
+        self.assertEqual(done, [True])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,18 @@
 # Copyright 2017 Aaron M. Hosford
 # See LICENSE.txt for licensing information.
 
-from vert.stores.memory import MemoryGraphStore
+import os
+import pickle
+import random
+import sys
+import threading
+import unittest
+from unittest import mock
+
+from vert import Graph, DirectedEdgeID, UndirectedEdgeID
+import vert.stores.memory as memory
+from vert.stores.locking import LockingGraphStore
+from vert.stores.memory import MemoryGraphStore, ConcurrentMemoryGraphStore, SNAPSHOT_MAGIC
 
 # noinspection PyProtectedMember
 import test_vert.test_stores._base as _base
@@ -16,3 +27,296 @@ class TestMemoryGraphStore(_base.TestGraphStore):
 
     def expectedStoreClass(self):
         return MemoryGraphStore
+
+
+class TestMemoryGraphStoreSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.store = MemoryGraphStore()
+        self.graph = Graph(self.store)
+        self.graph.edges['a', 'b'].add()
+        self.graph.edges['b', 'c'].add()
+        self.graph.vertices['a'].labels.add('l1')
+        self.graph.vertices['a'].data['k1'] = 'v1'
+        self.graph.edges['a', 'b'].data['k2'] = 'v2'
+
+    def testSnapshotIsFrozen(self):
+        snapshot = self.store.snapshot()
+        frozen = Graph(snapshot)
+        self.graph.vertices['a'].labels.add('l2')
+        self.graph.vertices['a'].data['k1'] = 'changed'
+        self.graph.edges['a', 'b'].data['k2'] = 'changed'
+        self.graph.edges['c', 'a'].add()
+        self.graph.edges['a', 'b'].remove()
+        self.graph.vertices['b'].remove()
+        self.assertEqual(len(frozen.vertices), 3)
+        self.assertEqual(len(frozen.edges), 2)
+        self.assertTrue(frozen.edges['a', 'b'].exists)
+        self.assertFalse(frozen.edges['c', 'a'].exists)
+        self.assertEqual(set(frozen.vertices['a'].labels), {'l1'})
+        self.assertEqual(frozen.vertices['a'].data['k1'], 'v1')
+        self.assertEqual(frozen.edges['a', 'b'].data['k2'], 'v2')
+        self.assertEqual(len(self.graph.vertices), 2)
+        self.assertEqual(len(self.graph.edges), 1)
+        self.assertEqual(set(self.graph.vertices['a'].labels), {'l1', 'l2'})
+        self.assertEqual(self.graph.vertices['a'].data['k1'], 'changed')
+
+    def testSnapshotDataIndex(self):
+        self.store.add_vertex_data_index('k1')
+        snapshot = self.store.snapshot()
+        self.graph.vertices['a'].data['k1'] = 'changed'
+        self.graph.vertices['b'].data['k1'] = ['unhashable']
+        self.assertEqual(list(snapshot.find_vertices('k1', 'v1')), ['a'])
+        self.assertEqual(list(snapshot.find_vertices('k1', ['unhashable'])), [])
+        self.assertEqual(list(self.store.find_vertices('k1', 'v1')), [])
+        self.assertEqual(list(self.store.find_vertices('k1', 'changed')), ['a'])
+        self.assertEqual(list(self.store.find_vertices('k1', ['unhashable'])), ['b'])
+
+    def testSnapshotRangeIndex(self):
+        for vid, score in (('a', 1), ('b', 2), ('c', 3)):
+            self.graph.vertices[vid].data['score'] = score
+        self.store.add_vertex_data_index('score', ordered=True)
+        snapshot = self.store.snapshot()
+        self.graph.vertices['a'].data['score'] = 4
+        self.graph.vertices['d'].data['score'] = 0
+        self.assertEqual(list(snapshot.find_vertices_in_range('score', reverse=True)), ['c', 'b', 'a'])
+        self.assertEqual(list(self.store.find_vertices_in_range('score', reverse=True)), ['a', 'c', 'b', 'd'])
+
+    def testSnapshotIsReadOnly(self):
+        snapshot = self.store.snapshot()
+        self.assertTrue(snapshot.is_read_only)
+        self.assertFalse(self.store.is_read_only)
+        self.assertIs(snapshot.snapshot(), snapshot)
+        with self.assertRaises(TypeError):
+            snapshot.add_vertex('d')
+        with self.assertRaises(TypeError):
+            snapshot.discard_edge(DirectedEdgeID('a', 'b'))
+        with self.assertRaises(TypeError):
+            snapshot.set_vertex_data('a', 'k1', 'changed')
+        self.assertEqual(snapshot.get_vertex_data('a', 'k1'), 'v1')
+
+    def testSuccessiveSnapshots(self):
+        first = self.store.snapshot()
+        self.graph.vertices['a'].data['k1'] = 'second'
+        second = self.store.snapshot()
+        self.graph.vertices['a'].data['k1'] = 'third'
+        self.assertEqual(first.get_vertex_data('a', 'k1'), 'v1')
+        self.assertEqual(second.get_vertex_data('a', 'k1'), 'second')
+        self.assertEqual(self.store.get_vertex_data('a', 'k1'), 'third')
+
+
+class TestMemoryGraphStoreSaveLoad(unittest.TestCase):
+
+    def setUp(self):
+        self.path = 'test_memory.snapshot'
+
+    def testSaveLoad(self):
+        store = MemoryGraphStore()
+        graph = Graph(store)
+        for index in range(25):
+            graph.edges[index, (index + 1) % 25].add()
+        graph.vertices[0].labels.add('l1')
+        graph.vertices[0].data['k1'] = {'nested': [1, 2]}
+        graph.edges[0, 1].labels.add('l2')
+        graph.edges[0, 1].data['weight'] = 1.5
+        store.add_vertex_data_index('k1')
+        store.add_edge_data_index('weight', ordered=True)
+        store.save(self.path)
+
+        loaded = Graph(MemoryGraphStore.load(self.path))
+        self.assertEqual(len(loaded.vertices), 25)
+        self.assertEqual(len(loaded.edges), 25)
+        self.assertEqual(set(loaded.edges), {loaded.edges[eid] for eid in store.iter_edges()})
+        self.assertIn('l1', loaded.vertices[0].labels)
+        self.assertEqual(loaded.vertices[0].data['k1'], {'nested': [1, 2]})
+        self.assertEqual(list(loaded.store.find_vertices('k1', {'nested': [1, 2]})), [0])
+        self.assertIn('l2', loaded.edges[0, 1].labels)
+        self.assertEqual(loaded.edges[0, 1].data['weight'], 1.5)
+        self.assertEqual(list(loaded.store.iter_vertices_with_label('l1')), [0])
+        self.assertEqual(loaded.store.count_edges_with_label('l2'), 1)
+        self.assertEqual(list(loaded.store.find_edges_in_range('weight', 1, 2)), [DirectedEdgeID(0, 1)])
+        self.assertTrue(loaded.vertices[1].sources)
+
+        # The loaded store must be fully usable.
+        loaded.edges[24, 26].add()
+        self.assertEqual(len(loaded.edges), 26)
+        loaded.vertices[0].remove()
+        self.assertEqual(len(loaded.vertices), 25)
+        self.assertEqual(len(loaded.edges), 24)
+
+    def testSharedValues(self):
+        store = MemoryGraphStore()
+        store.add_vertex_data_index('name')
+        store.add_vertex_data_index('t', ordered=True)
+        for index in range(50):
+            store.add_vertex(index)
+            store.set_vertex_data(index, 'name', 'n%d' % (index % 3))
+            store.set_vertex_data(index, 't', index)
+            store.add_vertex_label(index, 'person')
+        for index in range(49):
+            eid = DirectedEdgeID(index, index + 1)
+            store.add_edge(eid)
+            store.set_edge_data(eid, 'weight', 1.0)
+            store.add_edge_label(eid, 'knows')
+        store.save(self.path)
+
+        loaded = MemoryGraphStore.load(self.path)
+        # noinspection PyProtectedMember
+        for name in MemoryGraphStore._TABLES:
+            self.assertEqual(getattr(loaded, name), getattr(store, name), name)
+        self.assertEqual(loaded.get_vertex_data(2, 'name'), 'n2')
+        loaded.set_vertex_data(3, 't', -1)
+        self.assertEqual(list(loaded.find_vertices_in_range('t', None, 3)), [3, 0, 1, 2])
+
+    def testUndirectedEdges(self):
+        store = MemoryGraphStore()
+        store.add_edge(UndirectedEdgeID('a', 'b'))
+        store.add_edge(UndirectedEdgeID('c', 'c'))
+        store.add_edge_label(UndirectedEdgeID('a', 'b'), 'knows')
+        store.set_edge_data(UndirectedEdgeID('a', 'b'), 'weight', 2.5)
+        store.set_edge_data(UndirectedEdgeID('c', 'c'), 'weight', 1.0)
+        store.save(self.path)
+
+        loaded = MemoryGraphStore.load(self.path)
+        self.assertEqual(set(loaded.iter_edges()), {UndirectedEdgeID('a', 'b'), UndirectedEdgeID('c', 'c')})
+        self.assertEqual(set(loaded.iter_edge_labels(UndirectedEdgeID('a', 'b'))), {'knows'})
+        self.assertEqual(loaded.get_edge_data(UndirectedEdgeID('a', 'b'), 'weight'), 2.5)
+        self.assertEqual(loaded.get_edge_data(UndirectedEdgeID('c', 'c'), 'weight'), 1.0)
+        self.assertIsInstance(next(iter(loaded.iter_edges_with_label('knows'))), UndirectedEdgeID)
+
+    def testVersion2File(self):
+        store = MemoryGraphStore()
+        store.add_vertex_data_index('score', ordered=True)
+        store.set_vertex_data_many([('a', {'score': 1}), ('b', {'score': True})])
+        # Version 2 snapshots filed Booleans in the index entries of the equal numbers.
+        # noinspection PyProtectedMember
+        tables = {name: dict(getattr(store, name)) for name in MemoryGraphStore._TABLES}
+        tables['_vertex_data_index'] = {'score': {1: {'a', 'b'}}}
+        with open(self.path, 'wb') as file:
+            file.write(SNAPSHOT_MAGIC)
+            pickle.dump((2, 0, tuple(tables)), file)
+            for name in tables:
+                pickle.dump(list(tables[name].items()), file)
+                pickle.dump(None, file)
+
+        loaded = MemoryGraphStore.load(self.path)
+        self.assertTrue(loaded.has_vertex_data_index('score'))
+        self.assertEqual(list(loaded.find_vertices('score', 1)), ['a'])
+        self.assertEqual(list(loaded.find_vertices('score', True)), ['b'])
+
+    def testBadFile(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'not a snapshot')
+        with self.assertRaises(ValueError):
+            MemoryGraphStore.load(self.path)
+
+    def tearDown(self):
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+
+
+class LegacyGraphStore(MemoryGraphStore):
+    """A graph store implementing the data getters as they were before they took a default."""
+
+    def get_vertex_data(self, vid, key):
+        return super().get_vertex_data(vid, key)
+
+    def get_edge_data(self, eid, key):
+        return super().get_edge_data(eid, key)
+
+
+class TestLegacyGraphStore(unittest.TestCase):
+
+    def testDataGettersWithoutDefault(self):
+        store = LegacyGraphStore()
+        graph = Graph(store)
+        graph.vertices['a'].data['k'] = None
+        graph.vertices['b'].data['k'] = 2
+        graph.edges['a', 'b'].data['w'] = 1.5
+        self.assertIsNone(graph.vertices['a'].data['k'])
+        with self.assertRaises(KeyError):
+            _ = graph.vertices['b'].data['missing']
+        self.assertEqual(graph.edges['a', 'b'].data['w'], 1.5)
+        with self.assertRaises(KeyError):
+            _ = graph.edges['a', 'b'].data['missing']
+        self.assertEqual([edge.eid for edge in graph.edges.find(w=1.5)], [DirectedEdgeID('a', 'b')])
+        self.assertEqual(list(store.find_vertices('k', 2)), ['b'])
+        self.assertEqual(list(store.find_vertices_in_range('k')), ['b'])
+        self.assertEqual(list(store.iter_outbound_data('a', 'w', 0)), [('b', 1.5)])
+        locked = LockingGraphStore(store)
+        self.assertEqual(locked.get_vertex_data('b', 'missing', 'default'), 'default')
+        self.assertEqual(locked.get_edge_data(DirectedEdgeID('a', 'b'), 'w'), 1.5)
+
+
+class TestConcurrentMemoryGraphStore(_base.TestGraphStore):
+
+    def createStore(self):
+        return ConcurrentMemoryGraphStore(stripes=4)
+
+    def expectedStoreClass(self):
+        return ConcurrentMemoryGraphStore
+
+    def testConcurrentMutation(self):
+        store = self.graph._graph_store
+        thread_count = 8
+        per_thread = 200
+
+        def work(offset):
+            for index in range(per_thread):
+                source = offset * per_thread + index
+                store.add_edge(DirectedEdgeID(source, offset * per_thread + (index + 1) % per_thread))
+                store.add_edge(DirectedEdgeID(source, 'hub'))
+                store.set_vertex_data(source, 'k', index)
+                list(store.iter_inbound('hub'))
+            for index in range(0, per_thread, 2):
+                store.discard_vertex(offset * per_thread + index)
+
+        threads = [threading.Thread(target=work, args=(offset,)) for offset in range(thread_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        remaining = thread_count * per_thread // 2
+        self.assertEqual(len(self.graph.vertices), remaining + 1)
+        self.assertEqual(len(self.graph.edges), sum(1 for _ in store.iter_edges()))
+        self.assertEqual(len(self.graph.vertices['hub'].sources), remaining)
+        self.assertEqual(len(self.graph.edges), remaining)
+
+    def testConcurrentRangeScans(self):
+        store = self.graph._graph_store
+        store.add_vertex_data_index('k', ordered=True)
+        fixed = {('fixed', value): float(value) for value in range(0, 1000, 10)}
+        for vid, value in fixed.items():
+            store.set_vertex_data(vid, 'k', value)
+        errors = []
+
+        def write(offset):
+            # Values move around, so pages are split and emptied while the readers scan them.
+            generator = random.Random(offset)
+            for index in range(5000):
+                store.set_vertex_data((offset, index % 200), 'k', generator.random() * 1000)
+
+        def read():
+            try:
+                while any(thread.is_alive() for thread in writers):
+                    for reverse in (False, True):
+                        found = set(store.find_vertices_in_range('k', reverse=reverse))
+                        self.assertEqual([vid for vid in fixed if vid not in found], [])
+            except Exception as error:
+                errors.append(error)
+
+        writers = [threading.Thread(target=write, args=(offset,)) for offset in range(4)]
+        readers = [threading.Thread(target=read) for _ in range(2)]
+        # Small pages and frequent thread switches make scans overlap page splits.
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with mock.patch.object(memory, 'ORDER_PAGE_SIZE', 4):
+                for thread in writers + readers:
+                    thread.start()
+                for thread in writers + readers:
+                    thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        self.assertEqual(errors, [])
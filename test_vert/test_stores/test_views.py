@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+import unittest
+
+from vert import Graph, DirectedEdgeID, UndirectedEdgeID
+from vert.stores.memory import MemoryGraphStore
+from vert.stores.views import GraphView, InducedSubgraphView, LabelFilterView, EdgeFilterView
+
+# noinspection PyProtectedMember
+import test_vert.test_stores._base as _base
+
+
+class TestGraphView(_base.TestGraphStore):
+
+    def createStore(self):
+        return GraphView(MemoryGraphStore())
+
+    def expectedStoreClass(self):
+        return GraphView
+
+
+class TestUnfilteredLabelFilterView(_base.TestGraphStore):
+
+    def createStore(self):
+        return LabelFilterView(MemoryGraphStore())
+
+    def expectedStoreClass(self):
+        return LabelFilterView
+
+
+class TestViews(unittest.TestCase):
+
+    def setUp(self):
+        # 0 -> 1 -> 2 -> 3, 1 -- 3, 3 -- 3, and 4 -> 0.
+        self.store = MemoryGraphStore()
+        self.store.add_edges([DirectedEdgeID(0, 1), DirectedEdgeID(1, 2), DirectedEdgeID(2, 3), UndirectedEdgeID(1, 3),
+                              UndirectedEdgeID(3, 3), DirectedEdgeID(4, 0)])
+        for vid in 0, 1, 3:
+            self.store.add_vertex_label(vid, 'keep')
+        self.store.add_edge_label(DirectedEdgeID(0, 1), 'strong')
+        self.store.add_edge_label(UndirectedEdgeID(1, 3), 'strong')
+        self.store.set_edge_data(DirectedEdgeID(0, 1), 'weight', 2)
+
+    def assertConsistent(self, view):
+        # Everything reachable through the view must agree with the view's own vertex and edge listings.
+        vids = set(view.iter_vertices())
+        eids = set(view.iter_edges())
+        self.assertEqual(view.count_vertices(), len(vids))
+        self.assertEqual(view.count_edges(), len(eids))
+        for vid in vids:
+            self.assertTrue(view.has_vertex(vid))
+            self.assertEqual(set(view.iter_outbound(vid)), {eid for eid in eids if eid.is_directed and
+                                                             eid.source == vid})
+            self.assertEqual(set(view.iter_sinks(vid)), {eid.sink for eid in view.iter_outbound(vid)})
+            self.assertEqual(set(view.iter_sources(vid)), {eid.source for eid in view.iter_inbound(vid)})
+            self.assertEqual(view.count_undirected(vid), len(list(view.iter_undirected(vid))))
+            self.assertLessEqual(set(view.iter_neighbors(vid)), vids)
+            record = view.get_vertex_record(vid)
+            self.assertEqual((record.inbound, record.outbound),
+                             (view.count_inbound(vid), view.count_outbound(vid)))
+        for eid in eids:
+            self.assertTrue(view.has_edge(eid))
+            self.assertLessEqual(set(eid.vertices), vids)
+        return vids, eids
+
+    def testInducedSubgraph(self):
+        view = InducedSubgraphView(self.store, [1, 2, 3, 5])
+        vids, eids = self.assertConsistent(view)
+        self.assertEqual(vids, {1, 2, 3})
+        self.assertEqual(eids, {DirectedEdgeID(1, 2), DirectedEdgeID(2, 3), UndirectedEdgeID(1, 3),
+                                UndirectedEdgeID(3, 3)})
+        self.assertFalse(view.has_vertex(0))
+        self.assertFalse(view.has_edge(DirectedEdgeID(0, 1)))
+        self.assertFalse(view.has_inbound(1))
+        self.assertIsNone(view.get_vertex_record(0))
+        self.assertEqual(list(view.filter_vertices([0, 1, 2, 3], ['keep'])), [1, 3])
+
+        graph = Graph(view)
+        self.assertEqual(len(graph.vertices), 3)
+        self.assertEqual(len(graph.edges), 4)
+        self.assertEqual(set(graph.vertices[1].sinks), {graph.vertices[2]})
+
+        view.add_vertex(5)
+        self.assertEqual(len(graph.vertices), 4)
+
+    def testLabelFilter(self):
+        view = LabelFilterView(self.store, vertex_labels=['keep'])
+        vids, eids = self.assertConsistent(view)
+        self.assertEqual(vids, {0, 1, 3})
+        self.assertEqual(eids, {DirectedEdgeID(0, 1), UndirectedEdgeID(1, 3), UndirectedEdgeID(3, 3)})
+        self.assertEqual(list(view.iter_outbound_data(0, 'weight')), [(1, 2)])
+
+        view = LabelFilterView(self.store, vertex_labels=['keep'], edge_labels=['strong'])
+        vids, eids = self.assertConsistent(view)
+        self.assertEqual(vids, {0, 1, 3})
+        self.assertEqual(eids, {DirectedEdgeID(0, 1), UndirectedEdgeID(1, 3)})
+        self.assertEqual(set(view.iter_neighbors(1)), {0, 3})
+
+        # Changes made through the view refresh its counts; changes made directly need an explicit refresh.
+        view.add_vertex_label(2, 'keep')
+        self.assertEqual(view.count_vertices(), 4)
+        self.store.discard_vertex_label(2, 'keep')
+        self.assertEqual(view.count_vertices(), 4)
+        view.refresh()
+        self.assertEqual(view.count_vertices(), 3)
+
+    def testEdgeFilter(self):
+        view = EdgeFilterView(self.store, lambda eid: eid.is_directed)
+        vids, eids = self.assertConsistent(view)
+        self.assertEqual(vids, {0, 1, 2, 3, 4})
+        self.assertEqual(eids, {DirectedEdgeID(0, 1), DirectedEdgeID(1, 2), DirectedEdgeID(2, 3),
+                                DirectedEdgeID(4, 0)})
+        self.assertFalse(view.has_undirected(3))
+        self.assertEqual(view.get_vertex_record(3).undirected, 0)
+        self.assertFalse(Graph(view).edges[UndirectedEdgeID(1, 3)].exists)
+
+
+if __name__ == '__main__':
+    unittest.main()
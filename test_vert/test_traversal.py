@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+import unittest
+
+from vert import Graph, Traversal
+
+
+class TestTraversal(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = Graph()
+        for source, sink in [('a', 'b'), ('a', 'c'), ('b', 'd'), ('c', 'd'), ('d', 'e'), ('f', 'a')]:
+            self.graph.edges[source, sink].add()
+        self.graph.edges[{'a', 'g'}].add()
+        for vid in 'bde':
+            self.graph.vertices[vid].labels.add('x')
+        self.graph.vertices['b'].data['color'] = 'red'
+        self.graph.vertices['d'].data['color'] = 'blue'
+        self.graph.vertices['d'].data['size'] = 2
+
+    def testSteps(self):
+        traversal = self.graph.traverse('a')
+        self.assertIsInstance(traversal, Traversal)
+        self.assertEqual(sorted(traversal.out().ids()), ['b', 'c'])
+        self.assertEqual(sorted(traversal.in_().ids()), ['f'])
+        self.assertEqual(sorted(traversal.both().ids()), ['b', 'c', 'f', 'g'])
+        self.assertEqual(list(traversal.out().out().ids()), ['d', 'd'])
+        self.assertEqual(list(traversal.out().out().dedup().ids()), ['d'])
+        self.assertEqual(sorted(traversal.out().has_label('x').ids()), ['b'])
+        self.assertEqual(sorted(traversal.out().out().out().has_label('x').ids()), ['e', 'e'])
+        self.assertEqual(sorted(traversal.out().filter(lambda vid: vid != 'b').ids()), ['c'])
+        self.assertEqual(traversal.out().out().limit(1).count(), 1)
+        self.assertEqual(traversal.out().out().count(), 2)
+
+    def testFilters(self):
+        self.assertEqual(sorted(self.graph.traverse().has_label('x').ids()), ['b', 'd', 'e'])
+        self.assertEqual(sorted(self.graph.traverse().where(color='red').ids()), ['b'])
+        self.assertEqual(sorted(self.graph.traverse().has_label('x').where(color='blue', size=2).ids()), ['d'])
+        self.assertEqual(self.graph.traverse().where(color='red').where(color='blue').count(), 0)
+        self.assertEqual(self.graph.traverse().has_label('x', 'y').count(), 0)
+        self.assertEqual(self.graph.traverse('a', self.graph.vertices['f']).where(color='red').count(), 0)
+
+    def testLaziness(self):
+        traversal = self.graph.traverse('a').out()
+        extended = traversal.out()
+        self.assertEqual(sorted(traversal.ids()), ['b', 'c'])
+        self.assertEqual(sorted(extended.ids()), ['d', 'd'])
+
+        calls = []
+        self.assertEqual(self.graph.traverse().filter(lambda vid: calls.append(vid) or True).limit(2).count(), 2)
+        self.assertEqual(len(calls), 2)
+
+        first = self.graph.traverse('a').out().out().first()
+        self.assertEqual(first, self.graph.vertices['d'])
+        self.assertIsNone(self.graph.traverse('e').out().first())
+        self.assertEqual(set(self.graph.traverse('d').in_()), {self.graph.vertices['b'], self.graph.vertices['c']})
+
+
+if __name__ == '__main__':
+    unittest.main()
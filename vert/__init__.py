@@ -27,10 +27,19 @@ lock-in, and updating your code to use the latest technology is as simple as a o
 
 from . import stores, graphs
 
-from .stores.base import GraphStore, VertexID, EdgeID, DirectedEdgeID, UndirectedEdgeID, Label
+from .stores.base import GraphStore, VertexID, EdgeID, DirectedEdgeID, UndirectedEdgeID, Label, VertexRecord, \
+    EdgeRecord
 from .stores.dbm import DBMGraphStore
-from .stores.memory import MemoryGraphStore
+from .stores.memory import MemoryGraphStore, ConcurrentMemoryGraphStore
+from .stores.wrapper import GraphStoreWrapper
+from .stores.locking import ReadWriteLock, FileReadWriteLock, LockingGraphStore
+from .stores.views import GraphView, InducedSubgraphView, LabelFilterView, EdgeFilterView
 from .graphs import Graph, Vertex, Edge, DirectedEdge, UndirectedEdge
+from .traversal import Traversal
+from .migration import MigrationResult, migrate
+from .importers import ImportStats, import_edges
+from .exporters import ExportStats, export_graph
+from .aio import AsyncGraphStore, AsyncGraph
 
 from .__about__ import __title__, __summary__, __url__, __version__, __status__, __author__, __maintainer__, \
     __credits__, __email__, __license__, __copyright__
@@ -56,9 +65,29 @@ __all__ = [
     'DirectedEdgeID',
     'UndirectedEdgeID',
     'Label',
+    'VertexRecord',
+    'EdgeRecord',
     'DBMGraphStore',
     'MemoryGraphStore',
+    'ConcurrentMemoryGraphStore',
+    'GraphStoreWrapper',
+    'ReadWriteLock',
+    'FileReadWriteLock',
+    'LockingGraphStore',
+    'GraphView',
+    'InducedSubgraphView',
+    'LabelFilterView',
+    'EdgeFilterView',
     'Graph',
     'Vertex',
     'Edge',
+    'Traversal',
+    'MigrationResult',
+    'migrate',
+    'ImportStats',
+    'import_edges',
+    'ExportStats',
+    'export_graph',
+    'AsyncGraphStore',
+    'AsyncGraph',
 ]
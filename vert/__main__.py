@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+
+"""
+The command line interface for vert, run as python -m vert. The import command loads edges from flat files into a
+persistent graph store, either a DBM database or a memory graph store snapshot file, and the export command writes one
+out to flat files:
+
+    python -m vert import graph.db edges.csv.gz --processes 4
+    python -m vert export graph.db dump-{}.jsonl.gz --partitions 4 --processes 4
+"""
+
+
+import argparse
+import dbm
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from vert.stores.base import GraphStore
+from vert.stores.dbm import DBMGraphStore
+from vert.stores.memory import MemoryGraphStore
+from vert.importers import EDGE_LIST, CSV, JSONL, ImportStats, import_edges
+from vert.exporters import GRAPHML, ExportStats, export_graph
+
+
+__all__ = [
+    'main',
+]
+
+
+# The kinds of graph store the command line interface can open.
+DBM_STORE = 'dbm'
+SNAPSHOT_STORE = 'snapshot'
+
+
+def _guess_format(path: str) -> str:
+    """Guess a file's format from its extension, defaulting to an edge list."""
+    if path.endswith('.gz'):
+        path = path[:-3]
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return CSV
+    if extension in ('.jsonl', '.ndjson'):
+        return JSONL
+    return EDGE_LIST
+
+
+def _guess_export_format(path: str) -> str:
+    """Guess the format to export to from a file's extension, defaulting to JSON lines."""
+    if path.endswith('.gz'):
+        path = path[:-3]
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.graphml':
+        return GRAPHML
+    if extension in ('.txt', '.edges', '.edgelist'):
+        return EDGE_LIST
+    return JSONL
+
+
+def _store_exists(path: str, kind: str) -> bool:
+    """Return whether there is a graph store of the given kind at the path."""
+    if kind == SNAPSHOT_STORE:
+        return os.path.isfile(path)
+    return bool(dbm.whichdb(path))
+
+
+def _open_store(path: str, kind: str) -> GraphStore:
+    """Open the graph store at the path, creating it if it does not exist."""
+    if kind == SNAPSHOT_STORE:
+        return MemoryGraphStore.load(path) if os.path.isfile(path) else MemoryGraphStore()
+    return DBMGraphStore(path)
+
+
+def _close_store(graph_store: GraphStore, path: str, kind: str, save: bool = True) -> None:
+    """
+    Close the graph store opened by _open_store(). A snapshot is saved back to the path first, unless save is False,
+    which leaves the file as it was before the store was opened.
+    """
+    if save and kind == SNAPSHOT_STORE:
+        graph_store.save(path)
+    graph_store.close()
+
+
+def _report(path: str, stats: ImportStats, final: bool = False) -> None:
+    """Write the throughput of an import to stderr."""
+    rate = stats.records / stats.seconds if stats.seconds else 0.0
+    print("%s: %d records, %d new edges, %.1fs, %.0f records/s" %
+          (path, stats.records, stats.edges, stats.seconds, rate), file=sys.stderr, end='\n' if final else '\r')
+
+
+def _report_export(path: str, stats: ExportStats, final: bool = False) -> None:
+    """Write the throughput of an export to stderr."""
+    rate = (stats.vertices + stats.edges) / stats.seconds if stats.seconds else 0.0
+    print("%s: %d vertices, %d edges, %.1fs, %.0f records/s" %
+          (path, stats.vertices, stats.edges, stats.seconds, rate), file=sys.stderr, end='\n' if final else '\r')
+
+
+def _import_command(args: argparse.Namespace) -> int:
+    """Run the import command."""
+    graph_store = _open_store(args.target, args.store)
+    # A snapshot is only saved if every file was imported, so a failed import doesn't overwrite a good snapshot with
+    # a partial one. (A DBM store's writes go straight to the database, so they are kept either way.) Nothing else runs
+    # in the command's process, so garbage collection can be paused while importing.
+    succeeded = False
+    try:
+        for path in args.files:
+            progress = None if args.quiet else (lambda stats, path=path: _report(path, stats))
+            stats = import_edges(graph_store, path, args.format or _guess_format(path), not args.undirected,
+                                 int if args.int_ids else None, args.source_key, args.sink_key, args.weight_key,
+                                 args.chunk_size, args.processes, progress, pause_gc=True)
+            if not args.quiet:
+                _report(path, stats, final=True)
+        succeeded = True
+    finally:
+        _close_store(graph_store, args.target, args.store, save=succeeded)
+    return 0
+
+
+def _export_partition(source: str, kind: str, path: str, file_format: str, partition: Optional[int],
+                      partitions: int, weight_key: str, quiet: bool) -> ExportStats:
+    """Open the graph store and export one partition of it, or all of them. This is the function run by workers."""
+    graph_store = _open_store(source, kind)
+    try:
+        progress = None if quiet else (lambda stats: _report_export(path, stats))
+        return export_graph(graph_store, path, file_format, partitions, partition, weight_key=weight_key,
+                            progress=progress)
+    finally:
+        graph_store.close()
+
+
+def _export_command(args: argparse.Namespace) -> int:
+    """Run the export command."""
+    if not _store_exists(args.source, args.store):
+        print("No such graph store: %s" % args.source, file=sys.stderr)
+        return 1
+    file_format = args.format or _guess_export_format(args.output)
+    arguments = (args.source, args.store, args.output, file_format)
+    options = (args.partitions, args.weight_key, args.quiet)
+    if args.processes is not None and args.processes > 1 and args.partitions > 1:
+        # Each worker opens the graph store itself and writes its own partitions.
+        with ProcessPoolExecutor(args.processes) as executor:
+            futures = [executor.submit(_export_partition, *(arguments + (partition,) + options))
+                       for partition in range(args.partitions)]
+            results = [future.result() for future in futures]
+        stats = ExportStats(sum(result.vertices for result in results), sum(result.edges for result in results),
+                            max(result.seconds for result in results))
+    else:
+        stats = _export_partition(*(arguments + (None,) + options))
+    if not args.quiet:
+        _report_export(args.output, stats, final=True)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the command line interface with the given arguments, or with the arguments the program was run with.
+
+    :param argv: The command line arguments, not including the program name.
+    :return: The exit status.
+    """
+    parser = argparse.ArgumentParser(prog='python -m vert', description="Command line tools for vert graphs.")
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    commands.required = True
+
+    import_parser = commands.add_parser('import', help="Import edges from flat files into a graph store.")
+    import_parser.add_argument('target', help="The graph store to import into. It is created if it does not exist.")
+    import_parser.add_argument('files', nargs='+', help="The files to import. Files ending in .gz are decompressed.")
+    import_parser.add_argument('--store', choices=(DBM_STORE, SNAPSHOT_STORE), default=DBM_STORE,
+                               help="The kind of graph store the target is (default: %(default)s).")
+    import_parser.add_argument('--format', choices=(EDGE_LIST, CSV, JSONL),
+                               help="The format of the files (default: guessed from each file's extension).")
+    import_parser.add_argument('--undirected', action='store_true', help="Create undirected edges.")
+    import_parser.add_argument('--int-ids', action='store_true', help="Convert vertex IDs to integers.")
+    import_parser.add_argument('--source-key', default='source',
+                               help="The CSV column or JSON key of the source (default: %(default)s).")
+    import_parser.add_argument('--sink-key', default='sink',
+                               help="The CSV column or JSON key of the sink (default: %(default)s).")
+    import_parser.add_argument('--weight-key', default='weight',
+                               help="The edge data key for edge list weights (default: %(default)s).")
+    import_parser.add_argument('--chunk-size', type=int, default=10000,
+                               help="The number of lines parsed and written at a time (default: %(default)s).")
+    import_parser.add_argument('--processes', type=int, default=None,
+                               help="The number of worker processes to parse with (default: none).")
+    import_parser.add_argument('--quiet', action='store_true', help="Don't report progress and throughput.")
+    import_parser.set_defaults(handler=_import_command)
+
+    export_parser = commands.add_parser('export', help="Export a graph store to flat files.")
+    export_parser.add_argument('source', help="The graph store to export.")
+    export_parser.add_argument('output', help="The file to write. Files ending in .gz are compressed. With more than "
+                                              "one partition, {} in the name is replaced with the partition number.")
+    export_parser.add_argument('--store', choices=(DBM_STORE, SNAPSHOT_STORE), default=DBM_STORE,
+                               help="The kind of graph store the source is (default: %(default)s).")
+    export_parser.add_argument('--format', choices=(JSONL, EDGE_LIST, GRAPHML),
+                               help="The format to write (default: guessed from the output file's extension).")
+    export_parser.add_argument('--partitions', type=int, default=1,
+                               help="The number of files to split the graph into (default: %(default)s).")
+    export_parser.add_argument('--processes', type=int, default=None,
+                               help="The number of worker processes writing partitions (default: none).")
+    export_parser.add_argument('--weight-key', default='weight',
+                               help="The edge data key of edge list weights (default: %(default)s).")
+    export_parser.add_argument('--quiet', action='store_true', help="Don't report progress and throughput.")
+    export_parser.set_defaults(handler=_export_command)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,830 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+
+"""
+An asyncio interface to graphs. AsyncGraphStore offers every GraphStore method as a coroutine, with async iterators in
+place of iterators, and AsyncGraph adds graph-level operations on top of it:
+
+    graph = AsyncGraph('graph.db')
+    await graph.add_edge('a', 'b', data={'weight': 2.5})
+    async for vid in graph.store.iter_sinks('a'):
+        print(vid, await graph.store.get_vertex_data(vid, 'name'))
+    await graph.close()
+
+Graph stores that block on I/O, which is every graph store except the memory graph stores, are called from a bounded
+pool of worker threads, so the event loop keeps running while they work. They are wrapped in a LockingGraphStore so
+the workers can share them. Point lookups, such as has_vertex() and get_vertex_data(), made by any number of tasks
+during one pass of the event loop are coalesced into a single job for the pool, which runs them together under one read
+lock. Memory graph stores are fast enough to be called on the event loop directly.
+"""
+
+
+import asyncio
+import collections
+import concurrent.futures
+import functools
+import itertools
+from typing import Hashable, Any, Optional, Iterator, Iterable, Mapping, Tuple, Callable, List, Union, \
+    MutableMapping
+
+import vert.stores.base as base
+from vert.stores.locking import LockingGraphStore
+from vert.stores.dbm import DBMGraphStore
+from vert.stores.memory import MemoryGraphStore
+from vert.graphs import Graph
+
+
+__all__ = [
+    'AsyncGraphStore',
+    'AsyncGraph',
+    'AsyncIterator',
+]
+
+
+# The number of items an async iterator fetches from the graph store at a time.
+ITER_CHUNK_SIZE = 1000
+
+# The most point lookups run by one job in the worker threads.
+LOOKUP_BATCH_SIZE = 256
+
+
+class AsyncIterator:
+    """
+    An async iterator over the items of an iterator returned by a graph store. The iterator is created, and its items
+    fetched, ITER_CHUNK_SIZE at a time, the same way as the graph store's other calls are made.
+    """
+
+    def __init__(self, store: 'AsyncGraphStore', function: Callable[..., Iterable[Any]], *args: Any):
+        self._store = store
+        self._function = function
+        self._args = args
+        self._iterator = None  # type: Optional[Iterator[Any]]
+        self._buffer = collections.deque()
+        self._exhausted = False
+
+    def _fetch(self) -> List[Any]:
+        """Return the next chunk of items. This is called in a worker thread for blocking graph stores."""
+        if self._iterator is None:
+            self._iterator = iter(self._function(*self._args))
+        return list(itertools.islice(self._iterator, ITER_CHUNK_SIZE))
+
+    def __aiter__(self) -> 'AsyncIterator':
+        return self
+
+    async def __anext__(self) -> Any:
+        if not self._buffer:
+            if self._exhausted:
+                raise StopAsyncIteration
+            chunk = await self._store.call(self._fetch)
+            if len(chunk) < ITER_CHUNK_SIZE:
+                self._exhausted = True
+            if not chunk:
+                raise StopAsyncIteration
+            self._buffer.extend(chunk)
+        return self._buffer.popleft()
+
+    async def collect(self) -> List[Any]:
+        """Return a list of the remaining items."""
+        items = []
+        async for item in self:
+            items.append(item)
+        return items
+
+
+class AsyncGraphStore:
+    """
+    Coroutine versions of the methods of a graph store. Methods returning iterators return AsyncIterators instead,
+    for use with async for. The graph store should not be accessed directly while it is wrapped, except through the
+    store property, since the worker threads may be using it.
+    """
+
+    def __init__(self, graph_store: base.GraphStore, executor: Optional[concurrent.futures.Executor] = None,
+                 max_workers: int = 4, blocking: Optional[bool] = None):
+        """
+        :param graph_store: The graph store to wrap.
+        :param executor: The executor to call a blocking graph store in. If none is given, a thread pool with
+            max_workers threads is created, and shut down when the graph store is closed.
+        :param max_workers: The number of worker threads, if no executor is given.
+        :param blocking: Whether calls to the graph store block, and so have to be made in the executor. By default,
+            every graph store except the memory graph stores is assumed to block.
+        """
+        if blocking is None:
+            blocking = not isinstance(graph_store, MemoryGraphStore)
+        self._own_executor = False
+        if not blocking:
+            executor = None
+        else:
+            if not isinstance(graph_store, LockingGraphStore):
+                graph_store = LockingGraphStore(graph_store)
+            if executor is None:
+                executor = concurrent.futures.ThreadPoolExecutor(max_workers)
+                self._own_executor = True
+        self._graph_store = graph_store
+        self._executor = executor
+        self._pending = []  # type: List[Tuple[Callable[..., Any], Tuple[Any, ...], asyncio.Future]]
+
+    async def __aenter__(self) -> 'AsyncGraphStore':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> bool:
+        await self.close()
+        return False
+
+    @property
+    def store(self) -> base.GraphStore:
+        """
+        The graph store the calls are made to. For blocking graph stores, this is the LockingGraphStore wrapping the
+        graph store that was passed in.
+        """
+        return self._graph_store
+
+    @property
+    def blocking(self) -> bool:
+        """Whether calls to the graph store are made in the executor."""
+        return self._executor is not None
+
+    @property
+    def is_open(self) -> bool:
+        """
+        A Boolean value indicating whether the graph store is open. When a graph store is closed, it cannot be accessed.
+        """
+        return self._graph_store.is_open
+
+    def call(self, function: Callable[..., Any], *args: Any) -> 'asyncio.Future':
+        """
+        Call the function with the arguments the way the graph store is called: in the executor for blocking graph
+        stores, and right away otherwise. Return a future for the result.
+        """
+        loop = asyncio.get_event_loop()
+        if self._executor is not None:
+            return loop.run_in_executor(self._executor, functools.partial(function, *args))
+        future = loop.create_future()
+        try:
+            future.set_result(function(*args))
+        except Exception as error:
+            future.set_exception(error)
+        return future
+
+    def call_atomic(self, function: Callable[..., Any], *args: Any) -> 'asyncio.Future':
+        """
+        Like call(), but for blocking graph stores, hold the write lock around the call, so a function making several
+        calls to the graph store runs them as one atomic operation.
+        """
+        if self._executor is None:
+            return self.call(function, *args)
+        return self.call(self._call_locked, function, args)
+
+    def _call_locked(self, function: Callable[..., Any], args: Tuple[Any, ...]) -> Any:
+        """Call the function while holding the write lock. This is called in a worker thread."""
+        with self._graph_store.write_locked():
+            return function(*args)
+
+    def _lookup(self, function: Callable[..., Any], *args: Any) -> 'asyncio.Future':
+        """
+        Call a graph store method that looks up a single value, coalescing the call with the other lookups made during
+        the same pass of the event loop. Return a future for the result.
+        """
+        if self._executor is None:
+            return self.call(function, *args)
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        if not self._pending:
+            loop.call_soon(self._dispatch)
+        self._pending.append((function, args, future))
+        return future
+
+    def _dispatch(self) -> None:
+        """Send the pending lookups to the executor, in batches of at most LOOKUP_BATCH_SIZE."""
+        loop = asyncio.get_event_loop()
+        pending = self._pending
+        self._pending = []
+        for start in range(0, len(pending), LOOKUP_BATCH_SIZE):
+            batch = pending[start:start + LOOKUP_BATCH_SIZE]
+            calls = [(function, args) for function, args, _ in batch]
+            futures = [future for _, _, future in batch]
+            job = loop.run_in_executor(self._executor, self._run_lookups, calls)
+            job.add_done_callback(functools.partial(self._deliver, futures))
+
+    def _run_lookups(self, calls: List[Tuple[Callable[..., Any], Tuple[Any, ...]]]) -> List[Tuple[bool, Any]]:
+        """
+        Make a batch of lookups under a single read lock. This is called in a worker thread. Return a (succeeded,
+        result or exception) pair for each. Identical lookups are only made once.
+        """
+        results = []
+        done = {}
+        with self._graph_store.read_locked():
+            for function, args in calls:
+                try:
+                    result = done.get((function, args), None)
+                except TypeError:  # Unhashable arguments
+                    result = None
+                if result is None:
+                    try:
+                        result = (True, function(*args))
+                    except Exception as error:
+                        result = (False, error)
+                    try:
+                        done[function, args] = result
+                    except TypeError:
+                        pass
+                results.append(result)
+        return results
+
+    @staticmethod
+    def _deliver(futures: List['asyncio.Future'], job: 'asyncio.Future') -> None:
+        """Pass the results of a batch of lookups on to the futures waiting for them."""
+        if job.cancelled():
+            for future in futures:
+                future.cancel()
+            return
+        error = job.exception()
+        results = None if error is not None else job.result()
+        for index, future in enumerate(futures):
+            if future.done():
+                continue  # Cancelled by the caller
+            if error is not None:
+                future.set_exception(error)
+                continue
+            succeeded, result = results[index]
+            if succeeded:
+                future.set_result(result)
+            else:
+                future.set_exception(result)
+
+    async def close(self) -> None:
+        """
+        Perform a proper shutdown of the graph store, ensuring that if the graph store is persistent, it will be in a
+        consistent on-disk state. The worker threads are shut down too, if the executor was created for the graph
+        store.
+        """
+        await self.call(self._graph_store.close)
+        if self._own_executor:
+            self._executor.shutdown(wait=False)
+
+    async def count_vertices(self) -> int:
+        """Return the total number of vertices in the graph."""
+        return await self._lookup(self._graph_store.count_vertices)
+
+    async def count_edges(self) -> int:
+        """Return the total number of edges in the graph."""
+        return await self._lookup(self._graph_store.count_edges)
+
+    def iter_vertices(self) -> AsyncIterator:
+        """Return an async iterator over the IDs of every vertex in the graph."""
+        return AsyncIterator(self, self._graph_store.iter_vertices)
+
+    def iter_edges(self) -> AsyncIterator:
+        """Return an async iterator over the IDs of every edge in the graph."""
+        return AsyncIterator(self, self._graph_store.iter_edges)
+
+    async def has_inbound(self, sink: base.VertexID) -> bool:
+        """Return a Boolean value indicating whether the given vertex has at least one inbound edge."""
+        return await self._lookup(self._graph_store.has_inbound, sink)
+
+    async def has_outbound(self, source: base.VertexID) -> bool:
+        """Return a Boolean value indicating whether the given vertex has at least one outbound edge."""
+        return await self._lookup(self._graph_store.has_outbound, source)
+
+    async def has_undirected(self, vid: base.VertexID) -> bool:
+        """Return a Boolean value indicating whether the given vertex has at least one undirected edge."""
+        return await self._lookup(self._graph_store.has_undirected, vid)
+
+    def iter_inbound(self, sink: base.VertexID) -> AsyncIterator:
+        """Return an async iterator over the IDs of every inbound directed edge to this vertex."""
+        return AsyncIterator(self, self._graph_store.iter_inbound, sink)
+
+    def iter_outbound(self, source: base.VertexID) -> AsyncIterator:
+        """Return an async iterator over the IDs of every outbound directed edge from this vertex."""
+        return AsyncIterator(self, self._graph_store.iter_outbound, source)
+
+    def iter_undirected(self, vid: base.VertexID) -> AsyncIterator:
+        """Return an async iterator over the IDs of every undirected edge connected to this vertex."""
+        return AsyncIterator(self, self._graph_store.iter_undirected, vid)
+
+    def iter_sources(self, sink: base.VertexID) -> AsyncIterator:
+        """Return an async iterator over the IDs of the sources of every inbound directed edge to this vertex."""
+        return AsyncIterator(self, self._graph_store.iter_sources, sink)
+
+    def iter_sinks(self, source: base.VertexID) -> AsyncIterator:
+        """Return an async iterator over the IDs of the sinks of every outbound directed edge from this vertex."""
+        return AsyncIterator(self, self._graph_store.iter_sinks, source)
+
+    def iter_neighbors(self, vid: base.VertexID) -> AsyncIterator:
+        """
+        Return an async iterator over the IDs of every vertex connected to this vertex by an edge, whether inbound,
+        outbound, or undirected. Each neighbor is yielded only once, even if it is connected by more than one edge.
+        """
+        return AsyncIterator(self, self._graph_store.iter_neighbors, vid)
+
+    def iter_inbound_data(self, sink: base.VertexID, key: Hashable, default: Any = None) -> AsyncIterator:
+        """
+        Return an async iterator over (source, value) pairs, one for each inbound directed edge to this vertex, where
+        value is the data stored in the edge under the key, or the default if there is none.
+        """
+        return AsyncIterator(self, self._graph_store.iter_inbound_data, sink, key, default)
+
+    def iter_outbound_data(self, source: base.VertexID, key: Hashable, default: Any = None) -> AsyncIterator:
+        """
+        Return an async iterator over (sink, value) pairs, one for each outbound directed edge from this vertex, where
+        value is the data stored in the edge under the key, or the default if there is none.
+        """
+        return AsyncIterator(self, self._graph_store.iter_outbound_data, source, key, default)
+
+    def iter_undirected_data(self, vid: base.VertexID, key: Hashable, default: Any = None) -> AsyncIterator:
+        """
+        Return an async iterator over (neighbor, value) pairs, one for each undirected edge connected to this vertex,
+        where value is the data stored in the edge under the key, or the default if there is none.
+        """
+        return AsyncIterator(self, self._graph_store.iter_undirected_data, vid, key, default)
+
+    async def count_inbound(self, sink: base.VertexID) -> int:
+        """Return the number of inbound directed edges to this vertex."""
+        return await self._lookup(self._graph_store.count_inbound, sink)
+
+    async def count_outbound(self, source: base.VertexID) -> int:
+        """Return the number of outbound directed edges from this vertex."""
+        return await self._lookup(self._graph_store.count_outbound, source)
+
+    async def count_undirected(self, vid: base.VertexID) -> int:
+        """Return the number of undirected edges connected to this vertex."""
+        return await self._lookup(self._graph_store.count_undirected, vid)
+
+    async def has_vertex(self, vid: base.VertexID) -> bool:
+        """Return whether the given ID has a vertex associated with it in the graph."""
+        return await self._lookup(self._graph_store.has_vertex, vid)
+
+    async def has_edge(self, eid: base.EdgeID) -> bool:
+        """Return whether the given ID has an edge associated with it in the graph."""
+        return await self._lookup(self._graph_store.has_edge, eid)
+
+    async def add_vertex(self, vid: base.VertexID) -> None:
+        """
+        Add a vertex to the graph associated with this ID. If a vertex with the given ID already exists, do nothing.
+        """
+        return await self.call(self._graph_store.add_vertex, vid)
+
+    async def add_edge(self, eid: base.EdgeID) -> None:
+        """
+        Add an edge to the graph associated with this ID. If an edge with the given ID already exists, do nothing. If
+        either the source or sink vertex of the edge does not exist, add it first.
+        """
+        return await self.call(self._graph_store.add_edge, eid)
+
+    async def discard_vertex(self, vid: base.VertexID) -> bool:
+        """
+        Remove the vertex associated with this ID from the graph. If such a vertex does not exist, do nothing. Any
+        incident edges to the vertex are also removed. Return a Boolean indicating whether the vertex was present to be
+        removed.
+        """
+        return await self.call(self._graph_store.discard_vertex, vid)
+
+    async def discard_edge(self, eid: base.EdgeID, ignore: Optional[base.VertexID] = None) -> bool:
+        """
+        Remove the edge associated with this ID from the graph. If such an edge does not exist, do nothing. The source
+        and sink vertex are not removed. Return a Boolean indicating whether the edge was present to be removed.
+        """
+        return await self.call(self._graph_store.discard_edge, eid, ignore)
+
+    async def add_vertices(self, vids: Iterable[base.VertexID]) -> None:
+        """
+        Add a vertex to the graph for each of these IDs, skipping those that already exist. Equivalent to calling
+        add_vertex() for each ID.
+        """
+        return await self.call(self._graph_store.add_vertices, vids)
+
+    async def add_edges(self, eids: Iterable[base.EdgeID]) -> None:
+        """
+        Add an edge to the graph for each of these IDs, skipping those that already exist, and adding any missing
+        vertices first. Equivalent to calling add_edge() for each ID.
+        """
+        return await self.call(self._graph_store.add_edges, eids)
+
+    async def discard_vertices(self, vids: Iterable[base.VertexID]) -> int:
+        """
+        Remove the vertices associated with these IDs from the graph, along with their incident edges. IDs with no
+        associated vertex are ignored. Return the number of vertices that were removed. Equivalent to calling
+        discard_vertex() for each ID.
+        """
+        return await self.call(self._graph_store.discard_vertices, vids)
+
+    async def discard_edges(self, eids: Iterable[base.EdgeID]) -> int:
+        """
+        Remove the edges associated with these IDs from the graph. IDs with no associated edge are ignored. Return the
+        number of edges that were removed. Equivalent to calling discard_edge() for each ID.
+        """
+        return await self.call(self._graph_store.discard_edges, eids)
+
+    async def set_vertex_data_many(self, items: Iterable[Tuple[base.VertexID, Mapping[Hashable, Any]]]) -> None:
+        """
+        For each (vertex ID, mapping) pair, store every key/value pair of the mapping in the vertex, adding the vertex
+        first if it doesn't exist. Equivalent to calling set_vertex_data() for each key/value pair.
+        """
+        return await self.call(self._graph_store.set_vertex_data_many, items)
+
+    async def set_edge_data_many(self, items: Iterable[Tuple[base.EdgeID, Mapping[Hashable, Any]]]) -> None:
+        """
+        For each (edge ID, mapping) pair, store every key/value pair of the mapping in the edge, adding the edge first
+        if it doesn't exist. Equivalent to calling set_edge_data() for each key/value pair.
+        """
+        return await self.call(self._graph_store.set_edge_data_many, items)
+
+    async def add_vertex_labels_many(self, items: Iterable[Tuple[base.VertexID, Iterable[base.Label]]]) -> None:
+        """
+        For each (vertex ID, labels) pair, add every one of the labels to the vertex, adding the vertex first if it
+        doesn't exist. Equivalent to calling add_vertex_label() for each label.
+        """
+        return await self.call(self._graph_store.add_vertex_labels_many, items)
+
+    async def add_edge_labels_many(self, items: Iterable[Tuple[base.EdgeID, Iterable[base.Label]]]) -> None:
+        """
+        For each (edge ID, labels) pair, add every one of the labels to the edge, adding the edge first if it doesn't
+        exist. Equivalent to calling add_edge_label() for each label.
+        """
+        return await self.call(self._graph_store.add_edge_labels_many, items)
+
+    async def get_vertex_record(self, vid: base.VertexID) -> Optional[base.VertexRecord]:
+        """
+        Return the labels, data, and edge counts of the vertex in a single call, or None if the vertex does not exist.
+        """
+        return await self._lookup(self._graph_store.get_vertex_record, vid)
+
+    async def get_edge_record(self, eid: base.EdgeID) -> Optional[base.EdgeRecord]:
+        """Return the labels and data of the edge in a single call, or None if the edge does not exist."""
+        return await self._lookup(self._graph_store.get_edge_record, eid)
+
+    async def get_vertex_records(self, vids: Iterable[base.VertexID]) -> List[Optional[base.VertexRecord]]:
+        """
+        Return a list of the records of the vertices, in the same order as their IDs, with None for each ID that has no
+        vertex. Equivalent to calling get_vertex_record() for each ID.
+        """
+        return await self.call(self._graph_store.get_vertex_records, vids)
+
+    async def get_edge_records(self, eids: Iterable[base.EdgeID]) -> List[Optional[base.EdgeRecord]]:
+        """
+        Return a list of the records of the edges, in the same order as their IDs, with None for each ID that has no
+        edge. Equivalent to calling get_edge_record() for each ID.
+        """
+        return await self.call(self._graph_store.get_edge_records, eids)
+
+    def filter_vertices(self, vids: Iterable[base.VertexID], labels: Iterable[base.Label] = (),
+                        data: Optional[Mapping[Hashable, Any]] = None) -> AsyncIterator:
+        """
+        Return an async iterator over the vertex IDs in vids whose vertices have every one of the labels and store a
+        value equal to each of the values in data under the same key. The IDs are consumed in a worker thread for
+        blocking graph stores, so vids must not be tied to the event loop.
+        """
+        return AsyncIterator(self, self._graph_store.filter_vertices, vids, labels, data)
+
+    async def add_vertex_data_index(self, key: Hashable, ordered: bool = False) -> None:
+        """
+        Declare a secondary index on the vertex data stored under this key, so find_vertices() can look vertices up by
+        value without scanning the graph. If the key is already indexed, do nothing. If ordered is set, the index also
+        keeps the numbers stored under the key in sorted order, so find_vertices_in_range() can scan ranges of them, and
+        an existing index is made ordered.
+        """
+        return await self.call(self._graph_store.add_vertex_data_index, key, ordered)
+
+    async def discard_vertex_data_index(self, key: Hashable) -> bool:
+        """
+        Drop the secondary index on the vertex data stored under this key. Return a Boolean indicating whether there
+        was an index to drop.
+        """
+        return await self.call(self._graph_store.discard_vertex_data_index, key)
+
+    async def has_vertex_data_index(self, key: Hashable, ordered: bool = False) -> bool:
+        """
+        Return a Boolean indicating whether the vertex data stored under this key is indexed, or if ordered is set,
+        whether it has an ordered index.
+        """
+        return await self._lookup(self._graph_store.has_vertex_data_index, key, ordered)
+
+    def find_vertices(self, key: Hashable, value: Any) -> AsyncIterator:
+        """Return an async iterator over the IDs of the vertices that store a value equal to this one under the key."""
+        return AsyncIterator(self, self._graph_store.find_vertices, key, value)
+
+    def find_vertices_in_range(self, key: Hashable, minimum: Optional[Any] = None, maximum: Optional[Any] = None,
+                               reverse: bool = False) -> AsyncIterator:
+        """
+        Return an async iterator over the IDs of the vertices that store a number between the minimum and the maximum,
+        inclusive, under the key, in order of the numbers.
+        """
+        return AsyncIterator(self, self._graph_store.find_vertices_in_range, key, minimum, maximum, reverse)
+
+    async def add_edge_data_index(self, key: Hashable, ordered: bool = False) -> None:
+        """
+        Declare a secondary index on the edge data stored under this key, so find_edges() can look edges up by value
+        without scanning the graph. If the key is already indexed, do nothing. If ordered is set, the index also keeps
+        the numbers stored under the key in sorted order, so find_edges_in_range() can scan ranges of them, and an
+        existing index is made ordered.
+        """
+        return await self.call(self._graph_store.add_edge_data_index, key, ordered)
+
+    async def discard_edge_data_index(self, key: Hashable) -> bool:
+        """
+        Drop the secondary index on the edge data stored under this key. Return a Boolean indicating whether there was
+        an index to drop.
+        """
+        return await self.call(self._graph_store.discard_edge_data_index, key)
+
+    async def has_edge_data_index(self, key: Hashable, ordered: bool = False) -> bool:
+        """
+        Return a Boolean indicating whether the edge data stored under this key is indexed, or if ordered is set,
+        whether it has an ordered index.
+        """
+        return await self._lookup(self._graph_store.has_edge_data_index, key, ordered)
+
+    def find_edges(self, key: Hashable, value: Any) -> AsyncIterator:
+        """Return an async iterator over the IDs of the edges that store a value equal to this one under the key."""
+        return AsyncIterator(self, self._graph_store.find_edges, key, value)
+
+    def find_edges_in_range(self, key: Hashable, minimum: Optional[Any] = None, maximum: Optional[Any] = None,
+                            reverse: bool = False) -> AsyncIterator:
+        """
+        Return an async iterator over the IDs of the edges that store a number between the minimum and the maximum,
+        inclusive, under the key, in order of the numbers.
+        """
+        return AsyncIterator(self, self._graph_store.find_edges_in_range, key, minimum, maximum, reverse)
+
+    async def add_vertex_label(self, vid: base.VertexID, label: base.Label) -> None:
+        """Add a label to the vertex. If the vertex already has the label, do nothing."""
+        return await self.call(self._graph_store.add_vertex_label, vid, label)
+
+    async def has_vertex_label(self, vid: base.VertexID, label: base.Label) -> bool:
+        """Return a Boolean indicating whether the vertex has the label."""
+        return await self._lookup(self._graph_store.has_vertex_label, vid, label)
+
+    async def discard_vertex_label(self, vid: base.VertexID, label: base.Label) -> bool:
+        """
+        Remove the label from the vertex. If the vertex does not have the label, do nothing. Return a Boolean indicating
+        whether or not a label was removed.
+        """
+        return await self.call(self._graph_store.discard_vertex_label, vid, label)
+
+    def iter_vertex_labels(self, vid: base.VertexID) -> AsyncIterator:
+        """Return an async iterator over the labels for the vertex."""
+        return AsyncIterator(self, self._graph_store.iter_vertex_labels, vid)
+
+    async def count_vertex_labels(self, vid: base.VertexID) -> int:
+        """Return the number of labels the vertex has."""
+        return await self._lookup(self._graph_store.count_vertex_labels, vid)
+
+    async def add_edge_label(self, eid: base.EdgeID, label: base.Label) -> None:
+        """Add a label to the edge. If the edge already has the label, do nothing."""
+        return await self.call(self._graph_store.add_edge_label, eid, label)
+
+    async def has_edge_label(self, eid: base.EdgeID, label: base.Label) -> bool:
+        """Return a Boolean indicating whether or not the edge has the label."""
+        return await self._lookup(self._graph_store.has_edge_label, eid, label)
+
+    async def discard_edge_label(self, eid: base.EdgeID, label: base.Label) -> bool:
+        """
+        Remove the label from the edge. If the edge does not have the label, do nothing. Return a Boolean indicating
+        whether or not a label was removed.
+        """
+        return await self.call(self._graph_store.discard_edge_label, eid, label)
+
+    def iter_edge_labels(self, eid: base.EdgeID) -> AsyncIterator:
+        """Return an async iterator over the labels for the edge."""
+        return AsyncIterator(self, self._graph_store.iter_edge_labels, eid)
+
+    async def count_edge_labels(self, eid: base.EdgeID) -> int:
+        """Return the number of labels the edge has."""
+        return await self._lookup(self._graph_store.count_edge_labels, eid)
+
+    def iter_vertices_with_label(self, label: base.Label) -> AsyncIterator:
+        """Return an async iterator over the IDs of the vertices that have the label."""
+        return AsyncIterator(self, self._graph_store.iter_vertices_with_label, label)
+
+    async def count_vertices_with_label(self, label: base.Label) -> int:
+        """Return the number of vertices that have the label."""
+        return await self._lookup(self._graph_store.count_vertices_with_label, label)
+
+    def iter_edges_with_label(self, label: base.Label) -> AsyncIterator:
+        """Return an async iterator over the IDs of the edges that have the label."""
+        return AsyncIterator(self, self._graph_store.iter_edges_with_label, label)
+
+    async def count_edges_with_label(self, label: base.Label) -> int:
+        """Return the number of edges that have the label."""
+        return await self._lookup(self._graph_store.count_edges_with_label, label)
+
+    async def get_vertex_data(self, vid: base.VertexID, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the value stored in the vertex for this key. If no value is stored for the key, return the default. A
+        unique sentinel object can be passed as the default to distinguish a missing key from a stored None in a single
+        lookup.
+        """
+        return await self._lookup(base.lookup_vertex_data, self._graph_store, vid, key, default)
+
+    async def set_vertex_data(self, vid: base.VertexID, key: Hashable, value: Any) -> None:
+        """Store a value in the vertex for this key."""
+        return await self.call(self._graph_store.set_vertex_data, vid, key, value)
+
+    async def has_vertex_data(self, vid: base.VertexID, key: Hashable) -> bool:
+        """Return a Boolean indicating whether a value is stored in the vertex for this key."""
+        return await self._lookup(self._graph_store.has_vertex_data, vid, key)
+
+    async def discard_vertex_data(self, vid: base.VertexID, key: Hashable) -> bool:
+        """
+        Remove the value stored in the vertex under this key. If no value is stored for the key, do nothing. Return a
+        Boolean indicating whether a key/value pair was removed from the vertex.
+        """
+        return await self.call(self._graph_store.discard_vertex_data, vid, key)
+
+    def iter_vertex_data_keys(self, vid: base.VertexID) -> AsyncIterator:
+        """Return an async iterator over the keys for which data is stored in the vertex."""
+        return AsyncIterator(self, self._graph_store.iter_vertex_data_keys, vid)
+
+    async def count_vertex_data_keys(self, vid: base.VertexID) -> int:
+        """Return the number of key/value pairs stored in the vertex."""
+        return await self._lookup(self._graph_store.count_vertex_data_keys, vid)
+
+    async def get_edge_data(self, eid: base.EdgeID, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the value stored in the edge for this key. If no value is stored for the key, return the default. A
+        unique sentinel object can be passed as the default to distinguish a missing key from a stored None in a single
+        lookup.
+        """
+        return await self._lookup(base.lookup_edge_data, self._graph_store, eid, key, default)
+
+    async def set_edge_data(self, eid: base.EdgeID, key: Hashable, value: Any) -> None:
+        """Store a value in the edge for this key."""
+        return await self.call(self._graph_store.set_edge_data, eid, key, value)
+
+    async def has_edge_data(self, eid: base.EdgeID, key: Hashable) -> bool:
+        """Return a Boolean indicating whether a value is stored in the edge for this key."""
+        return await self._lookup(self._graph_store.has_edge_data, eid, key)
+
+    async def discard_edge_data(self, eid: base.EdgeID, key: Hashable) -> bool:
+        """
+        Remove the value stored in the edge under this key. If no value is stored for the key, do nothing. Return a
+        Boolean indicating whether a key/value pair was removed from the edge.
+        """
+        return await self.call(self._graph_store.discard_edge_data, eid, key)
+
+    def iter_edge_data_keys(self, eid: base.EdgeID) -> AsyncIterator:
+        """Return an async iterator over the keys for which data is stored in the edge."""
+        return AsyncIterator(self, self._graph_store.iter_edge_data_keys, eid)
+
+    async def count_edge_data_keys(self, eid: base.EdgeID) -> int:
+        """Return the number of key/value pairs stored in the edge."""
+        return await self._lookup(self._graph_store.count_edge_data_keys, eid)
+
+
+class AsyncGraph:
+    """
+    An asyncio counterpart to Graph. Vertices and edges are referred to by their IDs, rather than by Vertex and Edge
+    objects, whose attributes would each need a blocking call. The rest of the Graph interface is available through
+    run(), which calls a function with the graph in the same way as the graph store is called, and every graph store
+    method through the store property.
+    """
+
+    def __init__(self, store: Optional[Union[AsyncGraphStore, base.GraphStore, str,
+                                             MutableMapping[bytes, bytes]]] = None,
+                 executor: Optional[concurrent.futures.Executor] = None, max_workers: int = 4):
+        """
+        :param store: The graph store, which may be given in any of the forms accepted by Graph, or as an
+            AsyncGraphStore.
+        :param executor: The executor to call a blocking graph store in. See AsyncGraphStore.
+        :param max_workers: The number of worker threads, if no executor is given.
+        """
+        if not isinstance(store, AsyncGraphStore):
+            if store is None:
+                store = MemoryGraphStore()
+            elif not isinstance(store, base.GraphStore):
+                store = DBMGraphStore(store)
+            store = AsyncGraphStore(store, executor, max_workers)
+        self._store = store
+        self._graph = Graph(store.store)
+
+    async def __aenter__(self) -> 'AsyncGraph':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> bool:
+        await self.close()
+        return False
+
+    @property
+    def store(self) -> AsyncGraphStore:
+        """The async graph store in which the graph's vertices and edges are stored."""
+        return self._store
+
+    @property
+    def graph(self) -> Graph:
+        """
+        The synchronous graph. It must only be used by functions passed to run(), since for blocking graph stores, its
+        calls are made in the worker threads.
+        """
+        return self._graph
+
+    @property
+    def is_open(self) -> bool:
+        """Whether or not the graph is open. Once a graph is closed, it cannot be operated on."""
+        return self._store.is_open
+
+    async def close(self) -> None:
+        """Close the graph."""
+        await self._store.close()
+
+    async def run(self, function: Callable[..., Any], *args: Any) -> Any:
+        """
+        Call the function with the graph and the arguments, e.g. await graph.run(lambda g: len(g.vertices['a'].sinks)),
+        in a worker thread for blocking graph stores. Each call it makes to the graph store is atomic, but the function
+        as a whole is not.
+
+        :param function: The function to call with the Graph as its first argument.
+        :param args: The remaining arguments to the function.
+        :return: The function's return value.
+        """
+        return await self._store.call(function, self._graph, *args)
+
+    async def add_vertex(self, vid: base.VertexID, labels: Iterable[base.Label] = (),
+                         data: Optional[Mapping[Hashable, Any]] = None) -> None:
+        """
+        Add a vertex, if it doesn't exist, and give it the labels and data, as one atomic operation.
+
+        :param vid: The ID of the vertex.
+        :param labels: The labels to add to the vertex.
+        :param data: The key/value pairs to store in the vertex.
+        """
+        await self._store.call_atomic(self._add_vertex, vid, tuple(labels), data)
+
+    def _add_vertex(self, vid: base.VertexID, labels: Tuple[base.Label, ...],
+                    data: Optional[Mapping[Hashable, Any]]) -> None:
+        """Add a vertex with its labels and data to the graph store."""
+        graph_store = self._store.store
+        graph_store.add_vertex(vid)
+        for label in labels:
+            graph_store.add_vertex_label(vid, label)
+        if data:
+            graph_store.set_vertex_data_many([(vid, data)])
+
+    async def add_edge(self, source: base.VertexID, sink: base.VertexID, directed: bool = True,
+                       labels: Iterable[base.Label] = (), data: Optional[Mapping[Hashable, Any]] = None) -> base.EdgeID:
+        """
+        Add an edge, and any missing vertices it connects, if it doesn't exist, and give it the labels and data, as one
+        atomic operation.
+
+        :param source: The source vertex ID, or one of the vertex IDs of an undirected edge.
+        :param sink: The sink vertex ID, or the other vertex ID of an undirected edge.
+        :param directed: Whether the edge is directed.
+        :param labels: The labels to add to the edge.
+        :param data: The key/value pairs to store in the edge.
+        :return: The ID of the edge.
+        """
+        eid = base.DirectedEdgeID(source, sink) if directed else base.UndirectedEdgeID(source, sink)
+        await self._store.call_atomic(self._add_edge, eid, tuple(labels), data)
+        return eid
+
+    def _add_edge(self, eid: base.EdgeID, labels: Tuple[base.Label, ...],
+                  data: Optional[Mapping[Hashable, Any]]) -> None:
+        """Add an edge with its labels and data to the graph store."""
+        graph_store = self._store.store
+        graph_store.add_edge(eid)
+        for label in labels:
+            graph_store.add_edge_label(eid, label)
+        if data:
+            graph_store.set_edge_data_many([(eid, data)])
+
+    async def remove_vertex(self, vid: base.VertexID) -> bool:
+        """Remove the vertex and its edges. Return a Boolean indicating whether the vertex existed."""
+        return await self._store.discard_vertex(vid)
+
+    async def remove_edge(self, source: base.VertexID, sink: base.VertexID, directed: bool = True) -> bool:
+        """Remove the edge. Return a Boolean indicating whether the edge existed."""
+        eid = base.DirectedEdgeID(source, sink) if directed else base.UndirectedEdgeID(source, sink)
+        return await self._store.discard_edge(eid)
+
+    async def get_vertex(self, vid: base.VertexID) -> Optional[base.VertexRecord]:
+        """Return the labels, data, and edge counts of the vertex, or None if it does not exist."""
+        return await self._store.get_vertex_record(vid)
+
+    async def get_edge(self, source: base.VertexID, sink: base.VertexID,
+                       directed: bool = True) -> Optional[base.EdgeRecord]:
+        """Return the labels and data of the edge, or None if it does not exist."""
+        eid = base.DirectedEdgeID(source, sink) if directed else base.UndirectedEdgeID(source, sink)
+        return await self._store.get_edge_record(eid)
+
+    def find_vertices(self, data: Optional[Mapping[Hashable, Any]] = None, **kwargs: Any) -> AsyncIterator:
+        """
+        Return an async iterator over the IDs of the vertices that store a value equal to each of the given values
+        under the same key. See FullVertexSet.find().
+        """
+        return AsyncIterator(self._store, self._find_vertices, data, kwargs)
+
+    def _find_vertices(self, data: Optional[Mapping[Hashable, Any]], kwargs: Mapping[str, Any]) -> Iterator[Any]:
+        """Return an iterator over the IDs of the vertices that store the given values."""
+        return (vertex.vid for vertex in self._graph.vertices.find(data, **kwargs))
+
+    def find_edges(self, data: Optional[Mapping[Hashable, Any]] = None, **kwargs: Any) -> AsyncIterator:
+        """
+        Return an async iterator over the IDs of the edges that store a value equal to each of the given values under
+        the same key. See FullEdgeSet.find().
+        """
+        return AsyncIterator(self._store, self._find_edges, data, kwargs)
+
+    def _find_edges(self, data: Optional[Mapping[Hashable, Any]], kwargs: Mapping[str, Any]) -> Iterator[Any]:
+        """Return an iterator over the IDs of the edges that store the given values."""
+        return (edge.eid for edge in self._graph.edges.find(data, **kwargs))
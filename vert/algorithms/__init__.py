@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+
+"""
+Graph algorithms built on the GraphStore interface. Every algorithm accepts either a Graph or a GraphStore, and works
+in terms of vertex IDs, so it runs unchanged on any graph store.
+"""
+
+
+from .common import OUT, IN, BOTH, VisitedSet, VertexCounters
+from .search import bfs, dfs, bfs_frontiers, k_hop_neighborhood
+from .centrality import pagerank, personalized_pagerank, degree_centrality, eigenvector_centrality
+from .components import connected_components, weakly_connected_components, strongly_connected_components, \
+    UnionFind, ComponentIndexGraphStore
+from .dags import KAHN, DFS, topological_sort, find_cycle, is_dag
+from .paths import WeightedPath, dijkstra, bidirectional_dijkstra, astar, shortest_path
+from .triangles import triangles, count_triangles, clustering, average_clustering, global_clustering
+
+
+__all__ = [
+    'OUT',
+    'IN',
+    'BOTH',
+    'VisitedSet',
+    'VertexCounters',
+    'bfs',
+    'dfs',
+    'bfs_frontiers',
+    'k_hop_neighborhood',
+    'WeightedPath',
+    'dijkstra',
+    'bidirectional_dijkstra',
+    'astar',
+    'shortest_path',
+    'pagerank',
+    'personalized_pagerank',
+    'degree_centrality',
+    'eigenvector_centrality',
+    'connected_components',
+    'weakly_connected_components',
+    'strongly_connected_components',
+    'UnionFind',
+    'ComponentIndexGraphStore',
+    'triangles',
+    'count_triangles',
+    'clustering',
+    'average_clustering',
+    'global_clustering',
+    'KAHN',
+    'DFS',
+    'topological_sort',
+    'find_cycle',
+    'is_dag',
+]
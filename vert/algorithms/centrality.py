@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+
+"""
+Vectorized centrality measures: PageRank, personalized PageRank, degree centrality, and eigenvector centrality. The
+graph is first exported to CSR arrays with vert.arrays.to_csr(), and the iterations are then carried out as NumPy
+sparse matrix-vector products, so the graph store is only read once. NumPy is required to use this module.
+
+Each function returns a dictionary mapping vertex IDs to scores. If a store_key is given, the scores are also written
+back to the graph as vertex data under that key, in a single bulk call to GraphStore.set_vertex_data_many().
+"""
+
+
+from typing import Any, Dict, Hashable, Iterable, Mapping, Optional, Union
+
+from vert.stores.base import GraphStore, VertexID
+from vert.arrays import CSRArrays, to_csr
+from vert.algorithms.common import OUT, IN, BOTH, get_store, get_vid
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+__all__ = [
+    'pagerank',
+    'personalized_pagerank',
+    'degree_centrality',
+    'eigenvector_centrality',
+]
+
+
+def _require_numpy() -> None:
+    """Raise an ImportError if NumPy is not installed."""
+    if numpy is None:
+        raise ImportError("NumPy is required for centrality measures.")
+
+
+def _rows(arrays: CSRArrays) -> Any:
+    """Return an array giving the row (i.e. the source vertex) of each entry in the CSR arrays."""
+    return numpy.repeat(numpy.arange(len(arrays.vids)), numpy.diff(arrays.indptr))
+
+
+def _results(graph_store: GraphStore, arrays: CSRArrays, scores: Any,
+             store_key: Optional[Hashable]) -> Dict[VertexID, float]:
+    """Map the scores to their vertex IDs, writing them back to the graph store if a key is given."""
+    results = dict(zip(arrays.vids, scores.tolist()))
+    if store_key is not None:
+        graph_store.set_vertex_data_many((vid, {store_key: score}) for vid, score in results.items())
+    return results
+
+
+def pagerank(graph: Any, damping: float = 0.85, weight_key: Optional[Hashable] = None, default_weight: float = 1.0,
+             personalization: Optional[Mapping[Any, float]] = None, undirected: bool = True,
+             tolerance: float = 1e-6, max_iterations: int = 100,
+             store_key: Optional[Hashable] = None) -> Dict[VertexID, float]:
+    """
+    Compute the PageRank of every vertex by power iteration. Directed edges pass rank from source to sink, and
+    undirected edges pass it both ways. The rank of vertices with no outbound edges is redistributed according to the
+    personalization.
+
+    :param graph: The Graph or GraphStore to rank.
+    :param damping: The probability of following an edge rather than teleporting.
+    :param weight_key: If given, each vertex's rank is divided among its edges in proportion to the weights stored
+        under this edge data key. Otherwise it is divided evenly.
+    :param default_weight: The weight of edges with no value stored under the weight key.
+    :param personalization: If given, a mapping from vertices or vertex IDs to non-negative weights, which determines
+        where teleports land. Vertices not in the mapping get a weight of 0. Otherwise teleports land uniformly.
+    :param undirected: Whether to include undirected edges.
+    :param tolerance: Iteration stops once the total change in rank, divided by the number of vertices, falls below
+        this value.
+    :param max_iterations: Iteration stops after this many rounds even if the ranks have not converged.
+    :param store_key: If given, the ranks are also stored as vertex data under this key.
+    :return: A dictionary mapping each vertex ID to its rank. The ranks sum to 1.
+    """
+    _require_numpy()
+    graph_store = get_store(graph)
+    arrays = to_csr(graph_store, weight_key, default_weight, undirected)
+    size = len(arrays.vids)
+    if not size:
+        return {}
+
+    if personalization is None:
+        teleport = numpy.full(size, 1.0 / size)
+    else:
+        teleport = numpy.zeros(size)
+        for vertex, weight in personalization.items():
+            teleport[arrays.index[get_vid(vertex)]] = weight
+        total = teleport.sum()
+        if total <= 0:
+            raise ValueError("The personalization must have a positive total weight.")
+        teleport /= total
+
+    rows = _rows(arrays)
+    weights = numpy.ones(len(arrays.indices)) if arrays.weights is None else arrays.weights
+    out_weight = numpy.bincount(rows, weights=weights, minlength=size)
+    dangling = out_weight == 0
+    # The share of its source's rank that each edge carries.
+    shares = weights / numpy.where(dangling, 1.0, out_weight)[rows]
+
+    ranks = teleport.copy()
+    for _ in range(max_iterations):
+        new_ranks = damping * numpy.bincount(arrays.indices, weights=ranks[rows] * shares, minlength=size)
+        new_ranks += (damping * ranks[dangling].sum() + 1.0 - damping) * teleport
+        change = numpy.abs(new_ranks - ranks).sum()
+        ranks = new_ranks
+        if change < size * tolerance:
+            break
+    return _results(graph_store, arrays, ranks, store_key)
+
+
+def personalized_pagerank(graph: Any, sources: Union[Iterable[Any], Mapping[Any, float]], damping: float = 0.85,
+                          weight_key: Optional[Hashable] = None, default_weight: float = 1.0,
+                          undirected: bool = True, tolerance: float = 1e-6, max_iterations: int = 100,
+                          store_key: Optional[Hashable] = None) -> Dict[VertexID, float]:
+    """
+    Compute PageRank with every teleport landing on one of the source vertices, which measures how strongly each vertex
+    is connected to the sources. The remaining arguments are the same as for pagerank().
+
+    :param sources: The vertices or vertex IDs to teleport to, or a mapping from them to teleport weights.
+    :return: A dictionary mapping each vertex ID to its rank. The ranks sum to 1.
+    """
+    if not isinstance(sources, Mapping):
+        sources = {source: 1.0 for source in sources}
+    return pagerank(graph, damping, weight_key, default_weight, sources, undirected, tolerance, max_iterations,
+                    store_key)
+
+
+def degree_centrality(graph: Any, direction: str = BOTH, normalized: bool = True,
+                      store_key: Optional[Hashable] = None) -> Dict[VertexID, float]:
+    """
+    Compute the degree centrality of every vertex: the number of edges connected to it, optionally divided by the
+    number of other vertices in the graph.
+
+    :param graph: The Graph or GraphStore to measure.
+    :param direction: Which edges to count: OUT counts outbound and undirected edges, IN counts inbound and undirected
+        edges, and BOTH counts every edge.
+    :param normalized: Whether to divide each degree by one less than the number of vertices.
+    :param store_key: If given, the centralities are also stored as vertex data under this key.
+    :return: A dictionary mapping each vertex ID to its centrality.
+    """
+    _require_numpy()
+    if direction not in (OUT, IN, BOTH):
+        raise ValueError("Unknown direction: %r" % (direction,))
+    graph_store = get_store(graph)
+    arrays = to_csr(graph_store, undirected=False)
+    size = len(arrays.vids)
+    if not size:
+        return {}
+
+    undirected = numpy.fromiter((graph_store.count_undirected(vid) for vid in arrays.vids), dtype=numpy.float64,
+                                count=size)
+    degrees = undirected
+    if direction in (OUT, BOTH):
+        degrees = degrees + numpy.diff(arrays.indptr)
+    if direction in (IN, BOTH):
+        degrees = degrees + numpy.bincount(arrays.indices, minlength=size)
+    if normalized and size > 1:
+        degrees = degrees / (size - 1)
+    return _results(graph_store, arrays, degrees, store_key)
+
+
+def eigenvector_centrality(graph: Any, weight_key: Optional[Hashable] = None, default_weight: float = 1.0,
+                           undirected: bool = True, tolerance: float = 1e-6, max_iterations: int = 100,
+                           store_key: Optional[Hashable] = None) -> Dict[VertexID, float]:
+    """
+    Compute the eigenvector centrality of every vertex by power iteration: each vertex's score is proportional to the
+    sum of the scores of the vertices with edges leading to it. Iterating with the adjacency matrix plus the identity
+    keeps the iteration from oscillating on bipartite graphs without changing the result.
+
+    :param graph: The Graph or GraphStore to measure.
+    :param weight_key: If given, each edge's contribution is scaled by the weight stored under this edge data key.
+    :param default_weight: The weight of edges with no value stored under the weight key.
+    :param undirected: Whether to include undirected edges.
+    :param tolerance: Iteration stops once the total change in score, divided by the number of vertices, falls below
+        this value.
+    :param max_iterations: Iteration stops after this many rounds even if the scores have not converged.
+    :param store_key: If given, the centralities are also stored as vertex data under this key.
+    :return: A dictionary mapping each vertex ID to its centrality. The centralities have a Euclidean norm of 1.
+    """
+    _require_numpy()
+    graph_store = get_store(graph)
+    arrays = to_csr(graph_store, weight_key, default_weight, undirected)
+    size = len(arrays.vids)
+    if not size:
+        return {}
+
+    rows = _rows(arrays)
+    weights = numpy.ones(len(arrays.indices)) if arrays.weights is None else arrays.weights
+    scores = numpy.full(size, 1.0 / numpy.sqrt(size))
+    for _ in range(max_iterations):
+        new_scores = scores + numpy.bincount(arrays.indices, weights=scores[rows] * weights, minlength=size)
+        norm = numpy.linalg.norm(new_scores)
+        if norm == 0:
+            break
+        new_scores /= norm
+        change = numpy.abs(new_scores - scores).sum()
+        scores = new_scores
+        if change < size * tolerance:
+            break
+    return _results(graph_store, arrays, scores, store_key)
@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+
+"""
+Infrastructure shared by the graph algorithms: resolving graphs and vertices to the underlying store and IDs, choosing
+a neighbor iterator for a direction of travel, and compact per-vertex flags and counters for searches.
+"""
+
+
+import itertools
+from array import array
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+from vert.stores.base import GraphStore, VertexID
+
+
+__all__ = [
+    'OUT',
+    'IN',
+    'BOTH',
+    'VisitedSet',
+    'VertexCounters',
+    'get_store',
+    'get_vid',
+    'neighbor_function',
+    'weighted_neighbor_function',
+    'reverse_direction',
+]
+
+
+# The directions in which edges can be followed.
+OUT = 'out'
+IN = 'in'
+BOTH = 'both'
+
+# The largest number of integer IDs a VisitedSet will track with its bytearray, i.e. at most 16MB per set.
+DEFAULT_MAX_FLAG_COUNT = 1 << 24
+
+# The largest number of integer IDs a VertexCounters will track with its array, i.e. at most 256MB of 4-byte counters.
+DEFAULT_MAX_COUNTER_COUNT = 1 << 26
+
+
+def get_store(graph: Any) -> GraphStore:
+    """Return the graph store for a Graph or GraphStore."""
+    if isinstance(graph, GraphStore):
+        return graph
+    return graph.store
+
+
+def get_vid(vertex: Any) -> VertexID:
+    """Return the vertex ID for a Vertex or vertex ID."""
+    # Avoid importing vert.graphs here, so the algorithms can be used with nothing but a graph store.
+    return getattr(vertex, 'vid', vertex)
+
+
+def neighbor_function(graph_store: GraphStore, direction: str) -> Callable[[VertexID], Iterator[VertexID]]:
+    """
+    Return the graph store method that iterates over the IDs of a vertex's neighbors in the given direction: OUT
+    follows directed edges from source to sink, IN follows them from sink to source, and BOTH follows every edge,
+    including undirected ones, in either direction.
+    """
+    if direction == OUT:
+        return graph_store.iter_sinks
+    if direction == IN:
+        return graph_store.iter_sources
+    if direction == BOTH:
+        return graph_store.iter_neighbors
+    raise ValueError("Unknown direction: %r" % (direction,))
+
+
+def weighted_neighbor_function(graph_store: GraphStore, direction: str, key: Hashable,
+                               default: Any = None) -> Callable[[VertexID], Iterator[Tuple[VertexID, Any]]]:
+    """
+    Return a function that iterates over (neighbor ID, value) pairs for a vertex in the given direction, where value is
+    the data stored under the key in the edge leading to the neighbor, or the default if there is none. The directions
+    are the same as for neighbor_function(), and the adjacency and edge data are read together by the graph store.
+    """
+    if direction == OUT:
+        return lambda vid: graph_store.iter_outbound_data(vid, key, default)
+    if direction == IN:
+        return lambda vid: graph_store.iter_inbound_data(vid, key, default)
+    if direction == BOTH:
+        return lambda vid: itertools.chain(graph_store.iter_outbound_data(vid, key, default),
+                                           graph_store.iter_inbound_data(vid, key, default),
+                                           graph_store.iter_undirected_data(vid, key, default))
+    raise ValueError("Unknown direction: %r" % (direction,))
+
+
+def reverse_direction(direction: str) -> str:
+    """Return the direction that retraces edges followed in the given direction."""
+    if direction == OUT:
+        return IN
+    if direction == IN:
+        return OUT
+    if direction == BOTH:
+        return BOTH
+    raise ValueError("Unknown direction: %r" % (direction,))
+
+
+class VisitedSet:
+    """
+    A set of vertex IDs specialized for marking vertices as visited during a search. Non-negative integer IDs are
+    recorded as flags in a bytearray, one byte per ID, which for the dense integer IDs typical of large graphs is
+    about 30 times smaller and several times faster than a set. All other IDs, and integers beyond max_flag_count,
+    are kept in an ordinary set.
+    """
+
+    __slots__ = ('_flags', '_max_flag_count', '_others', '_count')
+
+    def __init__(self, size_hint: int = 0, max_flag_count: int = DEFAULT_MAX_FLAG_COUNT):
+        self._flags = bytearray(min(size_hint, max_flag_count))
+        self._max_flag_count = max_flag_count
+        self._others = set()  # type: Set[VertexID]
+        self._count = 0
+
+    def __contains__(self, vid: VertexID) -> bool:
+        if type(vid) is int and 0 <= vid < len(self._flags):
+            return bool(self._flags[vid])
+        return vid in self._others
+
+    def __len__(self) -> int:
+        return self._count + len(self._others)
+
+    def __iter__(self) -> Iterator[VertexID]:
+        for vid, flag in enumerate(self._flags):
+            if flag:
+                yield vid
+        yield from self._others
+
+    def _grow(self, vid: int) -> bool:
+        """Make room for the flag for this ID, returning False if it is too large to get one."""
+        if vid >= self._max_flag_count:
+            return False
+        flags = self._flags
+        flags.extend(bytes(min(max(vid + 1, 2 * len(flags)), self._max_flag_count) - len(flags)))
+        return True
+
+    def add(self, vid: VertexID) -> bool:
+        """Add the ID to the set. Return a Boolean indicating whether it was newly added."""
+        if type(vid) is int and vid >= 0:
+            flags = self._flags
+            if vid < len(flags) or self._grow(vid):
+                if flags[vid]:
+                    return False
+                flags[vid] = 1
+                self._count += 1
+                return True
+        if vid in self._others:
+            return False
+        self._others.add(vid)
+        return True
+
+    def add_new(self, vids: Iterable[VertexID], new: Optional[List[VertexID]] = None) -> List[VertexID]:
+        """
+        Add each ID to the set, returning a list of the ones that were newly added, in order. Searches should call this
+        once per vertex with all of its neighbors, rather than calling add() once per neighbor, since it avoids a method
+        call per edge.
+
+        :param vids: The IDs to add.
+        :param new: An optional list to append the new IDs to. If omitted, a new list is created.
+        :return: The list of newly added IDs.
+        """
+        if new is None:
+            new = []
+        flags = self._flags
+        size = len(flags)
+        added = 0
+        for vid in vids:
+            if type(vid) is int and 0 <= vid < size:
+                if not flags[vid]:
+                    flags[vid] = 1
+                    added += 1
+                    new.append(vid)
+            elif self.add(vid):
+                new.append(vid)
+                size = len(flags)
+        self._count += added
+        return new
+
+
+class VertexCounters:
+    """
+    A mapping from vertex IDs to non-negative integer counters, all starting at 0, specialized for algorithms that keep
+    a small number per vertex, such as an in-degree or a search state. Counters for non-negative integer IDs are stored
+    in an array of fixed-size integers, which for the dense integer IDs typical of large graphs is many times smaller
+    than a dictionary. All other IDs, and integers beyond max_count, are kept in an ordinary dictionary.
+    """
+
+    __slots__ = ('_counters', '_max_count', '_others')
+
+    def __init__(self, size_hint: int = 0, typecode: str = 'I', max_count: int = DEFAULT_MAX_COUNTER_COUNT):
+        """
+        :param size_hint: The expected number of vertices, used to preallocate the array.
+        :param typecode: The array module typecode of the counters, which determines their size and range.
+        :param max_count: The largest number of counters to keep in the array.
+        """
+        self._counters = array(typecode, bytes(array(typecode).itemsize * min(size_hint, max_count)))
+        self._max_count = max_count
+        self._others = {}  # type: Dict[VertexID, int]
+
+    def __getitem__(self, vid: VertexID) -> int:
+        if type(vid) is int and 0 <= vid < len(self._counters):
+            return self._counters[vid]
+        return self._others.get(vid, 0)
+
+    def __setitem__(self, vid: VertexID, value: int) -> None:
+        if type(vid) is int and vid >= 0:
+            counters = self._counters
+            if vid < len(counters) or self._grow(vid):
+                counters[vid] = value
+                return
+        if value:
+            self._others[vid] = value
+        else:
+            self._others.pop(vid, None)
+
+    def _grow(self, vid: int) -> bool:
+        """Make room for the counter for this ID, returning False if it is too large to get one."""
+        if vid >= self._max_count:
+            return False
+        counters = self._counters
+        counters.frombytes(bytes(counters.itemsize * (min(max(vid + 1, 2 * len(counters)), self._max_count) -
+                                                      len(counters))))
+        return True
+
+    def decrement(self, vid: VertexID) -> int:
+        """Subtract 1 from the counter for this ID, which must be positive, and return the new value."""
+        if type(vid) is int and 0 <= vid < len(self._counters):
+            value = self._counters[vid] - 1
+            self._counters[vid] = value
+            return value
+        value = self._others[vid] - 1
+        if value:
+            self._others[vid] = value
+        else:
+            del self._others[vid]
+        return value
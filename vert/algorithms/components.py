@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+
+"""
+Connected components: batch algorithms for connected, weakly connected, and strongly connected components, and an
+incrementally maintained union-find index, ComponentIndexGraphStore, which answers component queries in near-constant
+time for graphs that only grow.
+"""
+
+
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from vert.stores.base import GraphStore, VertexID, EdgeID, Label
+from vert.stores.wrapper import GraphStoreWrapper
+from vert.algorithms.common import BOTH, VisitedSet, get_store, neighbor_function
+
+
+__all__ = [
+    'connected_components',
+    'weakly_connected_components',
+    'strongly_connected_components',
+    'UnionFind',
+    'ComponentIndexGraphStore',
+]
+
+
+def connected_components(graph: Any) -> Iterator[Set[VertexID]]:
+    """
+    Yield the connected components of the graph, each as a set of vertex IDs. Edges are followed in both directions,
+    so for graphs with directed edges these are the weakly connected components.
+
+    :param graph: The Graph or GraphStore to search.
+    :return: An iterator over sets of vertex IDs.
+    """
+    graph_store = get_store(graph)
+    neighbors = neighbor_function(graph_store, BOTH)
+    visited = VisitedSet(graph_store.count_vertices())
+    for vid in graph_store.iter_vertices():
+        if not visited.add(vid):
+            continue
+        component = [vid]
+        frontier = [vid]
+        while frontier:
+            next_frontier = []  # type: List[VertexID]
+            for member in frontier:
+                visited.add_new(neighbors(member), next_frontier)
+            component.extend(next_frontier)
+            frontier = next_frontier
+        yield set(component)
+
+
+# Following every edge in both directions, as connected_components() does, is exactly what makes components weak.
+weakly_connected_components = connected_components
+
+
+def strongly_connected_components(graph: Any) -> Iterator[Set[VertexID]]:
+    """
+    Yield the strongly connected components of the graph, each as a set of vertex IDs, using an iterative form of
+    Tarjan's algorithm. Directed edges are followed from source to sink, and undirected edges in both directions.
+    Components are yielded in reverse topological order: no component has an edge leading to a component yielded
+    after it.
+
+    :param graph: The Graph or GraphStore to search.
+    :return: An iterator over sets of vertex IDs.
+    """
+    graph_store = get_store(graph)
+
+    def successors(vid: VertexID) -> Iterator[VertexID]:
+        yield from graph_store.iter_sinks(vid)
+        for eid in graph_store.iter_undirected(vid):
+            v1, v2 = eid.vertices
+            yield v2 if v1 == vid else v1
+
+    order = {}  # type: Dict[VertexID, int]
+    low_links = {}  # type: Dict[VertexID, int]
+    stack = []  # type: List[VertexID]
+    on_stack = set()  # type: Set[VertexID]
+    for root in graph_store.iter_vertices():
+        if root in order:
+            continue
+        order[root] = low_links[root] = len(order)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, successors(root))]  # type: List[Tuple[VertexID, Iterator[VertexID]]]
+        while work:
+            vid, remaining = work[-1]
+            for other in remaining:
+                if other not in order:
+                    order[other] = low_links[other] = len(order)
+                    stack.append(other)
+                    on_stack.add(other)
+                    work.append((other, successors(other)))
+                    break
+                if other in on_stack and order[other] < low_links[vid]:
+                    low_links[vid] = order[other]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low_links[vid] < low_links[parent]:
+                        low_links[parent] = low_links[vid]
+                if low_links[vid] == order[vid]:
+                    component = set()
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.add(member)
+                        if member == vid:
+                            break
+                    yield component
+
+
+class UnionFind:
+    """
+    A collection of disjoint sets of vertex IDs, using union by size and path halving, so that find() and union() take
+    nearly constant time. Each set's members are also kept in a circular linked list, so they can be listed without
+    scanning the others. IDs that have never been added or unioned are treated as sets of their own.
+    """
+
+    __slots__ = ('_parents', '_sizes', '_next', '_merges')
+
+    def __init__(self):
+        self._parents = {}  # type: Dict[VertexID, VertexID]
+        self._sizes = {}  # type: Dict[VertexID, int]
+        self._next = {}  # type: Dict[VertexID, VertexID]
+        self._merges = 0
+
+    def __contains__(self, vid: VertexID) -> bool:
+        return vid in self._parents
+
+    def __len__(self) -> int:
+        return len(self._parents)
+
+    @property
+    def merges(self) -> int:
+        """The number of times union() has joined two different sets."""
+        return self._merges
+
+    def add(self, vid: VertexID) -> None:
+        """Add the ID as a set of its own. If it has already been added, do nothing."""
+        if vid not in self._parents:
+            self._parents[vid] = vid
+            self._sizes[vid] = 1
+            self._next[vid] = vid
+
+    def find(self, vid: VertexID) -> VertexID:
+        """Return the representative ID of the set containing this ID."""
+        parents = self._parents
+        parent = parents.get(vid, vid)
+        while parent != vid:
+            grandparent = parents[parent]
+            parents[vid] = grandparent
+            vid = parent
+            parent = grandparent
+        return vid
+
+    def union(self, vid1: VertexID, vid2: VertexID) -> bool:
+        """Merge the sets containing the two IDs. Return a Boolean indicating whether they were in different sets."""
+        self.add(vid1)
+        self.add(vid2)
+        root1 = self.find(vid1)
+        root2 = self.find(vid2)
+        if root1 == root2:
+            return False
+        sizes = self._sizes
+        if sizes[root1] < sizes[root2]:
+            root1, root2 = root2, root1
+        self._parents[root2] = root1
+        sizes[root1] += sizes.pop(root2)
+        # Splice the two circular member lists together.
+        next_ids = self._next
+        next_ids[root1], next_ids[root2] = next_ids[root2], next_ids[root1]
+        self._merges += 1
+        return True
+
+    def same(self, vid1: VertexID, vid2: VertexID) -> bool:
+        """Return a Boolean indicating whether the two IDs are in the same set."""
+        return vid1 == vid2 or self.find(vid1) == self.find(vid2)
+
+    def size(self, vid: VertexID) -> int:
+        """Return the number of IDs in the set containing this ID."""
+        return self._sizes.get(self.find(vid), 1)
+
+    def iter_members(self, vid: VertexID) -> Iterator[VertexID]:
+        """Return an iterator over the IDs in the set containing this ID, including the ID itself."""
+        if vid not in self._next:
+            yield vid
+            return
+        member = vid
+        while True:
+            yield member
+            member = self._next[member]
+            if member == vid:
+                break
+
+
+class ComponentIndexGraphStore(GraphStoreWrapper):
+    """
+    A graph store wrapper which maintains a union-find index of the connected components of the wrapped graph store,
+    following edges in both directions. The index is built with a single pass over the edges the first time it is
+    needed, and from then on every edge added through the wrapper is merged into it as it is added, so component
+    queries take near-constant time. Removing a vertex or edge can split a component, which a union-find index cannot
+    express, so removals mark the index stale and it is rebuilt on the next query.
+
+    Graph.component_of() and Graph.same_component() use the index automatically when the graph's store provides it.
+    Changes made to the wrapped store directly, bypassing the wrapper, are not seen by the index.
+    """
+
+    def __init__(self, graph_store: GraphStore):
+        super().__init__(graph_store)
+        self._index = None  # type: Optional[UnionFind]
+
+    def _get_index(self) -> UnionFind:
+        """Return the index, building it if necessary."""
+        if self._index is None:
+            index = UnionFind()
+            for eid in self._graph_store.iter_edges():
+                index.union(*eid.vertices)
+            self._index = index
+        return self._index
+
+    def _merge(self, eids: Iterable[EdgeID]) -> None:
+        """Merge the endpoints of each edge in the index, if it has been built."""
+        index = self._index
+        if index is not None:
+            for eid in eids:
+                index.union(*eid.vertices)
+
+    def _removed(self, count: int) -> None:
+        """Mark the index stale if anything was removed."""
+        if count:
+            self._index = None
+
+    def component_of(self, vid: VertexID) -> Set[VertexID]:
+        """Return the set of IDs of the vertices in the same connected component as this vertex, including itself."""
+        return set(self._get_index().iter_members(vid))
+
+    def same_component(self, vid1: VertexID, vid2: VertexID) -> bool:
+        """Return a Boolean indicating whether the two vertices are in the same connected component."""
+        return self._get_index().same(vid1, vid2)
+
+    def count_components(self) -> int:
+        """Return the number of connected components in the graph."""
+        return self._graph_store.count_vertices() - self._get_index().merges
+
+    def add_edge(self, eid: EdgeID) -> None:
+        """
+        Add an edge to the graph associated with this ID. If an edge with the given ID already exists, do nothing. If
+        either the source or sink vertex of the edge does not exist, add it first.
+        """
+        self._graph_store.add_edge(eid)
+        self._merge((eid,))
+
+    def add_edges(self, eids: Iterable[EdgeID]) -> None:
+        """
+        Add an edge to the graph for each of these IDs, skipping those that already exist, and adding any missing
+        vertices first.
+        """
+        eids = list(eids)
+        self._graph_store.add_edges(eids)
+        self._merge(eids)
+
+    def add_edge_label(self, eid: EdgeID, label: Label) -> None:
+        """Add a label to the edge. If the edge already has the label, do nothing."""
+        self._graph_store.add_edge_label(eid, label)
+        self._merge((eid,))
+
+    def set_edge_data(self, eid: EdgeID, key: Hashable, value: Any) -> None:
+        """Store a value in the edge for this key."""
+        self._graph_store.set_edge_data(eid, key, value)
+        self._merge((eid,))
+
+    def set_edge_data_many(self, items: Iterable[Tuple[EdgeID, Mapping[Hashable, Any]]]) -> None:
+        """
+        For each (edge ID, mapping) pair, store every key/value pair of the mapping in the edge, adding the edge first
+        if it doesn't exist.
+        """
+        items = list(items)
+        self._graph_store.set_edge_data_many(items)
+        self._merge(eid for eid, _ in items)
+
+    def add_edge_labels_many(self, items: Iterable[Tuple[EdgeID, Iterable[Label]]]) -> None:
+        """
+        For each (edge ID, labels) pair, add every one of the labels to the edge, adding the edge first if it doesn't
+        exist.
+        """
+        items = list(items)
+        self._graph_store.add_edge_labels_many(items)
+        self._merge(eid for eid, _ in items)
+
+    def discard_vertex(self, vid: VertexID) -> bool:
+        """
+        Remove the vertex associated with this ID from the graph. If such a vertex does not exist, do nothing. Any
+        incident edges to the vertex are also removed. Return a Boolean indicating whether the vertex was present to be
+        removed.
+        """
+        removed = self._graph_store.discard_vertex(vid)
+        self._removed(removed)
+        return removed
+
+    def discard_edge(self, eid: EdgeID, ignore: Optional[VertexID] = None) -> bool:
+        """
+        Remove the edge associated with this ID from the graph. If such an edge does not exist, do nothing. The source
+        and sink vertex are not removed. Return a Boolean indicating whether the edge was present to be removed.
+        """
+        removed = self._graph_store.discard_edge(eid, ignore)
+        self._removed(removed)
+        return removed
+
+    def discard_vertices(self, vids: Iterable[VertexID]) -> int:
+        """
+        Remove the vertices associated with these IDs from the graph, along with their incident edges. IDs with no
+        associated vertex are ignored. Return the number of vertices that were removed.
+        """
+        removed = self._graph_store.discard_vertices(vids)
+        self._removed(removed)
+        return removed
+
+    def discard_edges(self, eids: Iterable[EdgeID]) -> int:
+        """
+        Remove the edges associated with these IDs from the graph. IDs with no associated edge are ignored. Return the
+        number of edges that were removed.
+        """
+        removed = self._graph_store.discard_edges(eids)
+        self._removed(removed)
+        return removed
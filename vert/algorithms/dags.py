@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+
+"""
+Topological ordering and cycle detection for directed graphs. Only directed edges are considered; undirected edges are
+ignored. Both Kahn's algorithm and depth-first search are provided, each fully iterative, so neither is limited by
+Python's recursion limit, and per-vertex state is kept in compact VertexCounters arrays, so that graphs far larger than
+a dictionary of their vertices could hold can be ordered straight from a persistent graph store.
+"""
+
+
+from collections import deque
+from typing import Any, Iterator, List, Optional
+
+from vert.stores.base import GraphStore, VertexID
+from vert.algorithms.common import VertexCounters, get_store
+
+
+__all__ = [
+    'KAHN',
+    'DFS',
+    'topological_sort',
+    'find_cycle',
+    'is_dag',
+]
+
+
+# The methods topological_sort() can use.
+KAHN = 'kahn'
+DFS = 'dfs'
+
+# The search states of vertices during a depth-first search.
+_UNSEEN = 0
+_ACTIVE = 1
+_FINISHED = 2
+
+
+def _kahn(graph_store: GraphStore) -> Iterator[VertexID]:
+    """Yield the vertex IDs in topological order using Kahn's algorithm."""
+    in_degrees = VertexCounters(graph_store.count_vertices())
+    ready = deque()
+    for vid in graph_store.iter_vertices():
+        in_degree = graph_store.count_inbound(vid)
+        if in_degree:
+            in_degrees[vid] = in_degree
+        else:
+            ready.append(vid)
+
+    total = 0
+    while ready:
+        vid = ready.popleft()
+        total += 1
+        yield vid
+        for sink in graph_store.iter_sinks(vid):
+            if not in_degrees.decrement(sink):
+                ready.append(sink)
+
+    if total < graph_store.count_vertices():
+        # Vertices on a cycle never have their in-degrees reduced to 0.
+        raise ValueError("The graph contains a cycle.")
+
+
+def _dfs(graph_store: GraphStore, postorder: Optional[List[VertexID]]) -> Optional[List[VertexID]]:
+    """
+    Search the graph depth-first along directed edges, appending each vertex ID to the postorder list, if one is given,
+    once all its descendants have been finished. Stop at the first cycle found, returning its vertex IDs in order, or
+    return None if there are no cycles.
+    """
+    states = VertexCounters(graph_store.count_vertices(), 'B')
+    for root in graph_store.iter_vertices():
+        if states[root]:
+            continue
+        states[root] = _ACTIVE
+        path = [root]
+        stack = [graph_store.iter_sinks(root)]
+        while stack:
+            for other in stack[-1]:
+                state = states[other]
+                if state == _UNSEEN:
+                    states[other] = _ACTIVE
+                    path.append(other)
+                    stack.append(graph_store.iter_sinks(other))
+                    break
+                if state == _ACTIVE:
+                    # The edge leads back to a vertex on the current path, closing a cycle.
+                    return path[path.index(other):]
+            else:
+                stack.pop()
+                vid = path.pop()
+                states[vid] = _FINISHED
+                if postorder is not None:
+                    postorder.append(vid)
+    return None
+
+
+def topological_sort(graph: Any, method: str = KAHN) -> Iterator[VertexID]:
+    """
+    Yield the vertex IDs of the graph in topological order, so that the source of every directed edge comes before its
+    sink.
+
+    With the KAHN method, vertices are yielded as they are ordered, and only a counter per vertex and the queue of
+    vertices ready to be yielded are held in memory. If the graph contains a cycle, ValueError is raised once every
+    vertex that is neither on nor downstream of a cycle has been yielded.
+
+    With the DFS method, the graph is searched depth-first and the vertices are yielded in reverse postorder, which
+    means the whole order is held in memory and nothing is yielded until the search is complete. If the graph contains
+    a cycle, ValueError is raised before anything is yielded.
+
+    :param graph: The Graph or GraphStore to order.
+    :param method: KAHN or DFS.
+    :return: An iterator over vertex IDs.
+    """
+    graph_store = get_store(graph)
+    if method == KAHN:
+        return _kahn(graph_store)
+    if method == DFS:
+        postorder = []  # type: List[VertexID]
+        if _dfs(graph_store, postorder) is not None:
+            raise ValueError("The graph contains a cycle.")
+        return reversed(postorder)
+    raise ValueError("Unknown method: %r" % (method,))
+
+
+def find_cycle(graph: Any) -> Optional[List[VertexID]]:
+    """
+    Find a cycle of directed edges in the graph with a depth-first search.
+
+    :param graph: The Graph or GraphStore to search.
+    :return: The vertex IDs of the cycle, in order, with an edge leading from each to the next and from the last back
+        to the first, or None if the graph has no cycles.
+    """
+    return _dfs(get_store(graph), None)
+
+
+def is_dag(graph: Any) -> bool:
+    """
+    Return a Boolean indicating whether the graph is a directed acyclic graph, i.e. has no cycles of directed edges.
+
+    :param graph: The Graph or GraphStore to check.
+    """
+    return find_cycle(graph) is None
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+
+"""
+Weighted shortest paths: Dijkstra's algorithm, bidirectional Dijkstra, and A*. Edge weights are read from the edge
+data under a weight key, using the graph store's iter_*_data() methods so that each vertex's adjacency and weights are
+fetched together. Weights must be non-negative numbers.
+"""
+
+
+import heapq
+import itertools
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+from vert.stores.base import VertexID
+from vert.algorithms.common import OUT, get_store, get_vid, reverse_direction, weighted_neighbor_function
+
+
+__all__ = [
+    'WeightedPath',
+    'dijkstra',
+    'bidirectional_dijkstra',
+    'astar',
+    'shortest_path',
+]
+
+
+WeightedPath = NamedTuple('WeightedPath', [('cost', float), ('vids', List[VertexID])])
+WeightedPath.__doc__ = """
+A path through the graph, as the list of vertex IDs it visits from start to end, together with its total weight.
+"""
+
+
+INFINITY = float('inf')
+
+
+def _trace(predecessors: Dict[VertexID, Optional[VertexID]], end: VertexID) -> List[VertexID]:
+    """Follow the predecessors back from the end, returning the path in reverse order."""
+    path = [end]
+    vid = predecessors[end]
+    while vid is not None:
+        path.append(vid)
+        vid = predecessors[vid]
+    return path
+
+
+def dijkstra(graph: Any, source: Any, weight_key: Hashable = 'weight', default_weight: float = 1.0,
+             direction: str = OUT, target: Any = None,
+             cutoff: Optional[float] = None) -> Tuple[Dict[VertexID, float], Dict[VertexID, Optional[VertexID]]]:
+    """
+    Find the least total weight from the source to every reachable vertex with Dijkstra's algorithm.
+
+    :param graph: The Graph or GraphStore to search.
+    :param source: The vertex or vertex ID to start from.
+    :param weight_key: The edge data key the weights are stored under.
+    :param default_weight: The weight of edges with no value stored under the weight key.
+    :param direction: Which way to follow edges: OUT, IN, or BOTH.
+    :param target: If given, the search stops as soon as the distance to this vertex is known.
+    :param cutoff: If given, vertices further than this from the source are not explored.
+    :return: A pair of dictionaries, (distances, predecessors), for each vertex whose distance was settled. The
+        predecessor of a vertex is the previous vertex on a shortest path to it, or None for the source.
+    """
+    edges = weighted_neighbor_function(get_store(graph), direction, weight_key)
+    source = get_vid(source)
+    if target is not None:
+        target = get_vid(target)
+
+    distances = {}  # type: Dict[VertexID, float]
+    predecessors = {}  # type: Dict[VertexID, Optional[VertexID]]
+    tentative = {source: 0}
+    tentative_predecessors = {source: None}  # type: Dict[VertexID, Optional[VertexID]]
+    # The counter breaks ties, so the vertex IDs themselves are never compared.
+    counter = itertools.count()
+    heap = [(0, next(counter), source)]
+    while heap:
+        distance, _, vid = heapq.heappop(heap)
+        if vid in distances:
+            continue
+        distances[vid] = distance
+        predecessors[vid] = tentative_predecessors[vid]
+        if vid == target:
+            break
+        for other, weight in edges(vid):
+            if other in distances:
+                continue
+            if weight is None:
+                weight = default_weight
+            elif weight < 0:
+                raise ValueError("Negative edge weight: %r" % (weight,))
+            other_distance = distance + weight
+            if cutoff is not None and other_distance > cutoff:
+                continue
+            if other_distance < tentative.get(other, INFINITY):
+                tentative[other] = other_distance
+                tentative_predecessors[other] = vid
+                heapq.heappush(heap, (other_distance, next(counter), other))
+    return distances, predecessors
+
+
+def bidirectional_dijkstra(graph: Any, source: Any, target: Any, weight_key: Hashable = 'weight',
+                           default_weight: float = 1.0, direction: str = OUT) -> Optional[WeightedPath]:
+    """
+    Find a least-weight path from the source to the target by running Dijkstra's algorithm forward from the source and
+    backward from the target at the same time, stopping once the two searches prove that no shorter path exists. This
+    typically settles far fewer vertices than a one-sided search.
+
+    :param graph: The Graph or GraphStore to search.
+    :param source: The vertex or vertex ID the path starts at.
+    :param target: The vertex or vertex ID the path ends at.
+    :param weight_key: The edge data key the weights are stored under.
+    :param default_weight: The weight of edges with no value stored under the weight key.
+    :param direction: Which way to follow edges: OUT, IN, or BOTH.
+    :return: The path, or None if the target cannot be reached.
+    """
+    graph_store = get_store(graph)
+    source = get_vid(source)
+    target = get_vid(target)
+    if source == target:
+        return WeightedPath(0, [source])
+
+    # Index 0 is the forward search from the source; index 1 is the backward search from the target.
+    edges = (weighted_neighbor_function(graph_store, direction, weight_key),
+             weighted_neighbor_function(graph_store, reverse_direction(direction), weight_key))
+    settled = (set(), set())
+    tentative = ({source: 0}, {target: 0})
+    predecessors = ({source: None}, {target: None})  # type: Tuple[Dict[VertexID, Optional[VertexID]], ...]
+    counter = itertools.count()
+    heaps = ([(0, next(counter), source)], [(0, next(counter), target)])
+
+    best = INFINITY
+    meeting_point = None
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        distance, _, vid = heapq.heappop(heaps[side])
+        if vid in settled[side]:
+            continue
+        settled[side].add(vid)
+        this_tentative = tentative[side]
+        other_tentative = tentative[1 - side]
+        for other, weight in edges[side](vid):
+            if other in settled[side]:
+                continue
+            if weight is None:
+                weight = default_weight
+            elif weight < 0:
+                raise ValueError("Negative edge weight: %r" % (weight,))
+            other_distance = distance + weight
+            if other_distance < this_tentative.get(other, INFINITY):
+                this_tentative[other] = other_distance
+                predecessors[side][other] = vid
+                heapq.heappush(heaps[side], (other_distance, next(counter), other))
+                if other in other_tentative and other_distance + other_tentative[other] < best:
+                    best = other_distance + other_tentative[other]
+                    meeting_point = other
+
+    if meeting_point is None:
+        return None
+    path = _trace(predecessors[0], meeting_point)
+    path.reverse()
+    path.extend(_trace(predecessors[1], meeting_point)[1:])
+    return WeightedPath(best, path)
+
+
+def astar(graph: Any, source: Any, target: Any, heuristic: Callable[[VertexID, VertexID], float],
+          weight_key: Hashable = 'weight', default_weight: float = 1.0,
+          direction: str = OUT) -> Optional[WeightedPath]:
+    """
+    Find a least-weight path from the source to the target with the A* algorithm, which uses a heuristic estimate of the
+    remaining distance to explore the most promising vertices first.
+
+    :param graph: The Graph or GraphStore to search.
+    :param source: The vertex or vertex ID the path starts at.
+    :param target: The vertex or vertex ID the path ends at.
+    :param heuristic: A function called as heuristic(vid, target_vid), returning an estimate of the least weight of a
+        path between them. It must never overestimate, or the path found may not be the shortest one, and it should be
+        consistent (obey the triangle inequality), or the search may settle vertices too early.
+    :param weight_key: The edge data key the weights are stored under.
+    :param default_weight: The weight of edges with no value stored under the weight key.
+    :param direction: Which way to follow edges: OUT, IN, or BOTH.
+    :return: The path, or None if the target cannot be reached.
+    """
+    edges = weighted_neighbor_function(get_store(graph), direction, weight_key)
+    source = get_vid(source)
+    target = get_vid(target)
+
+    settled = set()
+    tentative = {source: 0}
+    predecessors = {source: None}  # type: Dict[VertexID, Optional[VertexID]]
+    counter = itertools.count()
+    heap = [(heuristic(source, target), next(counter), source)]
+    while heap:
+        _, _, vid = heapq.heappop(heap)
+        if vid in settled:
+            continue
+        if vid == target:
+            path = _trace(predecessors, target)
+            path.reverse()
+            return WeightedPath(tentative[target], path)
+        settled.add(vid)
+        distance = tentative[vid]
+        for other, weight in edges(vid):
+            if other in settled:
+                continue
+            if weight is None:
+                weight = default_weight
+            elif weight < 0:
+                raise ValueError("Negative edge weight: %r" % (weight,))
+            other_distance = distance + weight
+            if other_distance < tentative.get(other, INFINITY):
+                tentative[other] = other_distance
+                predecessors[other] = vid
+                heapq.heappush(heap, (other_distance + heuristic(other, target), next(counter), other))
+    return None
+
+
+def shortest_path(graph: Any, source: Any, target: Any, weight_key: Hashable = 'weight', default_weight: float = 1.0,
+                  direction: str = OUT,
+                  heuristic: Optional[Callable[[VertexID, VertexID], float]] = None) -> Optional[WeightedPath]:
+    """
+    Find a least-weight path from the source to the target. If a heuristic is given, A* is used; otherwise
+    bidirectional Dijkstra is. See astar() and bidirectional_dijkstra() for the meaning of the arguments.
+
+    :return: The path, or None if the target cannot be reached.
+    """
+    if heuristic is None:
+        return bidirectional_dijkstra(graph, source, target, weight_key, default_weight, direction)
+    return astar(graph, source, target, heuristic, weight_key, default_weight, direction)
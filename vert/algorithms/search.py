@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+
+"""
+Breadth-first and depth-first search, k-hop neighborhoods, and level-synchronous frontier expansion. Every function
+accepts either a Graph or a GraphStore, and works entirely in terms of vertex IDs, walking the graph with the store's
+neighbor ID iterators. None of them may be used while the graph is being modified.
+"""
+
+
+from typing import Any, Iterable, Iterator, List, Optional, Set, Tuple
+
+from vert.stores.base import VertexID
+from vert.algorithms.common import OUT, VisitedSet, get_store, get_vid, neighbor_function
+
+
+__all__ = [
+    'bfs',
+    'dfs',
+    'bfs_frontiers',
+    'k_hop_neighborhood',
+]
+
+
+def bfs(graph: Any, start: Any, direction: str = OUT,
+        max_depth: Optional[int] = None) -> Iterator[Tuple[VertexID, int]]:
+    """
+    Search the graph breadth-first, yielding each reachable vertex ID along with its distance, in hops, from the start.
+    Vertices are yielded as soon as they are discovered, so the search can be abandoned part way through at no extra
+    cost.
+
+    :param graph: The Graph or GraphStore to search.
+    :param start: The vertex or vertex ID to start from. It is yielded first, with a distance of 0.
+    :param direction: Which way to follow edges: OUT, IN, or BOTH.
+    :param max_depth: If given, the search does not go further than this many hops from the start.
+    :return: An iterator over (vertex ID, distance) pairs.
+    """
+    graph_store = get_store(graph)
+    neighbors = neighbor_function(graph_store, direction)
+    start = get_vid(start)
+    visited = VisitedSet(graph_store.count_vertices())
+    visited.add(start)
+    yield start, 0
+
+    frontier = [start]
+    depth = 0
+    while frontier and (max_depth is None or depth < max_depth):
+        depth += 1
+        next_frontier = []
+        for vid in frontier:
+            for other in visited.add_new(neighbors(vid)):
+                next_frontier.append(other)
+                yield other, depth
+        frontier = next_frontier
+
+
+def dfs(graph: Any, start: Any, direction: str = OUT, max_depth: Optional[int] = None) -> Iterator[VertexID]:
+    """
+    Search the graph depth-first, yielding each reachable vertex ID in preorder. The search uses an explicit stack, so
+    it is not limited by Python's recursion limit.
+
+    :param graph: The Graph or GraphStore to search.
+    :param start: The vertex or vertex ID to start from. It is yielded first.
+    :param direction: Which way to follow edges: OUT, IN, or BOTH.
+    :param max_depth: If given, the search does not go further than this many hops from the start.
+    :return: An iterator over vertex IDs.
+    """
+    graph_store = get_store(graph)
+    neighbors = neighbor_function(graph_store, direction)
+    start = get_vid(start)
+    visited = VisitedSet(graph_store.count_vertices())
+    visited.add(start)
+    yield start
+
+    if max_depth is not None and max_depth < 1:
+        return
+    stack = [neighbors(start)]
+    while stack:
+        for other in stack[-1]:
+            if visited.add(other):
+                yield other
+                if max_depth is None or len(stack) < max_depth:
+                    stack.append(neighbors(other))
+                break
+        else:
+            stack.pop()
+
+
+def bfs_frontiers(graph: Any, sources: Iterable[Any], direction: str = OUT,
+                  max_depth: Optional[int] = None) -> Iterator[List[VertexID]]:
+    """
+    Expand outward from a set of source vertices one level at a time, yielding each frontier as a list of vertex IDs.
+    The first frontier holds the sources themselves, and frontier n holds the vertices first reached after n hops. This
+    is the level-synchronous form of breadth-first search, suited to algorithms that process a whole level at once.
+
+    :param graph: The Graph or GraphStore to search.
+    :param sources: The vertices or vertex IDs to start from.
+    :param direction: Which way to follow edges: OUT, IN, or BOTH.
+    :param max_depth: If given, no frontiers are yielded beyond this many hops from the sources.
+    :return: An iterator over lists of vertex IDs.
+    """
+    graph_store = get_store(graph)
+    neighbors = neighbor_function(graph_store, direction)
+    visited = VisitedSet(graph_store.count_vertices())
+    frontier = visited.add_new(get_vid(source) for source in sources)
+
+    depth = 0
+    while frontier:
+        yield frontier
+        if max_depth is not None and depth >= max_depth:
+            break
+        depth += 1
+        next_frontier = []  # type: List[VertexID]
+        for vid in frontier:
+            visited.add_new(neighbors(vid), next_frontier)
+        frontier = next_frontier
+
+
+def k_hop_neighborhood(graph: Any, start: Any, k: int, direction: str = OUT) -> Set[VertexID]:
+    """
+    Return the IDs of every vertex that can be reached from the start in at least 1 and at most k hops. The start
+    itself is not included.
+
+    :param graph: The Graph or GraphStore to search.
+    :param start: The vertex or vertex ID at the center of the neighborhood.
+    :param k: The maximum number of hops.
+    :param direction: Which way to follow edges: OUT, IN, or BOTH.
+    :return: The set of vertex IDs in the neighborhood.
+    """
+    if k < 0:
+        raise ValueError(k)
+    result = set()
+    for frontier in bfs_frontiers(graph, [start], direction, k):
+        result.update(frontier)
+    result.discard(get_vid(start))
+    return result
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+
+"""
+Triangle counting and clustering coefficients. Edge directions are ignored, as are self-loops and parallel edges, so
+two vertices are neighbors if any edge connects them. The graph store is read once, into a compact snapshot in which
+vertices are numbered by degree and each vertex keeps only its higher-numbered neighbors. Every triangle is then found
+exactly once, by intersecting the neighbor sets at the ends of each edge, and no vertex's neighbor set is larger than
+the square root of twice the number of edges. Counting can optionally be split across worker processes.
+"""
+
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, FrozenSet, Hashable, List, Optional, Sequence, Tuple
+
+from vert.stores.base import GraphStore, VertexID
+from vert.algorithms.common import get_store
+
+
+__all__ = [
+    'triangles',
+    'count_triangles',
+    'clustering',
+    'average_clustering',
+    'global_clustering',
+]
+
+
+# The neighbor sets of the snapshot being counted by a worker process, set by _init_worker().
+_worker_forward = None  # type: Optional[List[FrozenSet[int]]]
+
+
+def _snapshot(graph_store: GraphStore) -> Tuple[List[VertexID], List[int], List[FrozenSet[int]]]:
+    """
+    Read the graph into a compact snapshot. Return a tuple (vids, degrees, forward), where vids lists the vertex IDs in
+    order of increasing degree, degrees gives the number of distinct neighbors of each, and forward gives the indices
+    of each vertex's neighbors that come after it in the list.
+    """
+    vids = list(graph_store.iter_vertices())
+    index = {vid: i for i, vid in enumerate(vids)}
+    adjacency = [{index[other] for other in graph_store.iter_neighbors(vid) if other != vid} for vid in vids]
+    order = sorted(range(len(vids)), key=lambda i: len(adjacency[i]))
+    rank = [0] * len(vids)
+    for position, i in enumerate(order):
+        rank[i] = position
+    forward = [frozenset(rank[j] for j in adjacency[i] if rank[j] > position) for position, i in enumerate(order)]
+    return [vids[i] for i in order], [len(adjacency[i]) for i in order], forward
+
+
+def _count(forward: Sequence[FrozenSet[int]], start: int, step: int) -> array:
+    """Count the triangles at each vertex that are found from the vertices start, start + step, start + 2 * step..."""
+    counts = array('q', bytes(8 * len(forward)))
+    for u in range(start, len(forward), step):
+        forward_u = forward[u]
+        for v in forward_u:
+            common = forward_u & forward[v]
+            if common:
+                found = len(common)
+                counts[u] += found
+                counts[v] += found
+                for w in common:
+                    counts[w] += 1
+    return counts
+
+
+def _init_worker(forward: List[FrozenSet[int]]) -> None:
+    """Receive the snapshot in a worker process, so it is sent once per worker rather than once per task."""
+    global _worker_forward
+    _worker_forward = forward
+
+
+def _count_in_worker(start: int, step: int) -> array:
+    """Run _count() in a worker process, against the snapshot received by _init_worker()."""
+    return _count(_worker_forward, start, step)
+
+
+def _triangle_counts(graph: Any, processes: Optional[int]) -> Tuple[GraphStore, List[VertexID], List[int], array]:
+    """Snapshot the graph and count the triangles at each vertex, returning (graph_store, vids, degrees, counts)."""
+    graph_store = get_store(graph)
+    vids, degrees, forward = _snapshot(graph_store)
+    if processes is None or processes <= 1 or len(vids) < 2:
+        return graph_store, vids, degrees, _count(forward, 0, 1)
+    # Interleaving the vertices, rather than handing each task a contiguous block, spreads the high degree vertices
+    # at the end of the ordering evenly across the tasks.
+    step = 4 * processes
+    counts = array('q', bytes(8 * len(vids)))
+    with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(forward,)) as executor:
+        for partial in executor.map(_count_in_worker, range(step), [step] * step):
+            for i, count in enumerate(partial):
+                if count:
+                    counts[i] += count
+    return graph_store, vids, degrees, counts
+
+
+def triangles(graph: Any, processes: Optional[int] = None) -> Dict[VertexID, int]:
+    """
+    Count the triangles each vertex belongs to.
+
+    :param graph: The Graph or GraphStore to search.
+    :param processes: If greater than 1, the counting is split across this many worker processes.
+    :return: A dictionary mapping each vertex ID to the number of triangles it belongs to.
+    """
+    _, vids, _, counts = _triangle_counts(graph, processes)
+    return dict(zip(vids, counts))
+
+
+def count_triangles(graph: Any, processes: Optional[int] = None) -> int:
+    """
+    Count the triangles in the graph.
+
+    :param graph: The Graph or GraphStore to search.
+    :param processes: If greater than 1, the counting is split across this many worker processes.
+    :return: The number of triangles.
+    """
+    _, _, _, counts = _triangle_counts(graph, processes)
+    # Each triangle is counted once at each of its three vertices.
+    return sum(counts) // 3
+
+
+def clustering(graph: Any, processes: Optional[int] = None,
+               store_key: Optional[Hashable] = None) -> Dict[VertexID, float]:
+    """
+    Compute the local clustering coefficient of every vertex: the fraction of pairs of its neighbors that are
+    themselves neighbors. Vertices with fewer than two neighbors have a coefficient of 0.
+
+    :param graph: The Graph or GraphStore to measure.
+    :param processes: If greater than 1, the triangle counting is split across this many worker processes.
+    :param store_key: If given, the coefficients are also stored as vertex data under this key.
+    :return: A dictionary mapping each vertex ID to its clustering coefficient.
+    """
+    graph_store, vids, degrees, counts = _triangle_counts(graph, processes)
+    results = {vid: (2.0 * count / (degree * (degree - 1)) if degree > 1 else 0.0)
+               for vid, degree, count in zip(vids, degrees, counts)}
+    if store_key is not None:
+        graph_store.set_vertex_data_many((vid, {store_key: value}) for vid, value in results.items())
+    return results
+
+
+def average_clustering(graph: Any, processes: Optional[int] = None) -> float:
+    """
+    Compute the mean of the local clustering coefficients of all the vertices, or 0 if the graph has no vertices.
+
+    :param graph: The Graph or GraphStore to measure.
+    :param processes: If greater than 1, the triangle counting is split across this many worker processes.
+    :return: The average clustering coefficient.
+    """
+    coefficients = clustering(graph, processes)
+    return sum(coefficients.values()) / len(coefficients) if coefficients else 0.0
+
+
+def global_clustering(graph: Any, processes: Optional[int] = None) -> float:
+    """
+    Compute the global clustering coefficient (also called the transitivity) of the graph: the fraction of paths of
+    length two whose ends are neighbors, or 0 if there are no such paths.
+
+    :param graph: The Graph or GraphStore to measure.
+    :param processes: If greater than 1, the triangle counting is split across this many worker processes.
+    :return: The global clustering coefficient.
+    """
+    _, _, degrees, counts = _triangle_counts(graph, processes)
+    paths = sum(degree * (degree - 1) for degree in degrees) // 2
+    # Each triangle closes three paths of length two, one centered at each of its vertices.
+    return sum(counts) / paths if paths else 0.0
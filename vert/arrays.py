@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+
+"""
+Export of graphs to compressed sparse row (CSR) arrays, for use with NumPy and SciPy. NumPy is required to use this
+module; SciPy is only required for to_scipy_sparse().
+"""
+
+
+from typing import Any, Dict, Hashable, Iterator, List, NamedTuple, Optional, Tuple
+
+from vert.stores.base import GraphStore, VertexID, EdgeID
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import scipy.sparse
+except ImportError:
+    scipy = None
+
+
+__all__ = [
+    'CSRArrays',
+    'to_csr',
+    'to_scipy_sparse',
+]
+
+
+CSRArrays = NamedTuple('CSRArrays', [('indptr', Any), ('indices', Any), ('weights', Any), ('vids', List[VertexID]),
+                                     ('index', Dict[VertexID, int])])
+CSRArrays.__doc__ = """
+The adjacency structure of a graph in compressed sparse row form. Row i of the matrix corresponds to the vertex
+vids[i], and the columns of its nonzero entries are indices[indptr[i]:indptr[i + 1]]. The weights array, if present,
+runs parallel to indices. The index dictionary is the inverse of vids, mapping each vertex ID to its row.
+"""
+
+
+def _get_store(graph: Any) -> GraphStore:
+    """Return the graph store for a graph or graph store."""
+    if isinstance(graph, GraphStore):
+        return graph
+    return graph.store
+
+
+def _iter_adjacent(store: GraphStore, vid: VertexID, undirected: bool) -> Iterator[Tuple[VertexID, EdgeID]]:
+    """Yield each vertex adjacent to this one together with the connecting edge, in the same order every time."""
+    for eid in store.iter_outbound(vid):
+        yield eid.sink, eid
+    if undirected:
+        for eid in store.iter_undirected(vid):
+            v1, v2 = eid.vertices
+            yield (v2 if v1 == vid else v1), eid
+
+
+def _iter_adjacent_ids(store: GraphStore, vid: VertexID, undirected: bool) -> Iterator[VertexID]:
+    """Yield each vertex adjacent to this one, in the same order as _iter_adjacent()."""
+    yield from store.iter_sinks(vid)
+    if undirected:
+        for eid in store.iter_undirected(vid):
+            v1, v2 = eid.vertices
+            yield v2 if v1 == vid else v1
+
+
+def to_csr(graph: Any, weight_key: Optional[Hashable] = None, default_weight: float = 1.0,
+           undirected: bool = True) -> CSRArrays:
+    """
+    Export the adjacency structure of a graph to CSR arrays. Directed edges appear in the row of their source, and
+    undirected edges appear in the rows of both of their vertices. The graph must not be modified while the export is
+    in progress.
+
+    The vertex degrees are read first, so the arrays can be allocated at their final size and filled directly from the
+    store's iterators, without building any intermediate lists of edges.
+
+    :param graph: The Graph or GraphStore to export.
+    :param weight_key: The edge data key to read the weights from. If None, no weights are exported.
+    :param default_weight: The weight used for edges that have no value stored under the weight key.
+    :param undirected: Whether to include undirected edges.
+    :return: The CSR arrays, along with the mapping between vertex IDs and rows.
+    """
+    if numpy is None:
+        raise ImportError("NumPy is required for CSR export.")
+
+    store = _get_store(graph)
+
+    vids = list(store.iter_vertices())
+    index = {vid: row for row, vid in enumerate(vids)}
+    vertex_count = len(vids)
+
+    if undirected:
+        degrees = (store.count_outbound(vid) + store.count_undirected(vid) for vid in vids)
+    else:
+        degrees = (store.count_outbound(vid) for vid in vids)
+    indptr = numpy.zeros(vertex_count + 1, dtype=numpy.int64)
+    indptr[1:] = numpy.fromiter(degrees, dtype=numpy.int64, count=vertex_count)
+    numpy.cumsum(indptr, out=indptr)
+    edge_count = int(indptr[-1])
+
+    index_dtype = numpy.int32 if vertex_count < 2 ** 31 else numpy.int64
+    indices = numpy.fromiter((index[other] for vid in vids for other in _iter_adjacent_ids(store, vid, undirected)),
+                             dtype=index_dtype, count=edge_count)
+
+    if weight_key is None:
+        weights = None
+    else:
+        def iter_weights():
+            for vid in vids:
+                for _, eid in _iter_adjacent(store, vid, undirected):
+                    weight = store.get_edge_data(eid, weight_key)
+                    yield default_weight if weight is None else weight
+        weights = numpy.fromiter(iter_weights(), dtype=numpy.float64, count=edge_count)
+
+    return CSRArrays(indptr, indices, weights, vids, index)
+
+
+def to_scipy_sparse(graph: Any, weight_key: Optional[Hashable] = None, default_weight: float = 1.0,
+                    undirected: bool = True) -> Tuple[Any, List[VertexID], Dict[VertexID, int]]:
+    """
+    Export the adjacency matrix of a graph as a scipy.sparse.csr_matrix. The arguments are the same as for to_csr().
+    If no weight key is given, every edge has a weight of 1.
+
+    :return: A tuple (matrix, vids, index), where vids maps rows/columns to vertex IDs and index is its inverse.
+    """
+    if scipy is None:
+        raise ImportError("SciPy is required for sparse matrix export.")
+    arrays = to_csr(graph, weight_key, default_weight, undirected)
+    if arrays.weights is None:
+        data = numpy.ones(len(arrays.indices), dtype=numpy.float64)
+    else:
+        data = arrays.weights
+    size = len(arrays.vids)
+    matrix = scipy.sparse.csr_matrix((data, arrays.indices, arrays.indptr), shape=(size, size))
+    return matrix, arrays.vids, arrays.index
@@ -10,12 +10,15 @@ The definitions for the universal object-oriented graph interface.
 
 
 import collections.abc
+import itertools
 
-from typing import Union, Iterator, Hashable, Any, Optional, MutableMapping, Tuple
+from typing import Union, Iterator, Hashable, Any, Optional, Mapping, MutableMapping, Tuple, Iterable, Set, Callable
 
-from vert.stores.base import GraphStore, EdgeID, Label, VertexID, DirectedEdgeID, UndirectedEdgeID
+from vert.stores.base import GraphStore, EdgeID, Label, VertexID, DirectedEdgeID, UndirectedEdgeID, VertexRecord, \
+    EdgeRecord, lookup_vertex_data, lookup_edge_data, data_matches
 from vert.stores.memory import MemoryGraphStore
 from vert.stores.dbm import DBMGraphStore
+from vert.migration import migrate
 
 
 __all__ = [
@@ -30,12 +33,17 @@ __all__ = [
 VertexOrID = Union[VertexID, 'Vertex']
 EdgeOrID = Union[EdgeID, 'Edge', Tuple[VertexOrID, VertexOrID]]
 
+# Passed as the default to lookup_vertex_data() and lookup_edge_data() to detect missing keys with a single lookup.
+_MISSING = object()
+
 
 class GraphComponent:
     """
     Base class for graph interface components.
     """
 
+    __slots__ = ('_graph_store',)
+
     def __init__(self, graph_store: GraphStore):
         self._graph_store = graph_store
 
@@ -87,6 +95,8 @@ class FullVertexSet(collections.abc.MutableSet, GraphComponent):
     The complete set of every vertex belonging to the graph.
     """
 
+    __slots__ = ()
+
     def __contains__(self, vertex: VertexOrID) -> bool:
         vid = self._to_vid(vertex, self._graph_store)
         return self._graph_store.has_vertex(vid)
@@ -138,12 +148,100 @@ class FullVertexSet(collections.abc.MutableSet, GraphComponent):
         vid = self._to_vid(vertex, self._graph_store)
         self._graph_store.discard_vertex(vid)
 
+    def update(self, vertices: Iterable[VertexOrID]) -> None:
+        """
+        Add each of the vertices to the graph. Vertices which already belong to the graph are skipped. The vertices are
+        passed to the graph store in bulk, which is much faster than adding them one at a time.
+
+        :param vertices: The vertices or vertex IDs to add to the graph.
+        :return: None
+        """
+        graph_store = self._graph_store
+        graph_store.add_vertices(self._to_vid(vertex, graph_store) for vertex in vertices)
+
+    def difference_update(self, vertices: Iterable[VertexOrID]) -> None:
+        """
+        Remove each of the vertices from the graph, along with their incident edges. Vertices which do not belong to the
+        graph are skipped. The vertices are passed to the graph store in bulk, which is much faster than removing them
+        one at a time.
+
+        :param vertices: The vertices or vertex IDs to remove from the graph.
+        :return: None
+        """
+        graph_store = self._graph_store
+        graph_store.discard_vertices(self._to_vid(vertex, graph_store) for vertex in vertices)
+
+    def find(self, data: Optional[Mapping[Hashable, Any]] = None, **kwargs: Any) -> Iterator['Vertex']:
+        """
+        Find the vertices that store a value equal to each of the given values under the same key, e.g.
+        graph.vertices.find(email='someone@example.com'). Keys that aren't valid keyword arguments can be passed in a
+        mapping instead. If any of the keys has a secondary index in the graph store, the vertices are looked up in it;
+        see GraphStore.add_vertex_data_index(). Otherwise, every vertex in the graph is checked.
+
+        :param data: A mapping from data keys to the values to look for.
+        :param kwargs: More data keys and values to look for.
+        :return: An iterator over the matching vertices.
+        """
+        graph_store = self._graph_store
+        criteria = dict(data or (), **kwargs)
+        if not criteria:
+            yield from self
+            return
+        # Look up one key, preferring an indexed one, and check the rest against each vertex found.
+        key = next((key for key in criteria if graph_store.has_vertex_data_index(key)), next(iter(criteria)))
+        value = criteria.pop(key)
+        vids = graph_store.find_vertices(key, value)
+        if criteria:
+            vids = graph_store.filter_vertices(vids, data=criteria)
+        for vid in vids:
+            yield Vertex(vid, graph_store)
+
+    def find_range(self, key: Hashable, minimum: Optional[Any] = None, maximum: Optional[Any] = None,
+                   reverse: bool = False, limit: Optional[int] = None) -> Iterator['Vertex']:
+        """
+        Find the vertices that store a number between the minimum and the maximum, inclusive, under the key, in order of
+        the numbers, e.g. graph.vertices.find_range('score', reverse=True, limit=10) for the top ten scores. If the key
+        has an ordered index in the graph store, the vertices are streamed from it; see
+        GraphStore.add_vertex_data_index(). Otherwise, every vertex in the graph is checked.
+
+        :param key: The data key to look up.
+        :param minimum: The lowest value to include, or None for no lower bound.
+        :param maximum: The highest value to include, or None for no upper bound.
+        :param reverse: Whether to yield the highest values first.
+        :param limit: If given, the most vertices to yield.
+        :return: An iterator over the matching vertices.
+        """
+        graph_store = self._graph_store
+        vids = graph_store.find_vertices_in_range(key, minimum, maximum, reverse)
+        if limit is not None:
+            vids = itertools.islice(vids, limit)
+        for vid in vids:
+            yield Vertex(vid, graph_store)
+
+    def with_label(self, label: Label) -> Iterator['Vertex']:
+        """
+        Return an iterator over the vertices that have the label, e.g. graph.vertices.with_label('person'). Graph
+        stores that keep an inverted index of their labels look the vertices up in it.
+
+        :param label: The label to look for.
+        :return: An iterator over the vertices with the label.
+        """
+        graph_store = self._graph_store
+        for vid in graph_store.iter_vertices_with_label(label):
+            yield Vertex(vid, graph_store)
+
+    def count_with_label(self, label: Label) -> int:
+        """Return the number of vertices that have the label."""
+        return self._graph_store.count_vertices_with_label(label)
+
 
 class FullEdgeSet(collections.abc.MutableSet, GraphComponent):
     """
     The complete set of every edge belonging to the graph.
     """
 
+    __slots__ = ()
+
     def __contains__(self, edge: EdgeOrID) -> bool:
         eid = self._to_eid(edge, self._graph_store)
         return self._graph_store.has_edge(eid)
@@ -193,12 +291,99 @@ class FullEdgeSet(collections.abc.MutableSet, GraphComponent):
         eid = self._to_eid(edge, self._graph_store)
         self._graph_store.discard_edge(eid)
 
+    def update(self, edges: Iterable[EdgeOrID]) -> None:
+        """
+        Add each of the edges to the graph, along with any missing vertices. Edges which already belong to the graph are
+        skipped. The edges are passed to the graph store in bulk, which is much faster than adding them one at a time.
+
+        :param edges: The edges or edge IDs to add to the graph.
+        :return: None
+        """
+        graph_store = self._graph_store
+        graph_store.add_edges(self._to_eid(edge, graph_store) for edge in edges)
+
+    def difference_update(self, edges: Iterable[EdgeOrID]) -> None:
+        """
+        Remove each of the edges from the graph. Edges which do not belong to the graph are skipped. The edges are
+        passed to the graph store in bulk, which is much faster than removing them one at a time.
+
+        :param edges: The edges or edge IDs to remove from the graph.
+        :return: None
+        """
+        graph_store = self._graph_store
+        graph_store.discard_edges(self._to_eid(edge, graph_store) for edge in edges)
+
+    def find(self, data: Optional[Mapping[Hashable, Any]] = None, **kwargs: Any) -> Iterator['Edge']:
+        """
+        Find the edges that store a value equal to each of the given values under the same key, e.g.
+        graph.edges.find(kind='friend'). Keys that aren't valid keyword arguments can be passed in a mapping instead. If
+        any of the keys has a secondary index in the graph store, the edges are looked up in it; see
+        GraphStore.add_edge_data_index(). Otherwise, every edge in the graph is checked.
+
+        :param data: A mapping from data keys to the values to look for.
+        :param kwargs: More data keys and values to look for.
+        :return: An iterator over the matching edges.
+        """
+        graph_store = self._graph_store
+        criteria = dict(data or (), **kwargs)
+        if not criteria:
+            yield from self
+            return
+        # Look up one key, preferring an indexed one, and check the rest against each edge found.
+        key = next((key for key in criteria if graph_store.has_edge_data_index(key)), next(iter(criteria)))
+        value = criteria.pop(key)
+        missing = object()
+        for eid in graph_store.find_edges(key, value):
+            if all(data_matches(lookup_edge_data(graph_store, eid, other, missing), other_value)
+                   for other, other_value in criteria.items()):
+                yield Edge.from_eid(eid, graph_store)
+
+    def find_range(self, key: Hashable, minimum: Optional[Any] = None, maximum: Optional[Any] = None,
+                   reverse: bool = False, limit: Optional[int] = None) -> Iterator['Edge']:
+        """
+        Find the edges that store a number between the minimum and the maximum, inclusive, under the key, in order of
+        the numbers, e.g. graph.edges.find_range('since', 2000, 2009). If the key has an ordered index in the graph
+        store, the edges are streamed from it; see GraphStore.add_edge_data_index(). Otherwise, every edge in the graph
+        is checked.
+
+        :param key: The data key to look up.
+        :param minimum: The lowest value to include, or None for no lower bound.
+        :param maximum: The highest value to include, or None for no upper bound.
+        :param reverse: Whether to yield the highest values first.
+        :param limit: If given, the most edges to yield.
+        :return: An iterator over the matching edges.
+        """
+        graph_store = self._graph_store
+        eids = graph_store.find_edges_in_range(key, minimum, maximum, reverse)
+        if limit is not None:
+            eids = itertools.islice(eids, limit)
+        for eid in eids:
+            yield Edge.from_eid(eid, graph_store)
+
+    def with_label(self, label: Label) -> Iterator['Edge']:
+        """
+        Return an iterator over the edges that have the label, e.g. graph.edges.with_label('knows'). Graph stores that
+        keep an inverted index of their labels look the edges up in it.
+
+        :param label: The label to look for.
+        :return: An iterator over the edges with the label.
+        """
+        graph_store = self._graph_store
+        for eid in graph_store.iter_edges_with_label(label):
+            yield Edge.from_eid(eid, graph_store)
+
+    def count_with_label(self, label: Label) -> int:
+        """Return the number of edges that have the label."""
+        return self._graph_store.count_edges_with_label(label)
+
 
 class UniqueVertexSet(collections.abc.Set, GraphComponent):
     """
     A set containing exactly one vertex.
     """
 
+    __slots__ = ('_vid',)
+
     def __init__(self, vid, graph_store: GraphStore):
         GraphComponent.__init__(self, graph_store)
         self._vid = vid
@@ -219,6 +404,8 @@ class SourceVertexSet(collections.abc.MutableSet, GraphComponent):
     The set containing every vertex which is the source of an edge that shares the same given sink.
     """
 
+    __slots__ = ('_vid',)
+
     def __init__(self, vid: VertexID, graph_store: GraphStore):
         GraphComponent.__init__(self, graph_store)
         self._vid = vid
@@ -229,8 +416,8 @@ class SourceVertexSet(collections.abc.MutableSet, GraphComponent):
         return self._graph_store.has_edge(eid)
 
     def __iter__(self) -> Iterator['Vertex']:
-        for eid in self._graph_store.iter_inbound(self._vid):
-            yield Vertex(eid.source, self._graph_store)
+        for vid in self._graph_store.iter_sources(self._vid):
+            yield Vertex(vid, self._graph_store)
 
     def __len__(self) -> int:
         return self._graph_store.count_inbound(self._vid)
@@ -279,19 +466,27 @@ class InboundEdgeSet(collections.abc.Set, GraphComponent):
     The set of all edges having the given vertex as their shared sink.
     """
 
+    __slots__ = ('_vid', '_sources', '_sinks')
+
     def __init__(self, vid: VertexID, graph_store: GraphStore):
         GraphComponent.__init__(self, graph_store)
         self._vid = vid
+        self._sources = None
+        self._sinks = None
 
     @property
     def sources(self) -> SourceVertexSet:
         """The set of all source vertices for each edge in this edge set."""
-        return SourceVertexSet(self._vid, self._graph_store)
+        if self._sources is None:
+            self._sources = SourceVertexSet(self._vid, self._graph_store)
+        return self._sources
 
     @property
     def sinks(self) -> UniqueVertexSet:
         """The set of all sink vertices for each edge in this edge set."""
-        return UniqueVertexSet(self._vid, self._graph_store)
+        if self._sinks is None:
+            self._sinks = UniqueVertexSet(self._vid, self._graph_store)
+        return self._sinks
 
     def __contains__(self, edge: EdgeOrID) -> bool:
         eid = self._to_eid(edge, self._graph_store)
@@ -319,6 +514,8 @@ class SinkVertexSet(collections.abc.MutableSet, GraphComponent):
     The set containing every vertex which is the sink of an edge that shares the same given source.
     """
 
+    __slots__ = ('_vid',)
+
     def __init__(self, vid: VertexID, graph_store: GraphStore):
         GraphComponent.__init__(self, graph_store)
         self._vid = vid
@@ -329,8 +526,8 @@ class SinkVertexSet(collections.abc.MutableSet, GraphComponent):
         return self._graph_store.has_edge(eid)
 
     def __iter__(self) -> Iterator['Vertex']:
-        for eid in self._graph_store.iter_outbound(self._vid):
-            yield Vertex(eid.sink, self._graph_store)
+        for vid in self._graph_store.iter_sinks(self._vid):
+            yield Vertex(vid, self._graph_store)
 
     def __len__(self) -> int:
         return self._graph_store.count_outbound(self._vid)
@@ -379,19 +576,27 @@ class OutboundEdgeSet(collections.abc.Set, GraphComponent):
     The set of all edges having the given vertex as their shared source.
     """
 
+    __slots__ = ('_vid', '_sources', '_sinks')
+
     def __init__(self, vid: VertexID, graph_store: GraphStore):
         GraphComponent.__init__(self, graph_store)
         self._vid = vid
+        self._sources = None
+        self._sinks = None
 
     @property
     def sources(self) -> UniqueVertexSet:
         """The set of all source vertices for each edge in this edge set."""
-        return UniqueVertexSet(self._vid, self._graph_store)
+        if self._sources is None:
+            self._sources = UniqueVertexSet(self._vid, self._graph_store)
+        return self._sources
 
     @property
     def sinks(self):
         """The set of all sink vertices for each edge in this edge set."""
-        return SinkVertexSet(self._vid, self._graph_store)
+        if self._sinks is None:
+            self._sinks = SinkVertexSet(self._vid, self._graph_store)
+        return self._sinks
 
     def __contains__(self, edge: EdgeOrID) -> bool:
         eid = self._to_eid(edge, self._graph_store)
@@ -419,6 +624,8 @@ class VertexLabelSet(collections.abc.MutableSet, GraphComponent):
     The set of all labels associated with this vertex.
     """
 
+    __slots__ = ('_vid',)
+
     def __init__(self, vid: VertexID, graph_store: GraphStore):
         GraphComponent.__init__(self, graph_store)
         self._vid = vid
@@ -466,6 +673,8 @@ class EdgeLabelSet(collections.abc.MutableSet, GraphComponent):
     The set of all labels associated with this edge.
     """
 
+    __slots__ = ('_eid',)
+
     def __init__(self, eid: EdgeID, graph_store: GraphStore):
         GraphComponent.__init__(self, graph_store)
         self._eid = eid
@@ -513,6 +722,8 @@ class VertexDataMap(collections.abc.MutableMapping, GraphComponent):
     A dictionary mapping out the key/value pairs associated with the vertex.
     """
 
+    __slots__ = ('_vid',)
+
     def __init__(self, vid: VertexID, graph_store: GraphStore):
         GraphComponent.__init__(self, graph_store)
         self._vid = vid
@@ -527,9 +738,26 @@ class VertexDataMap(collections.abc.MutableMapping, GraphComponent):
         return self._graph_store.count_vertex_data_keys(self._vid)
 
     def __getitem__(self, key: Hashable) -> Any:
-        if not self._graph_store.has_vertex_data(self._vid, key):
+        value = lookup_vertex_data(self._graph_store, self._vid, key, _MISSING)
+        if value is _MISSING:
             raise KeyError(key)
-        return self._graph_store.get_vertex_data(self._vid, key)
+        return value
+
+    def items(self) -> collections.abc.ItemsView:
+        """
+        Return a view of the vertex's key/value pairs as they were at the time of the call. The pairs are fetched from
+        the graph store in a single call.
+        """
+        record = self._graph_store.get_vertex_record(self._vid)
+        return (record.data if record else {}).items()
+
+    def values(self) -> collections.abc.ValuesView:
+        """
+        Return a view of the vertex's values as they were at the time of the call. The values are fetched from the graph
+        store in a single call.
+        """
+        record = self._graph_store.get_vertex_record(self._vid)
+        return (record.data if record else {}).values()
 
     def __setitem__(self, key: Hashable, value: Any) -> None:
         self._graph_store.set_vertex_data(self._vid, key, value)
@@ -544,6 +772,8 @@ class EdgeDataMap(collections.abc.MutableMapping, GraphComponent):
     A dictionary mapping out the key/value pairs associated with the edge.
     """
 
+    __slots__ = ('_eid',)
+
     def __init__(self, eid: EdgeID, graph_store: GraphStore):
         GraphComponent.__init__(self, graph_store)
         self._eid = eid
@@ -558,9 +788,26 @@ class EdgeDataMap(collections.abc.MutableMapping, GraphComponent):
         return self._graph_store.count_edge_data_keys(self._eid)
 
     def __getitem__(self, key: Hashable) -> Any:
-        if not self._graph_store.has_edge_data(self._eid, key):
+        value = lookup_edge_data(self._graph_store, self._eid, key, _MISSING)
+        if value is _MISSING:
             raise KeyError(key)
-        return self._graph_store.get_edge_data(self._eid, key)
+        return value
+
+    def items(self) -> collections.abc.ItemsView:
+        """
+        Return a view of the edge's key/value pairs as they were at the time of the call. The pairs are fetched from
+        the graph store in a single call.
+        """
+        record = self._graph_store.get_edge_record(self._eid)
+        return (record.data if record else {}).items()
+
+    def values(self) -> collections.abc.ValuesView:
+        """
+        Return a view of the edge's values as they were at the time of the call. The values are fetched from the graph
+        store in a single call.
+        """
+        record = self._graph_store.get_edge_record(self._eid)
+        return (record.data if record else {}).values()
 
     def __setitem__(self, key: Hashable, value: Any) -> None:
         self._graph_store.set_edge_data(self._eid, key, value)
@@ -575,10 +822,20 @@ class Vertex(GraphComponent):
     A *potential* vertex of the graph. Check the exists property to determine if the vertex belongs to the graph or not.
     """
 
+    __slots__ = ('_vid', '_labels', '_data', '_inbound', '_outbound', '_sources', '_sinks')
+
     def __init__(self, vid: VertexID, graph_store: GraphStore):
         super().__init__(graph_store)
         self._vid = vid
 
+        # The views onto the vertex are created on first access, and then reused.
+        self._labels = None
+        self._data = None
+        self._inbound = None
+        self._outbound = None
+        self._sources = None
+        self._sinks = None
+
     def __str__(self):
         return repr(self._vid)
 
@@ -613,14 +870,18 @@ class Vertex(GraphComponent):
         """
         The set of labels associated with the vertex.
         """
-        return VertexLabelSet(self._vid, self._graph_store)
+        if self._labels is None:
+            self._labels = VertexLabelSet(self._vid, self._graph_store)
+        return self._labels
 
     @property
     def data(self) -> VertexDataMap:
         """
         The key/value pairs associated with the vertex.
         """
-        return VertexDataMap(self._vid, self._graph_store)
+        if self._data is None:
+            self._data = VertexDataMap(self._vid, self._graph_store)
+        return self._data
 
     @property
     def exists(self) -> bool:
@@ -629,25 +890,41 @@ class Vertex(GraphComponent):
         """
         return self._graph_store.has_vertex(self._vid)
 
+    @property
+    def record(self) -> Optional[VertexRecord]:
+        """
+        The labels, data, and edge counts of the vertex, fetched from the graph store in a single call, or None if the
+        vertex does not exist.
+        """
+        return self._graph_store.get_vertex_record(self._vid)
+
     @property
     def inbound(self) -> InboundEdgeSet:
         """The set of edges that have this vertex as their sink."""
-        return InboundEdgeSet(self._vid, self._graph_store)
+        if self._inbound is None:
+            self._inbound = InboundEdgeSet(self._vid, self._graph_store)
+        return self._inbound
 
     @property
     def outbound(self) -> OutboundEdgeSet:
         """The set of edges that have this vertex as their source."""
-        return OutboundEdgeSet(self._vid, self._graph_store)
+        if self._outbound is None:
+            self._outbound = OutboundEdgeSet(self._vid, self._graph_store)
+        return self._outbound
 
     @property
     def sources(self):
         """The set of vertices that are sources for edges that have this vertex as their sink."""
-        return SourceVertexSet(self._vid, self._graph_store)
+        if self._sources is None:
+            self._sources = SourceVertexSet(self._vid, self._graph_store)
+        return self._sources
 
     @property
     def sinks(self):
         """The set of vertices that are sinks for edges that have this vertex as their source."""
-        return SinkVertexSet(self._vid, self._graph_store)
+        if self._sinks is None:
+            self._sinks = SinkVertexSet(self._vid, self._graph_store)
+        return self._sinks
 
     def add(self) -> 'Vertex':
         """
@@ -683,6 +960,8 @@ class Edge(GraphComponent):
     A *potential* edge of the graph. Check the exists property to determine if the edge belongs to the graph or not.
     """
 
+    __slots__ = ('_eid', '_labels', '_data')
+
     @classmethod
     def from_eid(cls, eid: EdgeOrID, graph_store: GraphStore) -> 'Edge':
         eid = cls._to_eid(eid, None)
@@ -697,6 +976,10 @@ class Edge(GraphComponent):
             eid = self._to_eid(eid, self._graph_store)
         self._eid = eid
 
+        # The views onto the edge are created on first access, and then reused.
+        self._labels = None
+        self._data = None
+
     def __str__(self):
         return repr(self._eid)
 
@@ -737,20 +1020,32 @@ class Edge(GraphComponent):
     @property
     def labels(self) -> EdgeLabelSet:
         """The labels associated with the edge."""
-        # noinspection PyTypeChecker
-        return EdgeLabelSet(self._eid, self._graph_store)
+        if self._labels is None:
+            # noinspection PyTypeChecker
+            self._labels = EdgeLabelSet(self._eid, self._graph_store)
+        return self._labels
 
     @property
     def data(self) -> EdgeDataMap:
         """The key/value pairs associated with the edge."""
-        # noinspection PyTypeChecker
-        return EdgeDataMap(self._eid, self._graph_store)
+        if self._data is None:
+            # noinspection PyTypeChecker
+            self._data = EdgeDataMap(self._eid, self._graph_store)
+        return self._data
 
     @property
     def exists(self) -> bool:
         """Whether or not the edge exists in the graph."""
         return self._graph_store.has_edge(self._eid)
 
+    @property
+    def record(self) -> Optional[EdgeRecord]:
+        """
+        The labels and data of the edge, fetched from the graph store in a single call, or None if the edge does not
+        exist.
+        """
+        return self._graph_store.get_edge_record(self._eid)
+
     def add(self) -> 'Edge':
         """
         Add the edge to the graph. If the edge already exists, do nothing. If either source or sink does not exist,
@@ -786,10 +1081,14 @@ class DirectedEdge(Edge):
     or not.
     """
 
+    __slots__ = ('_source', '_sink')
+
     def __init__(self, eid: EdgeID, graph_store: GraphStore):
         super().__init__(eid, graph_store)
         if not isinstance(self._eid, DirectedEdgeID):
             raise TypeError(eid)
+        self._source = None
+        self._sink = None
 
     @property
     def is_directed(self) -> bool:
@@ -798,14 +1097,18 @@ class DirectedEdge(Edge):
     @property
     def source(self) -> Vertex:
         """The vertex that is the source of the edge."""
-        assert isinstance(self._eid, DirectedEdgeID)
-        return Vertex(self._eid.source, self._graph_store)
+        if self._source is None:
+            assert isinstance(self._eid, DirectedEdgeID)
+            self._source = Vertex(self._eid.source, self._graph_store)
+        return self._source
 
     @property
     def sink(self) -> Vertex:
         """The vertex that is the sink of the edge."""
-        assert isinstance(self._eid, DirectedEdgeID)
-        return Vertex(self._eid.sink, self._graph_store)
+        if self._sink is None:
+            assert isinstance(self._eid, DirectedEdgeID)
+            self._sink = Vertex(self._eid.sink, self._graph_store)
+        return self._sink
 
     @property
     def undirected(self) -> 'UndirectedEdge':
@@ -829,6 +1132,8 @@ class UndirectedEdge(Edge):
     or not.
     """
 
+    __slots__ = ()
+
     def __init__(self, eid: EdgeID, graph_store: GraphStore):
         super().__init__(eid, graph_store)
         if not isinstance(self._eid, UndirectedEdgeID):
@@ -855,6 +1160,8 @@ class Graph:
     vertices.
     """
 
+    __slots__ = ('_graph_store', '_vertices', '_edges')
+
     def __init__(self, store: Optional[Union[GraphStore, str, MutableMapping[bytes, bytes]]]=None):
         if store is None:
             store = MemoryGraphStore()
@@ -862,6 +1169,8 @@ class Graph:
             store = DBMGraphStore(store)
         assert isinstance(store, GraphStore)
         self._graph_store = store
+        self._vertices = FullVertexSet(store)
+        self._edges = FullEdgeSet(store)
 
     def __del__(self):
         self.close()
@@ -873,6 +1182,11 @@ class Graph:
         self.close()
         return False
 
+    @property
+    def store(self) -> GraphStore:
+        """The graph store in which the graph's vertices and edges are stored."""
+        return self._graph_store
+
     @property
     def is_open(self):
         """Whether or not the graph is open. Once a graph is closed, it cannot be operated on."""
@@ -882,12 +1196,111 @@ class Graph:
         """Close the graph."""
         self._graph_store.close()
 
+    def component_of(self, vertex: VertexOrID) -> Set[VertexID]:
+        """
+        Return the IDs of the vertices in the same connected component as the vertex, following edges in both
+        directions. If the graph store maintains a component index (see vert.algorithms.ComponentIndexGraphStore), it
+        is used; otherwise the component is found with a breadth-first search.
+
+        :param vertex: The vertex or vertex ID whose component is to be found.
+        :return: The set of vertex IDs in the component, including the vertex's own.
+        """
+        vid = GraphComponent._to_vid(vertex, self._graph_store)
+        component_of = getattr(self._graph_store, 'component_of', None)
+        if component_of is not None:
+            return component_of(vid)
+        from vert.algorithms.search import bfs
+        from vert.algorithms.common import BOTH
+        return {other for other, _ in bfs(self._graph_store, vid, BOTH)}
+
+    def same_component(self, vertex1: VertexOrID, vertex2: VertexOrID) -> bool:
+        """
+        Return whether the two vertices are in the same connected component, following edges in both directions. If
+        the graph store maintains a component index (see vert.algorithms.ComponentIndexGraphStore), it is used;
+        otherwise a breadth-first search is made from the first vertex, stopping as soon as the second is found.
+
+        :param vertex1: The first vertex or vertex ID.
+        :param vertex2: The second vertex or vertex ID.
+        :return: A Boolean indicating whether the vertices are in the same component.
+        """
+        vid1 = GraphComponent._to_vid(vertex1, self._graph_store)
+        vid2 = GraphComponent._to_vid(vertex2, self._graph_store)
+        same_component = getattr(self._graph_store, 'same_component', None)
+        if same_component is not None:
+            return same_component(vid1, vid2)
+        from vert.algorithms.search import bfs
+        from vert.algorithms.common import BOTH
+        return any(other == vid2 for other, _ in bfs(self._graph_store, vid1, BOTH))
+
+    def copy_to(self, graph_store: GraphStore, batch_size: int = 1000,
+                progress: Optional[Callable[[str, int, int], None]] = None,
+                checkpoint: Optional[str] = None, pause_gc: bool = False) -> 'Graph':
+        """
+        Copy every vertex and edge of the graph, with their labels and data, into another graph store, streaming them
+        in batches. See vert.migration.migrate() for details.
+
+        :param graph_store: The graph store to copy into.
+        :param batch_size: The number of vertices or edges written to the graph store at a time.
+        :param progress: If given, a function called as progress(phase, done, total) after each batch.
+        :param checkpoint: If given, the path of a file used to make the copy resumable.
+        :param pause_gc: Whether to disable the cyclic garbage collector, for the whole process, while copying.
+        :return: A new Graph for the graph store copied into.
+        """
+        migrate(self._graph_store, graph_store, batch_size, progress, checkpoint, pause_gc)
+        return Graph(graph_store)
+
+    def traverse(self, *start: VertexOrID) -> 'Traversal':
+        """
+        Begin a lazy traversal of the graph, e.g. graph.traverse(v).out().has_label('x').where(key=value).limit(n).
+        See vert.traversal.Traversal for the available steps.
+
+        :param start: The vertices or vertex IDs to start from. If none are given, the traversal starts from every
+            vertex in the graph.
+        :return: A new Traversal.
+        """
+        from vert.traversal import Traversal
+        if start:
+            return Traversal(self._graph_store, tuple(GraphComponent._to_vid(v, self._graph_store) for v in start))
+        return Traversal(self._graph_store)
+
+    def iter_source_ids(self, vertex: VertexOrID) -> Iterator[VertexID]:
+        """
+        Return an iterator over the IDs of the sources of every inbound directed edge to the vertex. Unlike
+        vertex.sources, no Vertex or EdgeID instances are created, which makes this the fastest way to walk the graph
+        backwards.
+
+        :param vertex: The vertex or vertex ID whose sources are to be iterated over.
+        :return: An iterator over vertex IDs.
+        """
+        return self._graph_store.iter_sources(GraphComponent._to_vid(vertex, self._graph_store))
+
+    def iter_sink_ids(self, vertex: VertexOrID) -> Iterator[VertexID]:
+        """
+        Return an iterator over the IDs of the sinks of every outbound directed edge from the vertex. Unlike
+        vertex.sinks, no Vertex or EdgeID instances are created, which makes this the fastest way to walk the graph
+        forwards.
+
+        :param vertex: The vertex or vertex ID whose sinks are to be iterated over.
+        :return: An iterator over vertex IDs.
+        """
+        return self._graph_store.iter_sinks(GraphComponent._to_vid(vertex, self._graph_store))
+
+    def iter_neighbor_ids(self, vertex: VertexOrID) -> Iterator[VertexID]:
+        """
+        Return an iterator over the IDs of every vertex connected to the vertex by an edge, whether inbound, outbound,
+        or undirected. Each neighbor is yielded only once. No Vertex or EdgeID instances are created.
+
+        :param vertex: The vertex or vertex ID whose neighbors are to be iterated over.
+        :return: An iterator over vertex IDs.
+        """
+        return self._graph_store.iter_neighbors(GraphComponent._to_vid(vertex, self._graph_store))
+
     @property
     def vertices(self) -> FullVertexSet:
         """The set of all vertices in the graph."""
-        return FullVertexSet(self._graph_store)
+        return self._vertices
 
     @property
     def edges(self) -> FullEdgeSet:
         """The set of all edges in the graph."""
-        return FullEdgeSet(self._graph_store)
+        return self._edges
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+
+"""
+Bulk import of edges from flat files: whitespace-separated edge lists, CSV, and JSON lines. Files are read in chunks of
+lines, each chunk is parsed (optionally in worker processes), and the parsed edges are written to the graph store with
+its bulk methods, a few calls per chunk. Files ending in .gz are decompressed transparently.
+
+Each record describes one edge:
+
+* Edge lists: "source sink [weight]" on each line. Blank lines and lines starting with # are skipped. The weight, if
+  present, is stored as a float under the weight key.
+* CSV: a header row naming the columns, one of which holds the source and one the sink. Every other non-empty column is
+  stored as edge data under the column's name, as a string. Quoted values must not contain line breaks.
+* JSON lines: one JSON object per line, with the source and sink under their keys. A "labels" key, if present, gives a
+  list of edge labels, a "directed" key set to true or false overrides whether the edge is directed, and a "data" key
+  holding an object gives edge data. Every other key is stored as edge data too. Lines with a "vertex" key instead
+  describe a vertex, with its labels and data given the same way, so files written by vert.exporters can be read back.
+"""
+
+
+import csv
+import gzip
+import io
+import itertools
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import vert.stores.base as base
+
+
+__all__ = [
+    'EDGE_LIST',
+    'CSV',
+    'JSONL',
+    'ImportStats',
+    'import_edges',
+]
+
+
+# The supported file formats.
+EDGE_LIST = 'edgelist'
+CSV = 'csv'
+JSONL = 'jsonl'
+
+# A parsed vertex: (vid, labels, data).
+VertexRecord = Tuple[base.VertexID, Sequence[base.Label], Dict[str, Any]]
+
+# A parsed edge: (source, sink, directed, labels, data), where directed is None if the edge takes the direction of the
+# import.
+EdgeRecord = Tuple[base.VertexID, base.VertexID, Optional[bool], Sequence[base.Label], Dict[str, Any]]
+
+# A parsed chunk: the vertices and the edges it describes.
+ParsedChunk = Tuple[List[VertexRecord], List[EdgeRecord]]
+
+
+ImportStats = NamedTuple('ImportStats', [('records', int), ('edges', int), ('seconds', float)])
+ImportStats.__doc__ = """
+Throughput metrics for an import: the number of vertex and edge records read, the number of edges written to the graph store, which is
+lower than the number of records if some of the edges already existed, and the elapsed time in seconds.
+"""
+
+
+def _parse_edge_list(lines: List[str], options: Dict[str, Any]) -> ParsedChunk:
+    """Parse lines of a whitespace-separated edge list."""
+    id_type = options['id_type']
+    weight_key = options['weight_key']
+    records = []
+    for line in lines:
+        fields = line.split()
+        if not fields or fields[0].startswith('#'):
+            continue
+        if len(fields) == 2:
+            records.append((id_type(fields[0]), id_type(fields[1]), None, (), {}))
+        elif len(fields) == 3:
+            records.append((id_type(fields[0]), id_type(fields[1]), None, (), {weight_key: float(fields[2])}))
+        else:
+            raise ValueError("Malformed edge list line: %r" % line)
+    return [], records
+
+
+def _parse_csv(lines: List[str], options: Dict[str, Any]) -> ParsedChunk:
+    """Parse lines of CSV, not including the header row."""
+    id_type = options['id_type']
+    source_key = options['source_key']
+    sink_key = options['sink_key']
+    records = []
+    for row in csv.DictReader(lines, options['fieldnames']):
+        source = row.pop(source_key)
+        sink = row.pop(sink_key)
+        if source is None or sink is None:
+            raise ValueError("Missing %s or %s column: %r" % (source_key, sink_key, row))
+        records.append((id_type(source), id_type(sink), None, (),
+                        {key: value for key, value in row.items() if value}))
+    return [], records
+
+
+def _parse_jsonl(lines: List[str], options: Dict[str, Any]) -> ParsedChunk:
+    """Parse lines of JSON objects."""
+    id_type = options['id_type']
+    source_key = options['source_key']
+    sink_key = options['sink_key']
+    vertices = []
+    edges = []
+    for line in lines:
+        if not line.strip():
+            continue
+        data = json.loads(line)
+        labels = data.pop('labels', ())
+        if isinstance(data.get('data'), dict):
+            data.update(data.pop('data'))
+        if 'vertex' in data and source_key not in data:
+            vertices.append((id_type(data.pop('vertex')), labels, data))
+            continue
+        directed = data.pop('directed') if isinstance(data.get('directed'), bool) else None
+        edges.append((id_type(data.pop(source_key)), id_type(data.pop(sink_key)), directed, labels, data))
+    return vertices, edges
+
+
+def _identity(value: Any) -> Any:
+    """Return the value unchanged. This is the default ID type, a named function so it can be sent to workers."""
+    return value
+
+
+_PARSERS = {
+    EDGE_LIST: _parse_edge_list,
+    CSV: _parse_csv,
+    JSONL: _parse_jsonl,
+}
+
+
+def _parse_chunk(file_format: str, lines: List[str], options: Dict[str, Any]) -> ParsedChunk:
+    """Parse a chunk of lines in the given format. This is the function run by worker processes."""
+    return _PARSERS[file_format](lines, options)
+
+
+def _open_text(path: str) -> io.TextIOBase:
+    """Open a file for reading as text, decompressing it if its name ends in .gz."""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    return open(path, 'r', encoding='utf-8', newline='')
+
+
+def _write_chunk(graph_store: base.GraphStore, chunk: ParsedChunk, directed: bool) -> None:
+    """Write a chunk of parsed vertices and edges to the graph store, with one bulk call for each kind of write."""
+    vertices, edges = chunk
+    if vertices:
+        graph_store.set_vertex_data_many((vid, data) for vid, _, data in vertices if data)
+        graph_store.add_vertices(vid for vid, labels, data in vertices if not (data or labels))
+        graph_store.add_vertex_labels_many((vid, labels) for vid, labels, _ in vertices if labels)
+    plain_eids = []
+    data_items = []
+    label_items = []
+    for source, sink, edge_directed, labels, data in edges:
+        if edge_directed is None:
+            edge_directed = directed
+        eid = base.DirectedEdgeID(source, sink) if edge_directed else base.UndirectedEdgeID(source, sink)
+        if data:
+            data_items.append((eid, data))
+        elif not labels:
+            plain_eids.append(eid)
+        if labels:
+            label_items.append((eid, labels))
+    # Edges with data or labels are added by the calls that set them, so stores such as the DBM store can write each
+    # new edge's record once, complete, instead of writing it empty and then reading it back to update it.
+    if data_items:
+        graph_store.set_edge_data_many(data_items)
+    if plain_eids:
+        graph_store.add_edges(plain_eids)
+    if label_items:
+        graph_store.add_edge_labels_many(label_items)
+
+
+def _parse_ahead(executor: ProcessPoolExecutor, file_format: str, chunks: Iterator[List[str]],
+                 options: Dict[str, Any], depth: int) -> Iterator[ParsedChunk]:
+    """Submit chunks to the worker processes, keeping up to depth of them in flight, and yield the results in order."""
+    pending = [executor.submit(_parse_chunk, file_format, chunk, options) for chunk in itertools.islice(chunks, depth)]
+    while pending:
+        parsed = pending.pop(0).result()
+        for chunk in itertools.islice(chunks, 1):
+            pending.append(executor.submit(_parse_chunk, file_format, chunk, options))
+        yield parsed
+
+
+def import_edges(graph: Any, path: str, file_format: str = EDGE_LIST, directed: bool = True,
+                 id_type: Optional[Callable[[Any], base.VertexID]] = None, source_key: str = 'source',
+                 sink_key: str = 'sink', weight_key: str = 'weight', chunk_size: int = 10000,
+                 processes: Optional[int] = None,
+                 progress: Optional[Callable[[ImportStats], None]] = None, pause_gc: bool = False) -> ImportStats:
+    """
+    Import edges from a file into the graph, adding any vertices they connect that are missing. The vertices described
+    by a JSON lines file are imported too, with their labels and data.
+
+    :param graph: The Graph or GraphStore to import into.
+    :param path: The path of the file to read. Files ending in .gz are decompressed as they are read.
+    :param file_format: The format of the file: EDGE_LIST, CSV, or JSONL.
+    :param directed: Whether to create directed or undirected edges, unless a JSON lines record says otherwise.
+    :param id_type: If given, a function that converts each vertex ID as read from the file to the vertex ID to use,
+        e.g. int. When worker processes are used, it must be picklable, so it cannot be a lambda. Otherwise, IDs are
+        strings in edge lists and CSV files, and whatever JSON value they are in JSON lines files.
+    :param source_key: The CSV column or JSON key holding the source vertex ID.
+    :param sink_key: The CSV column or JSON key holding the sink vertex ID.
+    :param weight_key: The edge data key the weights in an edge list are stored under.
+    :param chunk_size: The number of lines parsed and written at a time.
+    :param processes: If greater than 1, chunks are parsed in this many worker processes while the main process writes
+        the edges to the graph store.
+    :param progress: If given, a function called with the ImportStats so far after each chunk is written.
+    :param pause_gc: Whether to disable the cyclic garbage collector while importing, since every edge written adds
+        containers that it would otherwise keep rescanning. It is disabled for the whole process, so only set this when
+        nothing else running in the process needs it in the meantime.
+    :return: The ImportStats for the whole import.
+    """
+    if file_format not in _PARSERS:
+        raise ValueError("Unknown format: %r" % (file_format,))
+    if chunk_size < 1:
+        raise ValueError(chunk_size)
+    graph_store = graph if isinstance(graph, base.GraphStore) else graph.store
+    options = {
+        'id_type': id_type or _identity,
+        'source_key': source_key,
+        'sink_key': sink_key,
+        'weight_key': weight_key,
+    }
+
+    start_time = time.time()
+    start_count = graph_store.count_edges()
+    record_count = 0
+    with _open_text(path) as file:
+        if file_format == CSV:
+            options['fieldnames'] = next(csv.reader([file.readline()]), [])
+        chunks = iter(lambda: list(itertools.islice(file, chunk_size)), [])
+        if processes is not None and processes > 1:
+            executor = ProcessPoolExecutor(processes)
+            # Parsing runs ahead of writing by at most a few chunks per worker, so memory use stays bounded.
+            parsed = _parse_ahead(executor, file_format, chunks, options, 2 * processes)
+        else:
+            executor = None
+            parsed = (_parse_chunk(file_format, chunk, options) for chunk in chunks)
+        try:
+            with base.paused_gc(pause_gc):
+                for vertices, edges in parsed:
+                    _write_chunk(graph_store, (vertices, edges), directed)
+                    record_count += len(vertices) + len(edges)
+                    if progress is not None:
+                        progress(ImportStats(record_count, graph_store.count_edges() - start_count,
+                                             time.time() - start_time))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+    flush = getattr(graph_store, 'flush', None)
+    if flush is not None:
+        flush()
+    return ImportStats(record_count, graph_store.count_edges() - start_count, time.time() - start_time)
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+
+"""
+Streaming graph copies between graph stores. The records of the source's vertices and edges are read and written to
+the destination in batches, so memory use depends on the batch size rather than the size of the graph. Long migrations
+can be made resumable by giving a checkpoint file, which records how far the copy has progressed after every batch.
+"""
+
+
+import hashlib
+import itertools
+import json
+import os
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+import vert.stores.base as base
+
+
+__all__ = [
+    'MigrationResult',
+    'migrate',
+]
+
+
+MigrationResult = NamedTuple('MigrationResult', [('vertices', int), ('edges', int)])
+MigrationResult.__doc__ = """
+The number of vertices and edges copied by a migration, including any copied by earlier, interrupted runs.
+"""
+
+
+# The phases of a migration, in order, as reported to the progress callback and recorded in the checkpoint file.
+VERTICES = 'vertices'
+EDGES = 'edges'
+
+
+def _fingerprint(graph_store: base.GraphStore) -> Dict[str, Any]:
+    """Return the type and size of the graph store, which the checkpoint file records to recognize it again."""
+    return {'type': type(graph_store).__name__, VERTICES: graph_store.count_vertices(),
+            EDGES: graph_store.count_edges()}
+
+
+def _id_text(item: Any) -> str:
+    """
+    Return the text of a vertex or edge ID that goes into the checkpoint file's digests. The vertices of undirected
+    edges are put in a fixed order, since the order of a set can change from one process to the next.
+    """
+    if isinstance(item, base.EdgeID):
+        return repr((item.is_directed, tuple(item.vertices)))
+    return repr(item)
+
+
+def _digest_batch(digest: Any, batch: List[Any]) -> None:
+    """Add the IDs of a batch of vertices or edges to the digest of the IDs copied so far."""
+    digest.update(''.join(_id_text(item) + '\n' for item in batch).encode('utf-8'))
+
+
+def _read_checkpoint(path: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Return the contents of the checkpoint file, or None if there isn't one."""
+    if path is None or not os.path.isfile(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as file:
+        try:
+            checkpoint = json.load(file)
+            for phase in (VERTICES, EDGES):
+                int(checkpoint[phase])
+                str(checkpoint['digests'][phase])
+                int(checkpoint['source'][phase])
+                int(checkpoint['destination'][phase])
+            return checkpoint
+        except (ValueError, KeyError, TypeError):
+            raise ValueError("Not a migration checkpoint file: %r" % path)
+
+
+def _check_checkpoint(path: str, checkpoint: Dict[str, Any], source: base.GraphStore,
+                      destination: base.GraphStore) -> None:
+    """
+    Raise a ValueError if the checkpoint file was not written by a migration between the same two graph stores: the
+    source must be of the same type and size as it was, and the destination of the same type, and at least as large.
+    """
+    if checkpoint['source'] != _fingerprint(source):
+        raise ValueError("The migration checkpoint file %r was written for a different source." % path)
+    recorded = checkpoint['destination']
+    current = _fingerprint(destination)
+    if (recorded['type'] != current['type'] or current[VERTICES] < recorded[VERTICES] or
+            current[EDGES] < recorded[EDGES]):
+        raise ValueError("The migration checkpoint file %r was written for a different destination." % path)
+
+
+def _write_checkpoint(path: str, done: Dict[str, int], digests: Dict[str, Any], source: Dict[str, Any],
+                      destination: base.GraphStore) -> None:
+    """Record how far the migration has progressed, replacing the checkpoint file atomically."""
+    checkpoint = dict(done)
+    checkpoint['digests'] = {phase: digest.hexdigest() for phase, digest in digests.items()}
+    checkpoint['source'] = source
+    checkpoint['destination'] = _fingerprint(destination)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(checkpoint, file)
+    os.replace(temp_path, path)
+
+
+def _batches(iterator: Iterator[Any], size: int) -> Iterator[List[Any]]:
+    """Split the iterator into lists of the given size, the last of which may be shorter."""
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            break
+        yield batch
+
+
+def _copy_vertices(source: base.GraphStore, destination: base.GraphStore, vids: List[base.VertexID]) -> None:
+    """Copy a batch of vertices, with their labels and data."""
+    records = source.get_vertex_records(vids)
+    # Vertices are added by the call that writes their data, so graph stores that keep a record per vertex, like the
+    # DBM graph store, can create each record whole instead of writing it once to add it and again to fill it in.
+    destination.set_vertex_data_many((vid, record.data) for vid, record in zip(vids, records) if record)
+    destination.add_vertex_labels_many((vid, record.labels) for vid, record in zip(vids, records)
+                                       if record and record.labels)
+
+
+def _copy_edges(source: base.GraphStore, destination: base.GraphStore, eids: List[base.EdgeID]) -> None:
+    """Copy a batch of edges, with their labels and data."""
+    records = source.get_edge_records(eids)
+    destination.set_edge_data_many((eid, record.data) for eid, record in zip(eids, records) if record)
+    destination.add_edge_labels_many((eid, record.labels) for eid, record in zip(eids, records)
+                                     if record and record.labels)
+
+
+def migrate(source: Any, destination: Any, batch_size: int = 1000,
+            progress: Optional[Callable[[str, int, int], None]] = None,
+            checkpoint: Optional[str] = None, pause_gc: bool = False) -> MigrationResult:
+    """
+    Copy every vertex and edge of the source, with their labels and data, into the destination. Vertices are copied
+    first, then edges. Anything already in the destination is kept, and where the source has data under the same key,
+    it overwrites the destination's value.
+
+    If a checkpoint path is given, the number of vertices and edges copied so far is saved to that file after each
+    batch, once the batch has been flushed to the destination. If the migration is interrupted, calling migrate() again
+    with the same arguments skips the batches that were completed, and the file is removed once the migration is done.
+    Resuming relies on the source listing its vertices and edges in the same order each time, so the source must not
+    be modified until the migration completes. The file also records the type and size of both graph stores and a
+    digest of the IDs copied so far, and a ValueError is raised instead of resuming if they don't match, as when the
+    file was left behind by a migration between other graph stores.
+
+    :param source: The Graph or GraphStore to copy from.
+    :param destination: The Graph or GraphStore to copy into.
+    :param batch_size: The number of vertices or edges written to the destination at a time.
+    :param progress: If given, a function called as progress(phase, done, total) after each batch, where phase is
+        'vertices' or 'edges', and done and total are the number of vertices or edges copied so far and overall.
+    :param checkpoint: If given, the path of the file used to make the migration resumable.
+    :param pause_gc: Whether to disable the cyclic garbage collector while copying, which nearly halves the time taken
+        by copies between memory graph stores. It is disabled for the whole process, so only set this when nothing
+        else running in the process needs it in the meantime.
+    :return: The number of vertices and edges copied, as a MigrationResult.
+    """
+    if batch_size < 1:
+        raise ValueError(batch_size)
+    source = source if isinstance(source, base.GraphStore) else source.store
+    destination = destination if isinstance(destination, base.GraphStore) else destination.store
+    flush = getattr(destination, 'flush', None)
+    done = {VERTICES: 0, EDGES: 0}
+    digests = {VERTICES: hashlib.sha1(), EDGES: hashlib.sha1()}
+    source_fingerprint = _fingerprint(source) if checkpoint is not None else None
+    recorded = _read_checkpoint(checkpoint)
+    if recorded is not None:
+        _check_checkpoint(checkpoint, recorded, source, destination)
+
+    with base.paused_gc(pause_gc):
+        phases = ((VERTICES, source.count_vertices, source.iter_vertices, _copy_vertices),
+                  (EDGES, source.count_edges, source.iter_edges, _copy_edges))
+        for phase, count, iterate, copy in phases:
+            total = count()
+            items = iterate()
+            if recorded is not None and recorded[phase]:
+                # The items copied by an earlier run are skipped without reading their records, but their IDs are
+                # checked against the digest, to make sure the source still lists the same items first.
+                for batch in _batches(itertools.islice(items, recorded[phase]), batch_size):
+                    _digest_batch(digests[phase], batch)
+                    done[phase] += len(batch)
+                if done[phase] < recorded[phase] or digests[phase].hexdigest() != recorded['digests'][phase]:
+                    raise ValueError("The migration checkpoint file %r does not match the source's %s." %
+                                     (checkpoint, phase))
+            for batch in _batches(items, batch_size):
+                copy(source, destination, batch)
+                done[phase] += len(batch)
+                if checkpoint is not None:
+                    _digest_batch(digests[phase], batch)
+                    if flush is not None:
+                        flush()
+                    _write_checkpoint(checkpoint, done, digests, source_fingerprint, destination)
+                if progress is not None:
+                    progress(phase, done[phase], total)
+
+    if flush is not None:
+        flush()
+    if checkpoint is not None and os.path.isfile(checkpoint):
+        os.remove(checkpoint)
+    return MigrationResult(done[VERTICES], done[EDGES])
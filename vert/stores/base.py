@@ -9,7 +9,13 @@ Definitions for GraphStore abstract base class and type descriptors for labels a
 """
 
 
-from typing import NewType, Hashable, Any, Optional, Iterator, NamedTuple, Union
+import contextlib
+import functools
+import gc
+import inspect
+import threading
+from typing import NewType, Hashable, Any, Optional, Iterator, NamedTuple, Union, Iterable, Mapping, Tuple, FrozenSet, \
+    Dict, Callable, List
 
 
 __all__ = [
@@ -19,6 +25,13 @@ __all__ = [
     'DirectedEdgeID',
     'UndirectedEdgeID',
     'Label',
+    'VertexRecord',
+    'EdgeRecord',
+    'is_number',
+    'lookup_vertex_data',
+    'lookup_edge_data',
+    'data_matches',
+    'paused_gc',
 ]
 
 
@@ -75,12 +88,13 @@ class UndirectedEdgeID(frozenset, EdgeID):
     Edge ID signifiers for undirected edges.
     """
 
-    def __init__(self, vid1: VertexID, vid2: VertexID):
-        super().__init__((vid1, vid2))
-
     def __new__(cls, vid1: VertexID, vid2: VertexID, *args, **kwargs):
         return frozenset.__new__(cls, (vid1, vid2), *args, **kwargs)
 
+    def __reduce__(self) -> Tuple[type, Tuple[VertexID, VertexID]]:
+        # Frozensets are pickled as their elements, which doesn't match the arguments __new__() takes.
+        return type(self), tuple(self.vertices)
+
     @property
     def is_directed(self) -> bool:
         """Whether or not the edge is directed."""
@@ -100,6 +114,132 @@ class UndirectedEdgeID(frozenset, EdgeID):
                 yield from sorted(self, key=repr)
 
 
+VertexRecord = NamedTuple('VertexRecord', [('labels', FrozenSet[Label]), ('data', Dict[Hashable, Any]),
+                                           ('inbound', int), ('outbound', int), ('undirected', int)])
+VertexRecord.__doc__ = """
+Everything stored for a vertex, fetched in a single call: its labels, a copy of its data, and the number of inbound,
+outbound, and undirected edges it has.
+"""
+
+EdgeRecord = NamedTuple('EdgeRecord', [('labels', FrozenSet[Label]), ('data', Dict[Hashable, Any])])
+EdgeRecord.__doc__ = """
+Everything stored for an edge, fetched in a single call: its labels and a copy of its data.
+"""
+
+
+def is_number(value: Any) -> bool:
+    """
+    Return a Boolean indicating whether the value is a number that ordered data indexes keep in order: an int or a float
+    other than NaN. Booleans are not counted as numbers.
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value == value
+
+
+def data_matches(stored: Any, value: Any) -> bool:
+    """
+    Return a Boolean indicating whether a stored data value matches a value searched for, as by find_vertices(),
+    find_edges(), or filter_vertices(). They must be equal, and Booleans only match Booleans, not the equal numbers 1
+    and 0, as in the data indexes.
+    """
+    return stored == value and isinstance(stored, bool) == isinstance(value, bool)
+
+
+# For each graph store class, whether its get_vertex_data() and get_edge_data() both take a default. Graph stores
+# written before the default parameter was added to the interface don't.
+_TAKES_DEFAULT = {}  # type: Dict[type, bool]
+
+
+def _takes_default(graph_store: 'GraphStore') -> bool:
+    """Return a Boolean indicating whether the graph store's data getters take a default, checking once per class."""
+    store_type = type(graph_store)
+    takes_default = _TAKES_DEFAULT.get(store_type, None)
+    if takes_default is None:
+        takes_default = True
+        for method in (graph_store.get_vertex_data, graph_store.get_edge_data):
+            try:
+                inspect.signature(method).bind(None, None, None)
+            except TypeError:
+                takes_default = False
+            except ValueError:
+                pass  # No signature available; assume the current interface.
+        _TAKES_DEFAULT[store_type] = takes_default
+    return takes_default
+
+
+def lookup_vertex_data(graph_store: 'GraphStore', vid: VertexID, key: Hashable, default: Any = None) -> Any:
+    """
+    Return graph_store.get_vertex_data(vid, key, default). Graph stores whose get_vertex_data() predates the default
+    parameter are supported too, by checking has_vertex_data() first.
+    """
+    if _takes_default(graph_store):
+        return graph_store.get_vertex_data(vid, key, default)
+    if graph_store.has_vertex_data(vid, key):
+        return graph_store.get_vertex_data(vid, key)
+    return default
+
+
+def lookup_edge_data(graph_store: 'GraphStore', eid: EdgeID, key: Hashable, default: Any = None) -> Any:
+    """
+    Return graph_store.get_edge_data(eid, key, default). Graph stores whose get_edge_data() predates the default
+    parameter are supported too, by checking has_edge_data() first.
+    """
+    if _takes_default(graph_store):
+        return graph_store.get_edge_data(eid, key, default)
+    if graph_store.has_edge_data(eid, key):
+        return graph_store.get_edge_data(eid, key)
+    return default
+
+
+# The number of with blocks currently inside paused_gc(), and whether the garbage collector was enabled when the first
+# of them began. Overlapping pauses in different threads leave it disabled until the last one ends.
+_gc_lock = threading.Lock()
+_gc_pauses = 0
+_gc_was_enabled = False
+
+
+@contextlib.contextmanager
+def paused_gc(pause: bool = True) -> Iterator[None]:
+    """
+    Disable the cyclic garbage collector for the duration of the with block, if pause is true, and re-enable it
+    afterward if it was enabled before. Bulk loads and copies create millions of containers that can't be garbage,
+    which the collector would otherwise keep rescanning. The collector is disabled for the whole process, not just the
+    calling thread, so long-running operations should only pause it when their caller asks them to.
+    """
+    global _gc_pauses, _gc_was_enabled
+    if not pause:
+        yield
+        return
+    with _gc_lock:
+        if not _gc_pauses:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pauses += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_pauses -= 1
+            if not _gc_pauses and _gc_was_enabled:
+                gc.enable()
+
+
+def _scan_range(items: Iterable[Any], get_data: Callable[[Any, Hashable, Any], Any], key: Hashable,
+                minimum: Optional[Any], maximum: Optional[Any], reverse: bool) -> Iterator[Any]:
+    """
+    Yield the vertex or edge IDs whose numeric values under the key are in the range, in order of their values, by
+    reading the value of every one of them.
+    """
+    missing = object()
+    found = []
+    for item in items:
+        value = get_data(item, key, missing)
+        if is_number(value) and (minimum is None or value >= minimum) and (maximum is None or value <= maximum):
+            found.append((value, item))
+    found.sort(key=lambda pair: pair[0], reverse=reverse)
+    for _, item in found:
+        yield item
+
+
 class GraphStore:
     """
     The abstract interface for graph stores. All graph stores must support this interface in order to be accessed via
@@ -164,6 +304,74 @@ class GraphStore:
         """Return an iterator over the IDs of every undirected edge connected to this vertex."""
         raise NotImplementedError()
 
+    def iter_sources(self, sink: VertexID) -> Iterator[VertexID]:
+        """
+        Return an iterator over the IDs of the sources of every inbound directed edge to this vertex. Graph stores
+        should override this to avoid building an edge ID for each edge.
+        """
+        for eid in self.iter_inbound(sink):
+            yield eid.source
+
+    def iter_sinks(self, source: VertexID) -> Iterator[VertexID]:
+        """
+        Return an iterator over the IDs of the sinks of every outbound directed edge from this vertex. Graph stores
+        should override this to avoid building an edge ID for each edge.
+        """
+        for eid in self.iter_outbound(source):
+            yield eid.sink
+
+    def iter_neighbors(self, vid: VertexID) -> Iterator[VertexID]:
+        """
+        Return an iterator over the IDs of every vertex connected to this vertex by an edge, whether inbound, outbound,
+        or undirected. Each neighbor is yielded only once, even if it is connected by more than one edge. Graph stores
+        should override this to avoid building an edge ID for each edge.
+        """
+        seen = set()
+        for other in self.iter_sinks(vid):
+            seen.add(other)
+            yield other
+        for other in self.iter_sources(vid):
+            if other not in seen:
+                seen.add(other)
+                yield other
+        for eid in self.iter_undirected(vid):
+            v1, v2 = eid.vertices
+            other = v2 if v1 == vid else v1
+            if other not in seen:
+                seen.add(other)
+                yield other
+
+    def iter_inbound_data(self, sink: VertexID, key: Hashable,
+                          default: Any = None) -> Iterator[Tuple[VertexID, Any]]:
+        """
+        Return an iterator over (source, value) pairs, one for each inbound directed edge to this vertex, where value is
+        the data stored in the edge under the key, or the default if there is none. Graph stores should override this
+        to read each vertex's adjacency and edge data together.
+        """
+        for eid in self.iter_inbound(sink):
+            yield eid.source, lookup_edge_data(self, eid, key, default)
+
+    def iter_outbound_data(self, source: VertexID, key: Hashable,
+                           default: Any = None) -> Iterator[Tuple[VertexID, Any]]:
+        """
+        Return an iterator over (sink, value) pairs, one for each outbound directed edge from this vertex, where value
+        is the data stored in the edge under the key, or the default if there is none. Graph stores should override
+        this to read each vertex's adjacency and edge data together.
+        """
+        for eid in self.iter_outbound(source):
+            yield eid.sink, lookup_edge_data(self, eid, key, default)
+
+    def iter_undirected_data(self, vid: VertexID, key: Hashable,
+                             default: Any = None) -> Iterator[Tuple[VertexID, Any]]:
+        """
+        Return an iterator over (neighbor, value) pairs, one for each undirected edge connected to this vertex, where
+        value is the data stored in the edge under the key, or the default if there is none. Graph stores should
+        override this to read each vertex's adjacency and edge data together.
+        """
+        for eid in self.iter_undirected(vid):
+            v1, v2 = eid.vertices
+            yield (v2 if v1 == vid else v1), lookup_edge_data(self, eid, key, default)
+
     def count_inbound(self, sink: VertexID) -> int:
         """Return the number of inbound directed edges to this vertex."""
         raise NotImplementedError()
@@ -212,6 +420,252 @@ class GraphStore:
         """
         raise NotImplementedError()
 
+    def add_vertices(self, vids: Iterable[VertexID]) -> None:
+        """
+        Add a vertex to the graph for each of these IDs, skipping those that already exist. Equivalent to calling
+        add_vertex() for each ID, but graph stores can override it to do the work in bulk.
+        """
+        for vid in vids:
+            self.add_vertex(vid)
+
+    def add_edges(self, eids: Iterable[EdgeID]) -> None:
+        """
+        Add an edge to the graph for each of these IDs, skipping those that already exist, and adding any missing
+        vertices first. Equivalent to calling add_edge() for each ID, but graph stores can override it to do the work
+        in bulk.
+        """
+        for eid in eids:
+            self.add_edge(eid)
+
+    def discard_vertices(self, vids: Iterable[VertexID]) -> int:
+        """
+        Remove the vertices associated with these IDs from the graph, along with their incident edges. IDs with no
+        associated vertex are ignored. Return the number of vertices that were removed. Equivalent to calling
+        discard_vertex() for each ID, but graph stores can override it to do the work in bulk.
+        """
+        removed = 0
+        for vid in vids:
+            if self.discard_vertex(vid):
+                removed += 1
+        return removed
+
+    def discard_edges(self, eids: Iterable[EdgeID]) -> int:
+        """
+        Remove the edges associated with these IDs from the graph. IDs with no associated edge are ignored. Return the
+        number of edges that were removed. Equivalent to calling discard_edge() for each ID, but graph stores can
+        override it to do the work in bulk.
+        """
+        removed = 0
+        for eid in eids:
+            if self.discard_edge(eid):
+                removed += 1
+        return removed
+
+    def set_vertex_data_many(self, items: Iterable[Tuple[VertexID, Mapping[Hashable, Any]]]) -> None:
+        """
+        For each (vertex ID, mapping) pair, store every key/value pair of the mapping in the vertex, adding the vertex
+        first if it doesn't exist. Equivalent to calling set_vertex_data() for each key/value pair, but graph stores
+        can override it to do the work in bulk.
+        """
+        for vid, data in items:
+            self.add_vertex(vid)
+            for key, value in data.items():
+                self.set_vertex_data(vid, key, value)
+
+    def set_edge_data_many(self, items: Iterable[Tuple[EdgeID, Mapping[Hashable, Any]]]) -> None:
+        """
+        For each (edge ID, mapping) pair, store every key/value pair of the mapping in the edge, adding the edge first
+        if it doesn't exist. Equivalent to calling set_edge_data() for each key/value pair, but graph stores can
+        override it to do the work in bulk.
+        """
+        for eid, data in items:
+            self.add_edge(eid)
+            for key, value in data.items():
+                self.set_edge_data(eid, key, value)
+
+    def add_vertex_labels_many(self, items: Iterable[Tuple[VertexID, Iterable[Label]]]) -> None:
+        """
+        For each (vertex ID, labels) pair, add every one of the labels to the vertex, adding the vertex first if it
+        doesn't exist. Equivalent to calling add_vertex_label() for each label, but graph stores can override it to do
+        the work in bulk.
+        """
+        for vid, labels in items:
+            for label in labels:
+                self.add_vertex_label(vid, label)
+
+    def add_edge_labels_many(self, items: Iterable[Tuple[EdgeID, Iterable[Label]]]) -> None:
+        """
+        For each (edge ID, labels) pair, add every one of the labels to the edge, adding the edge first if it doesn't
+        exist. Equivalent to calling add_edge_label() for each label, but graph stores can override it to do the work
+        in bulk.
+        """
+        for eid, labels in items:
+            for label in labels:
+                self.add_edge_label(eid, label)
+
+    def get_vertex_record(self, vid: VertexID) -> Optional[VertexRecord]:
+        """
+        Return the labels, data, and edge counts of the vertex in a single call, or None if the vertex does not exist.
+        The default implementation makes a separate call for each piece; graph stores should override it to read the
+        vertex only once.
+        """
+        if not self.has_vertex(vid):
+            return None
+        return VertexRecord(frozenset(self.iter_vertex_labels(vid)),
+                            {key: self.get_vertex_data(vid, key) for key in self.iter_vertex_data_keys(vid)},
+                            self.count_inbound(vid), self.count_outbound(vid), self.count_undirected(vid))
+
+    def get_edge_record(self, eid: EdgeID) -> Optional[EdgeRecord]:
+        """
+        Return the labels and data of the edge in a single call, or None if the edge does not exist. The default
+        implementation makes a separate call for each piece; graph stores should override it to read the edge only
+        once.
+        """
+        if not self.has_edge(eid):
+            return None
+        return EdgeRecord(frozenset(self.iter_edge_labels(eid)),
+                          {key: self.get_edge_data(eid, key) for key in self.iter_edge_data_keys(eid)})
+
+    def get_vertex_records(self, vids: Iterable[VertexID]) -> List[Optional[VertexRecord]]:
+        """
+        Return a list of the records of the vertices, in the same order as their IDs, with None for each ID that has no
+        vertex. Equivalent to calling get_vertex_record() for each ID, but graph stores can override it to do the work
+        in bulk.
+        """
+        return [self.get_vertex_record(vid) for vid in vids]
+
+    def get_edge_records(self, eids: Iterable[EdgeID]) -> List[Optional[EdgeRecord]]:
+        """
+        Return a list of the records of the edges, in the same order as their IDs, with None for each ID that has no
+        edge. Equivalent to calling get_edge_record() for each ID, but graph stores can override it to do the work in
+        bulk.
+        """
+        return [self.get_edge_record(eid) for eid in eids]
+
+    def filter_vertices(self, vids: Iterable[VertexID], labels: Iterable[Label] = (),
+                        data: Optional[Mapping[Hashable, Any]] = None) -> Iterator[VertexID]:
+        """
+        Return an iterator over the vertex IDs in vids whose vertices have every one of the labels and store a value
+        equal to each of the values in data under the same key. The IDs are consumed lazily and yielded in the order
+        they are received. Graph stores should override this to test each vertex with a single lookup.
+        """
+        labels = tuple(labels)
+        data = tuple(data.items()) if data else ()
+        missing = object()
+        for vid in vids:
+            if (all(self.has_vertex_label(vid, label) for label in labels) and
+                    all(data_matches(lookup_vertex_data(self, vid, key, missing), value) for key, value in data)):
+                yield vid
+
+    def add_vertex_data_index(self, key: Hashable, ordered: bool = False) -> None:
+        """
+        Declare a secondary index on the vertex data stored under this key, mapping each value to the vertices that
+        store it, so find_vertices() can look them up without scanning the graph. The index is built from the existing
+        data and kept up to date as data is set and discarded. If the key is already indexed, do nothing, except that
+        an existing index is made ordered if ordered is set. Graph stores that support indexes override this; the
+        default implementation does nothing, and find_vertices() scans.
+
+        :param key: The data key to index.
+        :param ordered: Whether the index also keeps the numeric values stored under the key in sorted order, so
+            find_vertices_in_range() can scan ranges of them.
+        """
+
+    def discard_vertex_data_index(self, key: Hashable) -> bool:
+        """
+        Drop the secondary index on the vertex data stored under this key. Return a Boolean indicating whether there
+        was an index to drop.
+        """
+        return False
+
+    def has_vertex_data_index(self, key: Hashable, ordered: bool = False) -> bool:
+        """
+        Return a Boolean indicating whether the vertex data stored under this key is indexed, or if ordered is set,
+        whether it has an ordered index.
+        """
+        return False
+
+    def find_vertices(self, key: Hashable, value: Any) -> Iterator[VertexID]:
+        """
+        Return an iterator over the IDs of the vertices that store a value equal to this one under the key. If the key
+        is indexed, the vertices are looked up in the index. Otherwise, every vertex in the graph is checked. Booleans
+        are not treated as equal to the numbers 1 and 0.
+        """
+        missing = object()
+        for vid in self.iter_vertices():
+            if data_matches(lookup_vertex_data(self, vid, key, missing), value):
+                yield vid
+
+    def find_vertices_in_range(self, key: Hashable, minimum: Optional[Any] = None, maximum: Optional[Any] = None,
+                               reverse: bool = False) -> Iterator[VertexID]:
+        """
+        Return an iterator over the IDs of the vertices that store a number between the minimum and the maximum,
+        inclusive, under the key, in order of the numbers. Values that are not numbers are skipped; see is_number().
+        The results are streamed from the index if the key has an ordered index, so taking the first few of them, e.g.
+        the top N with reverse set, doesn't touch the rest. Otherwise, every vertex in the graph is checked.
+
+        :param key: The data key to look up.
+        :param minimum: The lowest value to include, or None for no lower bound.
+        :param maximum: The highest value to include, or None for no upper bound.
+        :param reverse: Whether to yield the highest values first.
+        :return: An iterator over the vertex IDs.
+        """
+        return _scan_range(self.iter_vertices(), functools.partial(lookup_vertex_data, self), key, minimum, maximum,
+                           reverse)
+
+    def add_edge_data_index(self, key: Hashable, ordered: bool = False) -> None:
+        """
+        Declare a secondary index on the edge data stored under this key, mapping each value to the edges that store
+        it, so find_edges() can look them up without scanning the graph. The index is built from the existing data and
+        kept up to date as data is set and discarded. If the key is already indexed, do nothing, except that an
+        existing index is made ordered if ordered is set. Graph stores that support indexes override this; the default
+        implementation does nothing, and find_edges() scans.
+
+        :param key: The data key to index.
+        :param ordered: Whether the index also keeps the numeric values stored under the key in sorted order, so
+            find_edges_in_range() can scan ranges of them.
+        """
+
+    def discard_edge_data_index(self, key: Hashable) -> bool:
+        """
+        Drop the secondary index on the edge data stored under this key. Return a Boolean indicating whether there was
+        an index to drop.
+        """
+        return False
+
+    def has_edge_data_index(self, key: Hashable, ordered: bool = False) -> bool:
+        """
+        Return a Boolean indicating whether the edge data stored under this key is indexed, or if ordered is set,
+        whether it has an ordered index.
+        """
+        return False
+
+    def find_edges(self, key: Hashable, value: Any) -> Iterator[EdgeID]:
+        """
+        Return an iterator over the IDs of the edges that store a value equal to this one under the key. If the key is
+        indexed, the edges are looked up in the index. Otherwise, every edge in the graph is checked. Booleans are not
+        treated as equal to the numbers 1 and 0.
+        """
+        missing = object()
+        for eid in self.iter_edges():
+            if data_matches(lookup_edge_data(self, eid, key, missing), value):
+                yield eid
+
+    def find_edges_in_range(self, key: Hashable, minimum: Optional[Any] = None, maximum: Optional[Any] = None,
+                            reverse: bool = False) -> Iterator[EdgeID]:
+        """
+        Return an iterator over the IDs of the edges that store a number between the minimum and the maximum,
+        inclusive, under the key, in order of the numbers. Values that are not numbers are skipped; see is_number().
+        The results are streamed from the index if the key has an ordered index, so taking the first few of them, e.g.
+        the top N with reverse set, doesn't touch the rest. Otherwise, every edge in the graph is checked.
+
+        :param key: The data key to look up.
+        :param minimum: The lowest value to include, or None for no lower bound.
+        :param maximum: The highest value to include, or None for no upper bound.
+        :param reverse: Whether to yield the highest values first.
+        :return: An iterator over the edge IDs.
+        """
+        return _scan_range(self.iter_edges(), functools.partial(lookup_edge_data, self), key, minimum, maximum, reverse)
+
     def add_vertex_label(self, vid: VertexID, label: Label) -> None:
         """Add a label to the vertex. If the vertex already has the label, do nothing."""
         raise NotImplementedError()
@@ -258,8 +712,38 @@ class GraphStore:
         """Return the number of labels the edge has."""
         raise NotImplementedError()
 
-    def get_vertex_data(self, vid: VertexID, key: Hashable) -> Any:
-        """Return the value stored in the vertex for this key."""
+    def iter_vertices_with_label(self, label: Label) -> Iterator[VertexID]:
+        """
+        Return an iterator over the IDs of the vertices that have the label. Graph stores that keep an inverted index
+        of their labels look the vertices up in it. Otherwise, every vertex in the graph is checked.
+        """
+        for vid in self.iter_vertices():
+            if self.has_vertex_label(vid, label):
+                yield vid
+
+    def count_vertices_with_label(self, label: Label) -> int:
+        """Return the number of vertices that have the label."""
+        return sum(1 for _ in self.iter_vertices_with_label(label))
+
+    def iter_edges_with_label(self, label: Label) -> Iterator[EdgeID]:
+        """
+        Return an iterator over the IDs of the edges that have the label. Graph stores that keep an inverted index of
+        their labels look the edges up in it. Otherwise, every edge in the graph is checked.
+        """
+        for eid in self.iter_edges():
+            if self.has_edge_label(eid, label):
+                yield eid
+
+    def count_edges_with_label(self, label: Label) -> int:
+        """Return the number of edges that have the label."""
+        return sum(1 for _ in self.iter_edges_with_label(label))
+
+    def get_vertex_data(self, vid: VertexID, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the value stored in the vertex for this key. If no value is stored for the key, return the default. A
+        unique sentinel object can be passed as the default to distinguish a missing key from a stored None in a
+        single lookup.
+        """
         raise NotImplementedError()
 
     def set_vertex_data(self, vid: VertexID, key: Hashable, value: Any) -> None:
@@ -285,8 +769,12 @@ class GraphStore:
         """Return the number of key/value pairs stored in the vertex."""
         raise NotImplementedError()
 
-    def get_edge_data(self, eid: EdgeID, key: Hashable) -> Any:
-        """Return the value stored in the edge for this key."""
+    def get_edge_data(self, eid: EdgeID, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the value stored in the edge for this key. If no value is stored for the key, return the default. A
+        unique sentinel object can be passed as the default to distinguish a missing key from a stored None in a
+        single lookup.
+        """
         raise NotImplementedError()
 
     def set_edge_data(self, eid: EdgeID, key: Hashable, value: Any) -> None:
@@ -9,13 +9,23 @@ A persistent graph store implemented on top of the built-in Python library, dbm.
 
 
 import ast
+import bisect
 import dbm
+import functools
 import json
+import threading
 import time
-from typing import Hashable, Any, Optional, Iterator, Union, MutableMapping, NewType
+from typing import Hashable, Any, Optional, Iterator, Union, MutableMapping, NewType, Iterable, Mapping, Tuple, \
+    List, Dict, Callable
 
 
 import vert.stores.base as base
+from vert.stores.locking import FileReadWriteLock
+
+try:
+    import dbm.gnu as gdbm
+except ImportError:
+    gdbm = None
 
 
 __all__ = [
@@ -29,6 +39,13 @@ EdgeData = NewType('EdgeData', list)
 COUNT_PREFIX = b'c'
 VID_PREFIX = b'v'
 EID_PREFIX = b'e'
+INDEX_KEYS_PREFIX = b'k'
+INDEX_PREFIX = b'i'
+ORDERED_KEYS_PREFIX = b'q'
+ORDER_PREFIX = b'o'
+PAGE_PREFIX = b'p'
+LABEL_COUNTS_PREFIX = b'n'
+LABELED_PREFIX = b'l'
 
 LABEL_INDEX = 0
 DATA_INDEX = 1
@@ -36,16 +53,91 @@ SOURCES_INDEX = 2
 SINKS_INDEX = 3
 UNDIRECTED_INDEX = 4
 
+# The number of items processed together by the bulk operations. Each vertex record touched by a batch is read and
+# written only once for the whole batch.
+BULK_BATCH_SIZE = 1000
+
+# The number of secondary index entries held in memory before the modified ones are written back to the database.
+INDEX_CACHE_SIZE = 1000
+
+# The most distinct numbers held in one page of an ordered index. A page that grows past this is split in two.
+ORDER_PAGE_SIZE = 512
+
+# The extension appended to the path of a shared database to get the path of its lock file.
+LOCK_EXTENSION = '.lock'
+
+
+def _merge_labels(items: Iterable[Tuple[Any, Iterable[base.Label]]]) -> Dict[Any, List[base.Label]]:
+    """Merge the labels given for each vertex or edge ID into a single list, without duplicates."""
+    merged = {}  # type: Dict[Any, List[base.Label]]
+    for item, labels in items:
+        item_labels = merged.get(item, None)
+        if item_labels is None:
+            item_labels = merged[item] = []
+        for label in labels:
+            if label not in item_labels:
+                item_labels.append(label)
+    return merged
+
+
+def _batches(items: Iterable[Any]) -> Iterator[List[Any]]:
+    """Split the items into lists of at most BULK_BATCH_SIZE items each."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= BULK_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _locked(write: bool) -> Callable[[Callable], Callable]:
+    """
+    Return a decorator for the public methods of DBMGraphStore that holds the write lock, if write is set, or otherwise
+    the read lock, around each call when the database is shared. Iterators are read into lists while the lock is held,
+    as LockingGraphStore does, since the database may be reopened or changed by another process once it is released.
+    Graph stores that aren't shared call the method directly.
+    """
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def locked_method(self: 'DBMGraphStore', *args, **kwargs) -> Any:
+            lock = self._lock
+            if lock is None:
+                return method(self, *args, **kwargs)
+            with lock.write_locked() if write else lock.read_locked():
+                result = method(self, *args, **kwargs)
+                if isinstance(result, Iterator):
+                    result = iter(list(result))
+            return result
+        return locked_method
+    return decorator
+
+
+_read_locked = _locked(False)
+_write_locked = _locked(True)
+
 
 class DBMGraphStore(base.GraphStore):
     """
     A Python-only persistent graph store based on the built-in dbm module, with optional memory-level caching for
     performance gains at the expense of robustness to incorrect shutdowns.
+
+    A database can be shared by several processes by opening it with shared set in each of them. The graph store's
+    lock is then a FileReadWriteLock on a lock file next to the database, which every access has to hold: the read
+    lock for reads and the write lock for writes. Each method call takes the lock for its own duration, so a shared
+    graph store can be used directly, even from several threads. To make a sequence of calls atomic, hold the lock's
+    write_locked() around them. Writes are flushed to disk before the write lock is released, and when another process
+    has written to the database since the lock was last held, the caches are dropped and the database is reopened once
+    it is acquired. A dbm.dumb database is also reopened after each write, which makes writes slow as it grows, so
+    sharing is best used with dbm.gnu.
     """
 
     def __init__(self, path: Union[str, MutableMapping[bytes, bytes]], v_cache_size: int = 100,
-                 e_cache_size: int = 100):
+                 e_cache_size: int = 100, shared: bool = False):
         self._db = None  # So it's defined in __del__ in case we get an error opening the database
+        self._lock = None  # type: Optional[FileReadWriteLock]
+        self._db_type = None  # type: Optional[str]
         self._auto_close_db = False
         self._is_open = True
 
@@ -65,6 +157,42 @@ class DBMGraphStore(base.GraphStore):
         self._e_count = None
         self._e_count_dirty = False
 
+        # Secondary indexes on data values. The indexed keys are read from the database the first time they are
+        # needed. Each index entry is the set of encoded IDs storing one value under one indexed key. Entries are
+        # cached in memory, and written back when the cache fills up or the graph store is flushed.
+        self._indexed_keys = {}  # type: Dict[bytes, List[Hashable]]
+        self._index_cache = {}  # type: Dict[bytes, Union[set, list]]
+        self._index_dirty = set()
+
+        # Ordered indexes keep the distinct numbers stored under their keys in sorted pages of at most ORDER_PAGE_SIZE
+        # numbers each. A directory entry per key lists the first number and the page number of each page, in order,
+        # so a number's page is found by bisecting the directory. Pages and directories are cached like index entries.
+        self._ordered_keys = {}  # type: Dict[bytes, List[Hashable]]
+
+        # Inverted indexes of the labels. Each entry is the set of encoded IDs with one label, and is cached along with
+        # the secondary index entries. The number of IDs with each label is kept in memory, and written back when the
+        # graph store is flushed, so labels can be counted without reading their entries.
+        self._label_counts = {}  # type: Dict[bytes, Dict[base.Label, int]]
+        self._label_counts_dirty = set()
+
+        # Reads modify the caches too, filling them and writing back the records they push out, so the caches and the
+        # database are only touched while this lock is held. It is held just long enough to fetch a record, so threads
+        # that only read can share the graph store, e.g. under the read lock of a LockingGraphStore. Writes still need
+        # to be kept apart from every other access by the caller.
+        self._cache_lock = threading.RLock()
+
+        if shared:
+            if not isinstance(path, str):
+                raise TypeError("Only databases opened by path can be shared.")
+            self._auto_close_db = True
+            self._path = path
+            self._lock = FileReadWriteLock(path + LOCK_EXTENSION, self._lock_acquired, self._lock_releasing)
+            # The database is opened when the lock is first acquired. The write lock is taken, since opening may
+            # create the database or write its label counts.
+            with self._lock.write_locked():
+                pass
+            return
+
         if isinstance(path, str):
             self._auto_close_db = True
             self._db = dbm.open(path, flag='c')
@@ -74,6 +202,10 @@ class DBMGraphStore(base.GraphStore):
                 # noinspection PyUnresolvedReferences
                 self._is_open = self._db.is_open
 
+        if self._is_open:
+            self._load_label_counts(VID_PREFIX)
+            self._load_label_counts(EID_PREFIX)
+
     def __del__(self) -> None:
         self.close()
 
@@ -86,13 +218,82 @@ class DBMGraphStore(base.GraphStore):
     def close(self):
         """Perform a proper shutdown of the graph store, ensuring that if the graph store is persistent, it will be
         in a consistent on-disk state."""
-        if not self._is_open:
-            return
-        self.flush()
+        if self._is_open:
+            self._close()
+
+    @_write_locked
+    def _close(self) -> None:
+        """Flush and close the database, and the lock file if the database is shared."""
+        self._flush()
         if self._auto_close_db and hasattr(self._db, 'close'):
             # noinspection PyUnresolvedReferences
             self._db.close()
         self._is_open = False
+        if self._lock is not None:
+            self._lock.close()
+
+    @property
+    def lock(self) -> Optional[FileReadWriteLock]:
+        """
+        The lock that has to be held to access a database shared between processes, or None if the database is not
+        shared.
+        """
+        return self._lock
+
+    def _lock_acquired(self, write: bool, changed: bool) -> None:
+        """Reload the database when the lock is acquired if another process has written to it since."""
+        if not changed and self._db is not None:
+            return
+        with self._cache_lock:
+            if changed:
+                self._v_cache.clear()
+                self._v_cache_times.clear()
+                self._v_cache_dirty.clear()
+                self._e_cache.clear()
+                self._e_cache_times.clear()
+                self._e_cache_dirty.clear()
+                self._v_count = None
+                self._v_count_dirty = False
+                self._e_count = None
+                self._e_count_dirty = False
+                self._indexed_keys.clear()
+                self._ordered_keys.clear()
+                self._index_cache.clear()
+                self._index_dirty.clear()
+                self._label_counts.clear()
+                self._label_counts_dirty.clear()
+
+                # Some dbm implementations, including dbm.dumb, keep part of the database in memory, so the database
+                # is reopened to see the other process's changes.
+                if self._db is not None:
+                    self._db.close()
+                    self._db = None
+
+            if self._db is None:
+                if not dbm.whichdb(self._path):
+                    dbm.open(self._path, flag='c').close()
+                self._db_type = dbm.whichdb(self._path)
+                if gdbm is not None and self._db_type == 'dbm.gnu':
+                    # The lock file takes the place of gdbm's own locking, which keeps other processes from opening
+                    # the database at all while it is open.
+                    self._db = gdbm.open(self._path, 'cu')
+                else:
+                    self._db = dbm.open(self._path, flag='c')
+
+            if changed:
+                self._load_label_counts(VID_PREFIX)
+                self._load_label_counts(EID_PREFIX)
+
+    def _lock_releasing(self, write: bool) -> None:
+        """Flush the writes made under the write lock to disk before it is released."""
+        if write and self._is_open:
+            self._flush()
+            if self._db_type == 'dbm.dumb':
+                # Once written to, a dbm.dumb database writes its whole index back to disk when it is closed, which
+                # would undo the other processes' changes if it were only closed after they had been made. It is
+                # closed now instead, and reopened the next time the lock is acquired.
+                self._db.close()
+                self._db = None
 
     @property
     def vertex_cache_size(self) -> int:
@@ -118,7 +319,7 @@ class DBMGraphStore(base.GraphStore):
         assert value >= 0
         self._e_cache_size = value
         while len(self._e_cache) > self._e_cache_size:
-            self._retire_vertex()
+            self._retire_edge()
 
     @staticmethod
     def _encode_key(key: Any, prefix: bytes) -> bytes:
@@ -190,24 +391,25 @@ class DBMGraphStore(base.GraphStore):
     def _read_vertex(self, vid: base.VertexID) -> VertexData:
         """Read a vertex from the cache or disk. If caching is enabled, ensure the vertex is cached."""
         assert self._is_open
-        if not self._v_cache_size:
-            return self._immediate_read_data(vid, VID_PREFIX)
+        with self._cache_lock:
+            if not self._v_cache_size:
+                return self._immediate_read_data(vid, VID_PREFIX)
 
-        if vid in self._v_cache:
-            self._v_cache_times[vid] = time.time()
-            return self._v_cache[vid]
+            if vid in self._v_cache:
+                self._v_cache_times[vid] = time.time()
+                return self._v_cache[vid]
 
-        data = self._immediate_read_data(vid, VID_PREFIX)
+            data = self._immediate_read_data(vid, VID_PREFIX)
 
-        # It's important that this comes *after* we attempt to read the data, since reading it can cause a
-        # KeyError, at which point we have a key in the times dictionary that isn't in the cache.
-        self._v_cache_times[vid] = time.time()
+            # It's important that this comes *after* we attempt to read the data, since reading it can cause a
+            # KeyError, at which point we have a key in the times dictionary that isn't in the cache.
+            self._v_cache_times[vid] = time.time()
 
-        self._v_cache[vid] = data
-        if len(self._v_cache) > self._v_cache_size:
-            self._retire_vertex()
+            self._v_cache[vid] = data
+            if len(self._v_cache) > self._v_cache_size:
+                self._retire_vertex()
 
-        return data
+            return data
 
     def _write_vertex(self, vid: base.VertexID, data: VertexData):
         """Write a vertex to the cache or disk. If caching is enabled, ensure the vertex is cached."""
@@ -243,24 +445,32 @@ class DBMGraphStore(base.GraphStore):
     def _read_edge(self, eid: base.EdgeID) -> EdgeData:
         """Read an edge from the cache or disk. If caching is enabled, ensure the edge is cached."""
         assert self._is_open
-        if not self._e_cache_size:
-            return self._immediate_read_data(eid, EID_PREFIX)
+        with self._cache_lock:
+            if not self._e_cache_size:
+                return self._immediate_read_data(eid, EID_PREFIX)
 
-        if eid in self._e_cache:
-            self._e_cache_times[eid] = time.time()
-            return self._e_cache[eid]
+            if eid in self._e_cache:
+                self._e_cache_times[eid] = time.time()
+                return self._e_cache[eid]
 
-        data = self._immediate_read_data(eid, EID_PREFIX)
+            data = self._immediate_read_data(eid, EID_PREFIX)
 
-        # It's important that this comes *after* we attempt to read the data, since reading it can cause a
-        # KeyError, at which point we have a key in the times dictionary that isn't in the cache.
-        self._e_cache_times[eid] = time.time()
+            # It's important that this comes *after* we attempt to read the data, since reading it can cause a
+            # KeyError, at which point we have a key in the times dictionary that isn't in the cache.
+            self._e_cache_times[eid] = time.time()
 
-        self._e_cache[eid] = data
-        if len(self._e_cache) > self._e_cache_size:
-            self._retire_vertex()
+            self._e_cache[eid] = data
+            if len(self._e_cache) > self._e_cache_size:
+                self._retire_edge()
 
-        return data
+            return data
+
+    def _read_edge_value(self, eid: base.EdgeID, key: Hashable, default: Any) -> Any:
+        """Read a single value from an edge's data, returning the default if the edge or key is missing."""
+        try:
+            return self._read_edge(eid)[DATA_INDEX].get(key, default)
+        except KeyError:
+            return default
 
     def _write_edge(self, eid: base.EdgeID, data: EdgeData) -> None:
         """Write an edge to the cache or disk. If caching is enabled, ensure the edge is cached."""
@@ -293,65 +503,443 @@ class DBMGraphStore(base.GraphStore):
         else:
             self._immediate_del_data(eid, EID_PREFIX)
 
+    def _get_indexed_keys(self, prefix: bytes) -> List[Hashable]:
+        """Return the indexed data keys of the vertices or the edges, depending on the prefix."""
+        keys = self._indexed_keys.get(prefix, None)
+        if keys is None:
+            with self._cache_lock:
+                try:
+                    keys = self._immediate_read_data(prefix, INDEX_KEYS_PREFIX)
+                except KeyError:
+                    keys = []
+                self._indexed_keys[prefix] = keys
+        return keys
+
+    def _get_ordered_keys(self, prefix: bytes) -> List[Hashable]:
+        """Return the data keys of the vertices or the edges with ordered indexes, depending on the prefix."""
+        keys = self._ordered_keys.get(prefix, None)
+        if keys is None:
+            with self._cache_lock:
+                try:
+                    keys = self._immediate_read_data(prefix, ORDERED_KEYS_PREFIX)
+                except KeyError:
+                    keys = []
+                self._ordered_keys[prefix] = keys
+        return keys
+
+    def _index_entry_key(self, prefix: bytes, key: Hashable, value: Any) -> bytes:
+        """
+        Return the database key of the index entry for a value stored under an indexed key. Values are identified by
+        their JSON encoding, since that is how they are stored, except that floats with integral values are encoded as
+        the equal ints, so equal numbers share an entry.
+        """
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        return self._encode_key((prefix.decode(), key, json.dumps(value, sort_keys=True)), INDEX_PREFIX)
+
+    def _read_index_entry(self, entry_key: bytes, factory: type = set) -> Union[set, list]:
+        """
+        Return an index entry, reading it into the index cache if necessary. Entries are sets of encoded IDs, except
+        for the pages and directories of ordered indexes, which are read with list as the factory.
+        """
+        entry = self._index_cache.get(entry_key, None)
+        if entry is None:
+            with self._cache_lock:
+                entry = self._index_cache.get(entry_key, None)
+                if entry is None:
+                    try:
+                        entry = factory(json.loads(self._db[entry_key].decode()))
+                    except KeyError:
+                        entry = factory()
+                    self._index_cache[entry_key] = entry
+        return entry
+
+    def _make_index_room(self) -> None:
+        """
+        Flush the index cache if it is full. This is done before each index update rather than while reading entries,
+        so the entries read by one update stay cached until it is done with them.
+        """
+        if len(self._index_cache) >= INDEX_CACHE_SIZE:
+            self._flush_index()
+
+    def _flush_index(self) -> None:
+        """Write the modified index entries to disk and clear the index cache."""
+        # Emptied entries are written rather than deleted, since some dbm implementations, including dbm.dumb, rewrite
+        # their whole directory file on every deletion.
+        for entry_key in self._index_dirty:
+            entry = self._index_cache[entry_key]
+            self._db[entry_key] = json.dumps(sorted(entry) if isinstance(entry, set) else entry).encode()
+        self._index_dirty.clear()
+        self._index_cache.clear()
+
+    def _update_index(self, prefix: bytes, key: Hashable, value: Any, item: Any, add: bool) -> None:
+        """Add the vertex or edge ID to the index entry for the value, or remove it. The key must be indexed."""
+        self._make_index_room()
+        entry_key = self._index_entry_key(prefix, key, value)
+        entry = self._read_index_entry(entry_key)
+        encoded = self._encode_key(item, prefix)[len(prefix):].decode()
+        if add:
+            if not entry and base.is_number(value) and key in self._get_ordered_keys(prefix):
+                self._insert_ordered(prefix, key, value)
+            entry.add(encoded)
+        elif encoded in entry:
+            entry.discard(encoded)
+            if not entry and base.is_number(value) and key in self._get_ordered_keys(prefix):
+                self._remove_ordered(prefix, key, value)
+        self._index_dirty.add(entry_key)
+
+    def _read_directory(self, prefix: bytes, key: Hashable) -> Tuple[bytes, List[Any], List[int]]:
+        """
+        Return the database key of an ordered index's directory, and the directory's lists of the first number of each
+        page and of the page numbers.
+        """
+        directory_key = self._encode_key((prefix.decode(), key), ORDER_PREFIX)
+        directory = self._read_index_entry(directory_key, list)
+        if not directory:
+            directory.extend(([], []))
+        return directory_key, directory[0], directory[1]
+
+    def _page_key(self, prefix: bytes, key: Hashable, page: int) -> bytes:
+        """Return the database key of a page of an ordered index."""
+        return self._encode_key((prefix.decode(), key, page), PAGE_PREFIX)
+
+    def _insert_ordered(self, prefix: bytes, key: Hashable, value: Any) -> None:
+        """Add a number that was not stored under the key before to the key's ordered index."""
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        directory_key, firsts, pages = self._read_directory(prefix, key)
+        if not pages:
+            firsts.append(value)
+            pages.append(0)
+        position = max(bisect.bisect_right(firsts, value) - 1, 0)
+        page_key = self._page_key(prefix, key, pages[position])
+        page = self._read_index_entry(page_key, list)
+        bisect.insort(page, value)
+        firsts[position] = page[0]
+        if len(page) > ORDER_PAGE_SIZE:
+            # Split the page, moving its upper half to a new page after it.
+            new_page_number = max(pages) + 1
+            new_page_key = self._page_key(prefix, key, new_page_number)
+            new_page = self._read_index_entry(new_page_key, list)
+            half = len(page) // 2
+            new_page[:] = page[half:]
+            del page[half:]
+            firsts.insert(position + 1, new_page[0])
+            pages.insert(position + 1, new_page_number)
+            self._index_dirty.add(new_page_key)
+        self._index_dirty.add(page_key)
+        self._index_dirty.add(directory_key)
+
+    def _remove_ordered(self, prefix: bytes, key: Hashable, value: Any) -> None:
+        """Remove a number that is no longer stored under the key from the key's ordered index."""
+        directory_key, firsts, pages = self._read_directory(prefix, key)
+        position = bisect.bisect_right(firsts, value) - 1
+        if position < 0:
+            return
+        page_key = self._page_key(prefix, key, pages[position])
+        page = self._read_index_entry(page_key, list)
+        index = bisect.bisect_left(page, value)
+        if index < len(page) and page[index] == value:
+            del page[index]
+        # Emptied pages are dropped from the directory, but not merged with their neighbors when they run low.
+        if page:
+            firsts[position] = page[0]
+        else:
+            del firsts[position]
+            del pages[position]
+        self._index_dirty.add(page_key)
+        self._index_dirty.add(directory_key)
+
+    def _build_order(self, prefix: bytes, key: Hashable) -> None:
+        """Write the pages and the directory of an ordered index for the key, which must already be indexed."""
+        self._flush_index()
+        values = []
+        for entry_key in list(self._db.keys()):
+            if not entry_key.startswith(INDEX_PREFIX):
+                continue
+            entry_prefix, entry_data_key, encoded_value = self._decode_key(entry_key, INDEX_PREFIX)
+            if (entry_prefix, entry_data_key) == (prefix.decode(), key) and json.loads(self._db[entry_key].decode()):
+                value = json.loads(encoded_value)
+                if base.is_number(value):
+                    values.append(value)
+        values.sort()
+        # Pages start out half full, so they have room to grow before they are split.
+        firsts = []
+        pages = []
+        for start in range(0, len(values), ORDER_PAGE_SIZE // 2):
+            page = values[start:start + ORDER_PAGE_SIZE // 2]
+            self._db[self._page_key(prefix, key, len(pages))] = json.dumps(page).encode()
+            firsts.append(page[0])
+            pages.append(len(pages))
+        self._immediate_write_data((prefix.decode(), key), ORDER_PREFIX, [firsts, pages])
+
+    def _iter_ordered(self, prefix: bytes, key: Hashable, minimum: Optional[Any], maximum: Optional[Any],
+                      reverse: bool) -> Iterator[Any]:
+        """
+        Yield the vertex or edge IDs that store a number in the range under the key from its ordered index, a page at a
+        time. Each page is found by bisecting for the last number of the one before, so the graph store can be
+        modified while the IDs are iterated over.
+        """
+        bound = maximum if reverse else minimum
+        inclusive = True
+        while True:
+            self._make_index_room()
+            if key not in self._get_ordered_keys(prefix):
+                return
+            _, firsts, pages = self._read_directory(prefix, key)
+            values = []
+            if reverse:
+                position = len(pages) - 1 if bound is None else bisect.bisect_right(firsts, bound) - 1
+                while position >= 0 and not values:
+                    page = self._read_index_entry(self._page_key(prefix, key, pages[position]), list)
+                    if bound is None:
+                        stop = len(page)
+                    else:
+                        stop = (bisect.bisect_right if inclusive else bisect.bisect_left)(page, bound)
+                    values = page[:stop]
+                    values.reverse()
+                    position -= 1
+                if minimum is not None:
+                    values = [value for value in values if value >= minimum]
+            else:
+                position = 0 if bound is None else max(bisect.bisect_right(firsts, bound) - 1, 0)
+                while position < len(pages) and not values:
+                    page = self._read_index_entry(self._page_key(prefix, key, pages[position]), list)
+                    if bound is None:
+                        start = 0
+                    else:
+                        start = (bisect.bisect_left if inclusive else bisect.bisect_right)(page, bound)
+                    values = page[start:]
+                    position += 1
+                if maximum is not None:
+                    values = [value for value in values if value <= maximum]
+            if not values:
+                return
+            found = []
+            for value in values:
+                found.extend(sorted(self._read_index_entry(self._index_entry_key(prefix, key, value))))
+            for encoded in found:
+                yield self._decode_key(prefix + encoded.encode(), prefix)
+            bound = values[-1]
+            inclusive = False
+
+    def _index_data(self, prefix: bytes, item: Any, old: Mapping[Hashable, Any],
+                    updates: Mapping[Hashable, Any]) -> None:
+        """Update the index entries of a vertex or edge whose data is about to be updated from old with updates."""
+        for key in self._get_indexed_keys(prefix):
+            if key in updates:
+                if key in old:
+                    self._update_index(prefix, key, old[key], item, False)
+                self._update_index(prefix, key, updates[key], item, True)
+
+    def _unindex_data(self, prefix: bytes, item: Any, removed: Mapping[Hashable, Any]) -> None:
+        """Remove a vertex or edge from the index entries of data that is being removed from it."""
+        for key in self._get_indexed_keys(prefix):
+            if key in removed:
+                self._update_index(prefix, key, removed[key], item, False)
+
+    def _add_index(self, prefix: bytes, key: Hashable, ordered: bool) -> None:
+        """
+        Create the index for the key, adding every vertex or edge that stores a value for it. If ordered is set, build
+        the ordered index for the key, whether or not it was already indexed.
+        """
+        keys = self._get_indexed_keys(prefix)
+        if key not in keys:
+            self._build_index(prefix, key)
+        ordered_keys = self._get_ordered_keys(prefix)
+        if ordered and key not in ordered_keys:
+            self._build_order(prefix, key)
+            ordered_keys.append(key)
+            self._immediate_write_data(prefix, ORDERED_KEYS_PREFIX, ordered_keys)
+
+    def _build_index(self, prefix: bytes, key: Hashable) -> None:
+        """Write the index entries for the key, and add it to the indexed keys."""
+        keys = self._get_indexed_keys(prefix)
+        iterate, read = (self.iter_vertices, self._read_vertex) if prefix == VID_PREFIX else \
+            (self.iter_edges, self._read_edge)
+        # The IDs are listed up front, since index entries may be written to the database while it is being built.
+        for item in list(iterate()):
+            data = read(item)[DATA_INDEX]
+            if key in data:
+                self._update_index(prefix, key, data[key], item, True)
+        keys.append(key)
+        self._immediate_write_data(prefix, INDEX_KEYS_PREFIX, keys)
+
+    def _discard_index(self, prefix: bytes, key: Hashable) -> bool:
+        """Drop the index for the key, removing its entries from the database."""
+        keys = self._get_indexed_keys(prefix)
+        if key not in keys:
+            return False
+        keys.remove(key)
+        self._immediate_write_data(prefix, INDEX_KEYS_PREFIX, keys)
+        ordered_keys = self._get_ordered_keys(prefix)
+        if key in ordered_keys:
+            ordered_keys.remove(key)
+            self._immediate_write_data(prefix, ORDERED_KEYS_PREFIX, ordered_keys)
+        self._flush_index()
+        for entry_key in list(self._db.keys()):
+            for entry_prefix in (INDEX_PREFIX, ORDER_PREFIX, PAGE_PREFIX):
+                if entry_key.startswith(entry_prefix) and self._decode_key(entry_key, entry_prefix)[:2] == \
+                        (prefix.decode(), key):
+                    del self._db[entry_key]
+        return True
+
+    def _find(self, prefix: bytes, key: Hashable, value: Any) -> Optional[Iterator[Any]]:
+        """
+        Return an iterator over the vertex or edge IDs that store the value under the key, or None if the key is not
+        indexed.
+        """
+        if key not in self._get_indexed_keys(prefix):
+            return None
+        try:
+            entry_key = self._index_entry_key(prefix, key, value)
+        except TypeError:
+            return iter(())  # Values that can't be encoded can't have been stored.
+        self._make_index_room()
+        return iter([self._decode_key(prefix + encoded.encode(), prefix)
+                     for encoded in sorted(self._read_index_entry(entry_key))])
+
+    def _load_label_counts(self, prefix: bytes) -> None:
+        """
+        Read the label counts of the vertices or the edges, depending on the prefix. Databases written before the label
+        indexes were added don't have any, so their label indexes are built from the records instead.
+        """
+        try:
+            self._label_counts[prefix] = {label: count for label, count in
+                                          self._immediate_read_data(prefix, LABEL_COUNTS_PREFIX)}
+            return
+        except KeyError:
+            self._label_counts[prefix] = {}
+            self._label_counts_dirty.add(prefix)
+        iterate, read = (self.iter_vertices, self._read_vertex) if prefix == VID_PREFIX else \
+            (self.iter_edges, self._read_edge)
+        for item in list(iterate()):
+            for label in read(item)[LABEL_INDEX]:
+                self._update_label_index(prefix, label, item, True)
+
+    def _label_entry_key(self, prefix: bytes, label: base.Label) -> bytes:
+        """Return the database key of the label index entry for a label of the vertices or the edges."""
+        return self._encode_key((prefix.decode(), label), LABELED_PREFIX)
+
+    def _update_label_index(self, prefix: bytes, label: base.Label, item: Any, add: bool) -> None:
+        """Add the vertex or edge ID to the label's index entry, or remove it, and update the label's count."""
+        self._make_index_room()
+        entry_key = self._label_entry_key(prefix, label)
+        entry = self._read_index_entry(entry_key)
+        encoded = self._encode_key(item, prefix)[len(prefix):].decode()
+        if add:
+            entry.add(encoded)
+        else:
+            entry.discard(encoded)
+        self._index_dirty.add(entry_key)
+        counts = self._label_counts[prefix]
+        if entry:
+            counts[label] = len(entry)
+        else:
+            counts.pop(label, None)
+        self._label_counts_dirty.add(prefix)
+
+    def _iter_with_label(self, prefix: bytes, label: base.Label) -> Iterator[Any]:
+        """Return an iterator over the vertex or edge IDs with the label, looked up in the label index."""
+        if not self._label_counts[prefix].get(label, 0):
+            return iter(())
+        self._make_index_room()
+        entry = self._read_index_entry(self._label_entry_key(prefix, label))
+        return iter([self._decode_key(prefix + encoded.encode(), prefix) for encoded in sorted(entry)])
+
+    def _unindex_edge(self, eid: base.EdgeID) -> None:
+        """
+        Remove an edge that is about to be deleted from the secondary and label indexes. If the edge does not exist,
+        raise a KeyError.
+        """
+        labels, data = self._read_edge(eid)
+        self._unindex_data(EID_PREFIX, eid, data)
+        for label in labels:
+            self._update_label_index(EID_PREFIX, label, eid, False)
+
+    @_write_locked
     def flush(self) -> None:
         """Flush all writes to disk and clear all caches."""
-        for vid in sorted(self._v_cache_times, key=self._v_cache_times.get):
-            self._retire_vertex(vid)
-        for eid in sorted(self._e_cache_times, key=self._e_cache_times.get):
-            self._retire_edge(eid)
-        if self._v_count_dirty:
-            self._immediate_write_data(VID_PREFIX, COUNT_PREFIX, self._v_count)
-            self._v_count_dirty = False
-        if self._e_count_dirty:
-            self._immediate_write_data(EID_PREFIX, COUNT_PREFIX, self._e_count)
-            self._e_count_dirty = False
-        if hasattr(self._db, 'sync'):
-            # noinspection PyUnresolvedReferences
-            self._db.sync()
+        self._flush()
+
+    def _flush(self) -> None:
+        """Flush all writes to disk and clear all caches, without taking the lock of a shared database."""
+        with self._cache_lock:
+            for vid in sorted(self._v_cache_times, key=self._v_cache_times.get):
+                self._retire_vertex(vid)
+            for eid in sorted(self._e_cache_times, key=self._e_cache_times.get):
+                self._retire_edge(eid)
+            if self._v_count_dirty:
+                self._immediate_write_data(VID_PREFIX, COUNT_PREFIX, self._v_count)
+                self._v_count_dirty = False
+            if self._e_count_dirty:
+                self._immediate_write_data(EID_PREFIX, COUNT_PREFIX, self._e_count)
+                self._e_count_dirty = False
+            self._flush_index()
+            for prefix in self._label_counts_dirty:
+                self._immediate_write_data(prefix, LABEL_COUNTS_PREFIX, list(self._label_counts[prefix].items()))
+            self._label_counts_dirty.clear()
+            if hasattr(self._db, 'sync'):
+                # noinspection PyUnresolvedReferences
+                self._db.sync()
 
+    @_read_locked
     def count_vertices(self) -> int:
         """Return the total number of vertices in the graph."""
         if self._v_count is None:
-            try:
-                self._v_count = int(self._immediate_read_data(VID_PREFIX, COUNT_PREFIX))
-            except KeyError:
-                self._v_count = 0
-                self._v_count_dirty = True
+            with self._cache_lock:
+                if self._v_count is None:
+                    try:
+                        self._v_count = int(self._immediate_read_data(VID_PREFIX, COUNT_PREFIX))
+                    except KeyError:
+                        self._v_count = 0
+                        self._v_count_dirty = True
         assert isinstance(self._v_count, int)
         return self._v_count
 
+    @_read_locked
     def count_edges(self) -> int:
         """Return the total number of edges in the graph."""
         if self._e_count is None:
-            try:
-                self._e_count = int(self._immediate_read_data(EID_PREFIX, COUNT_PREFIX))
-            except KeyError:
-                self._e_count = 0
-                self._e_count_dirty = True
+            with self._cache_lock:
+                if self._e_count is None:
+                    try:
+                        self._e_count = int(self._immediate_read_data(EID_PREFIX, COUNT_PREFIX))
+                    except KeyError:
+                        self._e_count = 0
+                        self._e_count_dirty = True
         assert isinstance(self._e_count, int)
         return self._e_count
 
+    @_read_locked
     def iter_vertices(self) -> Iterator[base.VertexID]:
         """Return an iterator over the IDs of every vertex in the graph."""
-        self.flush()
-        for key in self._db.keys():
+        with self._cache_lock:
+            self._flush()
+            keys = self._db.keys()
+        for key in keys:
             if key.startswith(VID_PREFIX):
                 yield self._decode_key(key, VID_PREFIX)
 
+    @_read_locked
     def iter_edges(self) -> Iterator[base.EdgeID]:
         """Return an iterator over the IDs of every edge in the graph."""
-        self.flush()
-        for key in self._db.keys():
+        with self._cache_lock:
+            self._flush()
+            keys = self._db.keys()
+        for key in keys:
             if key.startswith(EID_PREFIX):
                 yield self._decode_key(key, EID_PREFIX)
 
+    @_read_locked
     def has_inbound(self, sink: base.VertexID) -> bool:
         """Return a Boolean value indicating whether the given vertex has at least one inbound edge."""
         try:
-            return bool(self._retire_vertex(sink)[SOURCES_INDEX])
+            return bool(self._read_vertex(sink)[SOURCES_INDEX])
         except KeyError:
             return False
 
+    @_read_locked
     def has_outbound(self, source: base.VertexID) -> bool:
         """Return a Boolean value indicating whether the given vertex has at least one outbound edge."""
         try:
@@ -359,6 +947,7 @@ class DBMGraphStore(base.GraphStore):
         except KeyError:
             return False
 
+    @_read_locked
     def has_undirected(self, vid: base.VertexID) -> bool:
         """Return a Boolean value indicating whether the given vertex has at least one undirected edge."""
         try:
@@ -366,6 +955,7 @@ class DBMGraphStore(base.GraphStore):
         except KeyError:
             return False
 
+    @_read_locked
     def iter_inbound(self, sink: base.VertexID) -> Iterator[base.DirectedEdgeID]:
         """Return an iterator over the IDs of every inbound directed edge to this vertex."""
         try:
@@ -374,6 +964,7 @@ class DBMGraphStore(base.GraphStore):
         except KeyError:
             pass
 
+    @_read_locked
     def iter_outbound(self, source: base.VertexID) -> Iterator[base.DirectedEdgeID]:
         """Return an iterator over the IDs of every outbound directed edge from this vertex."""
         try:
@@ -382,6 +973,7 @@ class DBMGraphStore(base.GraphStore):
         except KeyError:
             pass
 
+    @_read_locked
     def iter_undirected(self, vid: base.VertexID) -> Iterator[base.UndirectedEdgeID]:
         """Return an iterator over the IDs of every undirected edge connected to this vertex."""
         try:
@@ -390,6 +982,84 @@ class DBMGraphStore(base.GraphStore):
         except KeyError:
             pass
 
+    @_read_locked
+    def iter_sources(self, sink: base.VertexID) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the IDs of the sources of every inbound directed edge to this vertex.
+        """
+        try:
+            return iter(self._read_vertex(sink)[SOURCES_INDEX])
+        except KeyError:
+            return iter(())
+
+    @_read_locked
+    def iter_sinks(self, source: base.VertexID) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the IDs of the sinks of every outbound directed edge from this vertex.
+        """
+        try:
+            return iter(self._read_vertex(source)[SINKS_INDEX])
+        except KeyError:
+            return iter(())
+
+    @_read_locked
+    def iter_neighbors(self, vid: base.VertexID) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the IDs of every vertex connected to this vertex by an edge, whether inbound, outbound,
+        or undirected. Each neighbor is yielded only once, even if it is connected by more than one edge.
+        """
+        try:
+            _, _, sources, sinks, undirected = self._read_vertex(vid)
+        except KeyError:
+            return iter(())
+        neighbors = set(sinks)
+        neighbors.update(sources)
+        neighbors.update(undirected)
+        return iter(neighbors)
+
+    @_read_locked
+    def iter_inbound_data(self, sink: base.VertexID, key: Hashable,
+                          default: Any = None) -> Iterator[Tuple[base.VertexID, Any]]:
+        """
+        Return an iterator over (source, value) pairs, one for each inbound directed edge to this vertex, where value is
+        the data stored in the edge under the key, or the default if there is none.
+        """
+        try:
+            sources = self._read_vertex(sink)[SOURCES_INDEX]
+        except KeyError:
+            return
+        for source in sources:
+            yield source, self._read_edge_value(base.DirectedEdgeID(source, sink), key, default)
+
+    @_read_locked
+    def iter_outbound_data(self, source: base.VertexID, key: Hashable,
+                           default: Any = None) -> Iterator[Tuple[base.VertexID, Any]]:
+        """
+        Return an iterator over (sink, value) pairs, one for each outbound directed edge from this vertex, where value
+        is the data stored in the edge under the key, or the default if there is none.
+        """
+        try:
+            sinks = self._read_vertex(source)[SINKS_INDEX]
+        except KeyError:
+            return
+        for sink in sinks:
+            yield sink, self._read_edge_value(base.DirectedEdgeID(source, sink), key, default)
+
+    @_read_locked
+    def iter_undirected_data(self, vid: base.VertexID, key: Hashable,
+                             default: Any = None) -> Iterator[Tuple[base.VertexID, Any]]:
+        """
+        Return an iterator over (neighbor, value) pairs, one for each undirected edge connected to this vertex, where
+        value is the data stored in the edge under the key, or the default if there is none.
+        """
+        try:
+            others = self._read_vertex(vid)[UNDIRECTED_INDEX]
+        except KeyError:
+            return
+        for other in others:
+            yield other, self._read_edge_value(base.UndirectedEdgeID(vid, other), key, default)
+
+    @_read_locked
     def count_inbound(self, sink: base.VertexID) -> int:
         """Return the number of inbound directed edges to this vertex."""
         try:
@@ -397,6 +1067,7 @@ class DBMGraphStore(base.GraphStore):
         except KeyError:
             return 0
 
+    @_read_locked
     def count_outbound(self, source: base.VertexID) -> int:
         """Return the number of outbound directed edges from this vertex."""
         try:
@@ -404,6 +1075,7 @@ class DBMGraphStore(base.GraphStore):
         except KeyError:
             return 0
 
+    @_read_locked
     def count_undirected(self, vid: base.VertexID) -> int:
         """Return the number of undirected edges connected to this vertex."""
         try:
@@ -411,14 +1083,19 @@ class DBMGraphStore(base.GraphStore):
         except KeyError:
             return 0
 
+    @_read_locked
     def has_vertex(self, vid: base.VertexID) -> bool:
         """Return whether the given ID has a vertex associated with it in the graph."""
-        return vid in self._v_cache or self._encode_key(vid, VID_PREFIX) in self._db
+        with self._cache_lock:
+            return vid in self._v_cache or self._encode_key(vid, VID_PREFIX) in self._db
 
+    @_read_locked
     def has_edge(self, eid: base.EdgeID) -> bool:
         """Return whether the given ID has an edge associated with it in the graph."""
-        return eid in self._e_cache or self._encode_key(eid, EID_PREFIX) in self._db
+        with self._cache_lock:
+            return eid in self._e_cache or self._encode_key(eid, EID_PREFIX) in self._db
 
+    @_write_locked
     def add_vertex(self, vid: base.VertexID) -> None:
         """
         Add a vertex to the graph associated with this ID. If a vertex with the given ID already exists, do nothing.
@@ -435,6 +1112,7 @@ class DBMGraphStore(base.GraphStore):
             self._v_count = self.count_vertices() + 1
             self._v_count_dirty = True
 
+    @_write_locked
     def add_edge(self, eid: base.EdgeID) -> None:
         """
         Add an edge to the graph associated with this ID. If an edge with the given ID already exists, do nothing. If
@@ -472,6 +1150,7 @@ class DBMGraphStore(base.GraphStore):
             self._e_count = self.count_edges() + 1
             self._e_count_dirty = True
 
+    @_write_locked
     def discard_vertex(self, vid: base.VertexID) -> bool:
         """
         Remove the vertex associated with this ID from the graph. If such a vertex does not exist, do nothing. Any
@@ -479,7 +1158,7 @@ class DBMGraphStore(base.GraphStore):
         be removed.
         """
         try:
-            _, _, sources, sinks, undirected = self._read_vertex(vid)
+            labels, data, sources, sinks, undirected = self._read_vertex(vid)
         except KeyError:
             return False
 
@@ -490,18 +1169,24 @@ class DBMGraphStore(base.GraphStore):
         for other in undirected:
             self.discard_edge(base.UndirectedEdgeID(vid, other), ignore=vid)
 
+        self._unindex_data(VID_PREFIX, vid, data)
+        for label in labels:
+            self._update_label_index(VID_PREFIX, label, vid, False)
         self._del_vertex(vid)
         self._v_count = self.count_vertices() - 1
         self._v_count_dirty = True
 
         return True
 
+    @_write_locked
     def discard_edge(self, eid: base.EdgeID, ignore: Optional[base.VertexID] = None) -> bool:
         """
         Remove the edge associated with this ID from the graph. If such an edge does not exist, do nothing. The source
         and sink vertex are not removed. Return a Boolean indicating whether the edge was present to be removed.
         """
         try:
+            if self._get_indexed_keys(EID_PREFIX) or self._label_counts[EID_PREFIX]:
+                self._unindex_edge(eid)
             self._del_edge(eid)
         except KeyError:
             return False
@@ -527,7 +1212,7 @@ class DBMGraphStore(base.GraphStore):
 
             if v1 != v2 and v2 != ignore:
                 v2_data = self._read_vertex(v2)
-                v2_data[UNDIRECTED_INDEX].remove(v2)
+                v2_data[UNDIRECTED_INDEX].remove(v1)
                 self._write_vertex(v2, v2_data)
 
         self._e_count = self.count_edges() - 1
@@ -535,6 +1220,375 @@ class DBMGraphStore(base.GraphStore):
 
         return True
 
+    @_write_locked
+    def add_vertices(self, vids: Iterable[base.VertexID]) -> None:
+        """
+        Add a vertex to the graph for each of these IDs, skipping those that already exist. Equivalent to calling
+        add_vertex() for each ID, but graph stores can override it to do the work in bulk.
+        """
+        added = 0
+        for vid in vids:
+            if not self.has_vertex(vid):
+                self._write_vertex(vid, [[], {}, [], [], []])
+                added += 1
+        if added:
+            self._v_count = self.count_vertices() + added
+            self._v_count_dirty = True
+
+    def _create_vertices(self, records: Mapping[base.VertexID, VertexData]) -> None:
+        """Write the records of new vertices, which must not exist yet, and count them."""
+        for vid, data in records.items():
+            self._write_vertex(vid, data)
+        if records:
+            self._v_count = self.count_vertices() + len(records)
+            self._v_count_dirty = True
+
+    def _read_vertices(self, vids: Iterable[base.VertexID], records: Dict[base.VertexID, VertexData]) -> int:
+        """
+        Ensure the records for the given vertices are in the records dictionary, reading them if necessary. Records
+        are created for vertices that don't exist yet. Return the number of records that were created.
+        """
+        created = 0
+        for vid in vids:
+            if vid not in records:
+                try:
+                    records[vid] = self._read_vertex(vid)
+                except KeyError:
+                    records[vid] = [[], {}, [], [], []]
+                    created += 1
+        return created
+
+    @_write_locked
+    def add_edges(self, eids: Iterable[base.EdgeID]) -> None:
+        """
+        Add an edge to the graph for each of these IDs, skipping those that already exist, and adding any missing
+        vertices first. Equivalent to calling add_edge() for each ID, but graph stores can override it to do the work
+        in bulk.
+        """
+        for batch in _batches(eids):
+            new = {}
+            for eid in batch:
+                if eid not in new and not self.has_edge(eid):
+                    new[eid] = [[], {}]
+            self._create_edges(new)
+
+    def _create_edges(self, edge_records: Mapping[base.EdgeID, EdgeData]) -> None:
+        """
+        Write the records of new edges, which must not exist yet, and add them to the records of their vertices, adding
+        any missing vertices. Each vertex record is read and written once.
+        """
+        records = {}
+        added_vertices = 0
+        for eid, edge_data in edge_records.items():
+            self._write_edge(eid, edge_data)
+            if isinstance(eid, base.DirectedEdgeID):
+                added_vertices += self._read_vertices(eid, records)
+                records[eid.source][SINKS_INDEX].append(eid.sink)
+                records[eid.sink][SOURCES_INDEX].append(eid.source)
+            else:
+                assert isinstance(eid, base.UndirectedEdgeID)
+                v1, v2 = eid.vertices
+                added_vertices += self._read_vertices((v1, v2), records)
+                records[v1][UNDIRECTED_INDEX].append(v2)
+                if v1 != v2:
+                    records[v2][UNDIRECTED_INDEX].append(v1)
+        for vid, data in records.items():
+            self._write_vertex(vid, data)
+        if added_vertices:
+            self._v_count = self.count_vertices() + added_vertices
+            self._v_count_dirty = True
+        if edge_records:
+            self._e_count = self.count_edges() + len(edge_records)
+            self._e_count_dirty = True
+
+    @_write_locked
+    def discard_edges(self, eids: Iterable[base.EdgeID]) -> int:
+        """
+        Remove the edges associated with these IDs from the graph. IDs with no associated edge are ignored. Return the
+        number of edges that were removed. Equivalent to calling discard_edge() for each ID, but graph stores can
+        override it to do the work in bulk.
+        """
+        removed = 0
+        edge_indexed = bool(self._get_indexed_keys(EID_PREFIX) or self._label_counts[EID_PREFIX])
+        for batch in _batches(eids):
+            records = {}
+            removed_edges = 0
+            for eid in batch:
+                try:
+                    if edge_indexed:
+                        self._unindex_edge(eid)
+                    self._del_edge(eid)
+                except KeyError:
+                    continue
+                removed_edges += 1
+                if isinstance(eid, base.DirectedEdgeID):
+                    self._read_vertices(eid, records)
+                    records[eid.source][SINKS_INDEX].remove(eid.sink)
+                    records[eid.sink][SOURCES_INDEX].remove(eid.source)
+                else:
+                    assert isinstance(eid, base.UndirectedEdgeID)
+                    v1, v2 = eid.vertices
+                    self._read_vertices((v1, v2), records)
+                    records[v1][UNDIRECTED_INDEX].remove(v2)
+                    if v1 != v2:
+                        records[v2][UNDIRECTED_INDEX].remove(v1)
+            for vid, data in records.items():
+                self._write_vertex(vid, data)
+            if removed_edges:
+                self._e_count = self.count_edges() - removed_edges
+                self._e_count_dirty = True
+            removed += removed_edges
+        return removed
+
+    @_write_locked
+    def set_vertex_data_many(self, items: Iterable[Tuple[base.VertexID, Mapping[Hashable, Any]]]) -> None:
+        """
+        For each (vertex ID, mapping) pair, store every key/value pair of the mapping in the vertex, adding the vertex
+        first if it doesn't exist. Equivalent to calling set_vertex_data() for each key/value pair, but graph stores
+        can override it to do the work in bulk.
+        """
+        for batch in _batches(items):
+            # Merge the updates for each vertex, so its record only has to be read and written once.
+            updates = {}
+            for vid, data in batch:
+                if vid in updates:
+                    updates[vid].update(data)
+                else:
+                    updates[vid] = dict(data)
+            # New vertices are created with their data, rather than created empty and then read back.
+            new = {}
+            for vid, data in updates.items():
+                try:
+                    record = self._read_vertex(vid)
+                except KeyError:
+                    self._index_data(VID_PREFIX, vid, {}, data)
+                    new[vid] = [[], data, [], [], []]
+                    continue
+                self._index_data(VID_PREFIX, vid, record[DATA_INDEX], data)
+                record[DATA_INDEX].update(data)
+                self._write_vertex(vid, record)
+            self._create_vertices(new)
+
+    @_write_locked
+    def set_edge_data_many(self, items: Iterable[Tuple[base.EdgeID, Mapping[Hashable, Any]]]) -> None:
+        """
+        For each (edge ID, mapping) pair, store every key/value pair of the mapping in the edge, adding the edge first
+        if it doesn't exist. Equivalent to calling set_edge_data() for each key/value pair, but graph stores can
+        override it to do the work in bulk.
+        """
+        for batch in _batches(items):
+            # Merge the updates for each edge, so its record only has to be read and written once.
+            updates = {}
+            for eid, data in batch:
+                if eid in updates:
+                    updates[eid].update(data)
+                else:
+                    updates[eid] = dict(data)
+            # New edges are created with their data, rather than created empty and then read back.
+            new = {}
+            for eid, data in updates.items():
+                try:
+                    record = self._read_edge(eid)
+                except KeyError:
+                    self._index_data(EID_PREFIX, eid, {}, data)
+                    new[eid] = [[], data]
+                    continue
+                self._index_data(EID_PREFIX, eid, record[DATA_INDEX], data)
+                record[DATA_INDEX].update(data)
+                self._write_edge(eid, record)
+            self._create_edges(new)
+
+    @_write_locked
+    def add_vertex_labels_many(self, items: Iterable[Tuple[base.VertexID, Iterable[base.Label]]]) -> None:
+        """
+        For each (vertex ID, labels) pair, add every one of the labels to the vertex, adding the vertex first if it
+        doesn't exist. Equivalent to calling add_vertex_label() for each label, but graph stores can override it to do
+        the work in bulk.
+        """
+        for batch in _batches(items):
+            new = {}
+            for vid, labels in _merge_labels(batch).items():
+                try:
+                    record = self._read_vertex(vid)
+                except KeyError:
+                    new[vid] = [labels, {}, [], [], []]
+                    added = labels
+                else:
+                    added = [label for label in labels if label not in record[LABEL_INDEX]]
+                    if added:
+                        record[LABEL_INDEX].extend(added)
+                        self._write_vertex(vid, record)
+                for label in added:
+                    self._update_label_index(VID_PREFIX, label, vid, True)
+            self._create_vertices(new)
+
+    @_write_locked
+    def add_edge_labels_many(self, items: Iterable[Tuple[base.EdgeID, Iterable[base.Label]]]) -> None:
+        """
+        For each (edge ID, labels) pair, add every one of the labels to the edge, adding the edge first if it doesn't
+        exist. Equivalent to calling add_edge_label() for each label, but graph stores can override it to do the work
+        in bulk.
+        """
+        for batch in _batches(items):
+            new = {}
+            for eid, labels in _merge_labels(batch).items():
+                try:
+                    record = self._read_edge(eid)
+                except KeyError:
+                    new[eid] = [labels, {}]
+                    added = labels
+                else:
+                    added = [label for label in labels if label not in record[LABEL_INDEX]]
+                    if added:
+                        record[LABEL_INDEX].extend(added)
+                        self._write_edge(eid, record)
+                for label in added:
+                    self._update_label_index(EID_PREFIX, label, eid, True)
+            self._create_edges(new)
+
+    @_read_locked
+    def get_vertex_record(self, vid: base.VertexID) -> Optional[base.VertexRecord]:
+        """
+        Return the labels, data, and edge counts of the vertex in a single call, or None if the vertex does not exist.
+        """
+        try:
+            labels, data, sources, sinks, undirected = self._read_vertex(vid)
+        except KeyError:
+            return None
+        return base.VertexRecord(frozenset(labels), dict(data), len(sources), len(sinks), len(undirected))
+
+    @_read_locked
+    def get_edge_record(self, eid: base.EdgeID) -> Optional[base.EdgeRecord]:
+        """Return the labels and data of the edge in a single call, or None if the edge does not exist."""
+        try:
+            labels, data = self._read_edge(eid)
+        except KeyError:
+            return None
+        return base.EdgeRecord(frozenset(labels), dict(data))
+
+    @_read_locked
+    def filter_vertices(self, vids: Iterable[base.VertexID], labels: Iterable[base.Label] = (),
+                        data: Optional[Mapping[Hashable, Any]] = None) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the vertex IDs in vids whose vertices have every one of the labels and store a value
+        equal to each of the values in data under the same key. The IDs are consumed lazily and yielded in the order
+        they are received.
+        """
+        labels = tuple(labels)
+        data = tuple(data.items()) if data else ()
+        missing = object()
+        for vid in vids:
+            try:
+                vertex_labels, vertex_data = self._read_vertex(vid)[:2]
+            except KeyError:
+                if not labels and not data:
+                    yield vid
+                continue
+            if (all(label in vertex_labels for label in labels) and
+                    all(base.data_matches(vertex_data.get(key, missing), value) for key, value in data)):
+                yield vid
+
+    @_write_locked
+    def add_vertex_data_index(self, key: Hashable, ordered: bool = False) -> None:
+        """
+        Declare a secondary index on the vertex data stored under this key, so find_vertices() can look vertices up by
+        value without scanning the graph. If the key is already indexed, do nothing. The index is persisted in the
+        database along with the graph. If ordered is set, the index also keeps the numbers stored under the key in
+        sorted order, so find_vertices_in_range() can scan ranges of them, and an existing index is made ordered.
+        """
+        self._add_index(VID_PREFIX, key, ordered)
+
+    @_write_locked
+    def discard_vertex_data_index(self, key: Hashable) -> bool:
+        """
+        Drop the secondary index on the vertex data stored under this key. Return a Boolean indicating whether there
+        was an index to drop.
+        """
+        return self._discard_index(VID_PREFIX, key)
+
+    @_read_locked
+    def has_vertex_data_index(self, key: Hashable, ordered: bool = False) -> bool:
+        """
+        Return a Boolean indicating whether the vertex data stored under this key is indexed, or if ordered is set,
+        whether it has an ordered index.
+        """
+        return key in (self._get_ordered_keys(VID_PREFIX) if ordered else self._get_indexed_keys(VID_PREFIX))
+
+    @_read_locked
+    def find_vertices(self, key: Hashable, value: Any) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the IDs of the vertices that store a value equal to this one under the key. If the key
+        is indexed, the vertices are looked up in the index, where values are compared by their JSON encoding.
+        Otherwise, every vertex in the graph is checked.
+        """
+        found = self._find(VID_PREFIX, key, value)
+        if found is None:
+            return super().find_vertices(key, value)
+        return found
+
+    @_read_locked
+    def find_vertices_in_range(self, key: Hashable, minimum: Optional[Any] = None, maximum: Optional[Any] = None,
+                               reverse: bool = False) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the IDs of the vertices that store a number between the minimum and the maximum,
+        inclusive, under the key, in order of the numbers. If the key has an ordered index, the vertices are streamed
+        from it a page at a time. Otherwise, every vertex in the graph is checked.
+        """
+        if key in self._get_ordered_keys(VID_PREFIX):
+            return self._iter_ordered(VID_PREFIX, key, minimum, maximum, reverse)
+        return super().find_vertices_in_range(key, minimum, maximum, reverse)
+
+    @_write_locked
+    def add_edge_data_index(self, key: Hashable, ordered: bool = False) -> None:
+        """
+        Declare a secondary index on the edge data stored under this key, so find_edges() can look edges up by value
+        without scanning the graph. If the key is already indexed, do nothing. The index is persisted in the database
+        along with the graph. If ordered is set, the index also keeps the numbers stored under the key in sorted order,
+        so find_edges_in_range() can scan ranges of them, and an existing index is made ordered.
+        """
+        self._add_index(EID_PREFIX, key, ordered)
+
+    @_write_locked
+    def discard_edge_data_index(self, key: Hashable) -> bool:
+        """
+        Drop the secondary index on the edge data stored under this key. Return a Boolean indicating whether there was
+        an index to drop.
+        """
+        return self._discard_index(EID_PREFIX, key)
+
+    @_read_locked
+    def has_edge_data_index(self, key: Hashable, ordered: bool = False) -> bool:
+        """
+        Return a Boolean indicating whether the edge data stored under this key is indexed, or if ordered is set,
+        whether it has an ordered index.
+        """
+        return key in (self._get_ordered_keys(EID_PREFIX) if ordered else self._get_indexed_keys(EID_PREFIX))
+
+    @_read_locked
+    def find_edges(self, key: Hashable, value: Any) -> Iterator[base.EdgeID]:
+        """
+        Return an iterator over the IDs of the edges that store a value equal to this one under the key. If the key is
+        indexed, the edges are looked up in the index, where values are compared by their JSON encoding. Otherwise,
+        every edge in the graph is checked.
+        """
+        found = self._find(EID_PREFIX, key, value)
+        if found is None:
+            return super().find_edges(key, value)
+        return found
+
+    @_read_locked
+    def find_edges_in_range(self, key: Hashable, minimum: Optional[Any] = None, maximum: Optional[Any] = None,
+                            reverse: bool = False) -> Iterator[base.EdgeID]:
+        """
+        Return an iterator over the IDs of the edges that store a number between the minimum and the maximum,
+        inclusive, under the key, in order of the numbers. If the key has an ordered index, the edges are streamed
+        from it a page at a time. Otherwise, every edge in the graph is checked.
+        """
+        if key in self._get_ordered_keys(EID_PREFIX):
+            return self._iter_ordered(EID_PREFIX, key, minimum, maximum, reverse)
+        return super().find_edges_in_range(key, minimum, maximum, reverse)
+
+    @_write_locked
     def add_vertex_label(self, vid: base.VertexID, label: base.Label) -> None:
         """Add a label to the vertex. If the vertex already has the label, do nothing."""
         self.add_vertex(vid)
@@ -542,7 +1596,9 @@ class DBMGraphStore(base.GraphStore):
         if label not in data[LABEL_INDEX]:
             data[LABEL_INDEX].append(label)
             self._write_vertex(vid, data)
+            self._update_label_index(VID_PREFIX, label, vid, True)
 
+    @_read_locked
     def has_vertex_label(self, vid: base.VertexID, label: base.Label) -> bool:
         """Return a Boolean indicating whether the vertex has the label."""
         try:
@@ -550,6 +1606,7 @@ class DBMGraphStore(base.GraphStore):
         except KeyError:
             return False
 
+    @_write_locked
     def discard_vertex_label(self, vid: base.VertexID, label: base.Label) -> bool:
         """
         Remove the label from the vertex. If the vertex does not have the label, do nothing. Return a Boolean indicating
@@ -562,9 +1619,11 @@ class DBMGraphStore(base.GraphStore):
         if label in data[LABEL_INDEX]:
             data[LABEL_INDEX].remove(label)
             self._write_vertex(vid, data)
+            self._update_label_index(VID_PREFIX, label, vid, False)
             return True
         return False
 
+    @_read_locked
     def iter_vertex_labels(self, vid: base.VertexID) -> Iterator[base.Label]:
         """Return an iterator over the labels for the vertex."""
         try:
@@ -572,6 +1631,7 @@ class DBMGraphStore(base.GraphStore):
         except KeyError:
             return iter(())
 
+    @_read_locked
     def count_vertex_labels(self, vid: base.VertexID) -> int:
         """Return the number of labels the vertex has."""
         try:
@@ -579,6 +1639,7 @@ class DBMGraphStore(base.GraphStore):
         except KeyError:
             return 0
 
+    @_write_locked
     def add_edge_label(self, eid: base.EdgeID, label: base.Label) -> None:
         """Add a label to the edge. If the edge already has the label, do nothing."""
         self.add_edge(eid)
@@ -586,7 +1647,9 @@ class DBMGraphStore(base.GraphStore):
         if label not in data[LABEL_INDEX]:
             data[LABEL_INDEX].append(label)
             self._write_edge(eid, data)
+            self._update_label_index(EID_PREFIX, label, eid, True)
 
+    @_read_locked
     def has_edge_label(self, eid: base.EdgeID, label: base.Label) -> bool:
         """Return a Boolean indicating whether or not the edge has the label."""
         try:
@@ -594,6 +1657,7 @@ class DBMGraphStore(base.GraphStore):
         except KeyError:
             return False
 
+    @_write_locked
     def discard_edge_label(self, eid: base.EdgeID, label: base.Label) -> bool:
         """
         Remove the label from the edge. If the edge does not have the label, do nothing. Return a Boolean indicating
@@ -606,9 +1670,11 @@ class DBMGraphStore(base.GraphStore):
         if label in data[LABEL_INDEX]:
             data[LABEL_INDEX].remove(label)
             self._write_edge(eid, data)
+            self._update_label_index(EID_PREFIX, label, eid, False)
             return True
         return False
 
+    @_read_locked
     def iter_edge_labels(self, eid: base.EdgeID) -> Iterator[base.Label]:
         """Return an iterator over the labels for the edge."""
         try:
@@ -616,6 +1682,7 @@ class DBMGraphStore(base.GraphStore):
         except KeyError:
             return iter(())
 
+    @_read_locked
     def count_edge_labels(self, eid: base.EdgeID) -> int:
         """Return the number of labels the edge has."""
         try:
@@ -623,20 +1690,46 @@ class DBMGraphStore(base.GraphStore):
         except KeyError:
             return 0
 
-    def get_vertex_data(self, vid: base.VertexID, key: Hashable) -> Any:
-        """Return the value stored in the vertex for this key."""
+    @_read_locked
+    def iter_vertices_with_label(self, label: base.Label) -> Iterator[base.VertexID]:
+        """Return an iterator over the IDs of the vertices that have the label, looked up in the label index."""
+        return self._iter_with_label(VID_PREFIX, label)
+
+    @_read_locked
+    def count_vertices_with_label(self, label: base.Label) -> int:
+        """Return the number of vertices that have the label."""
+        return self._label_counts[VID_PREFIX].get(label, 0)
+
+    @_read_locked
+    def iter_edges_with_label(self, label: base.Label) -> Iterator[base.EdgeID]:
+        """Return an iterator over the IDs of the edges that have the label, looked up in the label index."""
+        return self._iter_with_label(EID_PREFIX, label)
+
+    @_read_locked
+    def count_edges_with_label(self, label: base.Label) -> int:
+        """Return the number of edges that have the label."""
+        return self._label_counts[EID_PREFIX].get(label, 0)
+
+    @_read_locked
+    def get_vertex_data(self, vid: base.VertexID, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the value stored in the vertex for this key. If no value is stored for the key, return the default.
+        """
         try:
-            return self._read_vertex(vid)[DATA_INDEX].get(key, None)
+            return self._read_vertex(vid)[DATA_INDEX].get(key, default)
         except KeyError:
-            return None
+            return default
 
+    @_write_locked
     def set_vertex_data(self, vid: base.VertexID, key: Hashable, value: Any) -> None:
         """Store a value in the vertex for this key."""
         self.add_vertex(vid)
         data = self._read_vertex(vid)
+        self._index_data(VID_PREFIX, vid, data[DATA_INDEX], {key: value})
         data[DATA_INDEX][key] = value
         self._write_vertex(vid, data)
 
+    @_read_locked
     def has_vertex_data(self, vid: base.VertexID, key: Hashable) -> bool:
         """Return a Boolean indicating whether a value is stored in the vertex for this key."""
         try:
@@ -644,6 +1737,7 @@ class DBMGraphStore(base.GraphStore):
         except KeyError:
             return False
 
+    @_write_locked
     def discard_vertex_data(self, vid: base.VertexID, key: Hashable) -> bool:
         """
         Remove the value stored in the vertex under this key. If no value is stored for the key, do nothing. Return
@@ -651,13 +1745,15 @@ class DBMGraphStore(base.GraphStore):
         """
         try:
             data = self._read_vertex(vid)
-            del data[DATA_INDEX][key]
+            value = data[DATA_INDEX].pop(key)
         except KeyError:
             return False
         else:
+            self._unindex_data(VID_PREFIX, vid, {key: value})
             self._write_vertex(vid, data)
             return True
 
+    @_read_locked
     def iter_vertex_data_keys(self, vid: base.VertexID) -> Iterator[Hashable]:
         """Return an iterator over the keys for which data is stored in the vertex."""
         try:
@@ -665,6 +1761,7 @@ class DBMGraphStore(base.GraphStore):
         except KeyError:
             return iter(())
 
+    @_read_locked
     def count_vertex_data_keys(self, vid: base.VertexID) -> int:
         """Return the number of key/value pairs stored in the vertex."""
         try:
@@ -672,20 +1769,26 @@ class DBMGraphStore(base.GraphStore):
         except KeyError:
             return 0
 
-    def get_edge_data(self, eid: base.EdgeID, key: Hashable) -> Any:
-        """Return the value stored in the edge for this key."""
+    @_read_locked
+    def get_edge_data(self, eid: base.EdgeID, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the value stored in the edge for this key. If no value is stored for the key, return the default.
+        """
         try:
-            return self._read_edge(eid)[DATA_INDEX][key]
+            return self._read_edge(eid)[DATA_INDEX].get(key, default)
         except KeyError:
-            return None
+            return default
 
+    @_write_locked
     def set_edge_data(self, eid: base.EdgeID, key: Hashable, value: Any) -> None:
         """Store a value in the edge for this key."""
         self.add_edge(eid)
         data = self._read_edge(eid)
+        self._index_data(EID_PREFIX, eid, data[DATA_INDEX], {key: value})
         data[DATA_INDEX][key] = value
         self._write_edge(eid, data)
 
+    @_read_locked
     def has_edge_data(self, eid: base.EdgeID, key: Hashable) -> bool:
         """Return a Boolean indicating whether a value is stored in the edge for this key."""
         try:
@@ -693,6 +1796,7 @@ class DBMGraphStore(base.GraphStore):
         except KeyError:
             return False
 
+    @_write_locked
     def discard_edge_data(self, eid: base.EdgeID, key: Hashable) -> bool:
         """
         Remove the value stored in the edge under this key. If no value is stored for the key, do nothing. Return
@@ -700,13 +1804,15 @@ class DBMGraphStore(base.GraphStore):
         """
         try:
             data = self._read_edge(eid)
-            del data[DATA_INDEX][key]
+            value = data[DATA_INDEX].pop(key)
         except KeyError:
             return False
         else:
+            self._unindex_data(EID_PREFIX, eid, {key: value})
             self._write_edge(eid, data)
             return True
 
+    @_read_locked
     def iter_edge_data_keys(self, eid: base.EdgeID) -> Iterator[Hashable]:
         """Return an iterator over the keys for which data is stored in the edge."""
         try:
@@ -714,6 +1820,7 @@ class DBMGraphStore(base.GraphStore):
         except KeyError:
             return iter(())
 
+    @_read_locked
     def count_edge_data_keys(self, eid: base.EdgeID) -> int:
         """Return the number of key/value pairs stored in the edge."""
         try:
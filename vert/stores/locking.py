@@ -0,0 +1,833 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+
+"""
+Thread-safe access to a graph store shared between threads: ReadWriteLock, a lock that many readers can hold at once,
+and LockingGraphStore, a graph store wrapper that holds it around every call to the wrapped store. FileReadWriteLock
+extends the lock to other processes by locking a file as well.
+"""
+
+
+import itertools
+import os
+import threading
+from typing import Hashable, Any, Optional, Iterator, Iterable, List, Mapping, Tuple, Callable
+
+import vert.stores.base as base
+from vert.stores.wrapper import GraphStoreWrapper
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+__all__ = [
+    'ReadWriteLock',
+    'FileReadWriteLock',
+    'LockingGraphStore',
+]
+
+
+# The number of IDs a range query fetches each time it takes the read lock.
+LOCKED_CHUNK_SIZE = 1000
+
+# The number of bytes the generation number takes up at the start of a lock file.
+GENERATION_SIZE = 20
+
+
+class _LockContext:
+    """A reusable context manager that acquires and releases one side of a ReadWriteLock."""
+
+    __slots__ = ('_acquire', '_release')
+
+    def __init__(self, acquire: Callable[[], None], release: Callable[[], None]):
+        self._acquire = acquire
+        self._release = release
+
+    def __enter__(self) -> None:
+        self._acquire()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self._release()
+        return False
+
+
+class ReadWriteLock:
+    """
+    A lock that can be held by any number of readers at once, or by a single writer. Writers are given priority: once
+    a writer is waiting, new readers wait until it is done, so a steady stream of readers cannot starve it.
+
+    Both sides are reentrant. A thread holding the read lock can take it again even while a writer is waiting, and a
+    thread holding the write lock can take either side again. A thread holding only the read lock cannot take the write
+    lock, since two threads doing so at once would wait for each other forever; RuntimeError is raised instead.
+
+    Taking the read lock while no writer holds or waits for the lock only briefly holds an internal mutex; the condition
+    variables are only used when a thread actually has to wait.
+    """
+
+    def __init__(self):
+        self._mutex = threading.Lock()
+        self._can_read = threading.Condition(self._mutex)
+        self._can_write = threading.Condition(self._mutex)
+        self._readers = 0
+        self._writers_waiting = 0
+        self._writer = None  # type: Optional[int]
+        self._write_depth = 0
+
+        # Per thread: how many times the thread holds the read lock, and whether it was counted as a reader, which it
+        # isn't when it took the read lock while holding the write lock.
+        self._local = threading.local()
+
+        self._read_context = _LockContext(self.acquire_read, self.release_read)
+        self._write_context = _LockContext(self.acquire_write, self.release_write)
+
+    def acquire_read(self) -> None:
+        """Acquire the read lock, waiting while another thread holds or is waiting for the write lock."""
+        local = self._local
+        depth = getattr(local, 'depth', 0)
+        if depth:
+            local.depth = depth + 1
+            return
+        if self._writer == threading.get_ident():
+            local.depth = 1
+            local.counted = False
+            return
+        with self._mutex:
+            while self._writer is not None or self._writers_waiting:
+                self._can_read.wait()
+            # The thread holds the lock while _first_acquired() runs, so it can take the lock again from there.
+            local.depth = 1
+            local.counted = True
+            if not self._readers:
+                try:
+                    self._first_acquired(False)
+                except BaseException:
+                    local.depth = 0
+                    raise
+            self._readers += 1
+
+    def release_read(self) -> None:
+        """Release the read lock."""
+        local = self._local
+        depth = getattr(local, 'depth', 0)
+        if not depth:
+            raise RuntimeError("The read lock is not held by this thread.")
+        if depth > 1 or not local.counted:
+            local.depth = depth - 1
+            return
+        with self._mutex:
+            try:
+                if self._readers == 1:
+                    self._last_releasing(False)
+            finally:
+                local.depth = 0
+                self._readers -= 1
+                if not self._readers and self._writers_waiting:
+                    self._can_write.notify()
+
+    def acquire_write(self) -> None:
+        """Acquire the write lock, waiting until no other thread holds either side of the lock."""
+        me = threading.get_ident()
+        if self._writer == me:
+            self._write_depth += 1
+            return
+        if getattr(self._local, 'depth', 0):
+            raise RuntimeError("The read lock cannot be upgraded to the write lock.")
+        with self._mutex:
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._can_write.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+            self._write_depth = 1
+            try:
+                self._first_acquired(True)
+            except BaseException:
+                self._writer = None
+                self._write_depth = 0
+                self._wake()
+                raise
+
+    def release_write(self) -> None:
+        """Release the write lock."""
+        if self._writer != threading.get_ident():
+            raise RuntimeError("The write lock is not held by this thread.")
+        if self._write_depth > 1:
+            self._write_depth -= 1
+            return
+        with self._mutex:
+            try:
+                self._last_releasing(True)
+            finally:
+                self._writer = None
+                self._write_depth = 0
+                self._wake()
+
+    def _wake(self) -> None:
+        """Wake the next writer waiting for the lock, or if there is none, the waiting readers."""
+        if self._writers_waiting:
+            self._can_write.notify()
+        else:
+            self._can_read.notify_all()
+
+    def _first_acquired(self, write: bool) -> None:
+        """
+        Called when a thread acquires the lock while no other thread holds it. Subclasses can override this to guard a
+        resource shared with other processes, too. If it raises an exception, the lock is not acquired. The thread
+        already counts as holding the lock, so this can take it again.
+        """
+
+    def _last_releasing(self, write: bool) -> None:
+        """
+        Called when the last thread holding the lock is about to release it. The lock is released even if this raises
+        an exception. The thread still counts as holding the lock, so this can take it again.
+        """
+
+    def read_locked(self) -> _LockContext:
+        """Return a context manager that holds the read lock."""
+        return self._read_context
+
+    def write_locked(self) -> _LockContext:
+        """Return a context manager that holds the write lock."""
+        return self._write_context
+
+
+class FileReadWriteLock(ReadWriteLock):
+    """
+    A ReadWriteLock that also locks a file, with fcntl.flock(), while any thread holds it: shared while it is held by
+    readers and exclusive while it is held by a writer. Instances opened on the same file, in any process, exclude each
+    other the same way threads holding the lock do. File locks are advisory, so only processes that take the lock are
+    kept out. The fcntl module, and so this class, is only available on Unix.
+
+    The file holds a generation number, which is incremented each time the write lock is released. Each time the lock
+    is acquired, the acquired callback is called with whether it is the write lock and whether the generation changed
+    since this instance last held the lock, i.e. whether another instance has had the write lock since. The releasing
+    callback is called with whether it is the write lock just before the lock is released.
+    """
+
+    def __init__(self, path: str, acquired: Optional[Callable[[bool, bool], None]] = None,
+                 releasing: Optional[Callable[[bool], None]] = None):
+        """
+        :param path: The path of the lock file. It is created if it does not exist.
+        :param acquired: If given, a function called as acquired(write, changed) each time the lock is acquired.
+        :param releasing: If given, a function called as releasing(write) each time the lock is about to be released.
+        """
+        if fcntl is None:
+            raise ImportError("The fcntl module is required for file locking.")
+        super().__init__()
+        self._path = path
+        self._acquired = acquired
+        self._releasing = releasing
+        self._generation = None  # type: Optional[int]
+        self._closed = False
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o666)
+
+    @property
+    def path(self) -> str:
+        """The path of the lock file."""
+        return self._path
+
+    @property
+    def generation(self) -> Optional[int]:
+        """The generation number as of when this instance last held the lock, or None if it never has."""
+        return self._generation
+
+    def close(self) -> None:
+        """Close the lock file. If the lock is held, the file is closed when it is released. The lock cannot be acquired
+        afterward."""
+        with self._mutex:
+            self._closed = True
+            if self._fd is not None and not self._readers and self._writer is None:
+                os.close(self._fd)
+                self._fd = None
+
+    def _read_generation(self) -> int:
+        """Read the generation number from the lock file."""
+        data = os.pread(self._fd, GENERATION_SIZE, 0).strip()
+        return int(data) if data else 0
+
+    def _first_acquired(self, write: bool) -> None:
+        """Lock the file, and check whether the generation changed."""
+        if self._closed:
+            raise ValueError("The lock file is closed.")
+        fcntl.flock(self._fd, fcntl.LOCK_EX if write else fcntl.LOCK_SH)
+        try:
+            generation = self._read_generation()
+            changed = generation != self._generation
+            self._generation = generation
+            if self._acquired is not None:
+                self._acquired(write, changed)
+        except BaseException:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            raise
+
+    def _last_releasing(self, write: bool) -> None:
+        """Increment the generation if the write lock is being released, and unlock the file."""
+        try:
+            if self._releasing is not None:
+                self._releasing(write)
+        finally:
+            try:
+                if write:
+                    # The generation is incremented even if the callback failed, since it may have changed something.
+                    self._generation += 1
+                    os.pwrite(self._fd, str(self._generation).encode().rjust(GENERATION_SIZE), 0)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+                if self._closed:
+                    os.close(self._fd)
+                    self._fd = None
+
+
+class LockingGraphStore(GraphStoreWrapper):
+    """
+    A graph store wrapper that makes the wrapped graph store safe to share between threads. Calls that only read from
+    the graph store hold the read lock, so they run concurrently with each other, and calls that modify it hold the
+    write lock, so they run alone. The wrapped store must tolerate concurrent reads; the memory and DBM graph stores do.
+
+    Iterators are filled while the read lock is held and returned afterward, so they can be consumed at leisure, even
+    while the graph store is modified, at the cost of copying the IDs they yield. The range queries are the exception:
+    they fetch their IDs a chunk at a time, taking the read lock for each chunk, so a top-k query only copies what it
+    uses.
+
+    Every call is atomic, but a sequence of calls is not. To make one, e.g. to read a value and write back a new one,
+    hold write_locked() around the calls. The lock is reentrant, so calls made through the wrapper still work inside it.
+    """
+
+    def __init__(self, graph_store: base.GraphStore, lock: Optional[ReadWriteLock] = None):
+        """
+        :param graph_store: The graph store to wrap.
+        :param lock: The lock to hold. By default, the graph store's own lock property is used if it has one, e.g. a
+            DBMGraphStore shared between processes, and otherwise a new ReadWriteLock is created.
+        """
+        super().__init__(graph_store)
+        if lock is None:
+            lock = getattr(graph_store, 'lock', None) or ReadWriteLock()
+        self._lock = lock
+        self._read = self._lock.read_locked()
+        self._write = self._lock.write_locked()
+
+    @property
+    def lock(self) -> ReadWriteLock:
+        """The lock held around every call to the wrapped graph store."""
+        return self._lock
+
+    def read_locked(self) -> _LockContext:
+        """Return a context manager that holds the read lock, for making a sequence of reads consistent."""
+        return self._read
+
+    def write_locked(self) -> _LockContext:
+        """Return a context manager that holds the write lock, for making a sequence of calls atomic."""
+        return self._write
+
+    def _iter_chunks(self, iterator: Iterator[Any]) -> Iterator[Any]:
+        """Yield the items of the iterator, taking the read lock each time a chunk of them is fetched."""
+        while True:
+            with self._read:
+                chunk = list(itertools.islice(iterator, LOCKED_CHUNK_SIZE))
+            if not chunk:
+                return
+            yield from chunk
+
+    def close(self) -> None:
+        """
+        Perform a proper shutdown of the graph store, ensuring that if the graph store is persistent, it will be in a
+        consistent on-disk state.
+        """
+        if not self._graph_store.is_open:
+            return
+        with self._write:
+            self._graph_store.close()
+
+    def count_vertices(self) -> int:
+        """Return the total number of vertices in the graph."""
+        with self._read:
+            return self._graph_store.count_vertices()
+
+    def count_edges(self) -> int:
+        """Return the total number of edges in the graph."""
+        with self._read:
+            return self._graph_store.count_edges()
+
+    def iter_vertices(self) -> Iterator[base.VertexID]:
+        """Return an iterator over the IDs of every vertex in the graph."""
+        with self._read:
+            return iter(list(self._graph_store.iter_vertices()))
+
+    def iter_edges(self) -> Iterator[base.EdgeID]:
+        """Return an iterator over the IDs of every edge in the graph."""
+        with self._read:
+            return iter(list(self._graph_store.iter_edges()))
+
+    def has_inbound(self, sink: base.VertexID) -> bool:
+        """Return a Boolean value indicating whether the given vertex has at least one inbound edge."""
+        with self._read:
+            return self._graph_store.has_inbound(sink)
+
+    def has_outbound(self, source: base.VertexID) -> bool:
+        """Return a Boolean value indicating whether the given vertex has at least one outbound edge."""
+        with self._read:
+            return self._graph_store.has_outbound(source)
+
+    def has_undirected(self, vid: base.VertexID) -> bool:
+        """Return a Boolean value indicating whether the given vertex has at least one undirected edge."""
+        with self._read:
+            return self._graph_store.has_undirected(vid)
+
+    def iter_inbound(self, sink: base.VertexID) -> Iterator[base.DirectedEdgeID]:
+        """Return an iterator over the IDs of every inbound directed edge to this vertex."""
+        with self._read:
+            return iter(list(self._graph_store.iter_inbound(sink)))
+
+    def iter_outbound(self, source: base.VertexID) -> Iterator[base.DirectedEdgeID]:
+        """Return an iterator over the IDs of every outbound directed edge from this vertex."""
+        with self._read:
+            return iter(list(self._graph_store.iter_outbound(source)))
+
+    def iter_undirected(self, vid: base.VertexID) -> Iterator[base.UndirectedEdgeID]:
+        """Return an iterator over the IDs of every undirected edge connected to this vertex."""
+        with self._read:
+            return iter(list(self._graph_store.iter_undirected(vid)))
+
+    def iter_sources(self, sink: base.VertexID) -> Iterator[base.VertexID]:
+        """Return an iterator over the IDs of the sources of every inbound directed edge to this vertex."""
+        with self._read:
+            return iter(list(self._graph_store.iter_sources(sink)))
+
+    def iter_sinks(self, source: base.VertexID) -> Iterator[base.VertexID]:
+        """Return an iterator over the IDs of the sinks of every outbound directed edge from this vertex."""
+        with self._read:
+            return iter(list(self._graph_store.iter_sinks(source)))
+
+    def iter_neighbors(self, vid: base.VertexID) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the IDs of every vertex connected to this vertex by an edge, whether inbound, outbound,
+        or undirected. Each neighbor is yielded only once, even if it is connected by more than one edge.
+        """
+        with self._read:
+            return iter(list(self._graph_store.iter_neighbors(vid)))
+
+    def iter_inbound_data(self, sink: base.VertexID, key: Hashable,
+                          default: Any = None) -> Iterator[Tuple[base.VertexID, Any]]:
+        """
+        Return an iterator over (source, value) pairs, one for each inbound directed edge to this vertex, where value is
+        the data stored in the edge under the key, or the default if there is none.
+        """
+        with self._read:
+            return iter(list(self._graph_store.iter_inbound_data(sink, key, default)))
+
+    def iter_outbound_data(self, source: base.VertexID, key: Hashable,
+                           default: Any = None) -> Iterator[Tuple[base.VertexID, Any]]:
+        """
+        Return an iterator over (sink, value) pairs, one for each outbound directed edge from this vertex, where value
+        is the data stored in the edge under the key, or the default if there is none.
+        """
+        with self._read:
+            return iter(list(self._graph_store.iter_outbound_data(source, key, default)))
+
+    def iter_undirected_data(self, vid: base.VertexID, key: Hashable,
+                             default: Any = None) -> Iterator[Tuple[base.VertexID, Any]]:
+        """
+        Return an iterator over (neighbor, value) pairs, one for each undirected edge connected to this vertex, where
+        value is the data stored in the edge under the key, or the default if there is none.
+        """
+        with self._read:
+            return iter(list(self._graph_store.iter_undirected_data(vid, key, default)))
+
+    def count_inbound(self, sink: base.VertexID) -> int:
+        """Return the number of inbound directed edges to this vertex."""
+        with self._read:
+            return self._graph_store.count_inbound(sink)
+
+    def count_outbound(self, source: base.VertexID) -> int:
+        """Return the number of outbound directed edges from this vertex."""
+        with self._read:
+            return self._graph_store.count_outbound(source)
+
+    def count_undirected(self, vid: base.VertexID) -> int:
+        """Return the number of undirected edges connected to this vertex."""
+        with self._read:
+            return self._graph_store.count_undirected(vid)
+
+    def has_vertex(self, vid: base.VertexID) -> bool:
+        """Return whether the given ID has a vertex associated with it in the graph."""
+        with self._read:
+            return self._graph_store.has_vertex(vid)
+
+    def has_edge(self, eid: base.EdgeID) -> bool:
+        """Return whether the given ID has an edge associated with it in the graph."""
+        with self._read:
+            return self._graph_store.has_edge(eid)
+
+    def add_vertex(self, vid: base.VertexID) -> None:
+        """
+        Add a vertex to the graph associated with this ID. If a vertex with the given ID already exists, do nothing.
+        """
+        with self._write:
+            self._graph_store.add_vertex(vid)
+
+    def add_edge(self, eid: base.EdgeID) -> None:
+        """
+        Add an edge to the graph associated with this ID. If an edge with the given ID already exists, do nothing. If
+        either the source or sink vertex of the edge does not exist, add it first.
+        """
+        with self._write:
+            self._graph_store.add_edge(eid)
+
+    def discard_vertex(self, vid: base.VertexID) -> bool:
+        """
+        Remove the vertex associated with this ID from the graph. If such a vertex does not exist, do nothing. Any
+        incident edges to the vertex are also removed. Return a Boolean indicating whether the vertex was present to be
+        removed.
+        """
+        with self._write:
+            return self._graph_store.discard_vertex(vid)
+
+    def discard_edge(self, eid: base.EdgeID, ignore: Optional[base.VertexID] = None) -> bool:
+        """
+        Remove the edge associated with this ID from the graph. If such an edge does not exist, do nothing. The source
+        and sink vertex are not removed. Return a Boolean indicating whether the edge was present to be removed.
+        """
+        with self._write:
+            return self._graph_store.discard_edge(eid, ignore)
+
+    def add_vertices(self, vids: Iterable[base.VertexID]) -> None:
+        """
+        Add a vertex to the graph for each of these IDs, skipping those that already exist. Equivalent to calling
+        add_vertex() for each ID.
+        """
+        with self._write:
+            self._graph_store.add_vertices(vids)
+
+    def add_edges(self, eids: Iterable[base.EdgeID]) -> None:
+        """
+        Add an edge to the graph for each of these IDs, skipping those that already exist, and adding any missing
+        vertices first. Equivalent to calling add_edge() for each ID.
+        """
+        with self._write:
+            self._graph_store.add_edges(eids)
+
+    def discard_vertices(self, vids: Iterable[base.VertexID]) -> int:
+        """
+        Remove the vertices associated with these IDs from the graph, along with their incident edges. IDs with no
+        associated vertex are ignored. Return the number of vertices that were removed. Equivalent to calling
+        discard_vertex() for each ID.
+        """
+        with self._write:
+            return self._graph_store.discard_vertices(vids)
+
+    def discard_edges(self, eids: Iterable[base.EdgeID]) -> int:
+        """
+        Remove the edges associated with these IDs from the graph. IDs with no associated edge are ignored. Return the
+        number of edges that were removed. Equivalent to calling discard_edge() for each ID.
+        """
+        with self._write:
+            return self._graph_store.discard_edges(eids)
+
+    def set_vertex_data_many(self, items: Iterable[Tuple[base.VertexID, Mapping[Hashable, Any]]]) -> None:
+        """
+        For each (vertex ID, mapping) pair, store every key/value pair of the mapping in the vertex, adding the vertex
+        first if it doesn't exist. Equivalent to calling set_vertex_data() for each key/value pair.
+        """
+        with self._write:
+            self._graph_store.set_vertex_data_many(items)
+
+    def set_edge_data_many(self, items: Iterable[Tuple[base.EdgeID, Mapping[Hashable, Any]]]) -> None:
+        """
+        For each (edge ID, mapping) pair, store every key/value pair of the mapping in the edge, adding the edge first
+        if it doesn't exist. Equivalent to calling set_edge_data() for each key/value pair.
+        """
+        with self._write:
+            self._graph_store.set_edge_data_many(items)
+
+    def add_vertex_labels_many(self, items: Iterable[Tuple[base.VertexID, Iterable[base.Label]]]) -> None:
+        """
+        For each (vertex ID, labels) pair, add every one of the labels to the vertex, adding the vertex first if it
+        doesn't exist. Equivalent to calling add_vertex_label() for each label.
+        """
+        with self._write:
+            self._graph_store.add_vertex_labels_many(items)
+
+    def add_edge_labels_many(self, items: Iterable[Tuple[base.EdgeID, Iterable[base.Label]]]) -> None:
+        """
+        For each (edge ID, labels) pair, add every one of the labels to the edge, adding the edge first if it doesn't
+        exist. Equivalent to calling add_edge_label() for each label.
+        """
+        with self._write:
+            self._graph_store.add_edge_labels_many(items)
+
+    def get_vertex_record(self, vid: base.VertexID) -> Optional[base.VertexRecord]:
+        """
+        Return the labels, data, and edge counts of the vertex in a single call, or None if the vertex does not exist.
+        """
+        with self._read:
+            return self._graph_store.get_vertex_record(vid)
+
+    def get_edge_record(self, eid: base.EdgeID) -> Optional[base.EdgeRecord]:
+        """Return the labels and data of the edge in a single call, or None if the edge does not exist."""
+        with self._read:
+            return self._graph_store.get_edge_record(eid)
+
+    def get_vertex_records(self, vids: Iterable[base.VertexID]) -> List[Optional[base.VertexRecord]]:
+        """
+        Return a list of the records of the vertices, in the same order as their IDs, with None for each ID that has no
+        vertex. Equivalent to calling get_vertex_record() for each ID.
+        """
+        with self._read:
+            return self._graph_store.get_vertex_records(vids)
+
+    def get_edge_records(self, eids: Iterable[base.EdgeID]) -> List[Optional[base.EdgeRecord]]:
+        """
+        Return a list of the records of the edges, in the same order as their IDs, with None for each ID that has no
+        edge. Equivalent to calling get_edge_record() for each ID.
+        """
+        with self._read:
+            return self._graph_store.get_edge_records(eids)
+
+    def filter_vertices(self, vids: Iterable[base.VertexID], labels: Iterable[base.Label] = (),
+                        data: Optional[Mapping[Hashable, Any]] = None) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the vertex IDs in vids whose vertices have every one of the labels and store a value
+        equal to each of the values in data under the same key. The IDs are consumed while the read lock is held, and
+        yielded in the order they are received.
+        """
+        with self._read:
+            return iter(list(self._graph_store.filter_vertices(vids, labels, data)))
+
+    def add_vertex_data_index(self, key: Hashable, ordered: bool = False) -> None:
+        """
+        Declare a secondary index on the vertex data stored under this key, so find_vertices() can look vertices up by
+        value without scanning the graph. If the key is already indexed, do nothing. If ordered is set, the index also
+        keeps the numbers stored under the key in sorted order, so find_vertices_in_range() can scan ranges of them, and
+        an existing index is made ordered.
+        """
+        with self._write:
+            self._graph_store.add_vertex_data_index(key, ordered)
+
+    def discard_vertex_data_index(self, key: Hashable) -> bool:
+        """
+        Drop the secondary index on the vertex data stored under this key. Return a Boolean indicating whether there
+        was an index to drop.
+        """
+        with self._write:
+            return self._graph_store.discard_vertex_data_index(key)
+
+    def has_vertex_data_index(self, key: Hashable, ordered: bool = False) -> bool:
+        """
+        Return a Boolean indicating whether the vertex data stored under this key is indexed, or if ordered is set,
+        whether it has an ordered index.
+        """
+        with self._read:
+            return self._graph_store.has_vertex_data_index(key, ordered)
+
+    def find_vertices(self, key: Hashable, value: Any) -> Iterator[base.VertexID]:
+        """Return an iterator over the IDs of the vertices that store a value equal to this one under the key."""
+        with self._read:
+            return iter(list(self._graph_store.find_vertices(key, value)))
+
+    def find_vertices_in_range(self, key: Hashable, minimum: Optional[Any] = None, maximum: Optional[Any] = None,
+                               reverse: bool = False) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the IDs of the vertices that store a number between the minimum and the maximum,
+        inclusive, under the key, in order of the numbers.
+        """
+        with self._read:
+            iterator = self._graph_store.find_vertices_in_range(key, minimum, maximum, reverse)
+        return self._iter_chunks(iterator)
+
+    def add_edge_data_index(self, key: Hashable, ordered: bool = False) -> None:
+        """
+        Declare a secondary index on the edge data stored under this key, so find_edges() can look edges up by value
+        without scanning the graph. If the key is already indexed, do nothing. If ordered is set, the index also keeps
+        the numbers stored under the key in sorted order, so find_edges_in_range() can scan ranges of them, and an
+        existing index is made ordered.
+        """
+        with self._write:
+            self._graph_store.add_edge_data_index(key, ordered)
+
+    def discard_edge_data_index(self, key: Hashable) -> bool:
+        """
+        Drop the secondary index on the edge data stored under this key. Return a Boolean indicating whether there was
+        an index to drop.
+        """
+        with self._write:
+            return self._graph_store.discard_edge_data_index(key)
+
+    def has_edge_data_index(self, key: Hashable, ordered: bool = False) -> bool:
+        """
+        Return a Boolean indicating whether the edge data stored under this key is indexed, or if ordered is set,
+        whether it has an ordered index.
+        """
+        with self._read:
+            return self._graph_store.has_edge_data_index(key, ordered)
+
+    def find_edges(self, key: Hashable, value: Any) -> Iterator[base.EdgeID]:
+        """Return an iterator over the IDs of the edges that store a value equal to this one under the key."""
+        with self._read:
+            return iter(list(self._graph_store.find_edges(key, value)))
+
+    def find_edges_in_range(self, key: Hashable, minimum: Optional[Any] = None, maximum: Optional[Any] = None,
+                            reverse: bool = False) -> Iterator[base.EdgeID]:
+        """
+        Return an iterator over the IDs of the edges that store a number between the minimum and the maximum,
+        inclusive, under the key, in order of the numbers.
+        """
+        with self._read:
+            iterator = self._graph_store.find_edges_in_range(key, minimum, maximum, reverse)
+        return self._iter_chunks(iterator)
+
+    def add_vertex_label(self, vid: base.VertexID, label: base.Label) -> None:
+        """Add a label to the vertex. If the vertex already has the label, do nothing."""
+        with self._write:
+            self._graph_store.add_vertex_label(vid, label)
+
+    def has_vertex_label(self, vid: base.VertexID, label: base.Label) -> bool:
+        """Return a Boolean indicating whether the vertex has the label."""
+        with self._read:
+            return self._graph_store.has_vertex_label(vid, label)
+
+    def discard_vertex_label(self, vid: base.VertexID, label: base.Label) -> bool:
+        """
+        Remove the label from the vertex. If the vertex does not have the label, do nothing. Return a Boolean indicating
+        whether or not a label was removed.
+        """
+        with self._write:
+            return self._graph_store.discard_vertex_label(vid, label)
+
+    def iter_vertex_labels(self, vid: base.VertexID) -> Iterator[base.Label]:
+        """Return an iterator over the labels for the vertex."""
+        with self._read:
+            return iter(list(self._graph_store.iter_vertex_labels(vid)))
+
+    def count_vertex_labels(self, vid: base.VertexID) -> int:
+        """Return the number of labels the vertex has."""
+        with self._read:
+            return self._graph_store.count_vertex_labels(vid)
+
+    def add_edge_label(self, eid: base.EdgeID, label: base.Label) -> None:
+        """Add a label to the edge. If the edge already has the label, do nothing."""
+        with self._write:
+            self._graph_store.add_edge_label(eid, label)
+
+    def has_edge_label(self, eid: base.EdgeID, label: base.Label) -> bool:
+        """Return a Boolean indicating whether or not the edge has the label."""
+        with self._read:
+            return self._graph_store.has_edge_label(eid, label)
+
+    def discard_edge_label(self, eid: base.EdgeID, label: base.Label) -> bool:
+        """
+        Remove the label from the edge. If the edge does not have the label, do nothing. Return a Boolean indicating
+        whether or not a label was removed.
+        """
+        with self._write:
+            return self._graph_store.discard_edge_label(eid, label)
+
+    def iter_edge_labels(self, eid: base.EdgeID) -> Iterator[base.Label]:
+        """Return an iterator over the labels for the edge."""
+        with self._read:
+            return iter(list(self._graph_store.iter_edge_labels(eid)))
+
+    def count_edge_labels(self, eid: base.EdgeID) -> int:
+        """Return the number of labels the edge has."""
+        with self._read:
+            return self._graph_store.count_edge_labels(eid)
+
+    def iter_vertices_with_label(self, label: base.Label) -> Iterator[base.VertexID]:
+        """Return an iterator over the IDs of the vertices that have the label."""
+        with self._read:
+            return iter(list(self._graph_store.iter_vertices_with_label(label)))
+
+    def count_vertices_with_label(self, label: base.Label) -> int:
+        """Return the number of vertices that have the label."""
+        with self._read:
+            return self._graph_store.count_vertices_with_label(label)
+
+    def iter_edges_with_label(self, label: base.Label) -> Iterator[base.EdgeID]:
+        """Return an iterator over the IDs of the edges that have the label."""
+        with self._read:
+            return iter(list(self._graph_store.iter_edges_with_label(label)))
+
+    def count_edges_with_label(self, label: base.Label) -> int:
+        """Return the number of edges that have the label."""
+        with self._read:
+            return self._graph_store.count_edges_with_label(label)
+
+    def get_vertex_data(self, vid: base.VertexID, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the value stored in the vertex for this key. If no value is stored for the key, return the default. A
+        unique sentinel object can be passed as the default to distinguish a missing key from a stored None in a single
+        lookup.
+        """
+        with self._read:
+            return base.lookup_vertex_data(self._graph_store, vid, key, default)
+
+    def set_vertex_data(self, vid: base.VertexID, key: Hashable, value: Any) -> None:
+        """Store a value in the vertex for this key."""
+        with self._write:
+            self._graph_store.set_vertex_data(vid, key, value)
+
+    def has_vertex_data(self, vid: base.VertexID, key: Hashable) -> bool:
+        """Return a Boolean indicating whether a value is stored in the vertex for this key."""
+        with self._read:
+            return self._graph_store.has_vertex_data(vid, key)
+
+    def discard_vertex_data(self, vid: base.VertexID, key: Hashable) -> bool:
+        """
+        Remove the value stored in the vertex under this key. If no value is stored for the key, do nothing. Return a
+        Boolean indicating whether a key/value pair was removed from the vertex.
+        """
+        with self._write:
+            return self._graph_store.discard_vertex_data(vid, key)
+
+    def iter_vertex_data_keys(self, vid: base.VertexID) -> Iterator[Hashable]:
+        """Return an iterator over the keys for which data is stored in the vertex."""
+        with self._read:
+            return iter(list(self._graph_store.iter_vertex_data_keys(vid)))
+
+    def count_vertex_data_keys(self, vid: base.VertexID) -> int:
+        """Return the number of key/value pairs stored in the vertex."""
+        with self._read:
+            return self._graph_store.count_vertex_data_keys(vid)
+
+    def get_edge_data(self, eid: base.EdgeID, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the value stored in the edge for this key. If no value is stored for the key, return the default. A
+        unique sentinel object can be passed as the default to distinguish a missing key from a stored None in a single
+        lookup.
+        """
+        with self._read:
+            return base.lookup_edge_data(self._graph_store, eid, key, default)
+
+    def set_edge_data(self, eid: base.EdgeID, key: Hashable, value: Any) -> None:
+        """Store a value in the edge for this key."""
+        with self._write:
+            self._graph_store.set_edge_data(eid, key, value)
+
+    def has_edge_data(self, eid: base.EdgeID, key: Hashable) -> bool:
+        """Return a Boolean indicating whether a value is stored in the edge for this key."""
+        with self._read:
+            return self._graph_store.has_edge_data(eid, key)
+
+    def discard_edge_data(self, eid: base.EdgeID, key: Hashable) -> bool:
+        """
+        Remove the value stored in the edge under this key. If no value is stored for the key, do nothing. Return a
+        Boolean indicating whether a key/value pair was removed from the edge.
+        """
+        with self._write:
+            return self._graph_store.discard_edge_data(eid, key)
+
+    def iter_edge_data_keys(self, eid: base.EdgeID) -> Iterator[Hashable]:
+        """Return an iterator over the keys for which data is stored in the edge."""
+        with self._read:
+            return iter(list(self._graph_store.iter_edge_data_keys(eid)))
+
+    def count_edge_data_keys(self, eid: base.EdgeID) -> int:
+        """Return the number of key/value pairs stored in the edge."""
+        with self._read:
+            return self._graph_store.count_edge_data_keys(eid)
@@ -9,7 +9,11 @@ A non-persistent graph store implemented using standard Python data types.
 """
 
 
-from typing import Hashable, Any, Optional, Iterator
+import bisect
+import os
+import pickle
+import threading
+from typing import Hashable, Any, Callable, Optional, Iterator, Iterable, List, Mapping, Tuple
 
 
 import vert.stores.base as base
@@ -17,14 +21,66 @@ import vert.stores.base as base
 
 __all__ = [
     'MemoryGraphStore',
+    'ConcurrentMemoryGraphStore',
 ]
 
 
+SNAPSHOT_MAGIC = b'VERT-MGS'
+SNAPSHOT_VERSION = 3
+SNAPSHOT_CHUNK_SIZE = 10000
+
+# The most distinct numbers held in one page of an ordered index. A page that grows past this is split in two.
+ORDER_PAGE_SIZE = 512
+
+
+class _Sentinel:
+    """
+    The type of the special keys of index entries. Sentinels are pickled by name, so snapshot files refer back to the
+    same objects when they are loaded.
+    """
+
+    __slots__ = ('_name',)
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __reduce__(self) -> str:
+        return self._name
+
+    def __repr__(self) -> str:
+        return self._name
+
+
+# The index entry holding the IDs of the vertices or edges that store unhashable values under an indexed key.
+_UNHASHABLE = _Sentinel('_UNHASHABLE')
+
+# The index entry of an ordered index holding the distinct numbers stored under the key, in sorted order. It is a pair
+# of lists: the first number of each page, and the pages, which are sorted lists of at most ORDER_PAGE_SIZE numbers.
+# Keeping the numbers in pages bounds the cost of inserting or removing one to the size of a page.
+_ORDER = _Sentinel('_ORDER')
+
+# The index entries holding the IDs of the vertices or edges that store True or False under an indexed key. Booleans
+# are equal to the numbers 1 and 0, so without entries of their own they would be found by lookups of those numbers.
+_TRUE = _Sentinel('_TRUE')
+_FALSE = _Sentinel('_FALSE')
+
+
+def _entry_key(value: Any) -> Any:
+    """Return the key of the index entry for a value: the value itself, or a sentinel if it is a Boolean."""
+    if isinstance(value, bool):
+        return _TRUE if value else _FALSE
+    return value
+
+
 class MemoryGraphStore(base.GraphStore):
     """
     A Python-only, non-persistent graph store designed for sparse graphs.
     """
 
+    # The names of the attributes holding the graph's tables, in the order they are written to snapshot files.
+    _TABLES = ('_forward', '_backward', '_dual', '_vertex_labels', '_edge_labels', '_vertex_data', '_edge_data',
+               '_vertex_data_index', '_edge_data_index', '_vertex_label_index', '_edge_label_index')
+
     def __init__(self):
         self._forward = {}
         self._backward = {}
@@ -35,6 +91,380 @@ class MemoryGraphStore(base.GraphStore):
         self._edge_data = {}
         self._edge_count = 0
 
+        # Secondary indexes on data values. Each maps an indexed key to a dictionary from the values stored under the
+        # key to the set of vertex or edge IDs storing them. IDs storing unhashable values are kept under _UNHASHABLE,
+        # Booleans under _TRUE and _FALSE, and ordered indexes keep their distinct numbers in sorted pages under _ORDER.
+        self._vertex_data_index = {}
+        self._edge_data_index = {}
+
+        # Inverted indexes of the labels, mapping each label to the set of vertex or edge IDs that have it.
+        self._vertex_label_index = {}
+        self._edge_label_index = {}
+
+        # Copy-on-write bookkeeping for snapshots. While _shared is set, the top-level tables are referenced by at
+        # least one snapshot and must be copied before they are modified. Once they have been copied, _owned holds
+        # the ids of the nested containers that have been created or copied since the last snapshot; any nested
+        # container not listed there may still belong to a snapshot, and must be copied before it is modified. When
+        # no snapshot has ever been taken, _owned is None and no copying is done at all.
+        self._read_only = False
+        self._shared = False
+        self._owned = None
+
+    @property
+    def is_read_only(self) -> bool:
+        """Whether the graph store rejects modifications. This is only the case for snapshots."""
+        return self._read_only
+
+    def snapshot(self) -> 'MemoryGraphStore':
+        """
+        Return a read-only view of the graph store as it currently stands. The snapshot shares its underlying
+        containers with this graph store, so taking a snapshot takes constant time and memory. Containers are copied
+        lazily, the first time this graph store modifies them after the snapshot was taken, so later changes to this
+        graph store are never visible through the snapshot.
+
+        The copying is not free: the first modification after a snapshot copies all of the top-level tables, which
+        takes time and memory proportional to the number of vertices and edges, and each nested container is copied
+        again the first time it is modified. Alternating between taking snapshots and making small modifications
+        therefore costs a full copy of the tables per snapshot. Workloads like that should batch their modifications
+        between snapshots, or take snapshots less often.
+        """
+        if self._read_only:
+            return self
+
+        snapshot = MemoryGraphStore()
+        for name in self._TABLES:
+            setattr(snapshot, name, getattr(self, name))
+        snapshot._edge_count = self._edge_count
+        snapshot._read_only = True
+
+        self._shared = True
+        self._owned = set()
+
+        return snapshot
+
+    def _prepare_write(self) -> None:
+        """
+        Ensure the graph store can be modified. If the top-level tables are shared with a snapshot, they are copied
+        first, which takes time proportional to the size of the graph. The nested containers they hold are left
+        shared; see _own().
+        """
+        if self._read_only:
+            raise TypeError("Graph store snapshots are read-only.")
+        if self._shared:
+            for name in self._TABLES:
+                setattr(self, name, dict(getattr(self, name)))
+            self._owned = set()
+            self._shared = False
+
+    def _own(self, table: dict, key: Any) -> Any:
+        """
+        Return the nested container stored in the table under the key, copying it first if it may be shared with a
+        snapshot. Must only be called after _prepare_write().
+        """
+        container = table[key]
+        if self._owned is None or id(container) in self._owned:
+            return container
+        container = container.copy()
+        table[key] = container
+        self._owned.add(id(container))
+        return container
+
+    def _new(self, container: Any) -> Any:
+        """Register a newly created nested container as owned, so it isn't needlessly copied by _own()."""
+        if self._owned is not None:
+            self._owned.add(id(container))
+        return container
+
+    def save(self, path: str) -> None:
+        """
+        Save the contents of the graph store to a binary snapshot file, which can be read back in with load(). The
+        tables are streamed to disk in fixed-size chunks, so no serialized copy of the whole graph is ever held in
+        memory. The file is written under a temporary name and then moved into place, so an existing snapshot at the
+        same path is not lost if saving fails part way through.
+        """
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as file:
+            file.write(SNAPSHOT_MAGIC)
+            # Each chunk is written as a separate pickle, so the pickler's memo, which holds a reference to every
+            # object written, never grows past a single chunk. They are read back the same way, one at a time.
+            pickle.dump((SNAPSHOT_VERSION, self._edge_count, self._TABLES), file, pickle.HIGHEST_PROTOCOL)
+            for name in self._TABLES:
+                chunk = []
+                for item in getattr(self, name).items():
+                    chunk.append(item)
+                    if len(chunk) >= SNAPSHOT_CHUNK_SIZE:
+                        pickle.dump(chunk, file, pickle.HIGHEST_PROTOCOL)
+                        chunk = []
+                if chunk:
+                    pickle.dump(chunk, file, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(None, file, pickle.HIGHEST_PROTOCOL)  # End of table
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'MemoryGraphStore':
+        """
+        Load a graph store from a binary snapshot file written by save(). The tables are rebuilt directly from the
+        file's chunks, bypassing the bookkeeping done by add_vertex() and add_edge(). Snapshot files are pickles, so
+        only load files from trusted sources.
+        """
+        store = cls()
+
+        # Loading creates millions of containers, none of which can be garbage. Left enabled, the cyclic garbage
+        # collector would repeatedly rescan all of them, which more than triples the load time.
+        with base.paused_gc():
+            with open(path, 'rb') as file:
+                if file.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                    raise ValueError("Not a graph store snapshot file: %r" % path)
+                unpickler = pickle.Unpickler(file)
+                version, edge_count, tables = unpickler.load()
+                if version not in (1, 2, SNAPSHOT_VERSION):
+                    raise ValueError("Unsupported graph store snapshot version: %r" % version)
+                for name in tables:
+                    table = getattr(store, name)
+                    while True:
+                        if version > 1:
+                            unpickler = pickle.Unpickler(file)
+                        chunk = unpickler.load()
+                        if chunk is None:
+                            break
+                        table.update(chunk)
+                        if version == 1:
+                            # Version 1 files were written with a single pickler whose memo was only cleared
+                            # after each chunk, so everything up to the end of a chunk has to be read as one pickle.
+                            unpickler = pickle.Unpickler(file)
+                # Snapshots written before the label indexes were added don't include them.
+                if '_vertex_label_index' not in tables:
+                    store._build_label_index(store._vertex_label_index, store._vertex_labels)
+                    store._build_label_index(store._edge_label_index, store._edge_labels)
+                # Snapshots written before Booleans had index entries of their own filed them with the equal numbers.
+                if version < 3:
+                    for indexes, table in ((store._vertex_data_index, store._vertex_data),
+                                           (store._edge_data_index, store._edge_data)):
+                        for key in list(indexes):
+                            ordered = _ORDER in indexes.pop(key)
+                            store._build_index(indexes, key, table, ordered)
+
+        store._edge_count = edge_count
+        return store
+
+    def _adjust_edge_count(self, delta: int) -> None:
+        """Add the delta to the edge count."""
+        self._edge_count += delta
+
+    def _index(self, indexes: dict, key: Hashable, value: Any, item: Any) -> None:
+        """Add the vertex or edge ID to the index entry for the value. The key must be indexed."""
+        index = self._own(indexes, key)
+        value = _entry_key(value)
+        try:
+            entry = index.get(value, None)
+        except TypeError:
+            value = _UNHASHABLE
+            entry = index.get(value, None)
+        if entry is None:
+            index[value] = self._new({item})
+            if _ORDER in index and base.is_number(value):
+                self._insert_ordered(index, value)
+        else:
+            self._own(index, value).add(item)
+
+    def _unindex(self, indexes: dict, key: Hashable, value: Any, item: Any) -> None:
+        """Remove the vertex or edge ID from the index entry for the value. The key must be indexed."""
+        index = self._own(indexes, key)
+        value = _entry_key(value)
+        try:
+            entry = index.get(value, None)
+        except TypeError:
+            value = _UNHASHABLE
+            entry = index.get(value, None)
+        if entry is not None and item in entry:
+            entry = self._own(index, value)
+            entry.discard(item)
+            if not entry:
+                del index[value]
+                if _ORDER in index and base.is_number(value):
+                    self._remove_ordered(index, value)
+
+    def _insert_ordered(self, index: dict, value: Any) -> None:
+        """Add a number that was not stored under the key before to the key's ordered index."""
+        order = self._own(index, _ORDER)
+        firsts = self._own(order, 0)
+        pages = self._own(order, 1)
+        if not pages:
+            firsts.append(value)
+            pages.append(self._new([value]))
+            return
+        position = max(bisect.bisect_right(firsts, value) - 1, 0)
+        page = self._own(pages, position)
+        bisect.insort(page, value)
+        firsts[position] = page[0]
+        if len(page) > ORDER_PAGE_SIZE:
+            # Split the page, moving its upper half to a new page after it.
+            half = len(page) // 2
+            new_page = self._new(page[half:])
+            del page[half:]
+            firsts.insert(position + 1, new_page[0])
+            pages.insert(position + 1, new_page)
+
+    def _remove_ordered(self, index: dict, value: Any) -> None:
+        """Remove a number that is no longer stored under the key from the key's ordered index."""
+        order = self._own(index, _ORDER)
+        firsts = self._own(order, 0)
+        position = bisect.bisect_right(firsts, value) - 1
+        if position < 0:
+            return
+        pages = self._own(order, 1)
+        page = self._own(pages, position)
+        offset = bisect.bisect_left(page, value)
+        if offset < len(page) and page[offset] == value:
+            del page[offset]
+        # Emptied pages are dropped, but pages are not merged with their neighbors when they run low.
+        if page:
+            firsts[position] = page[0]
+        else:
+            del firsts[position]
+            del pages[position]
+
+    def _unindex_all(self, indexes: dict, data: Mapping[Hashable, Any], item: Any) -> None:
+        """Remove the vertex or edge ID from the index entries for all of its indexed data."""
+        for key, value in data.items():
+            if key in indexes:
+                self._unindex(indexes, key, value, item)
+
+    def _index_many(self, indexes: dict, old: Mapping[Hashable, Any], new: Mapping[Hashable, Any], item: Any) -> None:
+        """Update the index entries of a vertex or edge ID whose data is about to be updated from old to new."""
+        for key, value in new.items():
+            if key in indexes:
+                if key in old:
+                    self._unindex(indexes, key, old[key], item)
+                self._index(indexes, key, value, item)
+
+    def _build_index(self, indexes: dict, key: Hashable, table: dict, ordered: bool) -> None:
+        """
+        Create the index for the key, adding every vertex or edge in the data table that stores a value for it. If
+        ordered is set, sort the numbers in the index, whether or not it already existed.
+        """
+        self._prepare_write()
+        if key not in indexes:
+            indexes[key] = self._new({})
+            for item, data in table.items():
+                if key in data:
+                    self._index(indexes, key, data[key], item)
+        if ordered and _ORDER not in indexes[key]:
+            index = self._own(indexes, key)
+            values = sorted(value for value in index if base.is_number(value))
+            # Pages start out half full, so they have room to grow before they are split.
+            pages = [self._new(values[start:start + ORDER_PAGE_SIZE // 2])
+                     for start in range(0, len(values), ORDER_PAGE_SIZE // 2)]
+            index[_ORDER] = self._new([self._new([page[0] for page in pages]), self._new(pages)])
+
+    @staticmethod
+    def _find(indexes: dict, key: Hashable, value: Any, table: dict) -> Optional[Iterator[Any]]:
+        """
+        Return an iterator over the vertex or edge IDs that store the value under the key, or None if the key is not
+        indexed. The IDs are copied, so the graph store can be modified while they are iterated over.
+        """
+        index = indexes.get(key, None)
+        if index is None:
+            return None
+        try:
+            return iter(list(index.get(_entry_key(value), ())))
+        except TypeError:
+            return iter([item for item in index.get(_UNHASHABLE, ()) if table.get(item, {}).get(key) == value])
+
+    def _index_label(self, index: dict, label: base.Label, item: Any) -> None:
+        """Add the vertex or edge ID to the label's entry in the label index."""
+        if label in index:
+            self._own(index, label).add(item)
+        else:
+            index[label] = self._new({item})
+
+    def _unindex_label(self, index: dict, label: base.Label, item: Any) -> None:
+        """Remove the vertex or edge ID from the label's entry in the label index."""
+        entry = index.get(label, None)
+        if entry is not None and item in entry:
+            entry = self._own(index, label)
+            entry.discard(item)
+            if not entry:
+                del index[label]
+
+    def _build_label_index(self, index: dict, table: dict) -> None:
+        """Fill the label index from the labels table."""
+        for item, labels in table.items():
+            for label in labels:
+                self._index_label(index, label, item)
+
+    def _find_range(self, indexes: dict, key: Hashable, minimum: Optional[Any], maximum: Optional[Any],
+                    reverse: bool) -> Optional[Iterator[Any]]:
+        """
+        Return an iterator over the vertex or edge IDs that store a number in the range under the key, in order of the
+        numbers, or None if the key does not have an ordered index.
+        """
+        index = indexes.get(key, None)
+        if index is None or _ORDER not in index:
+            return None
+        return self._iter_range(indexes, key, minimum, maximum, reverse)
+
+    def _iter_range(self, indexes: dict, key: Hashable, minimum: Optional[Any], maximum: Optional[Any],
+                    reverse: bool) -> Iterator[Any]:
+        """
+        Yield the vertex or edge IDs that store a number in the range under the key from its ordered index, a page at a
+        time. Each page is found by bisecting for the last number of the one before, so the graph store can be
+        modified while the IDs are iterated over.
+        """
+        bound = maximum if reverse else minimum
+        inclusive = True
+        while True:
+            page = self._range_page(indexes, key, minimum, maximum, reverse, bound, inclusive)
+            if page is None:
+                return
+            bound, found = page
+            yield from found
+            inclusive = False
+
+    @staticmethod
+    def _range_page(indexes: dict, key: Hashable, minimum: Optional[Any], maximum: Optional[Any], reverse: bool,
+                    bound: Optional[Any], inclusive: bool) -> Optional[Tuple[Any, List[Any]]]:
+        """
+        Return the last number of the next page of numbers in the range past the bound, along with a list of the vertex
+        or edge IDs that store them, or None if there are no more numbers in the range.
+        """
+        index = indexes.get(key, None)
+        if index is None or _ORDER not in index:
+            return None
+        firsts, pages = index[_ORDER]
+        values = []
+        if reverse:
+            position = len(pages) - 1 if bound is None else bisect.bisect_right(firsts, bound) - 1
+            while position >= 0 and not values:
+                page = pages[position]
+                if bound is None:
+                    stop = len(page)
+                else:
+                    stop = (bisect.bisect_right if inclusive else bisect.bisect_left)(page, bound)
+                values = page[:stop]
+                values.reverse()
+                position -= 1
+            if minimum is not None:
+                values = [value for value in values if value >= minimum]
+        else:
+            position = 0 if bound is None else max(bisect.bisect_right(firsts, bound) - 1, 0)
+            while position < len(pages) and not values:
+                page = pages[position]
+                if bound is None:
+                    start = 0
+                else:
+                    start = (bisect.bisect_left if inclusive else bisect.bisect_right)(page, bound)
+                values = page[start:]
+                position += 1
+            if maximum is not None:
+                values = [value for value in values if value <= maximum]
+        if not values:
+            return None
+        found = []
+        for value in values:
+            found.extend(index.get(value, ()))
+        return values[-1], found
+
     def count_vertices(self) -> int:
         """Return the total number of vertices in the graph."""
         return len(self._forward)
@@ -83,7 +513,7 @@ class MemoryGraphStore(base.GraphStore):
 
     def iter_outbound(self, source: base.VertexID) -> Iterator[base.DirectedEdgeID]:
         """Return an iterator over the IDs of every outbound directed edge from this vertex."""
-        for sink in self._backward.get(source, ()):
+        for sink in self._forward.get(source, ()):
             yield base.DirectedEdgeID(source, sink)
 
     def iter_undirected(self, vid: base.VertexID) -> Iterator[base.UndirectedEdgeID]:
@@ -91,6 +521,68 @@ class MemoryGraphStore(base.GraphStore):
         for other in self._dual.get(vid, ()):
             yield base.UndirectedEdgeID(vid, other)
 
+    def iter_sources(self, sink: base.VertexID) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the IDs of the sources of every inbound directed edge to this vertex.
+        """
+        return iter(self._backward.get(sink, ()))
+
+    def iter_sinks(self, source: base.VertexID) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the IDs of the sinks of every outbound directed edge from this vertex.
+        """
+        return iter(self._forward.get(source, ()))
+
+    def iter_neighbors(self, vid: base.VertexID) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the IDs of every vertex connected to this vertex by an edge, whether inbound, outbound,
+        or undirected. Each neighbor is yielded only once, even if it is connected by more than one edge.
+        """
+        sinks = self._forward.get(vid, ())
+        sources = self._backward.get(vid, ())
+        yield from sinks
+        for other in sources:
+            if other not in sinks:
+                yield other
+        for other in self._dual.get(vid, ()):
+            if other not in sinks and other not in sources:
+                yield other
+
+    def iter_inbound_data(self, sink: base.VertexID, key: Hashable,
+                          default: Any = None) -> Iterator[Tuple[base.VertexID, Any]]:
+        """
+        Return an iterator over (source, value) pairs, one for each inbound directed edge to this vertex, where value is
+        the data stored in the edge under the key, or the default if there is none.
+        """
+        # Plain tuples and frozensets hash and compare equal to the edge IDs they stand in for, so the edge data can
+        # be looked up without constructing an edge ID for each edge.
+        edge_data = self._edge_data
+        for source in self._backward.get(sink, ()):
+            data = edge_data.get((source, sink), None)
+            yield source, (default if data is None else data.get(key, default))
+
+    def iter_outbound_data(self, source: base.VertexID, key: Hashable,
+                           default: Any = None) -> Iterator[Tuple[base.VertexID, Any]]:
+        """
+        Return an iterator over (sink, value) pairs, one for each outbound directed edge from this vertex, where value
+        is the data stored in the edge under the key, or the default if there is none.
+        """
+        edge_data = self._edge_data
+        for sink in self._forward.get(source, ()):
+            data = edge_data.get((source, sink), None)
+            yield sink, (default if data is None else data.get(key, default))
+
+    def iter_undirected_data(self, vid: base.VertexID, key: Hashable,
+                             default: Any = None) -> Iterator[Tuple[base.VertexID, Any]]:
+        """
+        Return an iterator over (neighbor, value) pairs, one for each undirected edge connected to this vertex, where
+        value is the data stored in the edge under the key, or the default if there is none.
+        """
+        edge_data = self._edge_data
+        for other in self._dual.get(vid, ()):
+            data = edge_data.get(frozenset((vid, other)), None)
+            yield other, (default if data is None else data.get(key, default))
+
     def count_inbound(self, sink: base.VertexID) -> int:
         """Return the number of inbound directed edges to this vertex."""
         return len(self._backward.get(sink, ()))
@@ -120,24 +612,25 @@ class MemoryGraphStore(base.GraphStore):
         """
         Add a vertex to the graph associated with this ID. If a vertex with the given ID already exists, do nothing.
         """
+        self._prepare_write()
         if vid not in self._forward:
-            self._forward[vid] = set()
-            self._backward[vid] = set()
-            self._dual[vid] = set()
+            self._forward[vid] = self._new(set())
+            self._backward[vid] = self._new(set())
+            self._dual[vid] = self._new(set())
 
     def add_edge(self, eid: base.EdgeID) -> None:
         """
         Add an edge to the graph associated with this ID. If an edge with the given ID already exists, do nothing. If
         either the source or sink vertex of the edge does not exist, add it first.
         """
+        self._prepare_write()
         if isinstance(eid, base.DirectedEdgeID):
             if eid.sink in self._forward.get(eid.source, ()):
                 return
             self.add_vertex(eid.source)
             self.add_vertex(eid.sink)
-            self._forward[eid.source].add(eid.sink)
-            self._backward[eid.sink].add(eid.source)
-            self._edge_count += 1
+            self._own(self._forward, eid.source).add(eid.sink)
+            self._own(self._backward, eid.sink).add(eid.source)
         else:
             assert isinstance(eid, base.UndirectedEdgeID)
             v1, v2 = eid.vertices
@@ -145,8 +638,9 @@ class MemoryGraphStore(base.GraphStore):
                 return
             self.add_vertex(v1)
             self.add_vertex(v2)
-            self._dual[v1].add(v2)
-            self._dual[v2].add(v1)
+            self._own(self._dual, v1).add(v2)
+            self._own(self._dual, v2).add(v1)
+        self._adjust_edge_count(1)
 
     def discard_vertex(self, vid: base.VertexID) -> bool:
         """
@@ -154,20 +648,26 @@ class MemoryGraphStore(base.GraphStore):
         incident edges to the vertex are also removed. Return a Boolean indicating whether the vertex was present to
         be removed.
         """
+        self._prepare_write()
         if vid not in self._forward:
             return False
 
         # Remove labels and data
         if vid in self._vertex_labels:
+            for label in self._vertex_labels[vid]:
+                self._unindex_label(self._vertex_label_index, label, vid)
             del self._vertex_labels[vid]
         if vid in self._vertex_data:
+            if self._vertex_data_index:
+                self._unindex_all(self._vertex_data_index, self._vertex_data[vid], vid)
             del self._vertex_data[vid]
 
         # Remove all incident edges.
         for sink in self._forward[vid]:
             self.discard_edge(base.DirectedEdgeID(vid, sink), ignore=vid)
         for source in self._backward[vid]:
-            self.discard_edge(base.DirectedEdgeID(source, vid), ignore=vid)
+            if source != vid:  # Self-loops were already removed along with the outbound edges.
+                self.discard_edge(base.DirectedEdgeID(source, vid), ignore=vid)
         for other in self._dual[vid]:
             self.discard_edge(base.UndirectedEdgeID(vid, other), ignore=vid)
 
@@ -183,41 +683,365 @@ class MemoryGraphStore(base.GraphStore):
         Remove the edge associated with this ID from the graph. If such an edge does not exist, do nothing. The source
         and sink vertex are not removed. Return a Boolean indicating whether the edge was present to be removed.
         """
+        self._prepare_write()
         if not self.has_edge(eid):
             return False
 
         # Remove labels and data.
         if eid in self._edge_labels:
+            for label in self._edge_labels[eid]:
+                self._unindex_label(self._edge_label_index, label, eid)
             del self._edge_labels[eid]
         if eid in self._edge_data:
+            if self._edge_data_index:
+                self._unindex_all(self._edge_data_index, self._edge_data[eid], eid)
             del self._edge_data[eid]
 
         # Remove the edge itself
         if isinstance(eid, base.DirectedEdgeID):
             if eid.source != ignore:
-                self._forward[eid.source].discard(eid.sink)
+                self._own(self._forward, eid.source).discard(eid.sink)
             if eid.sink != ignore:
-                self._backward[eid.sink].discard(eid.source)
+                self._own(self._backward, eid.sink).discard(eid.source)
         else:
             assert isinstance(eid, base.UndirectedEdgeID)
             v1, v2 = eid.vertices
             if v1 != ignore:
-                self._dual[v1].discard(v2)
+                self._own(self._dual, v1).discard(v2)
             if v1 != v2 and v2 != ignore:
-                self._dual[v2].discard(v1)
+                self._own(self._dual, v2).discard(v1)
 
         # Decrement the counter
-        self._edge_count -= 1
+        self._adjust_edge_count(-1)
 
         return True
 
+    def add_vertices(self, vids: Iterable[base.VertexID]) -> None:
+        """
+        Add a vertex to the graph for each of these IDs, skipping those that already exist. Equivalent to calling
+        add_vertex() for each ID, but graph stores can override it to do the work in bulk.
+        """
+        self._prepare_write()
+        forward = self._forward
+        backward = self._backward
+        dual = self._dual
+        new = self._new
+        for vid in vids:
+            if vid not in forward:
+                forward[vid] = new(set())
+                backward[vid] = new(set())
+                dual[vid] = new(set())
+
+    def add_edges(self, eids: Iterable[base.EdgeID]) -> None:
+        """
+        Add an edge to the graph for each of these IDs, skipping those that already exist, and adding any missing
+        vertices first. Equivalent to calling add_edge() for each ID, but graph stores can override it to do the work
+        in bulk.
+        """
+        self._prepare_write()
+        forward = self._forward
+        backward = self._backward
+        dual = self._dual
+        own = self._own
+        added = 0
+        for eid in eids:
+            if isinstance(eid, base.DirectedEdgeID):
+                # Attribute access is used rather than unpacking, which goes through DirectedEdgeID.__iter__().
+                source = eid.source
+                sink = eid.sink
+                if sink in forward.get(source, ()):
+                    continue
+                if source not in forward:
+                    self.add_vertex(source)
+                if sink not in forward:
+                    self.add_vertex(sink)
+                own(forward, source).add(sink)
+                own(backward, sink).add(source)
+            else:
+                assert isinstance(eid, base.UndirectedEdgeID)
+                v1, v2 = eid.vertices
+                if v2 in dual.get(v1, ()):
+                    continue
+                if v1 not in forward:
+                    self.add_vertex(v1)
+                if v2 not in forward:
+                    self.add_vertex(v2)
+                own(dual, v1).add(v2)
+                own(dual, v2).add(v1)
+            added += 1
+        self._adjust_edge_count(added)
+
+    def set_vertex_data_many(self, items: Iterable[Tuple[base.VertexID, Mapping[Hashable, Any]]]) -> None:
+        """
+        For each (vertex ID, mapping) pair, store every key/value pair of the mapping in the vertex, adding the vertex
+        first if it doesn't exist. Equivalent to calling set_vertex_data() for each key/value pair, but graph stores
+        can override it to do the work in bulk.
+        """
+        self._prepare_write()
+        vertex_data = self._vertex_data
+        indexes = self._vertex_data_index
+        for vid, data in items:
+            if vid not in self._forward:
+                self.add_vertex(vid)
+            if indexes:
+                self._index_many(indexes, vertex_data.get(vid, {}), data, vid)
+            if vid in vertex_data:
+                self._own(vertex_data, vid).update(data)
+            elif data:
+                vertex_data[vid] = self._new(dict(data))
+
+    def set_edge_data_many(self, items: Iterable[Tuple[base.EdgeID, Mapping[Hashable, Any]]]) -> None:
+        """
+        For each (edge ID, mapping) pair, store every key/value pair of the mapping in the edge, adding the edge first
+        if it doesn't exist. Equivalent to calling set_edge_data() for each key/value pair, but graph stores can
+        override it to do the work in bulk.
+        """
+        self._prepare_write()
+        edge_data = self._edge_data
+        indexes = self._edge_data_index
+        for eid, data in items:
+            self.add_edge(eid)
+            if indexes:
+                self._index_many(indexes, edge_data.get(eid, {}), data, eid)
+            if eid in edge_data:
+                self._own(edge_data, eid).update(data)
+            elif data:
+                edge_data[eid] = self._new(dict(data))
+
+    def add_vertex_labels_many(self, items: Iterable[Tuple[base.VertexID, Iterable[base.Label]]]) -> None:
+        """
+        For each (vertex ID, labels) pair, add every one of the labels to the vertex, adding the vertex first if it
+        doesn't exist. Equivalent to calling add_vertex_label() for each label, but graph stores can override it to do
+        the work in bulk.
+        """
+        self._prepare_write()
+        self._add_labels_many(self._vertex_labels, self._vertex_label_index, items, self.add_vertex)
+
+    def add_edge_labels_many(self, items: Iterable[Tuple[base.EdgeID, Iterable[base.Label]]]) -> None:
+        """
+        For each (edge ID, labels) pair, add every one of the labels to the edge, adding the edge first if it doesn't
+        exist. Equivalent to calling add_edge_label() for each label, but graph stores can override it to do the work
+        in bulk.
+        """
+        self._prepare_write()
+        self._add_labels_many(self._edge_labels, self._edge_label_index, items, self.add_edge)
+
+    def _add_labels_many(self, table: dict, index: dict, items: Iterable[Tuple[Any, Iterable[base.Label]]],
+                         add: Callable[[Any], None]) -> None:
+        """
+        Add the labels of each vertex or edge ID to the label table and the label index, calling add() with each ID
+        first to make sure the vertex or edge exists.
+        """
+        for item, labels in items:
+            add(item)
+            existing = table.get(item, None)
+            for label in labels:
+                if existing is None:
+                    existing = table[item] = self._new({label})
+                elif label in existing:
+                    continue
+                else:
+                    existing = self._own(table, item)
+                    existing.add(label)
+                self._index_label(index, label, item)
+
+    def get_vertex_record(self, vid: base.VertexID) -> Optional[base.VertexRecord]:
+        """
+        Return the labels, data, and edge counts of the vertex in a single call, or None if the vertex does not exist.
+        """
+        sinks = self._forward.get(vid, None)
+        if sinks is None:
+            return None
+        return base.VertexRecord(frozenset(self._vertex_labels.get(vid, ())), dict(self._vertex_data.get(vid, ())),
+                                 len(self._backward.get(vid, ())), len(sinks), len(self._dual.get(vid, ())))
+
+    def get_edge_record(self, eid: base.EdgeID) -> Optional[base.EdgeRecord]:
+        """Return the labels and data of the edge in a single call, or None if the edge does not exist."""
+        if not self.has_edge(eid):
+            return None
+        return base.EdgeRecord(frozenset(self._edge_labels.get(eid, ())), dict(self._edge_data.get(eid, ())))
+
+    def get_vertex_records(self, vids: Iterable[base.VertexID]) -> List[Optional[base.VertexRecord]]:
+        """
+        Return a list of the records of the vertices, in the same order as their IDs, with None for each ID that has no
+        vertex.
+        """
+        forward = self._forward
+        backward = self._backward
+        dual = self._dual
+        vertex_labels = self._vertex_labels
+        vertex_data = self._vertex_data
+        record = base.VertexRecord
+        no_labels = frozenset()
+        records = []
+        for vid in vids:
+            sinks = forward.get(vid, None)
+            if sinks is None:
+                records.append(None)
+                continue
+            labels = vertex_labels.get(vid, None)
+            data = vertex_data.get(vid, None)
+            records.append(record(frozenset(labels) if labels else no_labels, dict(data) if data else {},
+                                  len(backward[vid]), len(sinks), len(dual[vid])))
+        return records
+
+    def get_edge_records(self, eids: Iterable[base.EdgeID]) -> List[Optional[base.EdgeRecord]]:
+        """
+        Return a list of the records of the edges, in the same order as their IDs, with None for each ID that has no
+        edge.
+        """
+        forward = self._forward
+        dual = self._dual
+        edge_labels = self._edge_labels
+        edge_data = self._edge_data
+        record = base.EdgeRecord
+        no_labels = frozenset()
+        records = []
+        for eid in eids:
+            if isinstance(eid, base.DirectedEdgeID):
+                exists = eid.sink in forward.get(eid.source, ())
+            else:
+                v1, v2 = eid.vertices
+                exists = v2 in dual.get(v1, ())
+            if not exists:
+                records.append(None)
+                continue
+            labels = edge_labels.get(eid, None)
+            data = edge_data.get(eid, None)
+            records.append(record(frozenset(labels) if labels else no_labels, dict(data) if data else {}))
+        return records
+
+    def filter_vertices(self, vids: Iterable[base.VertexID], labels: Iterable[base.Label] = (),
+                        data: Optional[Mapping[Hashable, Any]] = None) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the vertex IDs in vids whose vertices have every one of the labels and store a value
+        equal to each of the values in data under the same key. The IDs are consumed lazily and yielded in the order
+        they are received.
+        """
+        labels = frozenset(labels)
+        data = tuple(data.items()) if data else ()
+        missing = object()
+        for vid in vids:
+            # The tables are looked up on every pass, since a write after a snapshot replaces them.
+            if labels and not labels.issubset(self._vertex_labels.get(vid, ())):
+                continue
+            if data:
+                values = self._vertex_data.get(vid, None)
+                if values is None or not all(base.data_matches(values.get(key, missing), value) for key, value in data):
+                    continue
+            yield vid
+
+    def add_vertex_data_index(self, key: Hashable, ordered: bool = False) -> None:
+        """
+        Declare a secondary index on the vertex data stored under this key, so find_vertices() can look vertices up by
+        value without scanning the graph. If the key is already indexed, do nothing. If ordered is set, the index also
+        keeps the numbers stored under the key in sorted order, so find_vertices_in_range() can scan ranges of them, and
+        an existing index is made ordered.
+        """
+        self._build_index(self._vertex_data_index, key, self._vertex_data, ordered)
+
+    def discard_vertex_data_index(self, key: Hashable) -> bool:
+        """
+        Drop the secondary index on the vertex data stored under this key. Return a Boolean indicating whether there
+        was an index to drop.
+        """
+        self._prepare_write()
+        if key not in self._vertex_data_index:
+            return False
+        del self._vertex_data_index[key]
+        return True
+
+    def has_vertex_data_index(self, key: Hashable, ordered: bool = False) -> bool:
+        """
+        Return a Boolean indicating whether the vertex data stored under this key is indexed, or if ordered is set,
+        whether it has an ordered index.
+        """
+        index = self._vertex_data_index.get(key, None)
+        return index is not None and (not ordered or _ORDER in index)
+
+    def find_vertices(self, key: Hashable, value: Any) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the IDs of the vertices that store a value equal to this one under the key. If the key
+        is indexed, the vertices are looked up in the index. Otherwise, every vertex in the graph is checked.
+        """
+        found = self._find(self._vertex_data_index, key, value, self._vertex_data)
+        if found is None:
+            return super().find_vertices(key, value)
+        return found
+
+    def find_vertices_in_range(self, key: Hashable, minimum: Optional[Any] = None, maximum: Optional[Any] = None,
+                               reverse: bool = False) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the IDs of the vertices that store a number between the minimum and the maximum,
+        inclusive, under the key, in order of the numbers. If the key has an ordered index, the vertices are streamed
+        from it. Otherwise, every vertex in the graph is checked.
+        """
+        found = self._find_range(self._vertex_data_index, key, minimum, maximum, reverse)
+        if found is None:
+            return super().find_vertices_in_range(key, minimum, maximum, reverse)
+        return found
+
+    def add_edge_data_index(self, key: Hashable, ordered: bool = False) -> None:
+        """
+        Declare a secondary index on the edge data stored under this key, so find_edges() can look edges up by value
+        without scanning the graph. If the key is already indexed, do nothing. If ordered is set, the index also keeps
+        the numbers stored under the key in sorted order, so find_edges_in_range() can scan ranges of them, and an
+        existing index is made ordered.
+        """
+        self._build_index(self._edge_data_index, key, self._edge_data, ordered)
+
+    def discard_edge_data_index(self, key: Hashable) -> bool:
+        """
+        Drop the secondary index on the edge data stored under this key. Return a Boolean indicating whether there was
+        an index to drop.
+        """
+        self._prepare_write()
+        if key not in self._edge_data_index:
+            return False
+        del self._edge_data_index[key]
+        return True
+
+    def has_edge_data_index(self, key: Hashable, ordered: bool = False) -> bool:
+        """
+        Return a Boolean indicating whether the edge data stored under this key is indexed, or if ordered is set,
+        whether it has an ordered index.
+        """
+        index = self._edge_data_index.get(key, None)
+        return index is not None and (not ordered or _ORDER in index)
+
+    def find_edges(self, key: Hashable, value: Any) -> Iterator[base.EdgeID]:
+        """
+        Return an iterator over the IDs of the edges that store a value equal to this one under the key. If the key is
+        indexed, the edges are looked up in the index. Otherwise, every edge in the graph is checked.
+        """
+        found = self._find(self._edge_data_index, key, value, self._edge_data)
+        if found is None:
+            return super().find_edges(key, value)
+        return found
+
+    def find_edges_in_range(self, key: Hashable, minimum: Optional[Any] = None, maximum: Optional[Any] = None,
+                            reverse: bool = False) -> Iterator[base.EdgeID]:
+        """
+        Return an iterator over the IDs of the edges that store a number between the minimum and the maximum,
+        inclusive, under the key, in order of the numbers. If the key has an ordered index, the edges are streamed
+        from it. Otherwise, every edge in the graph is checked.
+        """
+        found = self._find_range(self._edge_data_index, key, minimum, maximum, reverse)
+        if found is None:
+            return super().find_edges_in_range(key, minimum, maximum, reverse)
+        return found
+
     def add_vertex_label(self, vid: base.VertexID, label: base.Label) -> None:
         """Add a label to the vertex. If the vertex already has the label, do nothing."""
         self.add_vertex(vid)
-        if vid in self._vertex_labels:
-            self._vertex_labels[vid].add(label)
+        labels = self._vertex_labels.get(vid, None)
+        if labels is None:
+            self._vertex_labels[vid] = self._new({label})
+        elif label in labels:
+            return
         else:
-            self._vertex_labels[vid] = {label}
+            self._own(self._vertex_labels, vid).add(label)
+        self._index_label(self._vertex_label_index, label, vid)
 
     def has_vertex_label(self, vid: base.VertexID, label: base.Label) -> bool:
         """Return a Boolean indicating whether the vertex has the label."""
@@ -228,13 +1052,16 @@ class MemoryGraphStore(base.GraphStore):
         Remove the label from the vertex. If the vertex does not have the label, do nothing. Return a Boolean indicating
         whether or not a label was removed.
         """
+        self._prepare_write()
         labels = self._vertex_labels.get(vid, None)
         if labels is None:
             return False
         if label in labels:
+            labels = self._own(self._vertex_labels, vid)
             labels.discard(label)
             if not labels:
                 del self._vertex_labels[vid]
+            self._unindex_label(self._vertex_label_index, label, vid)
             return True
         return False
 
@@ -249,10 +1076,14 @@ class MemoryGraphStore(base.GraphStore):
     def add_edge_label(self, eid: base.EdgeID, label: base.Label) -> None:
         """Add a label to the edge. If the edge already has the label, do nothing."""
         self.add_edge(eid)
-        if eid in self._edge_labels:
-            self._edge_labels[eid].add(label)
+        labels = self._edge_labels.get(eid, None)
+        if labels is None:
+            self._edge_labels[eid] = self._new({label})
+        elif label in labels:
+            return
         else:
-            self._edge_labels[eid] = {label}
+            self._own(self._edge_labels, eid).add(label)
+        self._index_label(self._edge_label_index, label, eid)
 
     def has_edge_label(self, eid: base.EdgeID, label: base.Label) -> bool:
         """Return a Boolean indicating whether or not the edge has the label."""
@@ -263,13 +1094,16 @@ class MemoryGraphStore(base.GraphStore):
         Remove the label from the edge. If the edge does not have the label, do nothing. Return a Boolean indicating
         whether or not a label was removed.
         """
+        self._prepare_write()
         labels = self._edge_labels.get(eid, None)
         if labels is None:
             return False
         if label in labels:
+            labels = self._own(self._edge_labels, eid)
             labels.discard(label)
             if not labels:
                 del self._edge_labels[eid]
+            self._unindex_label(self._edge_label_index, label, eid)
             return True
         return False
 
@@ -281,20 +1115,49 @@ class MemoryGraphStore(base.GraphStore):
         """Return the number of labels the edge has."""
         return len(self._edge_labels.get(eid, ()))
 
-    def get_vertex_data(self, vid: base.VertexID, key: Hashable) -> Any:
-        """Return the value stored in the vertex for this key."""
-        if vid in self._vertex_data:
-            return self._vertex_data[vid].get(key, None)
-        return None
+    def iter_vertices_with_label(self, label: base.Label) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the IDs of the vertices that have the label, looked up in the label index. The IDs are
+        copied, so the graph store can be modified while they are iterated over.
+        """
+        return iter(list(self._vertex_label_index.get(label, ())))
+
+    def count_vertices_with_label(self, label: base.Label) -> int:
+        """Return the number of vertices that have the label."""
+        return len(self._vertex_label_index.get(label, ()))
+
+    def iter_edges_with_label(self, label: base.Label) -> Iterator[base.EdgeID]:
+        """
+        Return an iterator over the IDs of the edges that have the label, looked up in the label index. The IDs are
+        copied, so the graph store can be modified while they are iterated over.
+        """
+        return iter(list(self._edge_label_index.get(label, ())))
+
+    def count_edges_with_label(self, label: base.Label) -> int:
+        """Return the number of edges that have the label."""
+        return len(self._edge_label_index.get(label, ()))
+
+    def get_vertex_data(self, vid: base.VertexID, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the value stored in the vertex for this key. If no value is stored for the key, return the default.
+        """
+        data = self._vertex_data.get(vid, None)
+        if data is None:
+            return default
+        return data.get(key, default)
 
     def set_vertex_data(self, vid: base.VertexID, key: Hashable, value: Any) -> None:
         """Store a value in the vertex for this key."""
         self.add_vertex(vid)
         if vid in self._vertex_data:
-            data = self._vertex_data[vid]
+            data = self._own(self._vertex_data, vid)
         else:
-            data = {}
+            data = self._new({})
             self._vertex_data[vid] = data
+        if key in self._vertex_data_index:
+            if key in data:
+                self._unindex(self._vertex_data_index, key, data[key], vid)
+            self._index(self._vertex_data_index, key, value, vid)
         data[key] = value
 
     def has_vertex_data(self, vid: base.VertexID, key: Hashable) -> bool:
@@ -306,10 +1169,14 @@ class MemoryGraphStore(base.GraphStore):
         Remove the value stored in the vertex under this key. If no value is stored for the key, do nothing. Return
         a Boolean indicating whether a key/value pair was removed from the vertex.
         """
+        self._prepare_write()
         data = self._vertex_data.get(vid, None)
         if data is None:
             return False
         if key in data:
+            if key in self._vertex_data_index:
+                self._unindex(self._vertex_data_index, key, data[key], vid)
+            data = self._own(self._vertex_data, vid)
             del data[key]
             if not data:
                 del self._vertex_data[vid]
@@ -324,20 +1191,27 @@ class MemoryGraphStore(base.GraphStore):
         """Return the number of key/value pairs stored in the vertex."""
         return len(self._vertex_data.get(vid, ()))
 
-    def get_edge_data(self, eid: base.EdgeID, key: Hashable) -> Any:
-        """Return the value stored in the edge for this key."""
-        if eid in self._edge_data:
-            return self._edge_data[eid].get(key, None)
-        return None
+    def get_edge_data(self, eid: base.EdgeID, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the value stored in the edge for this key. If no value is stored for the key, return the default.
+        """
+        data = self._edge_data.get(eid, None)
+        if data is None:
+            return default
+        return data.get(key, default)
 
     def set_edge_data(self, eid: base.EdgeID, key: Hashable, value: Any) -> None:
         """Store a value in the edge for this key."""
         self.add_edge(eid)
         if eid in self._edge_data:
-            data = self._edge_data[eid]
+            data = self._own(self._edge_data, eid)
         else:
-            data = {}
+            data = self._new({})
             self._edge_data[eid] = data
+        if key in self._edge_data_index:
+            if key in data:
+                self._unindex(self._edge_data_index, key, data[key], eid)
+            self._index(self._edge_data_index, key, value, eid)
         data[key] = value
 
     def has_edge_data(self, eid: base.EdgeID, key: Hashable) -> bool:
@@ -349,10 +1223,14 @@ class MemoryGraphStore(base.GraphStore):
         Remove the value stored in the edge under this key. If no value is stored for the key, do nothing. Return
         a Boolean indicating whether a key/value pair was removed from the edge.
         """
+        self._prepare_write()
         data = self._edge_data.get(eid, None)
         if data is None:
             return False
         if key in data:
+            if key in self._edge_data_index:
+                self._unindex(self._edge_data_index, key, data[key], eid)
+            data = self._own(self._edge_data, eid)
             del data[key]
             if not data:
                 del self._edge_data[eid]
@@ -366,3 +1244,519 @@ class MemoryGraphStore(base.GraphStore):
     def count_edge_data_keys(self, eid: base.EdgeID) -> int:
         """Return the number of key/value pairs stored in the edge."""
         return len(self._edge_data.get(eid, ()))
+
+
+class ConcurrentMemoryGraphStore(MemoryGraphStore):
+    """
+    A thread-safe variant of MemoryGraphStore. Rather than serializing every operation behind a single lock, each
+    vertex is assigned to one of a fixed number of lock stripes by hashing its ID. Vertex operations lock the vertex's
+    stripe, and edge operations lock the stripes of both endpoints, always acquiring them in stripe order so that
+    two threads can never deadlock on each other. Threads working on disjoint vertices therefore rarely contend.
+    Point reads (has_*, count_*, get_*) take no locks at all, and iterators take a copy of the relevant container
+    under the stripe lock, so they are never invalidated by concurrent writes.
+    """
+
+    def __init__(self, stripes: int = 64):
+        assert stripes >= 1
+        super().__init__()
+        # Reentrant, because the mutators of MemoryGraphStore call each other with the locks already held.
+        self._stripes = tuple(threading.RLock() for _ in range(stripes))
+        self._count_lock = threading.Lock()
+        self._thaw_lock = threading.Lock()
+        # Index entries are shared by every vertex or edge storing the same value or label, regardless of their stripes.
+        self._index_lock = threading.Lock()
+
+    # The bulk operations of MemoryGraphStore read and write the tables directly, bypassing the per-item locking done
+    # here, so the per-item loops of the base class are used instead.
+    add_vertices = base.GraphStore.add_vertices
+    add_edges = base.GraphStore.add_edges
+    discard_vertices = base.GraphStore.discard_vertices
+    discard_edges = base.GraphStore.discard_edges
+    set_vertex_data_many = base.GraphStore.set_vertex_data_many
+    set_edge_data_many = base.GraphStore.set_edge_data_many
+    add_vertex_labels_many = base.GraphStore.add_vertex_labels_many
+    add_edge_labels_many = base.GraphStore.add_edge_labels_many
+    get_vertex_records = base.GraphStore.get_vertex_records
+    get_edge_records = base.GraphStore.get_edge_records
+
+    def _lock(self, vids: Iterable[base.VertexID]) -> List[threading.RLock]:
+        """Acquire the stripe locks for the given vertices, in stripe order, and return them."""
+        stripe_count = len(self._stripes)
+        locks = [self._stripes[index] for index in sorted({hash(vid) % stripe_count for vid in vids})]
+        for lock in locks:
+            lock.acquire()
+        return locks
+
+    @staticmethod
+    def _unlock(locks: List[threading.RLock]) -> None:
+        """Release stripe locks acquired by _lock()."""
+        for lock in reversed(locks):
+            lock.release()
+
+    def _lock_all(self) -> List[threading.RLock]:
+        """Acquire every stripe lock, in stripe order, and return them."""
+        for lock in self._stripes:
+            lock.acquire()
+        return list(self._stripes)
+
+    def _prepare_write(self) -> None:
+        """
+        Ensure the graph store can be modified. If the top-level tables are shared with a snapshot, they are copied
+        first, which takes time proportional to the size of the graph. The nested containers they hold are left
+        shared; see _own().
+        """
+        if self._shared:
+            # Writers holding different stripes may get here at the same time; only one of them should do the copy.
+            with self._thaw_lock:
+                super()._prepare_write()
+        else:
+            super()._prepare_write()
+
+    def _adjust_edge_count(self, delta: int) -> None:
+        """Add the delta to the edge count."""
+        with self._count_lock:
+            self._edge_count += delta
+
+    def _index(self, indexes: dict, key: Hashable, value: Any, item: Any) -> None:
+        """Add the vertex or edge ID to the index entry for the value. The key must be indexed."""
+        with self._index_lock:
+            super()._index(indexes, key, value, item)
+
+    def _unindex(self, indexes: dict, key: Hashable, value: Any, item: Any) -> None:
+        """Remove the vertex or edge ID from the index entry for the value. The key must be indexed."""
+        with self._index_lock:
+            super()._unindex(indexes, key, value, item)
+
+    def _range_page(self, indexes: dict, key: Hashable, minimum: Optional[Any], maximum: Optional[Any],
+                    reverse: bool, bound: Optional[Any], inclusive: bool) -> Optional[Tuple[Any, List[Any]]]:
+        """
+        Return the last number of the next page of numbers in the range past the bound, along with a list of the vertex
+        or edge IDs that store them, or None if there are no more numbers in the range.
+        """
+        with self._index_lock:
+            return super()._range_page(indexes, key, minimum, maximum, reverse, bound, inclusive)
+
+    def _index_label(self, index: dict, label: base.Label, item: Any) -> None:
+        """Add the vertex or edge ID to the label's entry in the label index."""
+        with self._index_lock:
+            super()._index_label(index, label, item)
+
+    def _unindex_label(self, index: dict, label: base.Label, item: Any) -> None:
+        """Remove the vertex or edge ID from the label's entry in the label index."""
+        with self._index_lock:
+            super()._unindex_label(index, label, item)
+
+    def snapshot(self) -> 'MemoryGraphStore':
+        """
+        Return a read-only view of the graph store as it currently stands. The snapshot shares its underlying
+        containers with this graph store, so taking a snapshot takes constant time and memory. Containers are copied
+        lazily, the first time this graph store modifies them after the snapshot was taken, so later changes to this
+        graph store are never visible through the snapshot.
+
+        Taking the snapshot blocks writers only briefly. See MemoryGraphStore.snapshot() for the cost of the copying
+        done by the first modification afterward.
+        """
+        locks = self._lock_all()
+        try:
+            return super().snapshot()
+        finally:
+            self._unlock(locks)
+
+    def save(self, path: str) -> None:
+        """
+        Save the contents of the graph store to a binary snapshot file, which can be read back in with load(). The
+        tables are streamed to disk in fixed-size chunks, so no serialized copy of the whole graph is ever held in
+        memory. The file is written under a temporary name and then moved into place, so an existing snapshot at the
+        same path is not lost if saving fails part way through.
+        """
+        # Writers are only blocked for as long as it takes to take the snapshot, not for the whole save.
+        self.snapshot().save(path)
+
+    def iter_vertices(self) -> Iterator[base.VertexID]:
+        """Return an iterator over the IDs of every vertex in the graph."""
+        return iter(list(self._forward))
+
+    def iter_edges(self) -> Iterator[base.EdgeID]:
+        """Return an iterator over the IDs of every edge in the graph."""
+        for source in list(self._forward):
+            locks = self._lock((source,))
+            try:
+                sinks = tuple(self._forward.get(source, ()))
+            finally:
+                self._unlock(locks)
+            for sink in sinks:
+                yield base.DirectedEdgeID(source, sink)
+
+        # See MemoryGraphStore.iter_edges() for an explanation of the ordering.
+        for left in list(self._dual):
+            locks = self._lock((left,))
+            try:
+                rights = tuple(self._dual.get(left, ()))
+            finally:
+                self._unlock(locks)
+            left_repr = repr(left)
+            for right in rights:
+                if left == right or left_repr < repr(right):
+                    yield base.UndirectedEdgeID(left, right)
+
+    def iter_inbound(self, sink: base.VertexID) -> Iterator[base.DirectedEdgeID]:
+        """Return an iterator over the IDs of every inbound directed edge to this vertex."""
+        locks = self._lock((sink,))
+        try:
+            sources = tuple(self._backward.get(sink, ()))
+        finally:
+            self._unlock(locks)
+        for source in sources:
+            yield base.DirectedEdgeID(source, sink)
+
+    def iter_outbound(self, source: base.VertexID) -> Iterator[base.DirectedEdgeID]:
+        """Return an iterator over the IDs of every outbound directed edge from this vertex."""
+        locks = self._lock((source,))
+        try:
+            sinks = tuple(self._forward.get(source, ()))
+        finally:
+            self._unlock(locks)
+        for sink in sinks:
+            yield base.DirectedEdgeID(source, sink)
+
+    def iter_undirected(self, vid: base.VertexID) -> Iterator[base.UndirectedEdgeID]:
+        """Return an iterator over the IDs of every undirected edge connected to this vertex."""
+        locks = self._lock((vid,))
+        try:
+            others = tuple(self._dual.get(vid, ()))
+        finally:
+            self._unlock(locks)
+        for other in others:
+            yield base.UndirectedEdgeID(vid, other)
+
+    def iter_inbound_data(self, sink: base.VertexID, key: Hashable,
+                          default: Any = None) -> Iterator[Tuple[base.VertexID, Any]]:
+        """
+        Return an iterator over (source, value) pairs, one for each inbound directed edge to this vertex, where value is
+        the data stored in the edge under the key, or the default if there is none.
+        """
+        locks = self._lock((sink,))
+        try:
+            return iter(list(super().iter_inbound_data(sink, key, default)))
+        finally:
+            self._unlock(locks)
+
+    def iter_outbound_data(self, source: base.VertexID, key: Hashable,
+                           default: Any = None) -> Iterator[Tuple[base.VertexID, Any]]:
+        """
+        Return an iterator over (sink, value) pairs, one for each outbound directed edge from this vertex, where value
+        is the data stored in the edge under the key, or the default if there is none.
+        """
+        locks = self._lock((source,))
+        try:
+            return iter(list(super().iter_outbound_data(source, key, default)))
+        finally:
+            self._unlock(locks)
+
+    def iter_undirected_data(self, vid: base.VertexID, key: Hashable,
+                             default: Any = None) -> Iterator[Tuple[base.VertexID, Any]]:
+        """
+        Return an iterator over (neighbor, value) pairs, one for each undirected edge connected to this vertex, where
+        value is the data stored in the edge under the key, or the default if there is none.
+        """
+        locks = self._lock((vid,))
+        try:
+            return iter(list(super().iter_undirected_data(vid, key, default)))
+        finally:
+            self._unlock(locks)
+
+    def iter_sources(self, sink: base.VertexID) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the IDs of the sources of every inbound directed edge to this vertex.
+        """
+        locks = self._lock((sink,))
+        try:
+            return iter(tuple(self._backward.get(sink, ())))
+        finally:
+            self._unlock(locks)
+
+    def iter_sinks(self, source: base.VertexID) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the IDs of the sinks of every outbound directed edge from this vertex.
+        """
+        locks = self._lock((source,))
+        try:
+            return iter(tuple(self._forward.get(source, ())))
+        finally:
+            self._unlock(locks)
+
+    def iter_neighbors(self, vid: base.VertexID) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the IDs of every vertex connected to this vertex by an edge, whether inbound, outbound,
+        or undirected. Each neighbor is yielded only once, even if it is connected by more than one edge.
+        """
+        locks = self._lock((vid,))
+        try:
+            neighbors = set(self._forward.get(vid, ()))
+            neighbors.update(self._backward.get(vid, ()))
+            neighbors.update(self._dual.get(vid, ()))
+        finally:
+            self._unlock(locks)
+        return iter(neighbors)
+
+    def add_vertex(self, vid: base.VertexID) -> None:
+        """
+        Add a vertex to the graph associated with this ID. If a vertex with the given ID already exists, do nothing.
+        """
+        locks = self._lock((vid,))
+        try:
+            super().add_vertex(vid)
+        finally:
+            self._unlock(locks)
+
+    def add_edge(self, eid: base.EdgeID) -> None:
+        """
+        Add an edge to the graph associated with this ID. If an edge with the given ID already exists, do nothing. If
+        either the source or sink vertex of the edge does not exist, add it first.
+        """
+        locks = self._lock(eid.vertices)
+        try:
+            super().add_edge(eid)
+        finally:
+            self._unlock(locks)
+
+    def discard_vertex(self, vid: base.VertexID) -> bool:
+        """
+        Remove the vertex associated with this ID from the graph. If such a vertex does not exist, do nothing. Any
+        incident edges to the vertex are also removed. Return a Boolean indicating whether the vertex was present to
+        be removed.
+        """
+        # Removing the vertex touches every one of its neighbors, so all of their stripes have to be held. The
+        # neighbors can't be known for certain until the vertex's own stripe is held, so they are read first and
+        # then checked again once all the locks are held, starting over if a new neighbor has appeared in between.
+        stripe_count = len(self._stripes)
+        neighbors = ()
+        while True:
+            locks = self._lock((vid,) + neighbors)
+            try:
+                if vid not in self._forward:
+                    return False
+                current = (tuple(self._forward[vid]) + tuple(self._backward[vid]) + tuple(self._dual[vid]))
+                held = {hash(other) % stripe_count for other in (vid,) + neighbors}
+                if all(hash(other) % stripe_count in held for other in current):
+                    return super().discard_vertex(vid)
+                neighbors = current
+            finally:
+                self._unlock(locks)
+
+    def discard_edge(self, eid: base.EdgeID, ignore: Optional[base.VertexID] = None) -> bool:
+        """
+        Remove the edge associated with this ID from the graph. If such an edge does not exist, do nothing. The source
+        and sink vertex are not removed. Return a Boolean indicating whether the edge was present to be removed.
+        """
+        locks = self._lock(eid.vertices)
+        try:
+            return super().discard_edge(eid, ignore)
+        finally:
+            self._unlock(locks)
+
+    def get_vertex_record(self, vid: base.VertexID) -> Optional[base.VertexRecord]:
+        """
+        Return the labels, data, and edge counts of the vertex in a single call, or None if the vertex does not exist.
+        """
+        locks = self._lock((vid,))
+        try:
+            return super().get_vertex_record(vid)
+        finally:
+            self._unlock(locks)
+
+    def get_edge_record(self, eid: base.EdgeID) -> Optional[base.EdgeRecord]:
+        """Return the labels and data of the edge in a single call, or None if the edge does not exist."""
+        locks = self._lock(eid.vertices)
+        try:
+            return super().get_edge_record(eid)
+        finally:
+            self._unlock(locks)
+
+    def add_vertex_data_index(self, key: Hashable, ordered: bool = False) -> None:
+        """
+        Declare a secondary index on the vertex data stored under this key, so find_vertices() can look vertices up by
+        value without scanning the graph. If the key is already indexed, do nothing. If ordered is set, the index also
+        keeps the numbers stored under the key in sorted order, so find_vertices_in_range() can scan ranges of them, and
+        an existing index is made ordered.
+        """
+        locks = self._lock_all()
+        try:
+            super().add_vertex_data_index(key, ordered)
+        finally:
+            self._unlock(locks)
+
+    def discard_vertex_data_index(self, key: Hashable) -> bool:
+        """
+        Drop the secondary index on the vertex data stored under this key. Return a Boolean indicating whether there
+        was an index to drop.
+        """
+        locks = self._lock_all()
+        try:
+            return super().discard_vertex_data_index(key)
+        finally:
+            self._unlock(locks)
+
+    def find_vertices(self, key: Hashable, value: Any) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the IDs of the vertices that store a value equal to this one under the key. If the key
+        is indexed, the vertices are looked up in the index. Otherwise, every vertex in the graph is checked.
+        """
+        with self._index_lock:
+            return super().find_vertices(key, value)
+
+    def add_edge_data_index(self, key: Hashable, ordered: bool = False) -> None:
+        """
+        Declare a secondary index on the edge data stored under this key, so find_edges() can look edges up by value
+        without scanning the graph. If the key is already indexed, do nothing. If ordered is set, the index also keeps
+        the numbers stored under the key in sorted order, so find_edges_in_range() can scan ranges of them, and an
+        existing index is made ordered.
+        """
+        locks = self._lock_all()
+        try:
+            super().add_edge_data_index(key, ordered)
+        finally:
+            self._unlock(locks)
+
+    def discard_edge_data_index(self, key: Hashable) -> bool:
+        """
+        Drop the secondary index on the edge data stored under this key. Return a Boolean indicating whether there was
+        an index to drop.
+        """
+        locks = self._lock_all()
+        try:
+            return super().discard_edge_data_index(key)
+        finally:
+            self._unlock(locks)
+
+    def find_edges(self, key: Hashable, value: Any) -> Iterator[base.EdgeID]:
+        """
+        Return an iterator over the IDs of the edges that store a value equal to this one under the key. If the key is
+        indexed, the edges are looked up in the index. Otherwise, every edge in the graph is checked.
+        """
+        with self._index_lock:
+            return super().find_edges(key, value)
+
+    def add_vertex_label(self, vid: base.VertexID, label: base.Label) -> None:
+        """Add a label to the vertex. If the vertex already has the label, do nothing."""
+        locks = self._lock((vid,))
+        try:
+            super().add_vertex_label(vid, label)
+        finally:
+            self._unlock(locks)
+
+    def discard_vertex_label(self, vid: base.VertexID, label: base.Label) -> bool:
+        """
+        Remove the label from the vertex. If the vertex does not have the label, do nothing. Return a Boolean indicating
+        whether or not a label was removed.
+        """
+        locks = self._lock((vid,))
+        try:
+            return super().discard_vertex_label(vid, label)
+        finally:
+            self._unlock(locks)
+
+    def iter_vertex_labels(self, vid: base.VertexID) -> Iterator[base.Label]:
+        """Return an iterator over the labels for the vertex."""
+        locks = self._lock((vid,))
+        try:
+            return iter(tuple(self._vertex_labels.get(vid, ())))
+        finally:
+            self._unlock(locks)
+
+    def add_edge_label(self, eid: base.EdgeID, label: base.Label) -> None:
+        """Add a label to the edge. If the edge already has the label, do nothing."""
+        locks = self._lock(eid.vertices)
+        try:
+            super().add_edge_label(eid, label)
+        finally:
+            self._unlock(locks)
+
+    def discard_edge_label(self, eid: base.EdgeID, label: base.Label) -> bool:
+        """
+        Remove the label from the edge. If the edge does not have the label, do nothing. Return a Boolean indicating
+        whether or not a label was removed.
+        """
+        locks = self._lock(eid.vertices)
+        try:
+            return super().discard_edge_label(eid, label)
+        finally:
+            self._unlock(locks)
+
+    def iter_edge_labels(self, eid: base.EdgeID) -> Iterator[base.Label]:
+        """Return an iterator over the labels for the edge."""
+        locks = self._lock(eid.vertices)
+        try:
+            return iter(tuple(self._edge_labels.get(eid, ())))
+        finally:
+            self._unlock(locks)
+
+    def iter_vertices_with_label(self, label: base.Label) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the IDs of the vertices that have the label, looked up in the label index. The IDs are
+        copied, so the graph store can be modified while they are iterated over.
+        """
+        with self._index_lock:
+            return super().iter_vertices_with_label(label)
+
+    def iter_edges_with_label(self, label: base.Label) -> Iterator[base.EdgeID]:
+        """
+        Return an iterator over the IDs of the edges that have the label, looked up in the label index. The IDs are
+        copied, so the graph store can be modified while they are iterated over.
+        """
+        with self._index_lock:
+            return super().iter_edges_with_label(label)
+
+    def set_vertex_data(self, vid: base.VertexID, key: Hashable, value: Any) -> None:
+        """Store a value in the vertex for this key."""
+        locks = self._lock((vid,))
+        try:
+            super().set_vertex_data(vid, key, value)
+        finally:
+            self._unlock(locks)
+
+    def discard_vertex_data(self, vid: base.VertexID, key: Hashable) -> bool:
+        """
+        Remove the value stored in the vertex under this key. If no value is stored for the key, do nothing. Return
+        a Boolean indicating whether a key/value pair was removed from the vertex.
+        """
+        locks = self._lock((vid,))
+        try:
+            return super().discard_vertex_data(vid, key)
+        finally:
+            self._unlock(locks)
+
+    def iter_vertex_data_keys(self, vid: base.VertexID) -> Iterator[Hashable]:
+        """Return an iterator over the keys for which data is stored in the vertex."""
+        locks = self._lock((vid,))
+        try:
+            return iter(tuple(self._vertex_data.get(vid, ())))
+        finally:
+            self._unlock(locks)
+
+    def set_edge_data(self, eid: base.EdgeID, key: Hashable, value: Any) -> None:
+        """Store a value in the edge for this key."""
+        locks = self._lock(eid.vertices)
+        try:
+            super().set_edge_data(eid, key, value)
+        finally:
+            self._unlock(locks)
+
+    def discard_edge_data(self, eid: base.EdgeID, key: Hashable) -> bool:
+        """
+        Remove the value stored in the edge under this key. If no value is stored for the key, do nothing. Return
+        a Boolean indicating whether a key/value pair was removed from the edge.
+        """
+        locks = self._lock(eid.vertices)
+        try:
+            return super().discard_edge_data(eid, key)
+        finally:
+            self._unlock(locks)
+
+    def iter_edge_data_keys(self, eid: base.EdgeID) -> Iterator[Hashable]:
+        """Return an iterator over the keys for which data is stored in the edge."""
+        locks = self._lock(eid.vertices)
+        try:
+            return iter(tuple(self._edge_data.get(eid, ())))
+        finally:
+            self._unlock(locks)
@@ -0,0 +1,561 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+
+"""
+Graph views: graph stores that present a filtered subset of another graph store without copying it. Filtering is
+applied as the view is read, so the view always reflects the current contents of the wrapped store, except for the
+vertex and edge counts, which are cached the first time they are computed. Wrap a view in a Graph to use it like any
+other graph.
+"""
+
+
+from typing import Any, Callable, Hashable, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+import vert.stores.base as base
+from vert.stores.wrapper import GraphStoreWrapper
+
+
+__all__ = [
+    'GraphView',
+    'InducedSubgraphView',
+    'LabelFilterView',
+    'EdgeFilterView',
+]
+
+
+class GraphView(GraphStoreWrapper):
+    """
+    The base class for graph views. A view includes each vertex of the wrapped store that satisfies _includes_vertex(),
+    and each edge of the wrapped store that satisfies _includes_edge() and connects two included vertices. Subclasses
+    override those two methods, and may override the iter_* methods with faster equivalents.
+
+    The vertex and edge counts are computed by iterating over the view, and are cached until refresh() is called.
+    Modifications made through the view are passed through to the wrapped store and refresh the view automatically;
+    modifications made to the wrapped store directly are only reflected in the counts once refresh() is called.
+    Vertices and edges added through the view are added to the wrapped store even if the view excludes them.
+
+    Labels and data are read straight from the wrapped store, without checking whether the view includes the vertex or
+    edge. The Graph interface checks for the vertex or edge before accessing them.
+    """
+
+    # Whether _includes_edge() ever excludes an edge between two included vertices. If not, adjacency can be filtered
+    # by checking the neighboring vertex alone.
+    _filters_edges = True
+
+    def __init__(self, graph_store: base.GraphStore):
+        super().__init__(graph_store)
+        self._vertex_count = None  # type: Optional[int]
+        self._edge_count = None  # type: Optional[int]
+
+    def _includes_vertex(self, vid: base.VertexID) -> bool:
+        """Return a Boolean indicating whether the view includes the vertex, which exists in the wrapped store."""
+        return True
+
+    def _includes_edge(self, eid: base.EdgeID) -> bool:
+        """
+        Return a Boolean indicating whether the view includes the edge, which exists in the wrapped store, regardless of
+        whether its vertices are included.
+        """
+        return True
+
+    def _accepts_edge(self, eid: base.EdgeID) -> bool:
+        """Return a Boolean indicating whether the view includes the edge and both of its vertices."""
+        includes_vertex = self._includes_vertex
+        return all(includes_vertex(vid) for vid in eid.vertices) and self._includes_edge(eid)
+
+    def refresh(self) -> None:
+        """Discard the cached vertex and edge counts, so they are recomputed the next time they are needed."""
+        self._vertex_count = None
+        self._edge_count = None
+
+    def count_vertices(self) -> int:
+        """Return the total number of vertices in the view."""
+        if self._vertex_count is None:
+            self._vertex_count = sum(1 for _ in self.iter_vertices())
+        return self._vertex_count
+
+    def count_edges(self) -> int:
+        """Return the total number of edges in the view."""
+        if self._edge_count is None:
+            self._edge_count = sum(1 for _ in self.iter_edges())
+        return self._edge_count
+
+    def iter_vertices(self) -> Iterator[base.VertexID]:
+        """Return an iterator over the IDs of every vertex in the view."""
+        includes_vertex = self._includes_vertex
+        return (vid for vid in self._graph_store.iter_vertices() if includes_vertex(vid))
+
+    def iter_edges(self) -> Iterator[base.EdgeID]:
+        """
+        Return an iterator over the IDs of every edge in the view. The edges are found through the adjacency of the
+        vertices in the view, so edges that lead away from them are never looked at.
+        """
+        # Each undirected edge is seen from both ends, so it is only yielded from the end that is visited first.
+        finished = set()
+        for vid in self.iter_vertices():
+            yield from self.iter_outbound(vid)
+            for eid in self.iter_undirected(vid):
+                v1, v2 = eid.vertices
+                if (v2 if v1 == vid else v1) not in finished:
+                    yield eid
+            finished.add(vid)
+
+    def has_inbound(self, sink: base.VertexID) -> bool:
+        """Return a Boolean value indicating whether this vertex has at least one inbound directed edge in the view."""
+        return any(True for _ in self.iter_inbound(sink))
+
+    def has_outbound(self, source: base.VertexID) -> bool:
+        """Return a Boolean value indicating whether this vertex has at least one outbound directed edge in the view."""
+        return any(True for _ in self.iter_outbound(source))
+
+    def has_undirected(self, vid: base.VertexID) -> bool:
+        """Return a Boolean value indicating whether this vertex has at least one undirected edge in the view."""
+        return any(True for _ in self.iter_undirected(vid))
+
+    def iter_inbound(self, sink: base.VertexID) -> Iterator[base.DirectedEdgeID]:
+        """Return an iterator over the IDs of every inbound directed edge to this vertex in the view."""
+        accepts_edge = self._accepts_edge
+        return (eid for eid in self._graph_store.iter_inbound(sink) if accepts_edge(eid))
+
+    def iter_outbound(self, source: base.VertexID) -> Iterator[base.DirectedEdgeID]:
+        """Return an iterator over the IDs of every outbound directed edge from this vertex in the view."""
+        accepts_edge = self._accepts_edge
+        return (eid for eid in self._graph_store.iter_outbound(source) if accepts_edge(eid))
+
+    def iter_undirected(self, vid: base.VertexID) -> Iterator[base.UndirectedEdgeID]:
+        """Return an iterator over the IDs of every undirected edge connected to this vertex in the view."""
+        accepts_edge = self._accepts_edge
+        return (eid for eid in self._graph_store.iter_undirected(vid) if accepts_edge(eid))
+
+    def iter_sources(self, sink: base.VertexID) -> Iterator[base.VertexID]:
+        """Return an iterator over the IDs of the sources of every inbound directed edge to this vertex in the view."""
+        if self._filters_edges:
+            return base.GraphStore.iter_sources(self, sink)
+        if not self._includes_vertex(sink):
+            return iter(())
+        includes_vertex = self._includes_vertex
+        return (vid for vid in self._graph_store.iter_sources(sink) if includes_vertex(vid))
+
+    def iter_sinks(self, source: base.VertexID) -> Iterator[base.VertexID]:
+        """Return an iterator over the IDs of the sinks of every outbound directed edge from this vertex in the view."""
+        if self._filters_edges:
+            return base.GraphStore.iter_sinks(self, source)
+        if not self._includes_vertex(source):
+            return iter(())
+        includes_vertex = self._includes_vertex
+        return (vid for vid in self._graph_store.iter_sinks(source) if includes_vertex(vid))
+
+    def iter_neighbors(self, vid: base.VertexID) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the IDs of every vertex connected to this vertex by an edge in the view, whether
+        inbound, outbound, or undirected. Each neighbor is yielded only once.
+        """
+        if self._filters_edges:
+            return base.GraphStore.iter_neighbors(self, vid)
+        if not self._includes_vertex(vid):
+            return iter(())
+        includes_vertex = self._includes_vertex
+        return (other for other in self._graph_store.iter_neighbors(vid) if includes_vertex(other))
+
+    def iter_inbound_data(self, sink: base.VertexID, key: Hashable,
+                          default: Any = None) -> Iterator[Tuple[base.VertexID, Any]]:
+        """
+        Return an iterator over (source, value) pairs, one for each inbound directed edge to this vertex in the view,
+        where value is the data stored in the edge under the key, or the default if there is none.
+        """
+        if self._filters_edges:
+            return base.GraphStore.iter_inbound_data(self, sink, key, default)
+        if not self._includes_vertex(sink):
+            return iter(())
+        includes_vertex = self._includes_vertex
+        return (item for item in self._graph_store.iter_inbound_data(sink, key, default) if includes_vertex(item[0]))
+
+    def iter_outbound_data(self, source: base.VertexID, key: Hashable,
+                           default: Any = None) -> Iterator[Tuple[base.VertexID, Any]]:
+        """
+        Return an iterator over (sink, value) pairs, one for each outbound directed edge from this vertex in the view,
+        where value is the data stored in the edge under the key, or the default if there is none.
+        """
+        if self._filters_edges:
+            return base.GraphStore.iter_outbound_data(self, source, key, default)
+        if not self._includes_vertex(source):
+            return iter(())
+        includes_vertex = self._includes_vertex
+        return (item for item in self._graph_store.iter_outbound_data(source, key, default)
+                if includes_vertex(item[0]))
+
+    def iter_undirected_data(self, vid: base.VertexID, key: Hashable,
+                             default: Any = None) -> Iterator[Tuple[base.VertexID, Any]]:
+        """
+        Return an iterator over (neighbor, value) pairs, one for each undirected edge connected to this vertex in the
+        view, where value is the data stored in the edge under the key, or the default if there is none.
+        """
+        if self._filters_edges:
+            return base.GraphStore.iter_undirected_data(self, vid, key, default)
+        if not self._includes_vertex(vid):
+            return iter(())
+        includes_vertex = self._includes_vertex
+        return (item for item in self._graph_store.iter_undirected_data(vid, key, default)
+                if includes_vertex(item[0]))
+
+    def count_inbound(self, sink: base.VertexID) -> int:
+        """Return the number of inbound directed edges to this vertex in the view."""
+        return sum(1 for _ in self.iter_inbound(sink))
+
+    def count_outbound(self, source: base.VertexID) -> int:
+        """Return the number of outbound directed edges from this vertex in the view."""
+        return sum(1 for _ in self.iter_outbound(source))
+
+    def count_undirected(self, vid: base.VertexID) -> int:
+        """Return the number of undirected edges connected to this vertex in the view."""
+        return sum(1 for _ in self.iter_undirected(vid))
+
+    def has_vertex(self, vid: base.VertexID) -> bool:
+        """Return whether the given ID has a vertex associated with it in the view."""
+        return self._graph_store.has_vertex(vid) and self._includes_vertex(vid)
+
+    def has_edge(self, eid: base.EdgeID) -> bool:
+        """Return whether the given ID has an edge associated with it in the view."""
+        return self._graph_store.has_edge(eid) and self._accepts_edge(eid)
+
+    def get_vertex_record(self, vid: base.VertexID) -> Optional[base.VertexRecord]:
+        """
+        Return the labels, data, and edge counts of the vertex in a single call, or None if the vertex is not in the
+        view. The edge counts include only the edges in the view.
+        """
+        if not self.has_vertex(vid):
+            return None
+        record = self._graph_store.get_vertex_record(vid)
+        return record._replace(inbound=self.count_inbound(vid), outbound=self.count_outbound(vid),
+                               undirected=self.count_undirected(vid))
+
+    def get_edge_record(self, eid: base.EdgeID) -> Optional[base.EdgeRecord]:
+        """Return the labels and data of the edge in a single call, or None if the edge is not in the view."""
+        if not self.has_edge(eid):
+            return None
+        return self._graph_store.get_edge_record(eid)
+
+    def get_vertex_records(self, vids: Iterable[base.VertexID]) -> List[Optional[base.VertexRecord]]:
+        """
+        Return a list of the records of the vertices, in the same order as their IDs, with None for each ID that is not
+        in the view.
+        """
+        return base.GraphStore.get_vertex_records(self, vids)
+
+    def get_edge_records(self, eids: Iterable[base.EdgeID]) -> List[Optional[base.EdgeRecord]]:
+        """
+        Return a list of the records of the edges, in the same order as their IDs, with None for each ID that is not in
+        the view.
+        """
+        return base.GraphStore.get_edge_records(self, eids)
+
+    def filter_vertices(self, vids: Iterable[base.VertexID], labels: Iterable[base.Label] = (),
+                        data: Optional[Mapping[Hashable, Any]] = None) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the vertex IDs in vids whose vertices are in the view, have every one of the labels,
+        and store a value equal to each of the values in data under the same key. The IDs are consumed lazily and
+        yielded in the order they are received.
+        """
+        includes_vertex = self._includes_vertex
+        return self._graph_store.filter_vertices((vid for vid in vids if includes_vertex(vid)), labels, data)
+
+    def find_vertices(self, key: Hashable, value: Any) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the IDs of the vertices in the view that store a value equal to this one under the key.
+        The wrapped store's index is used if it has one, and the results are filtered by the view.
+        """
+        includes_vertex = self._includes_vertex
+        return (vid for vid in self._graph_store.find_vertices(key, value) if includes_vertex(vid))
+
+    def find_edges(self, key: Hashable, value: Any) -> Iterator[base.EdgeID]:
+        """
+        Return an iterator over the IDs of the edges in the view that store a value equal to this one under the key.
+        The wrapped store's index is used if it has one, and the results are filtered by the view.
+        """
+        accepts_edge = self._accepts_edge
+        return (eid for eid in self._graph_store.find_edges(key, value) if accepts_edge(eid))
+
+    def find_vertices_in_range(self, key: Hashable, minimum: Optional[Any] = None, maximum: Optional[Any] = None,
+                               reverse: bool = False) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the IDs of the vertices in the view that store a number between the minimum and the
+        maximum, inclusive, under the key, in order of the numbers. The wrapped store's ordered index is used if it has
+        one, and the results are filtered by the view.
+        """
+        includes_vertex = self._includes_vertex
+        return (vid for vid in self._graph_store.find_vertices_in_range(key, minimum, maximum, reverse)
+                if includes_vertex(vid))
+
+    def find_edges_in_range(self, key: Hashable, minimum: Optional[Any] = None, maximum: Optional[Any] = None,
+                            reverse: bool = False) -> Iterator[base.EdgeID]:
+        """
+        Return an iterator over the IDs of the edges in the view that store a number between the minimum and the
+        maximum, inclusive, under the key, in order of the numbers. The wrapped store's ordered index is used if it has
+        one, and the results are filtered by the view.
+        """
+        accepts_edge = self._accepts_edge
+        return (eid for eid in self._graph_store.find_edges_in_range(key, minimum, maximum, reverse)
+                if accepts_edge(eid))
+
+    def iter_vertices_with_label(self, label: base.Label) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the IDs of the vertices in the view that have the label. The wrapped store's label index
+        is used if it has one, and the results are filtered by the view.
+        """
+        includes_vertex = self._includes_vertex
+        return (vid for vid in self._graph_store.iter_vertices_with_label(label) if includes_vertex(vid))
+
+    def count_vertices_with_label(self, label: base.Label) -> int:
+        """Return the number of vertices in the view that have the label."""
+        return sum(1 for _ in self.iter_vertices_with_label(label))
+
+    def iter_edges_with_label(self, label: base.Label) -> Iterator[base.EdgeID]:
+        """
+        Return an iterator over the IDs of the edges in the view that have the label. The wrapped store's label index is
+        used if it has one, and the results are filtered by the view.
+        """
+        accepts_edge = self._accepts_edge
+        return (eid for eid in self._graph_store.iter_edges_with_label(label) if accepts_edge(eid))
+
+    def count_edges_with_label(self, label: base.Label) -> int:
+        """Return the number of edges in the view that have the label."""
+        return sum(1 for _ in self.iter_edges_with_label(label))
+
+    def add_vertex(self, vid: base.VertexID) -> None:
+        """Add a vertex to the wrapped graph store, and refresh the view."""
+        self._graph_store.add_vertex(vid)
+        self.refresh()
+
+    def add_edge(self, eid: base.EdgeID) -> None:
+        """Add an edge, and any missing vertices, to the wrapped graph store, and refresh the view."""
+        self._graph_store.add_edge(eid)
+        self.refresh()
+
+    def discard_vertex(self, vid: base.VertexID) -> bool:
+        """
+        Remove a vertex and its incident edges from the wrapped graph store, and refresh the view. Return a Boolean
+        indicating whether the vertex was present to be removed.
+        """
+        removed = self._graph_store.discard_vertex(vid)
+        self.refresh()
+        return removed
+
+    def discard_edge(self, eid: base.EdgeID, ignore: Optional[base.VertexID] = None) -> bool:
+        """
+        Remove an edge from the wrapped graph store, and refresh the view. Return a Boolean indicating whether the edge
+        was present to be removed.
+        """
+        removed = self._graph_store.discard_edge(eid, ignore)
+        self.refresh()
+        return removed
+
+    def add_vertices(self, vids: Iterable[base.VertexID]) -> None:
+        """Add vertices to the wrapped graph store, and refresh the view."""
+        self._graph_store.add_vertices(vids)
+        self.refresh()
+
+    def add_edges(self, eids: Iterable[base.EdgeID]) -> None:
+        """Add edges, and any missing vertices, to the wrapped graph store, and refresh the view."""
+        self._graph_store.add_edges(eids)
+        self.refresh()
+
+    def discard_vertices(self, vids: Iterable[base.VertexID]) -> int:
+        """
+        Remove vertices and their incident edges from the wrapped graph store, and refresh the view. Return the number
+        of vertices that were removed.
+        """
+        removed = self._graph_store.discard_vertices(vids)
+        self.refresh()
+        return removed
+
+    def discard_edges(self, eids: Iterable[base.EdgeID]) -> int:
+        """Remove edges from the wrapped graph store, and refresh the view. Return the number of edges removed."""
+        removed = self._graph_store.discard_edges(eids)
+        self.refresh()
+        return removed
+
+    def set_vertex_data_many(self, items: Iterable[Tuple[base.VertexID, Mapping[Hashable, Any]]]) -> None:
+        """Store data in vertices of the wrapped graph store, adding any missing vertices, and refresh the view."""
+        self._graph_store.set_vertex_data_many(items)
+        self.refresh()
+
+    def set_edge_data_many(self, items: Iterable[Tuple[base.EdgeID, Mapping[Hashable, Any]]]) -> None:
+        """Store data in edges of the wrapped graph store, adding any missing edges, and refresh the view."""
+        self._graph_store.set_edge_data_many(items)
+        self.refresh()
+
+    def add_vertex_labels_many(self, items: Iterable[Tuple[base.VertexID, Iterable[base.Label]]]) -> None:
+        """Add labels to vertices of the wrapped graph store, adding any missing vertices, and refresh the view."""
+        self._graph_store.add_vertex_labels_many(items)
+        self.refresh()
+
+    def add_edge_labels_many(self, items: Iterable[Tuple[base.EdgeID, Iterable[base.Label]]]) -> None:
+        """Add labels to edges of the wrapped graph store, adding any missing edges, and refresh the view."""
+        self._graph_store.add_edge_labels_many(items)
+        self.refresh()
+
+    def add_vertex_label(self, vid: base.VertexID, label: base.Label) -> None:
+        """Add a label to a vertex in the wrapped graph store, and refresh the view."""
+        self._graph_store.add_vertex_label(vid, label)
+        self.refresh()
+
+    def discard_vertex_label(self, vid: base.VertexID, label: base.Label) -> bool:
+        """
+        Remove a label from a vertex in the wrapped graph store, and refresh the view. Return a Boolean indicating
+        whether the label was present to be removed.
+        """
+        removed = self._graph_store.discard_vertex_label(vid, label)
+        self.refresh()
+        return removed
+
+    def add_edge_label(self, eid: base.EdgeID, label: base.Label) -> None:
+        """Add a label to an edge in the wrapped graph store, and refresh the view."""
+        self._graph_store.add_edge_label(eid, label)
+        self.refresh()
+
+    def discard_edge_label(self, eid: base.EdgeID, label: base.Label) -> bool:
+        """
+        Remove a label from an edge in the wrapped graph store, and refresh the view. Return a Boolean indicating
+        whether the label was present to be removed.
+        """
+        removed = self._graph_store.discard_edge_label(eid, label)
+        self.refresh()
+        return removed
+
+    def set_vertex_data(self, vid: base.VertexID, key: Hashable, value: Any) -> None:
+        """Store a value in a vertex of the wrapped graph store, and refresh the view."""
+        self._graph_store.set_vertex_data(vid, key, value)
+        self.refresh()
+
+    def discard_vertex_data(self, vid: base.VertexID, key: Hashable) -> bool:
+        """
+        Remove a value from a vertex of the wrapped graph store, and refresh the view. Return a Boolean indicating
+        whether a value was present to be removed.
+        """
+        removed = self._graph_store.discard_vertex_data(vid, key)
+        self.refresh()
+        return removed
+
+    def set_edge_data(self, eid: base.EdgeID, key: Hashable, value: Any) -> None:
+        """Store a value in an edge of the wrapped graph store, and refresh the view."""
+        self._graph_store.set_edge_data(eid, key, value)
+        self.refresh()
+
+    def discard_edge_data(self, eid: base.EdgeID, key: Hashable) -> bool:
+        """
+        Remove a value from an edge of the wrapped graph store, and refresh the view. Return a Boolean indicating
+        whether a value was present to be removed.
+        """
+        removed = self._graph_store.discard_edge_data(eid, key)
+        self.refresh()
+        return removed
+
+
+class InducedSubgraphView(GraphView):
+    """
+    A view of the subgraph induced by a set of vertices: the vertices in the set, and every edge between two of them.
+    The view iterates over the set rather than over the whole wrapped store, so it stays cheap for small subsets of
+    large graphs.
+    """
+
+    _filters_edges = False
+
+    def __init__(self, graph_store: base.GraphStore, vids: Iterable[base.VertexID]):
+        super().__init__(graph_store)
+        self._vids = frozenset(vids)
+
+    @property
+    def vids(self) -> frozenset:
+        """The IDs of the vertices that induce the subgraph. IDs with no vertex in the wrapped store are ignored."""
+        return self._vids
+
+    def _includes_vertex(self, vid: base.VertexID) -> bool:
+        """Return a Boolean indicating whether the vertex is in the inducing set."""
+        return vid in self._vids
+
+    def _accepts_edge(self, eid: base.EdgeID) -> bool:
+        """Return a Boolean indicating whether both of the edge's vertices are in the inducing set."""
+        vids = self._vids
+        return all(vid in vids for vid in eid.vertices)
+
+    def iter_vertices(self) -> Iterator[base.VertexID]:
+        """Return an iterator over the IDs of every vertex in the view."""
+        has_vertex = self._graph_store.has_vertex
+        return (vid for vid in self._vids if has_vertex(vid))
+
+
+class LabelFilterView(GraphView):
+    """
+    A view of the vertices that have every one of a set of vertex labels, and the edges between them that have every
+    one of a set of edge labels. Either set may be empty, in which case every vertex or edge passes it.
+    """
+
+    def __init__(self, graph_store: base.GraphStore, vertex_labels: Iterable[base.Label] = (),
+                 edge_labels: Iterable[base.Label] = ()):
+        super().__init__(graph_store)
+        self._vertex_labels = tuple(vertex_labels)
+        self._edge_labels = tuple(edge_labels)
+        self._filters_edges = bool(self._edge_labels)
+
+    @property
+    def vertex_labels(self) -> Tuple[base.Label, ...]:
+        """The labels a vertex must have to be in the view."""
+        return self._vertex_labels
+
+    @property
+    def edge_labels(self) -> Tuple[base.Label, ...]:
+        """The labels an edge must have to be in the view."""
+        return self._edge_labels
+
+    def _includes_vertex(self, vid: base.VertexID) -> bool:
+        """Return a Boolean indicating whether the vertex has all of the vertex labels."""
+        has_vertex_label = self._graph_store.has_vertex_label
+        return all(has_vertex_label(vid, label) for label in self._vertex_labels)
+
+    def _includes_edge(self, eid: base.EdgeID) -> bool:
+        """Return a Boolean indicating whether the edge has all of the edge labels."""
+        has_edge_label = self._graph_store.has_edge_label
+        return all(has_edge_label(eid, label) for label in self._edge_labels)
+
+    def iter_vertices(self) -> Iterator[base.VertexID]:
+        """Return an iterator over the IDs of every vertex in the view."""
+        if not self._vertex_labels:
+            return self._graph_store.iter_vertices()
+        # Start from the vertices with the first label, which stores with a label index can list without a scan.
+        candidates = self._graph_store.iter_vertices_with_label(self._vertex_labels[0])
+        return self._graph_store.filter_vertices(candidates, self._vertex_labels[1:])
+
+
+class EdgeFilterView(GraphView):
+    """
+    A view of every vertex of the wrapped store, and the edges that satisfy a predicate. The predicate is called with
+    the edge's ID, and should return a Boolean indicating whether to include the edge.
+    """
+
+    def __init__(self, graph_store: base.GraphStore, predicate: Callable[[base.EdgeID], bool]):
+        super().__init__(graph_store)
+        self._predicate = predicate
+
+    @property
+    def predicate(self) -> Callable[[base.EdgeID], bool]:
+        """The function that decides which edges are included in the view."""
+        return self._predicate
+
+    def _accepts_edge(self, eid: base.EdgeID) -> bool:
+        """Return a Boolean indicating whether the edge satisfies the predicate."""
+        return self._predicate(eid)
+
+    def count_vertices(self) -> int:
+        """Return the total number of vertices in the view."""
+        return self._graph_store.count_vertices()
+
+    def iter_vertices(self) -> Iterator[base.VertexID]:
+        """Return an iterator over the IDs of every vertex in the view."""
+        return self._graph_store.iter_vertices()
+
+    def iter_edges(self) -> Iterator[base.EdgeID]:
+        """Return an iterator over the IDs of every edge in the view."""
+        return filter(self._predicate, self._graph_store.iter_edges())
@@ -0,0 +1,461 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+
+"""
+Definition of GraphStoreWrapper, a base class for graph stores that add behavior on top of another graph store.
+"""
+
+
+from typing import Hashable, Any, Optional, Iterator, Iterable, List, Mapping, Tuple
+
+import vert.stores.base as base
+
+
+__all__ = [
+    'GraphStoreWrapper',
+]
+
+
+class GraphStoreWrapper(base.GraphStore):
+    """
+    A graph store that passes every call through to another graph store. Subclasses override just the methods they
+    need to intercept, calling the wrapped store (or super()) to do the actual work. Every method of the GraphStore
+    interface is passed through explicitly, so the wrapped store's own implementations, rather than the GraphStore
+    defaults, are always used.
+    """
+
+    def __init__(self, graph_store: base.GraphStore):
+        self._graph_store = graph_store
+
+    @property
+    def graph_store(self) -> base.GraphStore:
+        """The wrapped graph store."""
+        return self._graph_store
+
+    @property
+    def is_open(self) -> bool:
+        """
+        A Boolean value indicating whether the graph store is open. When a graph store is closed, it cannot be accessed.
+        """
+        return self._graph_store.is_open
+
+    def close(self) -> None:
+        """
+        Perform a proper shutdown of the graph store, ensuring that if the graph store is persistent, it will be in a
+        consistent on-disk state.
+        """
+        self._graph_store.close()
+
+    def count_vertices(self) -> int:
+        """Return the total number of vertices in the graph."""
+        return self._graph_store.count_vertices()
+
+    def count_edges(self) -> int:
+        """Return the total number of edges in the graph."""
+        return self._graph_store.count_edges()
+
+    def iter_vertices(self) -> Iterator[base.VertexID]:
+        """Return an iterator over the IDs of every vertex in the graph."""
+        return self._graph_store.iter_vertices()
+
+    def iter_edges(self) -> Iterator[base.EdgeID]:
+        """Return an iterator over the IDs of every edge in the graph."""
+        return self._graph_store.iter_edges()
+
+    def has_inbound(self, sink: base.VertexID) -> bool:
+        """Return a Boolean value indicating whether the given vertex has at least one inbound edge."""
+        return self._graph_store.has_inbound(sink)
+
+    def has_outbound(self, source: base.VertexID) -> bool:
+        """Return a Boolean value indicating whether the given vertex has at least one outbound edge."""
+        return self._graph_store.has_outbound(source)
+
+    def has_undirected(self, vid: base.VertexID) -> bool:
+        """Return a Boolean value indicating whether the given vertex has at least one undirected edge."""
+        return self._graph_store.has_undirected(vid)
+
+    def iter_inbound(self, sink: base.VertexID) -> Iterator[base.DirectedEdgeID]:
+        """Return an iterator over the IDs of every inbound directed edge to this vertex."""
+        return self._graph_store.iter_inbound(sink)
+
+    def iter_outbound(self, source: base.VertexID) -> Iterator[base.DirectedEdgeID]:
+        """Return an iterator over the IDs of every outbound directed edge from this vertex."""
+        return self._graph_store.iter_outbound(source)
+
+    def iter_undirected(self, vid: base.VertexID) -> Iterator[base.UndirectedEdgeID]:
+        """Return an iterator over the IDs of every undirected edge connected to this vertex."""
+        return self._graph_store.iter_undirected(vid)
+
+    def iter_sources(self, sink: base.VertexID) -> Iterator[base.VertexID]:
+        """Return an iterator over the IDs of the sources of every inbound directed edge to this vertex."""
+        return self._graph_store.iter_sources(sink)
+
+    def iter_sinks(self, source: base.VertexID) -> Iterator[base.VertexID]:
+        """Return an iterator over the IDs of the sinks of every outbound directed edge from this vertex."""
+        return self._graph_store.iter_sinks(source)
+
+    def iter_neighbors(self, vid: base.VertexID) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the IDs of every vertex connected to this vertex by an edge, whether inbound, outbound,
+        or undirected. Each neighbor is yielded only once, even if it is connected by more than one edge.
+        """
+        return self._graph_store.iter_neighbors(vid)
+
+    def iter_inbound_data(self, sink: base.VertexID, key: Hashable,
+                          default: Any = None) -> Iterator[Tuple[base.VertexID, Any]]:
+        """
+        Return an iterator over (source, value) pairs, one for each inbound directed edge to this vertex, where value is
+        the data stored in the edge under the key, or the default if there is none.
+        """
+        return self._graph_store.iter_inbound_data(sink, key, default)
+
+    def iter_outbound_data(self, source: base.VertexID, key: Hashable,
+                           default: Any = None) -> Iterator[Tuple[base.VertexID, Any]]:
+        """
+        Return an iterator over (sink, value) pairs, one for each outbound directed edge from this vertex, where value
+        is the data stored in the edge under the key, or the default if there is none.
+        """
+        return self._graph_store.iter_outbound_data(source, key, default)
+
+    def iter_undirected_data(self, vid: base.VertexID, key: Hashable,
+                             default: Any = None) -> Iterator[Tuple[base.VertexID, Any]]:
+        """
+        Return an iterator over (neighbor, value) pairs, one for each undirected edge connected to this vertex, where
+        value is the data stored in the edge under the key, or the default if there is none.
+        """
+        return self._graph_store.iter_undirected_data(vid, key, default)
+
+    def count_inbound(self, sink: base.VertexID) -> int:
+        """Return the number of inbound directed edges to this vertex."""
+        return self._graph_store.count_inbound(sink)
+
+    def count_outbound(self, source: base.VertexID) -> int:
+        """Return the number of outbound directed edges from this vertex."""
+        return self._graph_store.count_outbound(source)
+
+    def count_undirected(self, vid: base.VertexID) -> int:
+        """Return the number of undirected edges connected to this vertex."""
+        return self._graph_store.count_undirected(vid)
+
+    def has_vertex(self, vid: base.VertexID) -> bool:
+        """Return whether the given ID has a vertex associated with it in the graph."""
+        return self._graph_store.has_vertex(vid)
+
+    def has_edge(self, eid: base.EdgeID) -> bool:
+        """Return whether the given ID has an edge associated with it in the graph."""
+        return self._graph_store.has_edge(eid)
+
+    def add_vertex(self, vid: base.VertexID) -> None:
+        """
+        Add a vertex to the graph associated with this ID. If a vertex with the given ID already exists, do nothing.
+        """
+        self._graph_store.add_vertex(vid)
+
+    def add_edge(self, eid: base.EdgeID) -> None:
+        """
+        Add an edge to the graph associated with this ID. If an edge with the given ID already exists, do nothing. If
+        either the source or sink vertex of the edge does not exist, add it first.
+        """
+        self._graph_store.add_edge(eid)
+
+    def discard_vertex(self, vid: base.VertexID) -> bool:
+        """
+        Remove the vertex associated with this ID from the graph. If such a vertex does not exist, do nothing. Any
+        incident edges to the vertex are also removed. Return a Boolean indicating whether the vertex was present to be
+        removed.
+        """
+        return self._graph_store.discard_vertex(vid)
+
+    def discard_edge(self, eid: base.EdgeID, ignore: Optional[base.VertexID] = None) -> bool:
+        """
+        Remove the edge associated with this ID from the graph. If such an edge does not exist, do nothing. The source
+        and sink vertex are not removed. Return a Boolean indicating whether the edge was present to be removed.
+        """
+        return self._graph_store.discard_edge(eid, ignore)
+
+    def add_vertices(self, vids: Iterable[base.VertexID]) -> None:
+        """
+        Add a vertex to the graph for each of these IDs, skipping those that already exist. Equivalent to calling
+        add_vertex() for each ID.
+        """
+        self._graph_store.add_vertices(vids)
+
+    def add_edges(self, eids: Iterable[base.EdgeID]) -> None:
+        """
+        Add an edge to the graph for each of these IDs, skipping those that already exist, and adding any missing
+        vertices first. Equivalent to calling add_edge() for each ID.
+        """
+        self._graph_store.add_edges(eids)
+
+    def discard_vertices(self, vids: Iterable[base.VertexID]) -> int:
+        """
+        Remove the vertices associated with these IDs from the graph, along with their incident edges. IDs with no
+        associated vertex are ignored. Return the number of vertices that were removed. Equivalent to calling
+        discard_vertex() for each ID.
+        """
+        return self._graph_store.discard_vertices(vids)
+
+    def discard_edges(self, eids: Iterable[base.EdgeID]) -> int:
+        """
+        Remove the edges associated with these IDs from the graph. IDs with no associated edge are ignored. Return the
+        number of edges that were removed. Equivalent to calling discard_edge() for each ID.
+        """
+        return self._graph_store.discard_edges(eids)
+
+    def set_vertex_data_many(self, items: Iterable[Tuple[base.VertexID, Mapping[Hashable, Any]]]) -> None:
+        """
+        For each (vertex ID, mapping) pair, store every key/value pair of the mapping in the vertex, adding the vertex
+        first if it doesn't exist. Equivalent to calling set_vertex_data() for each key/value pair.
+        """
+        self._graph_store.set_vertex_data_many(items)
+
+    def set_edge_data_many(self, items: Iterable[Tuple[base.EdgeID, Mapping[Hashable, Any]]]) -> None:
+        """
+        For each (edge ID, mapping) pair, store every key/value pair of the mapping in the edge, adding the edge first
+        if it doesn't exist. Equivalent to calling set_edge_data() for each key/value pair.
+        """
+        self._graph_store.set_edge_data_many(items)
+
+    def add_vertex_labels_many(self, items: Iterable[Tuple[base.VertexID, Iterable[base.Label]]]) -> None:
+        """
+        For each (vertex ID, labels) pair, add every one of the labels to the vertex, adding the vertex first if it
+        doesn't exist. Equivalent to calling add_vertex_label() for each label.
+        """
+        self._graph_store.add_vertex_labels_many(items)
+
+    def add_edge_labels_many(self, items: Iterable[Tuple[base.EdgeID, Iterable[base.Label]]]) -> None:
+        """
+        For each (edge ID, labels) pair, add every one of the labels to the edge, adding the edge first if it doesn't
+        exist. Equivalent to calling add_edge_label() for each label.
+        """
+        self._graph_store.add_edge_labels_many(items)
+
+    def get_vertex_record(self, vid: base.VertexID) -> Optional[base.VertexRecord]:
+        """
+        Return the labels, data, and edge counts of the vertex in a single call, or None if the vertex does not exist.
+        """
+        return self._graph_store.get_vertex_record(vid)
+
+    def get_edge_record(self, eid: base.EdgeID) -> Optional[base.EdgeRecord]:
+        """Return the labels and data of the edge in a single call, or None if the edge does not exist."""
+        return self._graph_store.get_edge_record(eid)
+
+    def get_vertex_records(self, vids: Iterable[base.VertexID]) -> List[Optional[base.VertexRecord]]:
+        """
+        Return a list of the records of the vertices, in the same order as their IDs, with None for each ID that has no
+        vertex. Equivalent to calling get_vertex_record() for each ID.
+        """
+        return self._graph_store.get_vertex_records(vids)
+
+    def get_edge_records(self, eids: Iterable[base.EdgeID]) -> List[Optional[base.EdgeRecord]]:
+        """
+        Return a list of the records of the edges, in the same order as their IDs, with None for each ID that has no
+        edge. Equivalent to calling get_edge_record() for each ID.
+        """
+        return self._graph_store.get_edge_records(eids)
+
+    def filter_vertices(self, vids: Iterable[base.VertexID], labels: Iterable[base.Label] = (),
+                        data: Optional[Mapping[Hashable, Any]] = None) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the vertex IDs in vids whose vertices have every one of the labels and store a value
+        equal to each of the values in data under the same key. The IDs are consumed lazily and yielded in the order
+        they are received.
+        """
+        return self._graph_store.filter_vertices(vids, labels, data)
+
+    def add_vertex_data_index(self, key: Hashable, ordered: bool = False) -> None:
+        """
+        Declare a secondary index on the vertex data stored under this key, so find_vertices() can look vertices up by
+        value without scanning the graph. If the key is already indexed, do nothing. If ordered is set, the index also
+        keeps the numbers stored under the key in sorted order, so find_vertices_in_range() can scan ranges of them, and
+        an existing index is made ordered.
+        """
+        self._graph_store.add_vertex_data_index(key, ordered)
+
+    def discard_vertex_data_index(self, key: Hashable) -> bool:
+        """
+        Drop the secondary index on the vertex data stored under this key. Return a Boolean indicating whether there
+        was an index to drop.
+        """
+        return self._graph_store.discard_vertex_data_index(key)
+
+    def has_vertex_data_index(self, key: Hashable, ordered: bool = False) -> bool:
+        """
+        Return a Boolean indicating whether the vertex data stored under this key is indexed, or if ordered is set,
+        whether it has an ordered index.
+        """
+        return self._graph_store.has_vertex_data_index(key, ordered)
+
+    def find_vertices(self, key: Hashable, value: Any) -> Iterator[base.VertexID]:
+        """Return an iterator over the IDs of the vertices that store a value equal to this one under the key."""
+        return self._graph_store.find_vertices(key, value)
+
+    def find_vertices_in_range(self, key: Hashable, minimum: Optional[Any] = None, maximum: Optional[Any] = None,
+                               reverse: bool = False) -> Iterator[base.VertexID]:
+        """
+        Return an iterator over the IDs of the vertices that store a number between the minimum and the maximum,
+        inclusive, under the key, in order of the numbers.
+        """
+        return self._graph_store.find_vertices_in_range(key, minimum, maximum, reverse)
+
+    def add_edge_data_index(self, key: Hashable, ordered: bool = False) -> None:
+        """
+        Declare a secondary index on the edge data stored under this key, so find_edges() can look edges up by value
+        without scanning the graph. If the key is already indexed, do nothing. If ordered is set, the index also keeps
+        the numbers stored under the key in sorted order, so find_edges_in_range() can scan ranges of them, and an
+        existing index is made ordered.
+        """
+        self._graph_store.add_edge_data_index(key, ordered)
+
+    def discard_edge_data_index(self, key: Hashable) -> bool:
+        """
+        Drop the secondary index on the edge data stored under this key. Return a Boolean indicating whether there was
+        an index to drop.
+        """
+        return self._graph_store.discard_edge_data_index(key)
+
+    def has_edge_data_index(self, key: Hashable, ordered: bool = False) -> bool:
+        """
+        Return a Boolean indicating whether the edge data stored under this key is indexed, or if ordered is set,
+        whether it has an ordered index.
+        """
+        return self._graph_store.has_edge_data_index(key, ordered)
+
+    def find_edges(self, key: Hashable, value: Any) -> Iterator[base.EdgeID]:
+        """Return an iterator over the IDs of the edges that store a value equal to this one under the key."""
+        return self._graph_store.find_edges(key, value)
+
+    def find_edges_in_range(self, key: Hashable, minimum: Optional[Any] = None, maximum: Optional[Any] = None,
+                            reverse: bool = False) -> Iterator[base.EdgeID]:
+        """
+        Return an iterator over the IDs of the edges that store a number between the minimum and the maximum,
+        inclusive, under the key, in order of the numbers.
+        """
+        return self._graph_store.find_edges_in_range(key, minimum, maximum, reverse)
+
+    def add_vertex_label(self, vid: base.VertexID, label: base.Label) -> None:
+        """Add a label to the vertex. If the vertex already has the label, do nothing."""
+        self._graph_store.add_vertex_label(vid, label)
+
+    def has_vertex_label(self, vid: base.VertexID, label: base.Label) -> bool:
+        """Return a Boolean indicating whether the vertex has the label."""
+        return self._graph_store.has_vertex_label(vid, label)
+
+    def discard_vertex_label(self, vid: base.VertexID, label: base.Label) -> bool:
+        """
+        Remove the label from the vertex. If the vertex does not have the label, do nothing. Return a Boolean indicating
+        whether or not a label was removed.
+        """
+        return self._graph_store.discard_vertex_label(vid, label)
+
+    def iter_vertex_labels(self, vid: base.VertexID) -> Iterator[base.Label]:
+        """Return an iterator over the labels for the vertex."""
+        return self._graph_store.iter_vertex_labels(vid)
+
+    def count_vertex_labels(self, vid: base.VertexID) -> int:
+        """Return the number of labels the vertex has."""
+        return self._graph_store.count_vertex_labels(vid)
+
+    def add_edge_label(self, eid: base.EdgeID, label: base.Label) -> None:
+        """Add a label to the edge. If the edge already has the label, do nothing."""
+        self._graph_store.add_edge_label(eid, label)
+
+    def has_edge_label(self, eid: base.EdgeID, label: base.Label) -> bool:
+        """Return a Boolean indicating whether or not the edge has the label."""
+        return self._graph_store.has_edge_label(eid, label)
+
+    def discard_edge_label(self, eid: base.EdgeID, label: base.Label) -> bool:
+        """
+        Remove the label from the edge. If the edge does not have the label, do nothing. Return a Boolean indicating
+        whether or not a label was removed.
+        """
+        return self._graph_store.discard_edge_label(eid, label)
+
+    def iter_edge_labels(self, eid: base.EdgeID) -> Iterator[base.Label]:
+        """Return an iterator over the labels for the edge."""
+        return self._graph_store.iter_edge_labels(eid)
+
+    def count_edge_labels(self, eid: base.EdgeID) -> int:
+        """Return the number of labels the edge has."""
+        return self._graph_store.count_edge_labels(eid)
+
+    def iter_vertices_with_label(self, label: base.Label) -> Iterator[base.VertexID]:
+        """Return an iterator over the IDs of the vertices that have the label."""
+        return self._graph_store.iter_vertices_with_label(label)
+
+    def count_vertices_with_label(self, label: base.Label) -> int:
+        """Return the number of vertices that have the label."""
+        return self._graph_store.count_vertices_with_label(label)
+
+    def iter_edges_with_label(self, label: base.Label) -> Iterator[base.EdgeID]:
+        """Return an iterator over the IDs of the edges that have the label."""
+        return self._graph_store.iter_edges_with_label(label)
+
+    def count_edges_with_label(self, label: base.Label) -> int:
+        """Return the number of edges that have the label."""
+        return self._graph_store.count_edges_with_label(label)
+
+    def get_vertex_data(self, vid: base.VertexID, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the value stored in the vertex for this key. If no value is stored for the key, return the default. A
+        unique sentinel object can be passed as the default to distinguish a missing key from a stored None in a single
+        lookup.
+        """
+        return base.lookup_vertex_data(self._graph_store, vid, key, default)
+
+    def set_vertex_data(self, vid: base.VertexID, key: Hashable, value: Any) -> None:
+        """Store a value in the vertex for this key."""
+        self._graph_store.set_vertex_data(vid, key, value)
+
+    def has_vertex_data(self, vid: base.VertexID, key: Hashable) -> bool:
+        """Return a Boolean indicating whether a value is stored in the vertex for this key."""
+        return self._graph_store.has_vertex_data(vid, key)
+
+    def discard_vertex_data(self, vid: base.VertexID, key: Hashable) -> bool:
+        """
+        Remove the value stored in the vertex under this key. If no value is stored for the key, do nothing. Return a
+        Boolean indicating whether a key/value pair was removed from the vertex.
+        """
+        return self._graph_store.discard_vertex_data(vid, key)
+
+    def iter_vertex_data_keys(self, vid: base.VertexID) -> Iterator[Hashable]:
+        """Return an iterator over the keys for which data is stored in the vertex."""
+        return self._graph_store.iter_vertex_data_keys(vid)
+
+    def count_vertex_data_keys(self, vid: base.VertexID) -> int:
+        """Return the number of key/value pairs stored in the vertex."""
+        return self._graph_store.count_vertex_data_keys(vid)
+
+    def get_edge_data(self, eid: base.EdgeID, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the value stored in the edge for this key. If no value is stored for the key, return the default. A
+        unique sentinel object can be passed as the default to distinguish a missing key from a stored None in a single
+        lookup.
+        """
+        return base.lookup_edge_data(self._graph_store, eid, key, default)
+
+    def set_edge_data(self, eid: base.EdgeID, key: Hashable, value: Any) -> None:
+        """Store a value in the edge for this key."""
+        self._graph_store.set_edge_data(eid, key, value)
+
+    def has_edge_data(self, eid: base.EdgeID, key: Hashable) -> bool:
+        """Return a Boolean indicating whether a value is stored in the edge for this key."""
+        return self._graph_store.has_edge_data(eid, key)
+
+    def discard_edge_data(self, eid: base.EdgeID, key: Hashable) -> bool:
+        """
+        Remove the value stored in the edge under this key. If no value is stored for the key, do nothing. Return a
+        Boolean indicating whether a key/value pair was removed from the edge.
+        """
+        return self._graph_store.discard_edge_data(eid, key)
+
+    def iter_edge_data_keys(self, eid: base.EdgeID) -> Iterator[Hashable]:
+        """Return an iterator over the keys for which data is stored in the edge."""
+        return self._graph_store.iter_edge_data_keys(eid)
+
+    def count_edge_data_keys(self, eid: base.EdgeID) -> int:
+        """Return the number of key/value pairs stored in the edge."""
+        return self._graph_store.count_edge_data_keys(eid)
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2017 Aaron M. Hosford
+# See LICENSE.txt for licensing information.
+
+
+"""
+A lazy, chainable traversal builder for multi-hop graph queries. Traversals are normally created with Graph.traverse()
+rather than directly.
+"""
+
+
+import itertools
+from typing import Any, Callable, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from vert.stores.base import GraphStore, Label, VertexID
+from vert.graphs import Vertex
+
+
+__all__ = [
+    'Traversal',
+]
+
+
+# Step kinds. Consecutive label and data steps are merged into a single call to GraphStore.filter_vertices().
+_OUT = 'out'
+_IN = 'in'
+_BOTH = 'both'
+_LABELS = 'labels'
+_DATA = 'data'
+_FILTER = 'filter'
+_DEDUP = 'dedup'
+_LIMIT = 'limit'
+
+
+class Traversal:
+    """
+    A lazily evaluated sequence of steps, starting from a tuple of vertex IDs (or from every vertex, if start is None)
+    and walking the graph one hop at a time. Each step method returns a new Traversal with the step appended, leaving
+    the original unchanged, so partial traversals can be stored and extended. Nothing is read from the graph store
+    until the traversal is iterated, and then the steps run as a single streaming pipeline over vertex IDs; Vertex
+    instances are only created for the final results.
+
+    Label and data filters are handed to the graph store's filter_vertices() method, so stores that can test vertices
+    natively do so.
+
+    Example:
+        for vertex in graph.traverse('dog').out().has_label('animal').where(color='black').limit(10):
+            print(vertex)
+    """
+
+    __slots__ = ('_graph_store', '_start', '_steps')
+
+    def __init__(self, graph_store: GraphStore, start: Optional[Tuple[VertexID, ...]] = None,
+                 steps: Tuple[Tuple[str, Any], ...] = ()):
+        self._graph_store = graph_store
+        self._start = start
+        self._steps = steps
+
+    def __iter__(self) -> Iterator[Vertex]:
+        graph_store = self._graph_store
+        for vid in self.ids():
+            yield Vertex(vid, graph_store)
+
+    def __repr__(self) -> str:
+        return '<%s with %d step(s)>' % (type(self).__name__, len(self._steps))
+
+    def _then(self, kind: str, argument: Any = None) -> 'Traversal':
+        """Return a new traversal with the step appended."""
+        return Traversal(self._graph_store, self._start, self._steps + ((kind, argument),))
+
+    def out(self) -> 'Traversal':
+        """
+        Step to the sinks of each vertex's outbound directed edges.
+
+        :return: The extended traversal.
+        """
+        return self._then(_OUT)
+
+    def in_(self) -> 'Traversal':
+        """
+        Step to the sources of each vertex's inbound directed edges.
+
+        :return: The extended traversal.
+        """
+        return self._then(_IN)
+
+    def both(self) -> 'Traversal':
+        """
+        Step to every neighbor of each vertex, following inbound, outbound, and undirected edges.
+
+        :return: The extended traversal.
+        """
+        return self._then(_BOTH)
+
+    def has_label(self, *labels: Label) -> 'Traversal':
+        """
+        Keep only the vertices that have every one of the labels.
+
+        :param labels: The labels the vertices must have.
+        :return: The extended traversal.
+        """
+        return self._then(_LABELS, labels)
+
+    def where(self, **data: Any) -> 'Traversal':
+        """
+        Keep only the vertices that store a value equal to each of the given values under the same key.
+
+        :param data: The key/value pairs the vertices must store.
+        :return: The extended traversal.
+        """
+        return self._then(_DATA, data)
+
+    def filter(self, predicate: Callable[[VertexID], bool]) -> 'Traversal':
+        """
+        Keep only the vertices for which the predicate returns a true value. The predicate is called with the vertex
+        ID, not a Vertex instance.
+
+        :param predicate: The test each vertex ID must pass.
+        :return: The extended traversal.
+        """
+        return self._then(_FILTER, predicate)
+
+    def dedup(self) -> 'Traversal':
+        """
+        Drop vertices that have already been yielded at this point in the traversal.
+
+        :return: The extended traversal.
+        """
+        return self._then(_DEDUP)
+
+    def limit(self, count: int) -> 'Traversal':
+        """
+        Stop after the given number of vertices have passed this point in the traversal. Because the traversal is
+        lazy, no more of the graph is read than is needed to produce them.
+
+        :param count: The maximum number of vertices to pass on.
+        :return: The extended traversal.
+        """
+        if count < 0:
+            raise ValueError(count)
+        return self._then(_LIMIT, count)
+
+    def ids(self) -> Iterator[VertexID]:
+        """
+        Run the traversal, yielding vertex IDs instead of Vertex instances.
+
+        :return: An iterator over the IDs of the vertices reached by the traversal.
+        """
+        graph_store = self._graph_store
+        if self._start is None:
+            vids = graph_store.iter_vertices()  # type: Iterator[VertexID]
+        else:
+            vids = iter(self._start)
+
+        labels = []  # type: List[Label]
+        data = {}  # type: dict
+        for kind, argument in self._steps:
+            if kind == _LABELS:
+                labels.extend(argument)
+                continue
+            if kind == _DATA and not any(key in data for key in argument):
+                data.update(argument)
+                continue
+            if labels or data:
+                vids = graph_store.filter_vertices(vids, labels, data)
+                labels = []
+                data = {}
+            if kind == _DATA:
+                data.update(argument)
+            elif kind == _OUT:
+                vids = itertools.chain.from_iterable(map(graph_store.iter_sinks, vids))
+            elif kind == _IN:
+                vids = itertools.chain.from_iterable(map(graph_store.iter_sources, vids))
+            elif kind == _BOTH:
+                vids = itertools.chain.from_iterable(map(graph_store.iter_neighbors, vids))
+            elif kind == _FILTER:
+                vids = filter(argument, vids)
+            elif kind == _DEDUP:
+                vids = _dedup(vids)
+            else:
+                assert kind == _LIMIT
+                vids = itertools.islice(vids, argument)
+        if labels or data:
+            vids = graph_store.filter_vertices(vids, labels, data)
+        return vids
+
+    def count(self) -> int:
+        """
+        Run the traversal and return the number of vertices it reaches, without creating any Vertex instances.
+
+        :return: The number of vertices reached.
+        """
+        return sum(1 for _ in self.ids())
+
+    def first(self) -> Optional[Vertex]:
+        """
+        Run the traversal just far enough to find the first vertex it reaches.
+
+        :return: The first vertex reached, or None if the traversal reaches no vertices.
+        """
+        for vid in self.ids():
+            return Vertex(vid, self._graph_store)
+        return None
+
+
+def _dedup(vids: Iterable[Hashable]) -> Iterator[Hashable]:
+    """Yield each ID the first time it is seen."""
+    seen = set()
+    for vid in vids:
+        if vid not in seen:
+            seen.add(vid)
+            yield vid